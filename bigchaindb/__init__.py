@@ -22,7 +22,9 @@ _base_database_rethinkdb = {
 
 _database_keys_map = {
     'mongodb': ('host', 'port', 'name', 'replicaset'),
-    'rethinkdb': ('host', 'port', 'name')
+    'rethinkdb': ('host', 'port', 'name'),
+    'memory': ('name',),
+    'sqlite': ('name', 'path'),
 }
 
 _base_database_mongodb = {
@@ -50,13 +52,36 @@ _database_mongodb = {
     'certfile': os.environ.get('BIGCHAINDB_DATABASE_CERTFILE'),
     'keyfile': os.environ.get('BIGCHAINDB_DATABASE_KEYFILE'),
     'keyfile_passphrase': os.environ.get('BIGCHAINDB_DATABASE_KEYFILE_PASSPHRASE'),
-    'crlfile': os.environ.get('BIGCHAINDB_DATABASE_CRLFILE')
+    'crlfile': os.environ.get('BIGCHAINDB_DATABASE_CRLFILE'),
+    'changefeed': os.environ.get('BIGCHAINDB_DATABASE_CHANGEFEED', 'oplog'),
 }
 _database_mongodb.update(_base_database_mongodb)
 
+_database_memory = {
+    'backend': os.environ.get('BIGCHAINDB_DATABASE_BACKEND', 'memory'),
+    'host': 'localhost',
+    'port': 0,
+    'name': os.environ.get('BIGCHAINDB_DATABASE_NAME', 'bigchain'),
+    'connection_timeout': 5000,
+    'max_tries': 3,
+    'latency': float(os.environ.get('BIGCHAINDB_DATABASE_LATENCY', 0)),
+}
+
+_database_sqlite = {
+    'backend': os.environ.get('BIGCHAINDB_DATABASE_BACKEND', 'sqlite'),
+    'host': 'localhost',
+    'port': 0,
+    'name': os.environ.get('BIGCHAINDB_DATABASE_NAME', 'bigchain'),
+    'path': os.environ.get('BIGCHAINDB_DATABASE_PATH', os.path.join('~', '.bigchaindb-data')),
+    'connection_timeout': 5000,
+    'max_tries': 3,
+}
+
 _database_map = {
     'mongodb': _database_mongodb,
-    'rethinkdb': _database_rethinkdb
+    'rethinkdb': _database_rethinkdb,
+    'memory': _database_memory,
+    'sqlite': _database_sqlite,
 }
 
 config = {
@@ -67,6 +92,8 @@ config = {
         'loglevel': logging.getLevelName(
             log_config['handlers']['console']['level']).lower(),
         'workers': None,  # if none, the value will be cpu_count * 2 + 1
+        'threads': None,  # if none, the value will be 1
+        'cache_size': 0,  # immutable responses cached by each worker
     },
     'wsserver': {
         'scheme': os.environ.get('BIGCHAINDB_WSSERVER_SCHEME') or 'ws',
@@ -75,6 +102,11 @@ config = {
         'advertised_scheme': os.environ.get('BIGCHAINDB_WSSERVER_ADVERTISED_SCHEME') or 'ws',
         'advertised_host': os.environ.get('BIGCHAINDB_WSSERVER_ADVERTISED_HOST') or 'localhost',
         'advertised_port': int(os.environ.get('BIGCHAINDB_WSSERVER_ADVERTISED_PORT', 9985)),
+        'read_threads': int(os.environ.get('BIGCHAINDB_WSSERVER_READ_THREADS', 0)),  # 0 disables the read API
+        'queue_size': int(os.environ.get('BIGCHAINDB_WSSERVER_QUEUE_SIZE', 1000)),  # events per subscriber
+        'slow_consumer': os.environ.get('BIGCHAINDB_WSSERVER_SLOW_CONSUMER') or 'disconnect',  # or 'drop'
+        'event_log': os.environ.get('BIGCHAINDB_WSSERVER_EVENT_LOG') or None,  # None: no replay
+        'event_log_size': int(os.environ.get('BIGCHAINDB_WSSERVER_EVENT_LOG_SIZE', 1000)),
     },
     'database': _database_map[
         os.environ.get('BIGCHAINDB_DATABASE_BACKEND', 'rethinkdb')
@@ -101,6 +133,23 @@ config = {
     'graphite': {
         'host': os.environ.get('BIGCHAINDB_GRAPHITE_HOST', 'localhost'),
     },
+    'metrics': {
+        # None: a temporary directory, created when the node starts
+        'directory': os.environ.get('BIGCHAINDB_METRICS_DIRECTORY') or None,
+    },
+    'profiling': {
+        'directory': (os.environ.get('BIGCHAINDB_PROFILING_DIRECTORY') or
+                      os.path.join(os.path.expanduser('~'), 'bigchaindb-profiles')),
+        'seconds': int(os.environ.get('BIGCHAINDB_PROFILING_SECONDS', 30)),
+        # None: the requests to the HTTP API are never profiled
+        'request_token': os.environ.get('BIGCHAINDB_PROFILING_REQUEST_TOKEN') or None,
+    },
+    'tracing': {
+        # 0: no tracing, 1: the trace of every transaction
+        'sample_rate': float(os.environ.get('BIGCHAINDB_TRACING_SAMPLE_RATE', 0)),
+        'file': (os.environ.get('BIGCHAINDB_TRACING_FILE') or
+                 os.path.join(os.path.expanduser('~'), 'bigchaindb-traces.log')),
+    },
 }
 
 # We need to maintain a backup copy of the original config dict in case
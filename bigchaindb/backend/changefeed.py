@@ -1,10 +1,22 @@
 """Changefeed interfaces for backends."""
 
-from functools import singledispatch
+import collections
+import logging
+import multiprocessing as mp
+import queue
+import threading
+from functools import reduce, singledispatch
+from operator import itemgetter, or_
+from time import sleep, time
 
-from multipipes import Node
+from multipipes import Node, Pipe
 
 import bigchaindb
+from bigchaindb import profiling
+from bigchaindb.metrics import statsd_client
+
+
+logger = logging.getLogger(__name__)
 
 
 class ChangeFeed(Node):
@@ -24,7 +36,8 @@ class ChangeFeed(Node):
     DELETE = 2
     UPDATE = 4
 
-    def __init__(self, table, operation, *, prefeed=None, connection=None):
+    def __init__(self, table, operation, *, prefeed=None, connection=None,
+                 match=None):
         """Create a new ChangeFeed.
 
         Args:
@@ -38,12 +51,18 @@ class ChangeFeed(Node):
             connection (:class:`~bigchaindb.backend.connection.Connection`, optional):  # noqa
                 A connection to the database. If no connection is provided a
                 default connection will be created.
+            match (dict, optional): a mapping of field names to values.
+                If given, the backend only emits the documents whose fields
+                are equal to those values, e.g. ``{'assignee': public_key}``.
+                The filter is evaluated by the database, so documents that
+                do not match never reach the pipeline.
         """
 
         super().__init__(name='changefeed')
         self.prefeed = prefeed if prefeed else []
         self.table = table
         self.operation = operation
+        self.match = match
         if connection:
             self.connection = connection
         else:
@@ -73,7 +92,7 @@ class ChangeFeed(Node):
 
 
 @singledispatch
-def get_changefeed(connection, table, operation, *, prefeed=None):
+def get_changefeed(connection, table, operation, *, prefeed=None, match=None):
     """Return a ChangeFeed.
 
     Args:
@@ -86,5 +105,359 @@ def get_changefeed(connection, table, operation, *, prefeed=None):
             (e.g. ``ChangeFeed.INSERT | ChangeFeed.UPDATE``)
         prefeed (iterable): whatever set of data you want to be published
             first.
+        match (dict): a mapping of field names to values that the
+            documents must have to be published. Deletes only carry the
+            primary key of the document, so they are never matched.
     """
     raise NotImplementedError
+
+
+@singledispatch
+def get_changes(connection, table, operation, *, position=None, match=None):
+    """Return a generator of the changes happening on a table.
+
+    This is the building block of the changefeeds: it tails the table,
+    recovers from connection errors and normalizes the backend records.
+
+    Args:
+        connection (:class:`~bigchaindb.backend.connection.Connection`):
+            A connection to the database.
+        table (str): name of the table to listen to for changes.
+        operation (int): the operations to yield, see
+            :func:`get_changefeed`.
+        position (optional): a backend specific position to resume from
+            (exclusive), as yielded by this function or returned by
+            :func:`get_insert_position`. If ``None`` only the changes
+            happening from now on are yielded.
+        match (dict, optional): see :func:`get_changefeed`.
+
+    Yields:
+        tuple: ``(operation, document, position)`` for each change.
+    """
+    raise NotImplementedError
+
+
+@singledispatch
+def get_insert_position(connection, table, document_id):
+    """Return the changefeed position of the insertion of a document.
+
+    Args:
+        table (str): the name of the table the document was inserted in.
+        document_id (str): the ``id`` of the document.
+
+    Returns:
+        A position to be given to :func:`get_changes`, or ``None`` if the
+        backend cannot resume a changefeed.
+    """
+    raise NotImplementedError
+
+
+@singledispatch
+def get_stored_position(connection, name):
+    """Return the position stored for a changefeed.
+
+    Args:
+        name (str): the name of the changefeed.
+
+    Returns:
+        The position last stored with :func:`store_position`, or ``None``.
+    """
+    raise NotImplementedError
+
+
+@singledispatch
+def store_position(connection, name, position):
+    """Store the position of a changefeed, so it can be resumed after a
+    restart.
+
+    Args:
+        name (str): the name of the changefeed.
+        position: a position yielded by :func:`get_changes`.
+    """
+    raise NotImplementedError
+
+
+class Subscription:
+    """A subscription to the changes of a table of a
+    :class:`ChangeFeedMultiplexer`.
+
+    The subscriber acknowledges the changes it is done with, by their keys
+    and in any order, so that the multiplexer only stores the positions of
+    the changes all the subscribers of a table are done with.
+    """
+
+    def __init__(self, operation, *, match=None, position=None, maxsize=1000,
+                 key=None):
+        self.operation = operation
+        self.match = match
+        self.position = position
+        self.key = key or _document_id
+        self.pipe = Pipe(maxsize=maxsize)
+        # shared with the processes of the subscriber
+        self.acknowledged = mp.Queue()
+        # the sequence number, key and previous position of each change
+        # published and not released yet, oldest first
+        self.pending = collections.deque()
+        self.acks = collections.Counter()
+
+    def wants(self, operation, document):
+        """Check if a change should be published to the subscriber."""
+        if not self.operation & operation:
+            return False
+        if self.match:
+            return all(document.get(field) == value
+                       for field, value in self.match.items())
+        return True
+
+    def publish(self, document, previous_position, sequence):
+        """Publish a change to the subscriber.
+
+        Args:
+            document (dict): the changed document.
+            previous_position: the position of the change before it, where
+                the table resumes from if the change is not acknowledged.
+            sequence (int): the number of the change in the table, which
+                orders the changes of the subscribers of the table.
+        """
+        self.pending.append((sequence, self.key(document), previous_position))
+        self.pipe.put(document)
+
+    def acknowledge(self, *keys):
+        """Tell the multiplexer that the subscriber is done with some
+        changes, e.g. the block they are in is written.
+
+        Called by the processes of the subscriber.
+
+        Args:
+            *keys: the keys of the changes, see :func:`_document_id`.
+        """
+        self.acknowledged.put(keys)
+
+    def oldest_pending(self):
+        """Return the oldest change not acknowledged yet.
+
+        Returns:
+            tuple: the sequence number and the previous position of the
+            change, or ``None`` if all the changes are acknowledged.
+        """
+        while True:
+            try:
+                self.acks.update(self.acknowledged.get_nowait())
+            except queue.Empty:
+                break
+        # a change acknowledged out of order waits for the older ones
+        while self.pending and self.acks[self.pending[0][1]] > 0:
+            _, key, _ = self.pending.popleft()
+            self.acks[key] -= 1
+            if not self.acks[key]:
+                del self.acks[key]
+        if not self.pending:
+            return None
+        sequence, _, previous_position = self.pending[0]
+        return sequence, previous_position
+
+
+def _document_id(document):
+    """The default key of a change: the ``id`` of its document."""
+    return document.get('id')
+
+
+def acknowledge_nothing(*keys):
+    """Acknowledge the changes of a pipeline running its own changefeed,
+    which is not resumed, see :meth:`Subscription.acknowledge`."""
+
+
+class ChangeFeedMultiplexer:
+    """Tail each table once and fan out the changes to many subscribers.
+
+    The multiplexer runs in its own process, with one thread tailing each
+    subscribed table. Every subscriber gets a bounded pipe: when the pipe
+    is full the tail of that table waits for the subscriber to catch up.
+
+    The position of each table is stored in the database, every
+    ``checkpoint_interval`` seconds, so that a restarted multiplexer
+    resumes where it stopped instead of skipping the changes that happened
+    in the meantime. The stored position is the one before the oldest change
+    a subscriber has not acknowledged yet: the changes waiting in the pipes
+    and in the pipelines when the node stops are published again.
+
+    All the subscriptions must be done before :meth:`start` is called.
+    """
+
+    def __init__(self, *, name=None, report_interval=10,
+                 checkpoint_interval=1):
+        """Create a new multiplexer.
+
+        Args:
+            name (str, optional): the name the positions are stored with.
+                Defaults to the public key of the node.
+            report_interval (int): how often (in sec) to report the lag
+                metrics of the changefeeds.
+            checkpoint_interval (int): how often (in sec) to store the
+                positions of the changefeeds.
+        """
+        self.name = name or bigchaindb.config['keypair']['public']
+        self.report_interval = report_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.subscriptions = {}
+        self.positions = {}
+        self.checkpoints = {}
+        self.stats = {}
+        self.process = None
+
+    def subscribe(self, table, operation, *, match=None, position=None,
+                  maxsize=1000, key=None):
+        """Subscribe to the changes of a table.
+
+        Args:
+            table (str): name of the table to listen to for changes.
+            operation (int): the operations to receive, see
+                :func:`get_changefeed`.
+            match (dict, optional): see :func:`get_changefeed`. If all the
+                subscribers of a table use the same ``match`` the filter is
+                evaluated by the database.
+            position (optional): the position to start from, see
+                :func:`get_changes`. The subscribers of a table share the
+                oldest of their positions. If no subscriber gives one, the
+                table resumes from its stored position.
+            maxsize (int): the size of the subscriber's pipe.
+            key (callable, optional): return the key the subscriber
+                acknowledges a changed document with, see
+                :meth:`Subscription.acknowledge`. Defaults to the ``id`` of
+                the document.
+
+        Returns:
+            :class:`Subscription`: the subscription, with the pipe the
+            changed documents are published to.
+        """
+        subscription = Subscription(operation, match=match,
+                                    position=position, maxsize=maxsize,
+                                    key=key)
+        self.subscriptions.setdefault(table, []).append(subscription)
+        return subscription
+
+    def start(self, *, thread=False):
+        """Start the multiplexer process.
+
+        Args:
+            thread (bool): start a thread of the current process instead,
+                e.g. for the memory backend, whose databases are the ones of
+                a process.
+        """
+        if thread:
+            self.process = threading.Thread(name='changefeed',
+                                            target=self.run_forever,
+                                            daemon=True)
+        else:
+            self.process = mp.Process(name='changefeed',
+                                      target=self.run_forever)
+        self.process.start()
+
+    def run_forever(self):
+        profiling.install('changefeed')
+        for table, subscriptions in self.subscriptions.items():
+            self.positions[table] = _oldest_position(
+                [s.position for s in subscriptions])
+            self.stats[table] = {'count': 0, 'received_at': None, 'lag': None}
+            thread = threading.Thread(target=self.run_table,
+                                      args=(table, subscriptions),
+                                      name='changefeed-{}'.format(table),
+                                      daemon=True)
+            thread.start()
+
+        connection = bigchaindb.backend.connect(**bigchaindb.config['database'])
+        metrics = statsd_client()
+        reported_at = time()
+        while True:
+            sleep(self.checkpoint_interval)
+            self.checkpoint(connection)
+            if time() - reported_at >= self.report_interval:
+                self.report(metrics)
+                reported_at = time()
+
+    def run_table(self, table, subscriptions):
+        """Tail a table and publish the changes to its subscribers."""
+        connection = bigchaindb.backend.connect(**bigchaindb.config['database'])
+        operation = reduce(or_, (s.operation for s in subscriptions))
+        matches = [s.match for s in subscriptions]
+        match = matches[0] if all(m == matches[0] for m in matches) else None
+
+        if self.positions[table] is None:
+            self.positions[table] = get_stored_position(
+                connection, '{}.{}'.format(self.name, table))
+
+        changes = get_changes(connection, table, operation,
+                              position=self.positions[table], match=match)
+        for sequence, (change_operation, document, position) in enumerate(changes):
+            self.update_stats(table, position)
+            for subscription in subscriptions:
+                if subscription.wants(change_operation, document):
+                    subscription.publish(document, self.positions[table],
+                                         sequence)
+            self.positions[table] = position
+
+    def checkpoint(self, connection):
+        """Store the position of each table the subscribers are done
+        with, see :meth:`checkpoint_position`."""
+        for table in self.subscriptions:
+            position = self.checkpoint_position(table)
+            if position is not None and position != self.checkpoints.get(table):
+                store_position(connection, '{}.{}'.format(self.name, table),
+                               position)
+                self.checkpoints[table] = position
+
+    def checkpoint_position(self, table):
+        """Return the position a table resumes from: the one before the
+        oldest change a subscriber has not acknowledged yet, see
+        :meth:`Subscription.oldest_pending`.
+
+        The changes are compared by their sequence numbers, since the
+        positions of some backends (e.g. the resume tokens of MongoDB change
+        streams) cannot be ordered.
+
+        Returns:
+            The position, or ``None`` if the table would have to resume from
+            before its first change.
+        """
+        # read before the pending changes, which the position can only be
+        # newer than
+        position = self.positions.get(table)
+        pending = [subscription.oldest_pending()
+                   for subscription in self.subscriptions[table]]
+        pending = [change for change in pending if change is not None]
+        if pending:
+            _, position = min(pending, key=itemgetter(0))
+        return position
+
+    def update_stats(self, table, position):
+        stats = self.stats[table]
+        stats['count'] += 1
+        stats['received_at'] = time()
+        # MongoDB positions are BSON timestamps of the oplog entries.
+        written_at = getattr(position, 'time', None)
+        if written_at is not None:
+            stats['lag'] = stats['received_at'] - written_at
+
+    def report(self, metrics):
+        """Report the lag metrics of the changefeeds.
+
+        For each table the metrics are: the number of changes received, the
+        seconds between the write and the reception of the last change (if
+        the backend provides it) and the number of changes waiting in the
+        subscribers' pipes.
+        """
+        for table, stats in self.stats.items():
+            queue_depth = sum(s.pipe.qsize() for s in self.subscriptions[table])
+            prefix = 'changefeed.{}'.format(table)
+            metrics.gauge(prefix + '.count', stats['count'])
+            metrics.gauge(prefix + '.queue_depth', queue_depth)
+            if stats['lag'] is not None:
+                metrics.gauge(prefix + '.lag', stats['lag'])
+            logger.debug('Changefeed %s: %s changes, lag %s, queue depth %s, '
+                         'position %s', table, stats['count'], stats['lag'],
+                         queue_depth, self.positions[table])
+
+
+def _oldest_position(positions):
+    positions = [p for p in positions if p is not None]
+    return min(positions) if positions else None
@@ -1,6 +1,7 @@
 from itertools import repeat
 from importlib import import_module
 import logging
+import threading
 
 import bigchaindb
 from bigchaindb.common.exceptions import ConfigurationError
@@ -9,7 +10,9 @@ from bigchaindb.backend.exceptions import ConnectionError
 
 BACKENDS = {
     'mongodb': 'bigchaindb.backend.mongodb.connection.MongoDBConnection',
-    'rethinkdb': 'bigchaindb.backend.rethinkdb.connection.RethinkDBConnection'
+    'rethinkdb': 'bigchaindb.backend.rethinkdb.connection.RethinkDBConnection',
+    'memory': 'bigchaindb.backend.memory.connection.MemoryConnection',
+    'sqlite': 'bigchaindb.backend.sqlite.connection.SQLiteConnection',
 }
 
 logger = logging.getLogger(__name__)
@@ -18,7 +21,7 @@ logger = logging.getLogger(__name__)
 def connect(backend=None, host=None, port=None, name=None, max_tries=None,
             connection_timeout=None, replicaset=None, ssl=None, login=None, password=None,
             ca_cert=None, certfile=None, keyfile=None, keyfile_passphrase=None,
-            crlfile=None):
+            crlfile=None, changefeed=None, latency=None, path=None):
     """Create a new connection to the database backend.
 
     All arguments default to the current configuration's values if not
@@ -31,6 +34,12 @@ def connect(backend=None, host=None, port=None, name=None, max_tries=None,
         name (str): the name of the database to use.
         replicaset (str): the name of the replica set (only relevant for
                           MongoDB connections).
+        changefeed (str): how to listen to the changes of the database
+                          (only relevant for MongoDB connections).
+        latency (float): the seconds to wait before each query (only
+                         relevant for in-memory connections).
+        path (str): the directory of the database files (only relevant
+                    for SQLite connections).
 
     Returns:
         An instance of :class:`~bigchaindb.backend.connection.Connection`
@@ -62,6 +71,9 @@ def connect(backend=None, host=None, port=None, name=None, max_tries=None,
     keyfile = keyfile or bigchaindb.config['database'].get('keyfile', None)
     keyfile_passphrase = keyfile_passphrase or bigchaindb.config['database'].get('keyfile_passphrase', None)
     crlfile = crlfile or bigchaindb.config['database'].get('crlfile', None)
+    changefeed = changefeed or bigchaindb.config['database'].get('changefeed')
+    latency = latency if latency is not None else bigchaindb.config['database'].get('latency')
+    path = path or bigchaindb.config['database'].get('path')
 
     try:
         module_name, _, class_name = BACKENDS[backend].rpartition('.')
@@ -77,7 +89,8 @@ def connect(backend=None, host=None, port=None, name=None, max_tries=None,
                  max_tries=max_tries, connection_timeout=connection_timeout,
                  replicaset=replicaset, ssl=ssl, login=login, password=password,
                  ca_cert=ca_cert, certfile=certfile, keyfile=keyfile,
-                 keyfile_passphrase=keyfile_passphrase, crlfile=crlfile)
+                 keyfile_passphrase=keyfile_passphrase, crlfile=crlfile,
+                 changefeed=changefeed, latency=latency, path=path)
 
 
 class Connection:
@@ -87,6 +100,9 @@ class Connection:
     from and implements this class.
     """
 
+    thread_safe = False
+    """Whether the threads of a process can share the connection."""
+
     def __init__(self, host=None, port=None, dbname=None,
                  connection_timeout=None, max_tries=None,
                  **kwargs):
@@ -115,11 +131,15 @@ class Connection:
         self.max_tries = max_tries if max_tries is not None else dbconf['max_tries']
         self.max_tries_counter = range(self.max_tries) if self.max_tries != 0 else repeat(0)
         self._conn = None
+        self._connect_lock = threading.Lock()
 
     @property
     def conn(self):
         if self._conn is None:
-            self.connect()
+            # the threads sharing a connection must not connect twice
+            with self._connect_lock:
+                if self._conn is None:
+                    self.connect()
         return self._conn
 
     def run(self, query):
@@ -0,0 +1,25 @@
+"""In-memory backend implementation.
+
+Contains an in-memory implementation of the
+:mod:`~bigchaindb.backend.changefeed`, :mod:`~bigchaindb.backend.query`, and
+:mod:`~bigchaindb.backend.schema` interfaces.
+
+The databases are plain dicts of documents, with secondary indexes and a
+bounded log of the changes of each table. They live in the memory of the
+process that creates them, and are not shared with the processes it starts:
+this backend is meant for tests and benchmarks, without a database server.
+With it, ``bigchaindb start`` runs the node in threads of its process, see
+:func:`bigchaindb.processes.start`.
+
+You can specify BigchainDB to use the in-memory backend by either setting
+``database.backend`` to ``'memory'`` in your configuration file, or setting
+the ``BIGCHAINDB_DATABASE_BACKEND`` environment variable to ``'memory'``.
+The ``database.latency`` setting adds a delay to each query, to simulate a
+database server.
+"""
+
+# Register the single dispatched modules on import.
+from bigchaindb.backend.memory import schema, query, changefeed  # noqa
+
+# MemoryConnection should always be accessed via
+# ``bigchaindb.backend.connect()``.
@@ -0,0 +1,89 @@
+import logging
+
+from bigchaindb import backend
+from bigchaindb.backend.changefeed import ChangeFeed
+from bigchaindb.backend.utils import module_dispatch_registrar
+from bigchaindb.backend.memory.connection import MemoryConnection
+from bigchaindb.backend.memory.store import copy
+
+
+logger = logging.getLogger(__name__)
+register_changefeed = module_dispatch_registrar(backend.changefeed)
+
+
+class MemoryChangeFeed(ChangeFeed):
+    """This class implements an in-memory changefeed as a multipipes Node.
+
+    It reads the change log the tables keep of their writes.
+    """
+
+    def run_forever(self):
+        for element in self.prefeed:
+            self.outqueue.put(element)
+
+        changes = get_changes(self.connection, self.table, self.operation,
+                              match=self.match)
+        for _, document, _ in changes:
+            self.outqueue.put(document)
+
+
+@register_changefeed(MemoryConnection)
+def get_changefeed(connection, table, operation, *, prefeed=None, match=None):
+    """Return an in-memory changefeed.
+
+    Returns:
+        An instance of
+        :class:`~bigchaindb.backend.memory.MemoryChangeFeed`.
+    """
+
+    return MemoryChangeFeed(table, operation, prefeed=prefeed,
+                            connection=connection, match=match)
+
+
+_FEED_STOP = False
+"""If it's True then the changefeed will return when there are no more items.
+"""
+
+
+@register_changefeed(MemoryConnection)
+def get_changes(connection, table, operation, *, position=None, match=None):
+    """Return a generator of the changes happening on an in-memory table.
+
+    The positions are the sequence numbers of the changes in the change log
+    of the table. Deletes yield the deleted document.
+    """
+    log = connection.run(connection.table(table).log)
+    if position is None:
+        position = log.next_position - 1
+
+    while True:
+        changes = log.read(position, timeout=1)
+        if not changes and _FEED_STOP:
+            return
+
+        for change_operation, document, position in changes:
+            if not change_operation & operation:
+                continue
+            if match and change_operation != ChangeFeed.DELETE and any(
+                    document.get(field) != value
+                    for field, value in match.items()):
+                continue
+            yield change_operation, copy(document), position
+
+
+@register_changefeed(MemoryConnection)
+def get_insert_position(connection, table, document_id):
+    table = connection.run(connection.table(table))
+    return table.log.find(ChangeFeed.INSERT, table.primary_key, document_id)
+
+
+@register_changefeed(MemoryConnection)
+def get_stored_position(connection, name):
+    document = connection.run(connection.table('changefeed').get(name))
+    return document['position'] if document else None
+
+
+@register_changefeed(MemoryConnection)
+def store_position(connection, name, position):
+    connection.run(connection.table('changefeed')
+                   .upsert({'name': name, 'position': position}))
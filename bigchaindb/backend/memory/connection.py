@@ -0,0 +1,62 @@
+import logging
+import time
+
+import bigchaindb
+from bigchaindb.utils import Lazy
+from bigchaindb.backend.connection import Connection
+from bigchaindb.metrics import DATABASE_QUERY_DURATION, timed
+from bigchaindb.backend.memory.store import Store
+
+logger = logging.getLogger(__name__)
+
+
+_store = Store()
+"""The databases of the process, shared by all its connections."""
+
+
+class MemoryConnection(Connection):
+    """Connection to the in-memory databases of the process.
+
+    Queries are :class:`~bigchaindb.utils.Lazy` chains run against the
+    :class:`~bigchaindb.backend.memory.store.Store`, one at a time.
+    """
+
+    def __init__(self, latency=None, **kwargs):
+        """Create a new Connection instance.
+
+        Args:
+            latency (float, optional): the seconds to wait before running
+                each query, to simulate the round trip to a database
+                server. Defaults to the ``database.latency`` setting, or 0.
+            **kwargs: arbitrary keyword arguments provided by the
+                configuration's ``database`` settings
+        """
+
+        super().__init__(**kwargs)
+        self.latency = latency if latency is not None else \
+            bigchaindb.config['database'].get('latency', 0)
+
+    @property
+    def db(self):
+        return self.conn[self.dbname]
+
+    def query(self):
+        return Lazy()
+
+    def table(self, name):
+        """Return a lazy object that can be used to compose a query.
+
+        Args:
+            name (str): the name of the table to query.
+        """
+        return self.query()[self.dbname][name]
+
+    @timed(DATABASE_QUERY_DURATION)
+    def run(self, query):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.conn.lock:
+            return query.run(self.conn)
+
+    def _connect(self):
+        return _store
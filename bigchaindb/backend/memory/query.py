@@ -0,0 +1,445 @@
+"""Query implementation for the in-memory backend"""
+
+import re
+from itertools import islice
+from time import time
+
+from bigchaindb import backend
+from bigchaindb.backend.changefeed import ChangeFeed
+from bigchaindb.backend.memory.changefeed import (get_changes,
+                                                  get_insert_position)
+from bigchaindb.common.exceptions import CyclicBlockchainError
+from bigchaindb.common.transaction import Transaction
+from bigchaindb.backend.exceptions import DuplicateKeyError
+from bigchaindb.backend.utils import module_dispatch_registrar
+from bigchaindb.backend.memory.connection import MemoryConnection
+
+
+register_query = module_dispatch_registrar(backend.query)
+
+
+@register_query(MemoryConnection)
+def write_transaction(conn, signed_transaction):
+    try:
+        return conn.run(
+            conn.table('backlog')
+            .insert(signed_transaction))
+    except DuplicateKeyError:
+        return
+
+
+@register_query(MemoryConnection)
+def write_transactions(conn, signed_transactions):
+    return conn.run(
+        conn.table('backlog')
+        .insert_many(signed_transactions, ignore_duplicates=True))
+
+
+@register_query(MemoryConnection)
+def update_transaction(conn, transaction_id, doc):
+    return conn.run(
+        conn.table('backlog')
+        .update(transaction_id, doc))
+
+
+@register_query(MemoryConnection)
+def update_transactions(conn, transaction_ids, doc):
+    return conn.run(
+        conn.table('backlog')
+        .update_many(transaction_ids, doc))
+
+
+@register_query(MemoryConnection)
+def delete_transaction(conn, *transaction_id):
+    return conn.run(
+        conn.table('backlog')
+        .delete(*transaction_id))
+
+
+@register_query(MemoryConnection)
+def get_stale_transactions(conn, reassign_delay):
+    stale = time() - reassign_delay
+    return iter(conn.run(
+        conn.table('backlog')
+        .filter(lambda tx: tx['assignment_timestamp'] < stale)))
+
+
+@register_query(MemoryConnection)
+def get_oldest_assignment_timestamp(conn):
+    oldest = conn.run(
+        conn.table('backlog')
+        .min(lambda tx: tx['assignment_timestamp']))
+    if oldest:
+        return oldest['assignment_timestamp']
+
+
+@register_query(MemoryConnection)
+def get_transaction_from_block(conn, transaction_id, block_id):
+    block = conn.run(conn.table('bigchain').get(block_id))
+    if block is None:
+        return
+    for transaction in block['block']['transactions']:
+        if transaction['id'] == transaction_id:
+            return transaction
+
+
+@register_query(MemoryConnection)
+def get_transaction_from_backlog(conn, transaction_id):
+    transaction = conn.run(conn.table('backlog').get(transaction_id))
+    if transaction:
+        transaction.pop('assignee', None)
+        transaction.pop('assignment_timestamp', None)
+    return transaction
+
+
+@register_query(MemoryConnection)
+def get_blocks_status_from_transaction(conn, transaction_id):
+    blocks = conn.run(
+        conn.table('bigchain')
+        .get_all(transaction_id, index='transaction_id'))
+    return ({'id': block['id'], 'block': {'voters': block['block']['voters']}}
+            for block in blocks)
+
+
+@register_query(MemoryConnection)
+def get_blocks_of_transactions(conn, transaction_ids):
+    transaction_ids = set(transaction_ids)
+    blocks = conn.run(
+        conn.table('bigchain')
+        .get_all(*transaction_ids, index='transaction_id'))
+    return ((transaction['id'],
+             {'id': block['id'], 'block': {'voters': block['block']['voters']}})
+            for block in blocks
+            for transaction in block['block']['transactions']
+            if transaction['id'] in transaction_ids)
+
+
+@register_query(MemoryConnection)
+def get_transactions_from_blocks(conn, transaction_ids):
+    transaction_ids = set(transaction_ids)
+    blocks = conn.run(
+        conn.table('bigchain')
+        .get_all(*transaction_ids, index='transaction_id'))
+    return (({'id': block['id'], 'block': {'voters': block['block']['voters']}},
+             transaction)
+            for block in blocks
+            for transaction in block['block']['transactions']
+            if transaction['id'] in transaction_ids)
+
+
+@register_query(MemoryConnection)
+def get_backlog_transaction_ids(conn, transaction_ids):
+    transactions = conn.run(
+        conn.table('backlog')
+        .get_many(*set(transaction_ids)))
+    return (transaction['id'] for transaction in transactions)
+
+
+def _transactions(blocks, predicate):
+    return ((block['id'], transaction)
+            for block in blocks
+            for transaction in block['block']['transactions']
+            if predicate(transaction))
+
+
+def _page(documents, key, last_id, limit):
+    """Keep the documents with a ``key`` greater than ``last_id``, in the
+    order of ``key``, and the first ``limit`` of them."""
+    if last_id is not None:
+        documents = (doc for doc in documents if key(doc) > last_id)
+    documents = sorted(documents, key=key)
+    if limit:
+        documents = documents[:limit]
+    return iter(documents)
+
+
+def _blocks_page(blocks, predicate, last_id, limit):
+    """Keep the transactions matching ``predicate`` of the blocks with an id
+    greater than ``last_id``, in the order of the blocks, and the first
+    ``limit`` of them."""
+    blocks = {block['id']: block for block in blocks}
+    block_ids = sorted(block_id for block_id in blocks
+                       if last_id is None or block_id > last_id)
+    transactions = _transactions((blocks[block_id] for block_id in block_ids),
+                                 predicate)
+    return islice(transactions, limit or None)
+
+
+@register_query(MemoryConnection)
+def get_txids_filtered(conn, asset_id, operation=None, *, last_id=None,
+                       limit=0):
+    def is_create(transaction):
+        return transaction['operation'] == Transaction.CREATE and \
+            transaction['id'] == asset_id
+
+    def is_transfer(transaction):
+        return transaction['operation'] == Transaction.TRANSFER and \
+            transaction['asset'].get('id') == asset_id
+
+    def get_blocks(index):
+        return conn.run(conn.table('bigchain').get_all(asset_id, index=index))
+
+    if operation == Transaction.CREATE:
+        blocks, match = get_blocks('transaction_id'), is_create
+    elif operation == Transaction.TRANSFER:
+        blocks, match = get_blocks('asset_id'), is_transfer
+    else:
+        blocks = get_blocks('transaction_id') + get_blocks('asset_id')
+
+        def match(transaction):
+            return is_create(transaction) or is_transfer(transaction)
+
+    return ((block_id, transaction['id']) for block_id, transaction
+            in _blocks_page(blocks, match, last_id, limit))
+
+
+@register_query(MemoryConnection)
+def get_asset_by_id(conn, asset_id):
+    blocks = conn.run(
+        conn.table('bigchain')
+        .get_all(asset_id, index='transaction_id'))
+    return ({'asset': transaction['asset']}
+            for _, transaction in _transactions(
+                blocks, lambda tx: tx['id'] == asset_id and
+                tx['operation'] == Transaction.CREATE))
+
+
+def _spends(transaction, links):
+    return any(input_['fulfills'] and
+               (input_['fulfills']['transaction_id'],
+                input_['fulfills']['output_index']) in links
+               for input_ in transaction['inputs'])
+
+
+@register_query(MemoryConnection)
+def get_spent(conn, transaction_id, output):
+    link = (transaction_id, output)
+    blocks = conn.run(
+        conn.table('bigchain')
+        .get_all(link, index='inputs'))
+    return (transaction for _, transaction in _transactions(
+        blocks, lambda tx: _spends(tx, {link})))
+
+
+@register_query(MemoryConnection)
+def get_spending_transactions(conn, inputs):
+    links = {(input_['transaction_id'], input_['output_index'])
+             for input_ in inputs}
+    blocks = conn.run(
+        conn.table('bigchain')
+        .get_all(*links, index='inputs'))
+    return _transactions(blocks, lambda tx: _spends(tx, links))
+
+
+@register_query(MemoryConnection)
+def get_owned_ids(conn, owner, *, last_id=None, limit=0):
+    blocks = conn.run(
+        conn.table('bigchain')
+        .get_all(owner, index='outputs'))
+    return _blocks_page(blocks, lambda tx: any(
+        owner in output['public_keys'] for output in tx['outputs']),
+        last_id, limit)
+
+
+@register_query(MemoryConnection)
+def get_votes_by_block_id(conn, block_id, *, last_id=None, limit=0):
+    votes = conn.run(
+        conn.table('votes')
+        .get_all(block_id, index='block'))
+    return _page(iter(votes), lambda vote: vote['node_pubkey'], last_id, limit)
+
+
+@register_query(MemoryConnection)
+def get_votes_for_blocks(conn, block_ids):
+    return iter(conn.run(
+        conn.table('votes')
+        .get_all(*block_ids, index='block')))
+
+
+@register_query(MemoryConnection)
+def get_votes_for_blocks_by_voter(conn, block_ids, node_pubkey):
+    return iter(conn.run(
+        conn.table('votes')
+        .get_all(*((block_id, node_pubkey) for block_id in block_ids),
+                 index='block_and_voter')))
+
+
+@register_query(MemoryConnection)
+def get_votes_by_block_id_and_voter(conn, block_id, node_pubkey):
+    return iter(conn.run(
+        conn.table('votes')
+        .get_all((block_id, node_pubkey), index='block_and_voter')))
+
+
+@register_query(MemoryConnection)
+def write_block(conn, block_dict):
+    return conn.run(
+        conn.table('bigchain')
+        .insert(block_dict))
+
+
+@register_query(MemoryConnection)
+def get_block(conn, block_id):
+    return conn.run(
+        conn.table('bigchain')
+        .get(block_id))
+
+
+@register_query(MemoryConnection)
+def write_assets(conn, assets):
+    # The same asset can be written multiple times, e.g. when the same
+    # transaction is written into multiple blocks due to invalid blocks.
+    return conn.run(
+        conn.table('assets')
+        .insert_many(assets, ignore_duplicates=True))
+
+
+@register_query(MemoryConnection)
+def get_assets(conn, asset_ids):
+    assets = (conn.run(conn.table('assets').get(asset_id))
+              for asset_id in asset_ids)
+    return (asset for asset in assets if asset is not None)
+
+
+@register_query(MemoryConnection)
+def count_blocks(conn):
+    return conn.run(
+        conn.table('bigchain')
+        .count())
+
+
+@register_query(MemoryConnection)
+def count_backlog(conn):
+    return conn.run(
+        conn.table('backlog')
+        .count())
+
+
+@register_query(MemoryConnection)
+def write_vote(conn, vote):
+    conn.run(conn.table('votes').insert(vote))
+    return vote
+
+
+@register_query(MemoryConnection)
+def get_genesis_block(conn):
+    blocks = conn.run(
+        conn.table('bigchain')
+        .get_all(Transaction.GENESIS, index='operation'))
+    for block in blocks:
+        if block['block']['transactions'][0]['operation'] == \
+                Transaction.GENESIS:
+            return block
+
+
+@register_query(MemoryConnection)
+def get_last_voted_block_id(conn, node_pubkey):
+    last_voted = conn.run(
+        conn.table('votes')
+        .get_all(node_pubkey, index='voter'))
+
+    if not last_voted:
+        return get_genesis_block(conn)['id']
+
+    last_voted.sort(key=lambda v: v['vote']['timestamp'], reverse=True)
+    mapping = {v['vote']['previous_block']: v['vote']['voting_for_block']
+               for v in last_voted}
+
+    last_block_id = list(mapping.values())[0]
+
+    explored = set()
+
+    while True:
+        try:
+            if last_block_id in explored:
+                raise CyclicBlockchainError()
+            explored.add(last_block_id)
+            last_block_id = mapping[last_block_id]
+        except KeyError:
+            break
+
+    return last_block_id
+
+
+@register_query(MemoryConnection)
+def get_votes_by_previous_block_and_voter(conn, previous_block_id,
+                                          node_pubkey):
+    return iter(conn.run(
+        conn.table('votes')
+        .get_all((previous_block_id, node_pubkey),
+                 index='previous_block_and_voter')))
+
+
+@register_query(MemoryConnection)
+def get_vote_checkpoint(conn, node_pubkey):
+    checkpoint = conn.run(
+        conn.table('vote_checkpoints')
+        .get(node_pubkey))
+    return checkpoint['block_id'] if checkpoint else None
+
+
+@register_query(MemoryConnection)
+def write_vote_checkpoint(conn, node_pubkey, block_id):
+    conn.run(
+        conn.table('vote_checkpoints')
+        .upsert({'node_pubkey': node_pubkey, 'block_id': block_id}))
+
+
+@register_query(MemoryConnection)
+def get_blocks_after(conn, block_id, *, limit=0):
+    blocks = conn.run(
+        conn.table('bigchain')
+        .after(block_id))
+    if blocks is None:
+        return None
+    return iter(blocks[:limit] if limit else blocks)
+
+
+@register_query(MemoryConnection)
+def get_new_blocks_feed(conn, start_block_id):
+    position = get_insert_position(conn, 'bigchain', start_block_id)
+    feed = get_changes(conn, 'bigchain', ChangeFeed.INSERT, position=position)
+    return (block for _, block, _ in feed)
+
+
+_WORD = re.compile(r'\w+')
+
+
+def _words(value, case_sensitive):
+    if isinstance(value, str):
+        return set(_WORD.findall(value if case_sensitive else value.lower()))
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, list):
+        return set()
+    return set().union(*(_words(item, case_sensitive) for item in value))
+
+
+@register_query(MemoryConnection)
+def text_search(conn, search, *, language='english', case_sensitive=False,
+                diacritic_sensitive=False, text_score=False, limit=0,
+                after=None):
+    # A plain match of the words of the search in the string values of the
+    # assets: there is no stemming, stop words or phrase search.
+    words = _words(search, case_sensitive)
+    assets = conn.run(
+        conn.table('assets')
+        .filter(lambda asset: words & _words(asset, case_sensitive)))
+
+    def rank(asset):
+        return -asset['score'], asset['id']
+
+    for asset in assets:
+        asset['score'] = len(words & _words(asset, case_sensitive))
+    assets.sort(key=rank)
+    if after is not None:
+        score, asset_id = after
+        assets = [asset for asset in assets
+                  if rank(asset) > (-score, asset_id)]
+    if limit:
+        assets = assets[:limit]
+
+    if not text_score:
+        for asset in assets:
+            del asset['score']
+    return iter(assets)
@@ -0,0 +1,113 @@
+"""Utils to initialize and drop the database."""
+
+import logging
+
+from bigchaindb import backend
+from bigchaindb.common import exceptions
+from bigchaindb.backend.utils import module_dispatch_registrar
+from bigchaindb.backend.memory.connection import MemoryConnection
+from bigchaindb.backend.memory.store import Database, Table
+
+
+logger = logging.getLogger(__name__)
+register_schema = module_dispatch_registrar(backend.schema)
+
+
+PRIMARY_KEYS = {
+    'bigchain': 'id',
+    'backlog': 'id',
+    # votes have no natural primary key
+    'votes': None,
+    'assets': 'id',
+    'vote_checkpoints': 'node_pubkey',
+    'changefeed': 'name',
+}
+
+
+@register_schema(MemoryConnection)
+def create_database(conn, dbname):
+    with conn.conn.lock:
+        if dbname in conn.conn.databases:
+            raise exceptions.DatabaseAlreadyExists(
+                'Database `{}` already exists'.format(dbname))
+
+        logger.info('Create database `%s`.', dbname)
+        conn.conn.databases[dbname] = Database()
+
+
+@register_schema(MemoryConnection)
+def create_tables(conn, dbname):
+    with conn.conn.lock:
+        database = conn.conn[dbname]
+        for table_name, primary_key in PRIMARY_KEYS.items():
+            logger.info('Create `%s` table.', table_name)
+            database.tables[table_name] = Table(table_name,
+                                                primary_key=primary_key)
+
+
+@register_schema(MemoryConnection)
+def create_indexes(conn, dbname):
+    with conn.conn.lock:
+        database = conn.conn[dbname]
+        create_bigchain_secondary_index(database)
+        create_votes_secondary_index(database)
+
+
+@register_schema(MemoryConnection)
+def drop_database(conn, dbname):
+    with conn.conn.lock:
+        if conn.conn.databases.pop(dbname, None) is None:
+            raise exceptions.DatabaseDoesNotExist(
+                'Database `{}` does not exist'.format(dbname))
+
+
+def _transactions(block):
+    return block['block']['transactions']
+
+
+def create_bigchain_secondary_index(database):
+    logger.info('Create `bigchain` secondary index.')
+    bigchain = database['bigchain']
+
+    # to query the bigchain for a transaction id
+    bigchain.create_index('transaction_id', lambda block: [
+        transaction['id'] for transaction in _transactions(block)])
+
+    # to query the transfers of an asset
+    bigchain.create_index('asset_id', lambda block: [
+        transaction['asset']['id'] for transaction in _transactions(block)
+        if 'id' in (transaction.get('asset') or {})])
+
+    # to find the genesis block
+    bigchain.create_index('operation', lambda block: {
+        transaction['operation'] for transaction in _transactions(block)})
+
+    # to query the spending transactions of an output
+    bigchain.create_index('inputs', lambda block: {
+        (input_['fulfills']['transaction_id'],
+         input_['fulfills']['output_index'])
+        for transaction in _transactions(block)
+        for input_ in transaction['inputs'] if input_['fulfills']})
+
+    # to query the outputs of a public key
+    bigchain.create_index('outputs', lambda block: {
+        public_key
+        for transaction in _transactions(block)
+        for output in transaction['outputs']
+        for public_key in output['public_keys']})
+
+
+def create_votes_secondary_index(database):
+    logger.info('Create `votes` secondary index.')
+    votes = database['votes']
+
+    # to query the votes by block id and node
+    votes.create_index('block_and_voter', lambda vote: [
+        (vote['vote']['voting_for_block'], vote['node_pubkey'])], unique=True)
+    votes.create_index('block', lambda vote: [
+        vote['vote']['voting_for_block']])
+
+    # to follow the chain of votes of a node
+    votes.create_index('previous_block_and_voter', lambda vote: [
+        (vote['vote']['previous_block'], vote['node_pubkey'])])
+    votes.create_index('voter', lambda vote: [vote['node_pubkey']])
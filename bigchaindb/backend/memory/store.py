@@ -0,0 +1,283 @@
+"""Tables, indexes and change logs of the in-memory backend."""
+
+import logging
+import threading
+from collections import OrderedDict, deque
+from itertools import count, islice
+
+import rapidjson
+
+from bigchaindb.backend.changefeed import ChangeFeed
+from bigchaindb.backend.exceptions import DuplicateKeyError, OperationError
+
+
+logger = logging.getLogger(__name__)
+
+
+def copy(document):
+    """Return a deep copy of a JSON document.
+
+    Documents are copied when they enter and leave the store, so that
+    callers never share them with the store. Going through rapidjson is a
+    lot faster than :func:`copy.deepcopy`.
+    """
+    return rapidjson.loads(rapidjson.dumps(document))
+
+
+class Store:
+    """The databases of the process, by name."""
+
+    def __init__(self):
+        self.databases = {}
+        self.lock = threading.RLock()
+
+    def __getitem__(self, name):
+        try:
+            return self.databases[name]
+        except KeyError:
+            raise OperationError('Database `{}` does not exist'.format(name))
+
+
+class Database:
+    """A database: a set of tables, by name."""
+
+    def __init__(self):
+        self.tables = {}
+
+    def __getitem__(self, name):
+        try:
+            return self.tables[name]
+        except KeyError:
+            raise OperationError('Table `{}` does not exist'.format(name))
+
+
+class Index:
+    """A secondary index of a table.
+
+    It maps each of the keys of a document, as returned by ``keys``, to the
+    primary keys of the documents having it.
+    """
+
+    def __init__(self, name, keys, *, unique=False):
+        """Create a new index.
+
+        Args:
+            name (str): the name of the index.
+            keys (callable): a function returning the (hashable) keys of a
+                document. Compound indexes use tuples as keys.
+            unique (bool): whether two documents can share a key.
+        """
+        self.name = name
+        self.keys = keys
+        self.unique = unique
+        self.entries = {}
+
+    def check(self, document):
+        if self.unique and any(key in self.entries
+                               for key in self.keys(document)):
+            raise DuplicateKeyError('Duplicate key in index `{}`'
+                                    .format(self.name))
+
+    def add(self, primary_key, document):
+        for key in self.keys(document):
+            self.entries.setdefault(key, OrderedDict())[primary_key] = None
+
+    def remove(self, primary_key, document):
+        for key in self.keys(document):
+            primary_keys = self.entries.get(key)
+            if primary_keys is not None:
+                primary_keys.pop(primary_key, None)
+                if not primary_keys:
+                    del self.entries[key]
+
+    def get(self, key):
+        return list(self.entries.get(key, ()))
+
+
+class ChangeLog:
+    """A bounded, append-only log of the changes of a table.
+
+    The position of a change is its sequence number in the log. Readers
+    lagging behind by more than ``size`` changes miss the oldest ones.
+    """
+
+    def __init__(self, size):
+        self.changes = deque(maxlen=size)
+        self.next_position = 0
+        self.condition = threading.Condition()
+
+    def append(self, operation, document):
+        with self.condition:
+            self.changes.append((operation, document, self.next_position))
+            self.next_position += 1
+            self.condition.notify_all()
+
+    def read(self, position, *, timeout=None):
+        """Return the changes after ``position``.
+
+        Args:
+            position (int): the position of the last change read, or ``-1``
+                to read the log from its start.
+            timeout (float, optional): how long (in sec) to wait for a new
+                change if there is none.
+
+        Returns:
+            list: the ``(operation, document, position)`` changes.
+        """
+        with self.condition:
+            if position + 1 >= self.next_position:
+                self.condition.wait(timeout)
+
+            first_position = self.next_position - len(self.changes)
+            if position + 1 < first_position:
+                logger.warning('Changes %s to %s were dropped from the log',
+                               position + 1, first_position - 1)
+            start = max(position + 1 - first_position, 0)
+            return list(islice(self.changes, start, None))
+
+    def find(self, operation, primary_key, key):
+        """Return the position of the last change of a document, or
+        ``None`` if it is not in the log anymore."""
+        with self.condition:
+            for change_operation, document, position in reversed(self.changes):
+                if change_operation == operation and \
+                        document.get(primary_key) == key:
+                    return position
+
+
+class Table:
+    """A table of documents, indexed by primary key.
+
+    Documents are stored in insertion order. If the table has no primary
+    key, documents get an internal sequential one.
+    """
+
+    def __init__(self, name, *, primary_key='id', log_size=10000):
+        self.name = name
+        self.primary_key = primary_key
+        self.documents = OrderedDict()
+        self.indexes = {}
+        self.log = ChangeLog(log_size)
+        self._sequence = count()
+
+    def create_index(self, name, keys, *, unique=False):
+        index = Index(name, keys, unique=unique)
+        for primary_key, document in self.documents.items():
+            index.check(document)
+            index.add(primary_key, document)
+        self.indexes[name] = index
+
+    def _key(self, document):
+        if self.primary_key is None:
+            return next(self._sequence)
+        return document[self.primary_key]
+
+    def insert(self, document):
+        document = copy(document)
+        primary_key = self._key(document)
+        if primary_key in self.documents:
+            raise DuplicateKeyError('Duplicate primary key `{}` in table `{}`'
+                                    .format(primary_key, self.name))
+        for index in self.indexes.values():
+            index.check(document)
+
+        self.documents[primary_key] = document
+        for index in self.indexes.values():
+            index.add(primary_key, document)
+        self.log.append(ChangeFeed.INSERT, document)
+
+    def insert_many(self, documents, *, ignore_duplicates=False):
+        for document in documents:
+            try:
+                self.insert(document)
+            except DuplicateKeyError:
+                if not ignore_duplicates:
+                    raise
+
+    def upsert(self, document):
+        primary_key = self._key(document)
+        if primary_key in self.documents:
+            return self.update(primary_key, document)
+        self.insert(document)
+        return copy(document)
+
+    def update(self, primary_key, changes):
+        """Set the given fields of a document.
+
+        Returns:
+            dict: the updated document, or ``None`` if there is no document
+            with the given primary key.
+        """
+        old = self.documents.get(primary_key)
+        if old is None:
+            return None
+
+        document = copy(old)
+        document.update(copy(changes))
+        for index in self.indexes.values():
+            index.remove(primary_key, old)
+        self.documents[primary_key] = document
+        for index in self.indexes.values():
+            index.add(primary_key, document)
+        self.log.append(ChangeFeed.UPDATE, document)
+        return copy(document)
+
+    def update_many(self, primary_keys, changes):
+        return sum(1 for primary_key in primary_keys
+                   if self.update(primary_key, changes) is not None)
+
+    def delete(self, *primary_keys):
+        deleted = 0
+        for primary_key in primary_keys:
+            document = self.documents.pop(primary_key, None)
+            if document is None:
+                continue
+            for index in self.indexes.values():
+                index.remove(primary_key, document)
+            self.log.append(ChangeFeed.DELETE, document)
+            deleted += 1
+        return deleted
+
+    def get(self, primary_key):
+        document = self.documents.get(primary_key)
+        return copy(document) if document is not None else None
+
+    def get_many(self, *primary_keys):
+        """Return the documents with any of the given primary keys."""
+        return [copy(self.documents[primary_key])
+                for primary_key in primary_keys
+                if primary_key in self.documents]
+
+    def after(self, primary_key):
+        """Return the documents inserted after a document, in insertion
+        order, or ``None`` if there is no such document."""
+        keys = iter(self.documents)
+        # looking for the key consumes the keys up to it
+        if primary_key not in keys:
+            return None
+        return [copy(self.documents[key]) for key in keys]
+
+    def get_all(self, *keys, index):
+        """Return the documents having any of the given keys in an index,
+        without duplicates."""
+        primary_keys = OrderedDict()
+        for key in keys:
+            for primary_key in self.indexes[index].get(key):
+                primary_keys[primary_key] = None
+        return [copy(self.documents[primary_key])
+                for primary_key in primary_keys]
+
+    def filter(self, predicate):
+        """Return the documents matching ``predicate``, scanning the
+        table."""
+        return [copy(document) for document in self.documents.values()
+                if predicate(document)]
+
+    def min(self, key):
+        """Return the document with the smallest ``key``, or ``None``."""
+        if not self.documents:
+            return None
+        return copy(min(self.documents.values(), key=key))
+
+    def count(self):
+        return len(self.documents)
@@ -2,6 +2,7 @@ import logging
 import time
 
 import pymongo
+from bson.timestamp import Timestamp
 
 from bigchaindb import backend
 from bigchaindb.backend.changefeed import ChangeFeed
@@ -18,54 +19,21 @@ class MongoDBChangeFeed(ChangeFeed):
     """This class implements a MongoDB changefeed as a multipipes Node.
 
     We emulate the behaviour of the RethinkDB changefeed by using a tailable
-    cursor that listens for events on the oplog.
+    cursor that listens for events on the oplog, or a change stream if the
+    connection is configured to use them.
     """
     def run_forever(self):
         for element in self.prefeed:
             self.outqueue.put(element)
 
-        table = self.table
-        dbname = self.connection.dbname
-
-        # last timestamp in the oplog. We only care for operations happening
-        # in the future.
-        last_ts = self.connection.run(
-            self.connection.query().local.oplog.rs.find()
-            .sort('$natural', pymongo.DESCENDING).limit(1)
-            .next()['ts'])
-
-        for record in run_changefeed(self.connection, table, last_ts):
-
-            is_insert = record['op'] == 'i'
-            is_delete = record['op'] == 'd'
-            is_update = record['op'] == 'u'
-
-            # mongodb documents uses the `_id` for the primary key.
-            # We are not using this field at this point and we need to
-            # remove it to prevent problems with schema validation.
-            # See https://github.com/bigchaindb/bigchaindb/issues/992
-            if is_insert and (self.operation & ChangeFeed.INSERT):
-                record['o'].pop('_id', None)
-                self.outqueue.put(record['o'])
-            elif is_delete and (self.operation & ChangeFeed.DELETE):
-                # on delete it only returns the id of the document
-                self.outqueue.put(record['o'])
-            elif is_update and (self.operation & ChangeFeed.UPDATE):
-                # the oplog entry for updates only returns the update
-                # operations to apply to the document and not the
-                # document itself. So here we first read the document
-                # and then return it.
-                doc = self.connection.conn[dbname][table].find_one(
-                    {'_id': record['o2']['_id']},
-                    {'_id': False}
-                )
-                self.outqueue.put(doc)
-
-            logger.debug('Record in changefeed: %s:%s', table, record['op'])
+        changes = get_changes(self.connection, self.table, self.operation,
+                              match=self.match)
+        for _, document, _ in changes:
+            self.outqueue.put(document)
 
 
 @register_changefeed(MongoDBConnection)
-def get_changefeed(connection, table, operation, *, prefeed=None):
+def get_changefeed(connection, table, operation, *, prefeed=None, match=None):
     """Return a MongoDB changefeed.
 
     Returns:
@@ -74,7 +42,122 @@ def get_changefeed(connection, table, operation, *, prefeed=None):
     """
 
     return MongoDBChangeFeed(table, operation, prefeed=prefeed,
-                             connection=connection)
+                             connection=connection, match=match)
+
+
+@register_changefeed(MongoDBConnection)
+def get_changes(conn, table, operation, *, position=None, match=None):
+    """Return a generator of the changes happening on a MongoDB collection.
+
+    If the connection uses change streams the positions are their resume
+    tokens, otherwise they are the timestamps (``ts``) of the oplog entries.
+    Both kinds of changefeed can start from an oplog timestamp, as returned
+    by :func:`get_insert_position`.
+    """
+    if conn.changefeed == 'change_stream':
+        return get_change_stream_changes(conn, table, operation,
+                                         position=position, match=match)
+    return get_oplog_changes(conn, table, operation,
+                             position=position, match=match)
+
+
+def get_oplog_changes(conn, table, operation, *, position=None, match=None):
+    """Return a generator of the changes happening on a MongoDB collection,
+    read from the oplog."""
+    dbname = conn.dbname
+
+    if isinstance(position, dict):
+        logger.warning('Unable to resume the oplog from the change stream '
+                       'resume token %s, starting from now', position)
+        position = None
+
+    if position is None:
+        # last timestamp in the oplog. We only care for operations happening
+        # in the future.
+        position = conn.run(
+            conn.query().local.oplog.rs.find()
+            .sort('$natural', pymongo.DESCENDING).limit(1)
+            .next()['ts'])
+
+    for record in run_changefeed(conn, table, position, match=match):
+
+        is_insert = record['op'] == 'i'
+        is_delete = record['op'] == 'd'
+        is_update = record['op'] == 'u'
+
+        # mongodb documents uses the `_id` for the primary key.
+        # We are not using this field at this point and we need to
+        # remove it to prevent problems with schema validation.
+        # See https://github.com/bigchaindb/bigchaindb/issues/992
+        if is_insert and (operation & ChangeFeed.INSERT):
+            record['o'].pop('_id', None)
+            yield ChangeFeed.INSERT, record['o'], record['ts']
+        elif is_delete and (operation & ChangeFeed.DELETE):
+            # on delete it only returns the id of the document
+            yield ChangeFeed.DELETE, record['o'], record['ts']
+        elif is_update and (operation & ChangeFeed.UPDATE):
+            # the oplog entry for updates only returns the update
+            # operations to apply to the document and not the
+            # document itself. So here we first read the document
+            # and then return it.
+            # If the document does not match anymore (e.g. it has been
+            # updated again in the meantime) it's skipped.
+            lookup = {'_id': record['o2']['_id']}
+            lookup.update(match or {})
+            doc = conn.conn[dbname][table].find_one(
+                lookup,
+                {'_id': False}
+            )
+            if doc is not None:
+                yield ChangeFeed.UPDATE, doc, record['ts']
+
+        logger.debug('Record in changefeed: %s:%s', table, record['op'])
+
+
+def get_change_stream_changes(conn, table, operation, *, position=None,
+                              match=None):
+    """Return a generator of the changes happening on a MongoDB collection,
+    read from a change stream.
+
+    Updated documents are looked up by the server (``updateLookup``), and
+    the operation type and ``match`` are filtered by the server too.
+    """
+    pipeline = change_stream_pipeline(operation, match)
+    for change in run_change_stream(conn, table, pipeline, position):
+        change_type = change['operationType']
+        document = change.get('fullDocument')
+
+        if change_type == 'delete':
+            yield ChangeFeed.DELETE, change['documentKey'], change['_id']
+            continue
+
+        # The document was deleted, or does not match anymore, by the time
+        # the update was looked up.
+        if document is None or (match and any(
+                document.get(field) != value
+                for field, value in match.items())):
+            continue
+
+        # See the note on `_id` in `get_oplog_changes`.
+        document.pop('_id', None)
+        if change_type == 'insert':
+            yield ChangeFeed.INSERT, document, change['_id']
+        else:
+            yield ChangeFeed.UPDATE, document, change['_id']
+
+
+@register_changefeed(MongoDBConnection)
+def get_insert_position(conn, table, document_id):
+    namespace = conn.dbname + '.' + table
+    match = {'o.id': document_id, 'op': 'i', 'ns': namespace}
+    # Neccesary to find in descending order since tests may write same block id several times
+    try:
+        return conn.run(
+            conn.query().local.oplog.rs.find(match)
+            .sort('$natural', pymongo.DESCENDING).limit(1)
+            .next()['ts'])
+    except StopIteration:
+        return None
 
 
 _FEED_STOP = False
@@ -82,17 +165,126 @@ _FEED_STOP = False
 """
 
 
-def run_changefeed(conn, table, last_ts):
-    """Encapsulate operational logic of tailing changefeed from MongoDB
+def oplog_match(match):
+    """Translate a changefeed ``match`` into a query on the oplog.
+
+    Inserts (and full document replacements) store the document in ``o``,
+    while ``$set`` updates store the changed fields in ``o.$set``.
+
+    Args:
+        match (dict): a mapping of field names to values.
+
+    Returns:
+        dict: the query matching the oplog records that write the given
+        values.
+    """
+    return {'$or': [
+        {'o.{}'.format(field): value for field, value in match.items()},
+        {'o.$set.{}'.format(field): value for field, value in match.items()},
+    ]}
+
+
+_OPERATION_TYPES = (
+    (ChangeFeed.INSERT, ['insert']),
+    (ChangeFeed.DELETE, ['delete']),
+    (ChangeFeed.UPDATE, ['update', 'replace']),
+)
+
+
+def change_stream_pipeline(operation, match=None):
+    """Build the aggregation pipeline of a change stream.
+
+    Args:
+        operation (int): the operations to listen to, see
+            :func:`~bigchaindb.backend.changefeed.get_changefeed`.
+        match (dict, optional): a mapping of field names to values. Inserts
+            are matched on the document, updates on the updated fields, and
+            deletes are never matched.
+
+    Returns:
+        list: the pipeline, with a single ``$match`` stage.
+    """
+    operation_types = [operation_type
+                       for flag, operation_types in _OPERATION_TYPES
+                       if operation & flag
+                       for operation_type in operation_types]
+    stage = {'operationType': {'$in': operation_types}}
+    if match:
+        stage['$or'] = [
+            {'fullDocument.{}'.format(field): value
+             for field, value in match.items()},
+            {'updateDescription.updatedFields.{}'.format(field): value
+             for field, value in match.items()},
+        ]
+    return [{'$match': stage}]
+
+
+def run_change_stream(conn, table, pipeline, position=None):
+    """Encapsulate operational logic of watching a change stream on a
+    MongoDB collection.
+
+    After an error the change stream is resumed after the last change
+    yielded, so no change is lost or yielded twice.
+
+    Args:
+        position (optional): a resume token to resume after, or an oplog
+            timestamp to start after. If ``None``, only the changes
+            happening from now on are yielded.
     """
     while True:
+        options = {'full_document': 'updateLookup'}
+        if isinstance(position, Timestamp):
+            options['start_at_operation_time'] = position
+        elif position is not None:
+            options['resume_after'] = position
         try:
-            # XXX: hack to force reconnection, in case the connection
-            # is lost while waiting on the cursor. See #1154.
+            stream = conn.run(
+                conn.collection(table).watch(pipeline, **options))
+            logger.debug('Watching %s/%s from %s', conn.dbname, table,
+                         position)
+            for change in stream:
+                # `start_at_operation_time` is inclusive.
+                if isinstance(position, Timestamp) and \
+                        change['clusterTime'] <= position:
+                    continue
+                yield change
+                position = change['_id']
+            # The stream has been invalidated, e.g. the collection has been
+            # dropped.
+            if _FEED_STOP:
+                return
+        except (BackendError, pymongo.errors.ConnectionFailure):
+            logger.exception('Lost connection while watching change stream, '
+                             'retrying')
             conn._conn = None
-            namespace = conn.dbname + '.' + table
+            time.sleep(1)
+
+
+@register_changefeed(MongoDBConnection)
+def get_stored_position(conn, name):
+    document = conn.run(conn.collection('changefeed').find_one({'_id': name}))
+    return document['position'] if document else None
+
+
+@register_changefeed(MongoDBConnection)
+def store_position(conn, name, position):
+    conn.run(
+        conn.collection('changefeed')
+        .update_one({'_id': name}, {'$set': {'position': position}},
+                    upsert=True))
+
+
+def run_changefeed(conn, table, last_ts, match=None):
+    """Encapsulate operational logic of tailing changefeed from MongoDB
+    """
+    namespace = conn.dbname + '.' + table
+    while True:
+        try:
+            spec = {'ns': namespace, 'ts': {'$gt': last_ts}}
+            if match:
+                spec.update(oplog_match(match))
             query = conn.query().local.oplog.rs.find(
-                {'ns': namespace, 'ts': {'$gt': last_ts}},
+                spec,
                 {'o._id': False},
                 cursor_type=pymongo.CursorType.TAILABLE_AWAIT
             )
@@ -108,4 +300,7 @@ def run_changefeed(conn, table, last_ts):
                         return
         except (BackendError, pymongo.errors.ConnectionFailure):
             logger.exception('Lost connection while tailing oplog, retrying')
+            # Force a reconnection, since the connection might have been
+            # lost while waiting on the cursor. See #1154.
+            conn._conn = None
             time.sleep(1)
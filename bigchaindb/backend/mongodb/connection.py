@@ -11,21 +11,29 @@ from bigchaindb.backend.exceptions import (DuplicateKeyError,
                                            OperationError,
                                            ConnectionError)
 from bigchaindb.backend.connection import Connection
+from bigchaindb.metrics import DATABASE_QUERY_DURATION, timed
 
 logger = logging.getLogger(__name__)
 
 
 class MongoDBConnection(Connection):
 
+    # a MongoClient has its own pool of sockets, for all the threads
+    thread_safe = True
+
     def __init__(self, replicaset=None, ssl=None, login=None, password=None,
                  ca_cert=None, certfile=None, keyfile=None,
-                 keyfile_passphrase=None, crlfile=None, **kwargs):
+                 keyfile_passphrase=None, crlfile=None, changefeed=None,
+                 **kwargs):
 
         """Create a new Connection instance.
 
         Args:
             replicaset (str, optional): the name of the replica set to
                                         connect to.
+            changefeed (str, optional): how to listen to the changes of
+                                        the database, either ``'oplog'``
+                                        or ``'change_stream'``.
             **kwargs: arbitrary keyword arguments provided by the
                 configuration's ``database`` settings
         """
@@ -40,6 +48,7 @@ class MongoDBConnection(Connection):
         self.keyfile = keyfile or bigchaindb.config['database'].get('keyfile', None)
         self.keyfile_passphrase = keyfile_passphrase or bigchaindb.config['database'].get('keyfile_passphrase', None)
         self.crlfile = crlfile or bigchaindb.config['database'].get('crlfile', None)
+        self.changefeed = changefeed or bigchaindb.config['database'].get('changefeed', 'oplog')
 
     @property
     def db(self):
@@ -56,6 +65,7 @@ class MongoDBConnection(Connection):
         """
         return self.query()[self.dbname][name]
 
+    @timed(DATABASE_QUERY_DURATION)
     def run(self, query):
         try:
             try:
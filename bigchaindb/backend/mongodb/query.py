@@ -2,10 +2,12 @@
 
 from time import time
 
-from pymongo import ReturnDocument
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
 
 from bigchaindb import backend
-from bigchaindb.backend.mongodb.changefeed import run_changefeed
+from bigchaindb.backend.changefeed import ChangeFeed
+from bigchaindb.backend.mongodb.changefeed import (get_changes,
+                                                   get_insert_position)
 from bigchaindb.common.exceptions import CyclicBlockchainError
 from bigchaindb.common.transaction import Transaction
 from bigchaindb.backend.exceptions import DuplicateKeyError, OperationError
@@ -26,6 +28,20 @@ def write_transaction(conn, signed_transaction):
         return
 
 
+@register_query(MongoDBConnection)
+def write_transactions(conn, signed_transactions):
+    try:
+        # unordered means that all the inserts will be attempted instead of
+        # stopping after the first error.
+        return conn.run(
+            conn.collection('backlog')
+            .insert_many(signed_transactions, ordered=False))
+    # The actual mongodb exception is a BulkWriteError due to a duplicated key
+    # in one of the inserts.
+    except OperationError:
+        return
+
+
 @register_query(MongoDBConnection)
 def update_transaction(conn, transaction_id, doc):
     # with mongodb we need to add update operators to the doc
@@ -38,6 +54,14 @@ def update_transaction(conn, transaction_id, doc):
             return_document=ReturnDocument.AFTER))
 
 
+@register_query(MongoDBConnection)
+def update_transactions(conn, transaction_ids, doc):
+    return conn.run(
+        conn.collection('backlog')
+        .update_many({'id': {'$in': list(transaction_ids)}},
+                     {'$set': doc}))
+
+
 @register_query(MongoDBConnection)
 def delete_transaction(conn, *transaction_id):
     return conn.run(
@@ -53,6 +77,17 @@ def get_stale_transactions(conn, reassign_delay):
               projection={'_id': False}))
 
 
+@register_query(MongoDBConnection)
+def get_oldest_assignment_timestamp(conn):
+    oldest = conn.run(
+        conn.collection('backlog')
+        .find_one({},
+                  projection={'_id': False, 'assignment_timestamp': True},
+                  sort=[('assignment_timestamp', ASCENDING)]))
+    if oldest:
+        return oldest['assignment_timestamp']
+
+
 @register_query(MongoDBConnection)
 def get_transaction_from_block(conn, transaction_id, block_id):
     try:
@@ -99,7 +134,51 @@ def get_blocks_status_from_transaction(conn, transaction_id):
 
 
 @register_query(MongoDBConnection)
-def get_txids_filtered(conn, asset_id, operation=None):
+def get_blocks_of_transactions(conn, transaction_ids):
+    transaction_ids = list(transaction_ids)
+    cursor = conn.run(
+        conn.collection('bigchain')
+        .aggregate([
+            {'$match': {'block.transactions.id': {'$in': transaction_ids}}},
+            {'$project': {'_id': False, 'id': True, 'block.voters': True,
+                          'transaction_id': '$block.transactions.id'}},
+            {'$unwind': '$transaction_id'},
+            {'$match': {'transaction_id': {'$in': transaction_ids}}},
+        ]))
+    return ((doc['transaction_id'],
+             {'id': doc['id'], 'block': {'voters': doc['block']['voters']}})
+            for doc in cursor)
+
+
+@register_query(MongoDBConnection)
+def get_transactions_from_blocks(conn, transaction_ids):
+    transaction_ids = list(transaction_ids)
+    cursor = conn.run(
+        conn.collection('bigchain')
+        .aggregate([
+            {'$match': {'block.transactions.id': {'$in': transaction_ids}}},
+            {'$project': {'_id': False, 'id': True, 'block.voters': True,
+                          'block.transactions': True}},
+            {'$unwind': '$block.transactions'},
+            {'$match': {'block.transactions.id': {'$in': transaction_ids}}},
+        ]))
+    return (({'id': doc['id'], 'block': {'voters': doc['block']['voters']}},
+             doc['block']['transactions'])
+            for doc in cursor)
+
+
+@register_query(MongoDBConnection)
+def get_backlog_transaction_ids(conn, transaction_ids):
+    cursor = conn.run(
+        conn.collection('backlog')
+        .find({'id': {'$in': list(transaction_ids)}},
+              projection={'_id': False, 'id': True}))
+    return (doc['id'] for doc in cursor)
+
+
+@register_query(MongoDBConnection)
+def get_txids_filtered(conn, asset_id, operation=None, *, last_id=None,
+                       limit=0):
     match_create = {
         'block.transactions.operation': 'CREATE',
         'block.transactions.id': asset_id
@@ -116,16 +195,14 @@ def get_txids_filtered(conn, asset_id, operation=None):
     else:
         match = {'$or': [match_create, match_transfer]}
 
-    pipeline = [
-        {'$match': match},
-        {'$unwind': '$block.transactions'},
-        {'$match': match},
-        {'$project': {'block.transactions.id': True}}
+    pipeline = _page(match, last_id, limit) + [
+        {'$project': {'id': True, 'block.transactions.id': True}}
     ]
     cursor = conn.run(
         conn.collection('bigchain')
         .aggregate(pipeline))
-    return (elem['block']['transactions']['id'] for elem in cursor)
+    return ((elem['id'], elem['block']['transactions']['id'])
+            for elem in cursor)
 
 
 # TODO: This doesn't seem to be used anywhere
@@ -197,21 +274,56 @@ def get_spending_transactions(conn, inputs):
 
 
 @register_query(MongoDBConnection)
-def get_owned_ids(conn, owner):
+def get_owned_ids(conn, owner, *, last_id=None, limit=0):
+    match = {'block.transactions.outputs.public_keys': owner}
     cursor = conn.run(
-        conn.collection('bigchain').aggregate([
-            {'$match': {'block.transactions.outputs.public_keys': owner}},
-            {'$unwind': '$block.transactions'},
-            {'$match': {'block.transactions.outputs.public_keys': owner}}
-        ]))
+        conn.collection('bigchain')
+        .aggregate(_page(match, last_id, limit)))
     return ((b['id'], b['block']['transactions']) for b in cursor)
 
 
+def _page(match, last_id, limit):
+    """Return the aggregation stages that unwind the transactions matching
+    ``match`` of the blocks with an id greater than ``last_id``, in the
+    order of the blocks, and keep the first ``limit`` of them.
+
+    The blocks are sorted on the ``block_id`` index before the ``$unwind``,
+    which keeps the transactions of a block in order, so the query reads
+    the transactions in the order of the index instead of sorting them, and
+    the next page starts from the index.
+    """
+    block_match = match
+    if last_id is not None:
+        block_match = {'$and': [match, {'id': {'$gt': last_id}}]}
+    stages = [
+        {'$match': block_match},
+        {'$sort': {'id': ASCENDING}},
+        {'$unwind': '$block.transactions'},
+        {'$match': match},
+    ]
+    if limit:
+        stages.append({'$limit': limit})
+    return stages
+
+
+@register_query(MongoDBConnection)
+def get_votes_by_block_id(conn, block_id, *, last_id=None, limit=0):
+    spec = {'vote.voting_for_block': block_id}
+    if last_id is not None:
+        spec['node_pubkey'] = {'$gt': last_id}
+
+    cursor = conn.collection('votes').find(spec, projection={'_id': False})
+    if limit:
+        # the `block_and_voter` index keeps the votes of a block in order
+        cursor = cursor.sort('node_pubkey', ASCENDING).limit(limit)
+    return conn.run(cursor)
+
+
 @register_query(MongoDBConnection)
-def get_votes_by_block_id(conn, block_id):
+def get_votes_for_blocks(conn, block_ids):
     return conn.run(
         conn.collection('votes')
-        .find({'vote.voting_for_block': block_id},
+        .find({'vote.voting_for_block': {'$in': list(block_ids)}},
               projection={'_id': False}))
 
 
@@ -335,30 +447,88 @@ def get_last_voted_block_id(conn, node_pubkey):
     return last_block_id
 
 
+@register_query(MongoDBConnection)
+def get_votes_by_previous_block_and_voter(conn, previous_block_id,
+                                          node_pubkey):
+    return conn.run(
+        conn.collection('votes')
+        .find({'vote.previous_block': previous_block_id,
+               'node_pubkey': node_pubkey},
+              projection={'_id': False}))
+
+
+@register_query(MongoDBConnection)
+def get_vote_checkpoint(conn, node_pubkey):
+    checkpoint = conn.run(
+        conn.collection('vote_checkpoints')
+        .find_one({'node_pubkey': node_pubkey}, {'_id': False}))
+    return checkpoint['block_id'] if checkpoint else None
+
+
+@register_query(MongoDBConnection)
+def write_vote_checkpoint(conn, node_pubkey, block_id):
+    conn.run(
+        conn.collection('vote_checkpoints')
+        .update_one({'node_pubkey': node_pubkey},
+                    {'$set': {'block_id': block_id}},
+                    upsert=True))
+
+
 @register_query(MongoDBConnection)
 def get_new_blocks_feed(conn, start_block_id):
-    namespace = conn.dbname + '.bigchain'
-    match = {'o.id': start_block_id, 'op': 'i', 'ns': namespace}
-    # Neccesary to find in descending order since tests may write same block id several times
-    query = conn.query().local.oplog.rs.find(match).sort('$natural', -1).next()['ts']
-    last_ts = conn.run(query)
-    feed = run_changefeed(conn, 'bigchain', last_ts)
-    return (evt['o'] for evt in feed if evt['op'] == 'i')
+    last_ts = get_insert_position(conn, 'bigchain', start_block_id)
+    feed = get_changes(conn, 'bigchain', ChangeFeed.INSERT, position=last_ts)
+    return (block for _, block, _ in feed)
 
 
 @register_query(MongoDBConnection)
-def text_search(conn, search, *, language='english', case_sensitive=False,
-                diacritic_sensitive=False, text_score=False, limit=0):
-    cursor = conn.run(
-        conn.collection('assets')
-        .find({'$text': {
-                '$search': search,
-                '$language': language,
-                '$caseSensitive': case_sensitive,
-                '$diacriticSensitive': diacritic_sensitive}},
-              {'score': {'$meta': 'textScore'}, '_id': False})
-        .sort([('score', {'$meta': 'textScore'})])
+def get_blocks_after(conn, block_id, *, limit=0):
+    # The ObjectIds are generated by the clients of the database, with
+    # their clocks, so the order of the writes is the one of the oplog,
+    # whose timestamps are assigned by the primary.
+    position = get_insert_position(conn, 'bigchain', block_id)
+    if position is None:
+        return None
+
+    # the oplog has no index, oplog_replay starts the scan at the position
+    # instead of the start of the oplog
+    records = conn.run(
+        conn.query().local.oplog.rs
+        .find({'ns': conn.dbname + '.bigchain', 'op': 'i',
+               'ts': {'$gt': position}},
+              projection={'o': True}, oplog_replay=True)
+        .sort('$natural', ASCENDING)
         .limit(limit))
+    return (_remove_id(record['o']) for record in records)
+
+
+def _remove_id(document):
+    document.pop('_id', None)
+    return document
+
+
+@register_query(MongoDBConnection)
+def text_search(conn, search, *, language='english', case_sensitive=False,
+                diacritic_sensitive=False, text_score=False, limit=0,
+                after=None):
+    pipeline = [
+        {'$match': {'$text': {
+            '$search': search,
+            '$language': language,
+            '$caseSensitive': case_sensitive,
+            '$diacriticSensitive': diacritic_sensitive}}},
+        {'$addFields': {'score': {'$meta': 'textScore'}}},
+        {'$project': {'_id': False}},
+    ]
+    if after is not None:
+        score, asset_id = after
+        pipeline.append({'$match': {'$or': [
+            {'score': {'$lt': score}},
+            {'score': score, 'id': {'$gt': asset_id}}]}})
+    pipeline.append({'$sort': {'score': DESCENDING, 'id': ASCENDING}})
+    if limit:
+        pipeline.append({'$limit': limit})
+    cursor = conn.run(conn.collection('assets').aggregate(pipeline))
 
     if text_score:
         return cursor
@@ -27,7 +27,8 @@ def create_database(conn, dbname):
 
 @register_schema(MongoDBConnection)
 def create_tables(conn, dbname):
-    for table_name in ['bigchain', 'backlog', 'votes', 'assets']:
+    for table_name in ['bigchain', 'backlog', 'votes', 'assets',
+                       'vote_checkpoints', 'changefeed']:
         logger.info('Create `%s` table.', table_name)
         # create the table
         # TODO: read and write concerns can be declared here
@@ -40,6 +41,7 @@ def create_indexes(conn, dbname):
     create_backlog_secondary_index(conn, dbname)
     create_votes_secondary_index(conn, dbname)
     create_assets_secondary_index(conn, dbname)
+    create_vote_checkpoints_secondary_index(conn, dbname)
 
 
 @register_schema(MongoDBConnection)
@@ -55,6 +57,9 @@ def create_bigchain_secondary_index(conn, dbname):
                                                  ASCENDING)],
                                                name='block_timestamp')
 
+    # to read the blocks in the order of their ids
+    conn.conn[dbname]['bigchain'].create_index('id', name='block_id')
+
     # to query the bigchain for a transaction id, this field is unique
     conn.conn[dbname]['bigchain'].create_index('block.transactions.id',
                                                name='transaction_id')
@@ -91,6 +96,11 @@ def create_backlog_secondary_index(conn, dbname):
                        ('assignment_timestamp', DESCENDING)],
                       name='assignee__transaction_timestamp')
 
+    # to find stale transactions with a range query on the assignment time
+    conn.conn[dbname]['backlog']\
+        .create_index([('assignment_timestamp', ASCENDING)],
+                      name='assignment_timestamp')
+
 
 def create_votes_secondary_index(conn, dbname):
     logger.info('Create `votes` secondary index.')
@@ -104,6 +114,13 @@ def create_votes_secondary_index(conn, dbname):
                                             name='block_and_voter',
                                             unique=True)
 
+    # compound index to follow the chain of votes of a node
+    conn.conn[dbname]['votes'].create_index([('vote.previous_block',
+                                              ASCENDING),
+                                             ('node_pubkey',
+                                              ASCENDING)],
+                                            name='previous_block_and_voter')
+
 
 def create_assets_secondary_index(conn, dbname):
     logger.info('Create `assets` secondary index.')
@@ -116,3 +133,12 @@ def create_assets_secondary_index(conn, dbname):
 
     # full text search index
     conn.conn[dbname]['assets'].create_index([('$**', TEXT)], name='text')
+
+
+def create_vote_checkpoints_secondary_index(conn, dbname):
+    logger.info('Create `vote_checkpoints` secondary index.')
+
+    # unique index on the public key of the voter
+    conn.conn[dbname]['vote_checkpoints'].create_index('node_pubkey',
+                                                       name='voter',
+                                                       unique=True)
@@ -19,6 +19,22 @@ def write_transaction(connection, signed_transaction):
     raise NotImplementedError
 
 
+@singledispatch
+def write_transactions(connection, signed_transactions):
+    """Write many transactions to the backlog table.
+
+    The transactions that are already in the backlog are ignored.
+
+    Args:
+        signed_transactions (list of dict): the signed transactions.
+
+    Returns:
+        The result of the operation.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def update_transaction(connection, transaction_id, doc):
     """Update a transaction in the backlog table.
@@ -34,6 +50,21 @@ def update_transaction(connection, transaction_id, doc):
     raise NotImplementedError
 
 
+@singledispatch
+def update_transactions(connection, transaction_ids, doc):
+    """Update many transactions in the backlog table with the same values.
+
+    Args:
+        transaction_ids (list): the ids of the transactions.
+        doc (dict): the values to update.
+
+    Returns:
+        The result of the operation.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def delete_transaction(connection, *transaction_id):
     """Delete a transaction from the backlog.
@@ -65,6 +96,18 @@ def get_stale_transactions(connection, reassign_delay):
     raise NotImplementedError
 
 
+@singledispatch
+def get_oldest_assignment_timestamp(connection):
+    """Get the oldest assignment timestamp of the transactions in the backlog.
+
+    Returns:
+        The oldest ``assignment_timestamp`` (float) or ``None`` if the
+        backlog is empty.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def get_transaction_from_block(connection, transaction_id, block_id):
     """Get a transaction from a specific block.
@@ -80,6 +123,22 @@ def get_transaction_from_block(connection, transaction_id, block_id):
     raise NotImplementedError
 
 
+@singledispatch
+def get_transactions_from_blocks(connection, transaction_ids):
+    """Get some transactions from all the blocks they are in.
+
+    Args:
+        transaction_ids (list): the ids of the transactions.
+
+    Returns:
+        Iterator of (block, transaction) for each block containing one of
+        the transactions, where the block has only its election
+        information (``id`` and ``block.voters``).
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def get_transaction_from_backlog(connection, transaction_id):
     """Get a transaction from backlog.
@@ -157,25 +216,33 @@ def get_spending_transactions(connection, inputs):
 
 
 @singledispatch
-def get_owned_ids(connection, owner):
+def get_owned_ids(connection, owner, *, last_id=None, limit=0):
     """Retrieve a list of `txids` that can we used has inputs.
 
     Args:
         owner (str): base58 encoded public key.
+        last_id (str, optional): only return the transactions of the
+            blocks with an id greater than ``last_id``.
+        limit (int, optional): return at most ``limit`` transactions.
 
     Returns:
         Iterator of (block_id, transaction) for transactions
-        that list given owner in conditions.
+        that list given owner in conditions, in the order of the ids of
+        their blocks, then of their positions in the blocks.
     """
     raise NotImplementedError
 
 
 @singledispatch
-def get_votes_by_block_id(connection, block_id):
+def get_votes_by_block_id(connection, block_id, *, last_id=None, limit=0):
     """Get all the votes casted for a specific block.
 
     Args:
         block_id (str): the block id to use.
+        last_id (str, optional): only return the votes of the nodes with a
+            public key greater than ``last_id``.
+        limit (int, optional): return at most ``limit`` votes, in the order
+            of the public keys of the nodes.
 
     Returns:
         A cursor for the matching votes.
@@ -199,6 +266,20 @@ def get_votes_by_block_id_and_voter(connection, block_id, node_pubkey):
     raise NotImplementedError
 
 
+@singledispatch
+def get_votes_for_blocks(connection, block_ids):
+    """Get all the votes on some blocks.
+
+    Args:
+        block_ids (list): the ids of the blocks.
+
+    Returns:
+        An iterator of the votes.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def get_votes_for_blocks_by_voter(connection, block_ids, pubkey):
     """Return votes for many block_ids
@@ -331,13 +412,96 @@ def get_last_voted_block_id(connection, node_pubkey):
 
 
 @singledispatch
-def get_txids_filtered(connection, asset_id, operation=None):
+def get_votes_by_previous_block_and_voter(connection, previous_block_id,
+                                          node_pubkey):
+    """Get all the votes casted by a specific voter right after voting for a
+    specific block.
+
+    Args:
+        previous_block_id (str): the id of the previous block of the votes.
+        node_pubkey (str): base58 encoded public key
+
+    Returns:
+        A cursor for the matching votes.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def get_vote_checkpoint(connection, node_pubkey):
+    """Get the vote checkpoint of a specific node.
+
+    Args:
+        node_pubkey (str): base58 encoded public key.
+
+    Returns:
+        The id of the block of the last vote written with
+        :func:`write_vote_checkpoint`, or ``None``.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def write_vote_checkpoint(connection, node_pubkey, block_id):
+    """Write the vote checkpoint of a specific node.
+
+    Args:
+        node_pubkey (str): base58 encoded public key.
+        block_id (str): the id of the last block the node voted on.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def get_blocks_of_transactions(connection, transaction_ids):
+    """Return the blocks containing some transactions, with what their
+    election needs.
+
+    Args:
+        transaction_ids (list): the ids of the transactions.
+
+    Returns:
+        An iterable of ``(transaction_id, block)`` pairs, the block holding
+        its ``id`` and its ``block.voters``.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def get_backlog_transaction_ids(connection, transaction_ids):
+    """Return the ids of the given transactions which are in the backlog.
+
+    Args:
+        transaction_ids (list): the ids of the transactions.
+
+    Returns:
+        An iterable of transaction ids.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def get_txids_filtered(connection, asset_id, operation=None, *,
+                       last_id=None, limit=0):
     """
     Return all transactions for a particular asset id and optional operation.
 
     Args:
         asset_id (str): ID of transaction that defined the asset
         operation (str) (optional): Operation to filter on
+        last_id (str) (optional): only return the transactions of the blocks
+            with an id greater than ``last_id``
+        limit (int) (optional): return at most ``limit`` ids
+
+    Returns:
+        An iterable of (block_id, transaction_id), in the order of the ids
+        of the blocks, then of the positions of the transactions in the
+        blocks.
     """
 
     raise NotImplementedError
@@ -358,12 +522,36 @@ def get_new_blocks_feed(connection, start_block_id):
     raise NotImplementedError
 
 
+@singledispatch
+def get_blocks_after(connection, block_id, *, limit=0):
+    """Return the blocks written after a block, in the order they were
+    written.
+
+    Unlike :func:`get_new_blocks_feed`, this doesn't wait for new blocks.
+    The blocks are read from a single query, so that they can be read a
+    chunk at a time without looking up the block again.
+
+    Args:
+        block_id (str): the id of the block.
+        limit (int): the maximum number of blocks to return, or ``0``
+            for all of them.
+
+    Returns:
+        An iterable of blocks, or ``None`` if there is no block with the
+        given id, or if the order of the writes since that block is no
+        longer known, e.g. on MongoDB once its write has left the oplog.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def text_search(conn, search, *, language='english', case_sensitive=False,
-                diacritic_sensitive=False, text_score=False, limit=0):
+                diacritic_sensitive=False, text_score=False, limit=0,
+                after=None):
     """Return all the assets that match the text search.
 
-    The results are sorted by text score.
+    The results are sorted by text score, and then by id.
     For more information about the behavior of text search on MongoDB see
     https://docs.mongodb.com/manual/reference/operator/query/text/#behavior
 
@@ -379,6 +567,8 @@ def text_search(conn, search, *, language='english', case_sensitive=False,
         text_score (bool, optional): If ``True`` returns the text score with
             each document.
         limit (int, optional): Limit the number of returned documents.
+        after (tuple, optional): the text score and the id of an asset:
+            only return the assets sorted after it.
 
     Returns:
         :obj:`list` of :obj:`dict`: a list of assets
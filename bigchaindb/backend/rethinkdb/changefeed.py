@@ -20,25 +20,26 @@ class RethinkDBChangeFeed(ChangeFeed):
         for element in self.prefeed:
             self.outqueue.put(element)
 
-        for change in run_changefeed(self.connection, self.table):
-            is_insert = change['old_val'] is None
-            is_delete = change['new_val'] is None
-            is_update = not is_insert and not is_delete
+        changes = get_changes(self.connection, self.table, self.operation,
+                              match=self.match)
+        for _, document, _ in changes:
+            self.outqueue.put(document)
 
-            if is_insert and (self.operation & ChangeFeed.INSERT):
-                self.outqueue.put(change['new_val'])
-            elif is_delete and (self.operation & ChangeFeed.DELETE):
-                self.outqueue.put(change['old_val'])
-            elif is_update and (self.operation & ChangeFeed.UPDATE):
-                self.outqueue.put(change['new_val'])
 
-
-def run_changefeed(connection, table):
+def run_changefeed(connection, table, match=None):
     """Encapsulate operational logic of tailing changefeed from RethinkDB
+
+    If ``match`` is given, the changefeed is filtered by RethinkDB. A document
+    that stops matching is reported as a deletion, a document that starts
+    matching as an insertion.
     """
+    query = r.table(table)
+    if match:
+        query = query.filter(match)
+
     while True:
         try:
-            for change in connection.run(r.table(table).changes()):
+            for change in connection.run(query.changes()):
                 yield change
             break
         except (BackendError, r.ReqlDriverError) as exc:
@@ -47,7 +48,7 @@ def run_changefeed(connection, table):
 
 
 @register_changefeed(RethinkDBConnection)
-def get_changefeed(connection, table, operation, *, prefeed=None):
+def get_changefeed(connection, table, operation, *, prefeed=None, match=None):
     """Return a RethinkDB changefeed.
 
     Returns:
@@ -56,4 +57,43 @@ def get_changefeed(connection, table, operation, *, prefeed=None):
     """
 
     return RethinkDBChangeFeed(table, operation, prefeed=prefeed,
-                               connection=connection)
+                               connection=connection, match=match)
+
+
+@register_changefeed(RethinkDBConnection)
+def get_changes(connection, table, operation, *, position=None, match=None):
+    """Return a generator of the changes happening on a RethinkDB table.
+
+    RethinkDB changefeeds cannot be resumed, so positions are always
+    ``None``.
+    """
+    if position is not None:
+        logger.warning('RethinkDB changefeed unable to resume from given '
+                       'position: %s', position)
+
+    for change in run_changefeed(connection, table, match=match):
+        is_insert = change['old_val'] is None
+        is_delete = change['new_val'] is None
+        is_update = not is_insert and not is_delete
+
+        if is_insert and (operation & ChangeFeed.INSERT):
+            yield ChangeFeed.INSERT, change['new_val'], None
+        elif is_delete and (operation & ChangeFeed.DELETE):
+            yield ChangeFeed.DELETE, change['old_val'], None
+        elif is_update and (operation & ChangeFeed.UPDATE):
+            yield ChangeFeed.UPDATE, change['new_val'], None
+
+
+@register_changefeed(RethinkDBConnection)
+def get_insert_position(connection, table, document_id):
+    return None
+
+
+@register_changefeed(RethinkDBConnection)
+def get_stored_position(connection, name):
+    return None
+
+
+@register_changefeed(RethinkDBConnection)
+def store_position(connection, name, position):
+    pass
@@ -1,5 +1,6 @@
 import rethinkdb as r
 from bigchaindb.backend.connection import Connection
+from bigchaindb.metrics import DATABASE_QUERY_DURATION, timed
 from bigchaindb.backend.exceptions import ConnectionError, OperationError
 
 
@@ -12,6 +13,7 @@ class RethinkDBConnection(Connection):
           more times to run the query or open a connection.
     """
 
+    @timed(DATABASE_QUERY_DURATION)
     def run(self, query):
         """Run a RethinkDB query.
 
@@ -1,4 +1,3 @@
-from itertools import chain
 import logging as logger
 from time import time
 
@@ -29,6 +28,13 @@ def write_transaction(connection, signed_transaction):
             .insert(signed_transaction, durability=WRITE_DURABILITY))
 
 
+@register_query(RethinkDBConnection)
+def write_transactions(connection, signed_transactions):
+    return connection.run(
+            r.table('backlog')
+            .insert(signed_transactions, durability=WRITE_DURABILITY))
+
+
 @register_query(RethinkDBConnection)
 def update_transaction(connection, transaction_id, doc):
     return connection.run(
@@ -37,6 +43,14 @@ def update_transaction(connection, transaction_id, doc):
             .update(doc))
 
 
+@register_query(RethinkDBConnection)
+def update_transactions(connection, transaction_ids, doc):
+    return connection.run(
+            r.table('backlog')
+            .get_all(*transaction_ids)
+            .update(doc, durability=WRITE_DURABILITY))
+
+
 @register_query(RethinkDBConnection)
 def delete_transaction(connection, *transaction_id):
     return connection.run(
@@ -49,7 +63,19 @@ def delete_transaction(connection, *transaction_id):
 def get_stale_transactions(connection, reassign_delay):
     return connection.run(
             r.table('backlog')
-            .filter(lambda tx: time() - tx['assignment_timestamp'] > reassign_delay))
+            .between(r.minval, time() - reassign_delay,
+                     index='assignment_timestamp'))
+
+
+@register_query(RethinkDBConnection)
+def get_oldest_assignment_timestamp(connection):
+    oldest = list(connection.run(
+            r.table('backlog')
+            .order_by(index=r.asc('assignment_timestamp'))
+            .limit(1)
+            .get_field('assignment_timestamp')))
+    if oldest:
+        return oldest[0]
 
 
 @register_query(RethinkDBConnection)
@@ -80,27 +106,88 @@ def get_blocks_status_from_transaction(connection, transaction_id):
 
 
 @register_query(RethinkDBConnection)
-def get_txids_filtered(connection, asset_id, operation=None):
+def get_blocks_of_transactions(connection, transaction_ids):
+    transaction_ids = list(transaction_ids)
+    return connection.run(
+            r.table('bigchain', read_mode=READ_MODE)
+            .get_all(*transaction_ids, index='transaction_id')
+            .distinct()
+            .concat_map(lambda block: block['block']['transactions']
+                        .filter(lambda tx: r.expr(transaction_ids).contains(tx['id']))
+                        .map(lambda tx: [tx['id'], {
+                            'id': block['id'],
+                            'block': {'voters': block['block']['voters']}}])))
+
+
+@register_query(RethinkDBConnection)
+def get_transactions_from_blocks(connection, transaction_ids):
+    transaction_ids = list(transaction_ids)
+    cursor = connection.run(
+            r.table('bigchain', read_mode=READ_MODE)
+            .get_all(*transaction_ids, index='transaction_id')
+            .distinct()
+            .concat_map(unwind_block_transactions)
+            .filter(lambda doc: r.expr(transaction_ids).contains(doc['tx']['id']))
+            .pluck('id', {'block': 'voters'}, 'tx'))
+    return (({'id': doc['id'], 'block': doc['block']}, doc['tx'])
+            for doc in cursor)
+
+
+@register_query(RethinkDBConnection)
+def get_backlog_transaction_ids(connection, transaction_ids):
+    return connection.run(
+            r.table('backlog')
+            .get_all(*transaction_ids)
+            .get_field('id'))
+
+
+@register_query(RethinkDBConnection)
+def get_txids_filtered(connection, asset_id, operation=None, *,
+                       last_id=None, limit=0):
     # here we only want to return the transaction ids since later on when
     # we are going to retrieve the transaction with status validation
 
-    parts = []
+    def is_create(transaction):
+        return transaction['id'] == asset_id
 
-    if operation in (Transaction.CREATE, None):
-        # First find the asset's CREATE transaction
-        parts.append(connection.run(
-            _get_asset_create_tx_query(asset_id).get_field('id')))
+    def is_transfer(transaction):
+        return transaction['asset']['id'].default(None) == asset_id
 
-    if operation in (Transaction.TRANSFER, None):
-        # Then find any TRANSFER transactions related to the asset
-        parts.append(connection.run(
-            r.table('bigchain')
-            .get_all(asset_id, index='asset_id')
-            .concat_map(lambda block: block['block']['transactions'])
-            .filter(lambda transaction: transaction['asset']['id'] == asset_id)
-            .get_field('id')))
+    def get_blocks(index):
+        return r.table('bigchain', read_mode=READ_MODE) \
+                .get_all(asset_id, index=index)
+
+    if operation == Transaction.CREATE:
+        blocks, match = get_blocks('transaction_id'), is_create
+    elif operation == Transaction.TRANSFER:
+        blocks, match = get_blocks('asset_id'), is_transfer
+    else:
+        blocks = get_blocks('transaction_id') \
+            .union(get_blocks('asset_id')).distinct()
+
+        def match(transaction):
+            return is_create(transaction) | is_transfer(transaction)
 
-    return chain(*parts)
+    cursor = connection.run(_page(blocks, match, last_id, limit)
+                            .pluck('id', {'tx': 'id'}))
+    return ((doc['id'], doc['tx']['id']) for doc in cursor)
+
+
+def _page(blocks, predicate, last_id, limit):
+    """Unwind the transactions matching ``predicate`` of the ``blocks`` with
+    an id greater than ``last_id``, in the order of the blocks, and keep the
+    first ``limit`` of them.
+
+    The blocks are sorted before they are unwound, and the unwinding keeps
+    the transactions of a block in order."""
+    if last_id is not None:
+        blocks = blocks.filter(lambda block: block['id'] > last_id)
+    query = (blocks.order_by('id')
+             .concat_map(unwind_block_transactions)
+             .filter(lambda doc: predicate(doc['tx'])))
+    if limit:
+        query = query.limit(limit)
+    return query
 
 
 @register_query(RethinkDBConnection)
@@ -127,23 +214,24 @@ def get_spent(connection, transaction_id, output):
 
 
 @register_query(RethinkDBConnection)
-def get_owned_ids(connection, owner):
+def get_owned_ids(connection, owner, *, last_id=None, limit=0):
     query = (r.table('bigchain', read_mode=READ_MODE)
              .get_all(owner, index='outputs')
-             .distinct()
-             .concat_map(unwind_block_transactions)
-             .filter(lambda doc: doc['tx']['outputs'].contains(
-                lambda c: c['public_keys'].contains(owner))))
-    cursor = connection.run(query)
+             .distinct())
+    cursor = connection.run(_page(query, lambda tx: tx['outputs'].contains(
+        lambda c: c['public_keys'].contains(owner)), last_id, limit))
     return ((b['id'], b['tx']) for b in cursor)
 
 
 @register_query(RethinkDBConnection)
-def get_votes_by_block_id(connection, block_id):
-    return connection.run(
-            r.table('votes', read_mode=READ_MODE)
-            .between([block_id, r.minval], [block_id, r.maxval], index='block_and_voter')
-            .without('id'))
+def get_votes_by_block_id(connection, block_id, *, last_id=None, limit=0):
+    query = (r.table('votes', read_mode=READ_MODE)
+             .between([block_id, r.minval if last_id is None else last_id],
+                      [block_id, r.maxval], index='block_and_voter',
+                      left_bound='closed' if last_id is None else 'open'))
+    if limit:
+        query = query.order_by(index='block_and_voter').limit(limit)
+    return connection.run(query.without('id'))
 
 
 @register_query(RethinkDBConnection)
@@ -154,6 +242,32 @@ def get_votes_by_block_id_and_voter(connection, block_id, node_pubkey):
             .without('id'))
 
 
+@register_query(RethinkDBConnection)
+def get_votes_by_previous_block_and_voter(connection, previous_block_id,
+                                          node_pubkey):
+    return connection.run(
+            r.table('votes')
+            .get_all([previous_block_id, node_pubkey],
+                     index='previous_block_and_voter')
+            .without('id'))
+
+
+@register_query(RethinkDBConnection)
+def get_vote_checkpoint(connection, node_pubkey):
+    checkpoint = connection.run(
+            r.table('vote_checkpoints', read_mode=READ_MODE)
+            .get(node_pubkey))
+    return checkpoint['block_id'] if checkpoint else None
+
+
+@register_query(RethinkDBConnection)
+def write_vote_checkpoint(connection, node_pubkey, block_id):
+    return connection.run(
+            r.table('vote_checkpoints')
+            .insert({'node_pubkey': node_pubkey, 'block_id': block_id},
+                    conflict='replace', durability=WRITE_DURABILITY))
+
+
 @register_query(RethinkDBConnection)
 def write_block(connection, block_dict):
     return connection.run(
@@ -270,6 +384,32 @@ def get_new_blocks_feed(connection, start_block_id):  # pragma: no cover
         yield change['new_val']
 
 
+@register_query(RethinkDBConnection)
+def get_blocks_after(connection, block_id, *, limit=0):
+    block = connection.run(r.table('bigchain', read_mode=READ_MODE).get(block_id))
+    if block is None:
+        return None
+
+    # RethinkDB doesn't keep the order of the writes, the timestamps of the
+    # blocks come closest
+    query = (r.table('bigchain', read_mode=READ_MODE)
+             .filter(lambda doc: (doc['block']['timestamp'] > block['block']['timestamp']) |
+                     ((doc['block']['timestamp'] == block['block']['timestamp']) &
+                      (doc['id'] > block_id)))
+             .order_by(lambda doc: doc['block']['timestamp'], 'id'))
+    if limit:
+        query = query.limit(limit)
+    return connection.run(query)
+
+
+@register_query(RethinkDBConnection)
+def get_votes_for_blocks(connection, block_ids):
+    return connection.run(
+        r.table('votes', read_mode=READ_MODE)
+        .filter(lambda row: r.expr(list(block_ids)).contains(row['vote']['voting_for_block']))
+        .without('id'))
+
+
 @register_query(RethinkDBConnection)
 def get_votes_for_blocks_by_voter(connection, block_ids, node_pubkey):
     return connection.run(
@@ -27,6 +27,16 @@ def create_tables(connection, dbname):
         logger.info('Create `%s` table.', table_name)
         connection.run(r.db(dbname).table_create(table_name))
 
+    # one checkpoint per voter
+    logger.info('Create `vote_checkpoints` table.')
+    connection.run(r.db(dbname).table_create('vote_checkpoints',
+                                             primary_key='node_pubkey'))
+
+    # one position per changefeed
+    logger.info('Create `changefeed` table.')
+    connection.run(r.db(dbname).table_create('changefeed',
+                                             primary_key='name'))
+
 
 @register_schema(RethinkDBConnection)
 def create_indexes(connection, dbname):
@@ -107,6 +117,12 @@ def create_backlog_secondary_index(connection, dbname):
         .table('backlog')
         .index_create('assignee__transaction_timestamp', [r.row['assignee'], r.row['assignment_timestamp']]))
 
+    # to find stale transactions with a range query on the assignment time
+    connection.run(
+        r.db(dbname)
+        .table('backlog')
+        .index_create('assignment_timestamp'))
+
     # wait for rethinkdb to finish creating secondary indexes
     connection.run(
         r.db(dbname)
@@ -123,6 +139,12 @@ def create_votes_secondary_index(connection, dbname):
         .table('votes')
         .index_create('block_and_voter', [r.row['vote']['voting_for_block'], r.row['node_pubkey']]))
 
+    # compound index to follow the chain of votes of a node
+    connection.run(
+        r.db(dbname)
+        .table('votes')
+        .index_create('previous_block_and_voter', [r.row['vote']['previous_block'], r.row['node_pubkey']]))
+
     # wait for rethinkdb to finish creating secondary indexes
     connection.run(
         r.db(dbname)
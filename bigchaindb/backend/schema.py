@@ -1,13 +1,18 @@
 """Database creation and schema-providing interfaces for backends.
 
 Attributes:
-    TABLES (tuple): The three standard tables BigchainDB relies on:
+    TABLES (tuple): The standard tables BigchainDB relies on:
 
         * ``backlog`` for incoming transactions awaiting to be put into
           a block.
         * ``bigchain`` for blocks.
         * ``votes`` to store votes for each block by each federation
           node.
+        * ``assets`` to store the assets of the transactions.
+        * ``vote_checkpoints`` to store the last block each federation
+          node voted on.
+        * ``changefeed`` to store the positions the changefeeds of the
+          node resume from.
 
 """
 
@@ -19,7 +24,8 @@ from bigchaindb.backend.connection import connect
 
 logger = logging.getLogger(__name__)
 
-TABLES = ('bigchain', 'backlog', 'votes', 'assets')
+TABLES = ('bigchain', 'backlog', 'votes', 'assets', 'vote_checkpoints',
+          'changefeed')
 
 
 @singledispatch
@@ -0,0 +1,25 @@
+"""SQLite backend implementation.
+
+Contains an SQLite-specific implementation of the
+:mod:`~bigchaindb.backend.changefeed`, :mod:`~bigchaindb.backend.query`, and
+:mod:`~bigchaindb.backend.schema` interfaces.
+
+The database is a single file in WAL mode, which lets a node run without a
+separate database server. The documents are stored as JSON text; triggers
+index the transactions of the blocks in side tables, and write the changes
+of the tables to a bounded change log that the changefeeds poll.
+
+You can specify BigchainDB to use SQLite as its database backend by either
+setting ``database.backend`` to ``'sqlite'`` in your configuration file, or
+setting the ``BIGCHAINDB_DATABASE_BACKEND`` environment variable to
+``'sqlite'``. The database file is ``<database.path>/<database.name>.sqlite``.
+
+SQLite needs to be built with the JSON1 extension, as it is by default
+since SQLite 3.38.
+"""
+
+# Register the single dispatched modules on import.
+from bigchaindb.backend.sqlite import schema, query, changefeed  # noqa
+
+# SQLiteConnection should always be accessed via
+# ``bigchaindb.backend.connect()``.
@@ -0,0 +1,134 @@
+import logging
+import time
+
+import rapidjson
+
+from bigchaindb import backend
+from bigchaindb.backend.changefeed import ChangeFeed
+from bigchaindb.backend.exceptions import BackendError
+from bigchaindb.backend.utils import module_dispatch_registrar
+from bigchaindb.backend.sqlite.connection import SQLiteConnection
+
+
+logger = logging.getLogger(__name__)
+register_changefeed = module_dispatch_registrar(backend.changefeed)
+
+
+POLL_INTERVAL = 0.05
+"""How long (in sec) to wait before reading the change log again when
+there is no new change."""
+
+BATCH_SIZE = 1000
+"""How many changes to read from the change log at once."""
+
+
+class SQLiteChangeFeed(ChangeFeed):
+    """This class implements an SQLite changefeed as a multipipes Node.
+
+    It polls the change log that the triggers of the tables write.
+    """
+
+    def run_forever(self):
+        for element in self.prefeed:
+            self.outqueue.put(element)
+
+        changes = get_changes(self.connection, self.table, self.operation,
+                              match=self.match)
+        for _, document, _ in changes:
+            self.outqueue.put(document)
+
+
+@register_changefeed(SQLiteConnection)
+def get_changefeed(connection, table, operation, *, prefeed=None, match=None):
+    """Return an SQLite changefeed.
+
+    Returns:
+        An instance of
+        :class:`~bigchaindb.backend.sqlite.SQLiteChangeFeed`.
+    """
+
+    return SQLiteChangeFeed(table, operation, prefeed=prefeed,
+                            connection=connection, match=match)
+
+
+_FEED_STOP = False
+"""If it's True then the changefeed will return when there are no more items.
+"""
+
+
+def _last_position(connection):
+    position = connection.run(
+        connection.query()
+        .execute('SELECT max(position) FROM changes')
+        .fetchone())[0]
+    return position or 0
+
+
+@register_changefeed(SQLiteConnection)
+def get_changes(connection, table, operation, *, position=None, match=None):
+    """Return a generator of the changes happening on an SQLite table.
+
+    The positions are the rowids of the changes in the change log. Deletes
+    yield the deleted document.
+    """
+    conditions = ['table_name = ?', 'position > ?', 'operation & ?']
+    params = [operation]
+    for field, value in (match or {}).items():
+        # deletes are never filtered, like with the other backends
+        conditions.append("(operation = {} OR json_extract(doc, ?) = ?)"
+                          .format(ChangeFeed.DELETE))
+        params.extend(['$.{}'.format(field), value])
+    sql = ('SELECT operation, doc, position FROM changes WHERE {} '
+           'ORDER BY position LIMIT {}'.format(' AND '.join(conditions),
+                                               BATCH_SIZE))
+
+    while True:
+        try:
+            if position is None:
+                position = _last_position(connection)
+            changes = connection.run(
+                connection.query()
+                .execute(sql, [table, position] + params)
+                .fetchall())
+        except BackendError:
+            logger.exception('Error reading the change log of `%s`', table)
+            time.sleep(1)
+            continue
+
+        if not changes:
+            if _FEED_STOP:
+                return
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        for change_operation, document, position in changes:
+            yield change_operation, rapidjson.loads(document), position
+
+
+@register_changefeed(SQLiteConnection)
+def get_insert_position(connection, table, document_id):
+    position = connection.run(
+        connection.query()
+        .execute("SELECT max(position) FROM changes WHERE table_name = ? "
+                 "AND operation = ? AND json_extract(doc, '$.id') = ?",
+                 (table, ChangeFeed.INSERT, document_id))
+        .fetchone())[0]
+    return position
+
+
+@register_changefeed(SQLiteConnection)
+def get_stored_position(connection, name):
+    row = connection.run(
+        connection.query()
+        .execute('SELECT position FROM changefeed WHERE name = ?',
+                 (name,))
+        .fetchone())
+    return row[0] if row else None
+
+
+@register_changefeed(SQLiteConnection)
+def store_position(connection, name, position):
+    connection.run(
+        connection.query()
+        .execute('INSERT OR REPLACE INTO changefeed '
+                 '(name, position) VALUES (?, ?)', (name, position)))
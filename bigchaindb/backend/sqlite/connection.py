@@ -0,0 +1,109 @@
+import logging
+import os
+import sqlite3
+import threading
+from urllib.request import pathname2url
+
+import bigchaindb
+from bigchaindb.utils import Lazy
+from bigchaindb.backend.connection import Connection
+from bigchaindb.metrics import DATABASE_QUERY_DURATION, timed
+from bigchaindb.backend.exceptions import (DuplicateKeyError,
+                                           OperationError,
+                                           ConnectionError)
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteConnection(Connection):
+    """Connection to an SQLite database file.
+
+    Each database is a file named after it in the ``path`` directory. The
+    connection is reopened in a forked process, since SQLite connections
+    cannot be shared across processes.
+    """
+
+    def __init__(self, path=None, **kwargs):
+        """Create a new Connection instance.
+
+        Args:
+            path (str, optional): the directory of the database files.
+                Defaults to the ``database.path`` setting.
+            **kwargs: arbitrary keyword arguments provided by the
+                configuration's ``database`` settings
+        """
+
+        super().__init__(**kwargs)
+        self.path = os.path.expanduser(
+            path or bigchaindb.config['database'].get('path', os.path.join('~', '.bigchaindb-data')))
+        self.lock = threading.RLock()
+        self._pid = None
+
+    @property
+    def conn(self):
+        if self._pid != os.getpid():
+            self._conn = None
+            self._pid = os.getpid()
+        return super().conn
+
+    def query(self):
+        return Lazy()
+
+    def filename(self, dbname=None):
+        """Return the path of the file of a database."""
+        return os.path.join(self.path, '{}.sqlite'.format(dbname or self.dbname))
+
+    def open(self, dbname=None, *, create=False):
+        """Open a new SQLite connection to a database.
+
+        Args:
+            dbname (str, optional): the name of the database. Defaults to
+                the database of this connection.
+            create (bool): whether to create the database file if it does
+                not exist.
+
+        Raises:
+            :exc:`sqlite3.OperationalError`: If the database file cannot be
+                opened.
+        """
+        if create:
+            os.makedirs(self.path, exist_ok=True)
+        uri = 'file:{}?mode={}'.format(pathname2url(self.filename(dbname)),
+                                       'rwc' if create else 'rw')
+        db = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                             timeout=self.connection_timeout / 1000)
+        # WAL mode is persistent, with it readers do not block the writer
+        # and the writer does not need to sync the file on every commit.
+        db.execute('PRAGMA synchronous = NORMAL')
+        return db
+
+    def close(self):
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @timed(DATABASE_QUERY_DURATION)
+    def run(self, query):
+        """Run a query in a transaction.
+
+        Args:
+            query (:class:`~bigchaindb.utils.Lazy`): the calls to make on
+                the :class:`sqlite3.Connection`.
+        """
+        with self.lock:
+            try:
+                with self.conn:
+                    return query.run(self.conn)
+            except sqlite3.IntegrityError as exc:
+                raise DuplicateKeyError from exc
+            except sqlite3.Error as exc:
+                raise OperationError from exc
+
+    def _connect(self):
+        try:
+            return self.open()
+        except sqlite3.Error as exc:
+            logger.warning('Cannot open the database file %s: %s',
+                           self.filename(), exc)
+            raise ConnectionError from exc
@@ -0,0 +1,420 @@
+"""Query implementation for SQLite"""
+
+from time import time
+
+import rapidjson
+
+from bigchaindb import backend
+from bigchaindb.backend.changefeed import ChangeFeed
+from bigchaindb.backend.sqlite.changefeed import (get_changes,
+                                                  get_insert_position)
+from bigchaindb.common.exceptions import CyclicBlockchainError
+from bigchaindb.common.transaction import Transaction
+from bigchaindb.backend.exceptions import DuplicateKeyError
+from bigchaindb.backend.utils import module_dispatch_registrar
+from bigchaindb.backend.sqlite.connection import SQLiteConnection
+
+
+register_query = module_dispatch_registrar(backend.query)
+
+# The transaction at `transactions.tx_index` in the block `b`
+_TRANSACTION = "json_extract(b.doc, '$.block.transactions[' || t.tx_index || ']')"
+
+
+def _execute(conn, sql, params=()):
+    return conn.run(conn.query().execute(sql, params).fetchall())
+
+
+def _documents(rows):
+    return (rapidjson.loads(row[0]) for row in rows)
+
+
+def _document(rows):
+    return next(_documents(rows), None)
+
+
+def _page(key, last_id, limit, order=None):
+    """Return the SQL condition and ordering, and their parameters, that keep
+    the rows with a ``key`` greater than ``last_id``, in the order of
+    ``key``, or of the columns of ``order`` if given, and the first ``limit``
+    of them."""
+    condition, order, params = '', ' ORDER BY {}'.format(order or key), []
+    if last_id is not None:
+        condition = ' AND {} > ?'.format(key)
+        params.append(last_id)
+    if limit:
+        order += ' LIMIT ?'
+        params.append(limit)
+    return condition, order, params
+
+
+def _set(doc):
+    """Return the SQL expression and the parameters that set the fields of
+    ``doc`` in the ``doc`` column, like the MongoDB ``$set`` operator."""
+    params = []
+    for field, value in doc.items():
+        params.extend(['$."{}"'.format(field), rapidjson.dumps(value)])
+    return 'json_set(doc{})'.format(', ?, json(?)' * len(doc)), params
+
+
+@register_query(SQLiteConnection)
+def write_transaction(conn, signed_transaction):
+    try:
+        return _execute(conn, 'INSERT INTO backlog (id, doc) VALUES (?, ?)',
+                        (signed_transaction['id'],
+                         rapidjson.dumps(signed_transaction)))
+    except DuplicateKeyError:
+        return
+
+
+@register_query(SQLiteConnection)
+def write_transactions(conn, signed_transactions):
+    return conn.run(
+        conn.query()
+        .executemany('INSERT OR IGNORE INTO backlog (id, doc) VALUES (?, ?)',
+                     [(transaction['id'], rapidjson.dumps(transaction))
+                      for transaction in signed_transactions]))
+
+
+@register_query(SQLiteConnection)
+def update_transaction(conn, transaction_id, doc):
+    expression, params = _set(doc)
+    return _execute(conn, 'UPDATE backlog SET doc = {} WHERE id = ?'
+                          .format(expression),
+                    params + [transaction_id])
+
+
+@register_query(SQLiteConnection)
+def update_transactions(conn, transaction_ids, doc):
+    expression, params = _set(doc)
+    return _execute(conn, 'UPDATE backlog SET doc = {} '
+                          'WHERE id IN (SELECT value FROM json_each(?))'
+                          .format(expression),
+                    params + [rapidjson.dumps(list(transaction_ids))])
+
+
+@register_query(SQLiteConnection)
+def delete_transaction(conn, *transaction_id):
+    return _execute(conn, 'DELETE FROM backlog '
+                          'WHERE id IN (SELECT value FROM json_each(?))',
+                    (rapidjson.dumps(transaction_id),))
+
+
+@register_query(SQLiteConnection)
+def get_stale_transactions(conn, reassign_delay):
+    return _documents(_execute(
+        conn, "SELECT doc FROM backlog "
+              "WHERE json_extract(doc, '$.assignment_timestamp') < ?",
+        (time() - reassign_delay,)))
+
+
+@register_query(SQLiteConnection)
+def get_oldest_assignment_timestamp(conn):
+    return _execute(
+        conn, "SELECT min(json_extract(doc, '$.assignment_timestamp')) "
+              "FROM backlog")[0][0]
+
+
+@register_query(SQLiteConnection)
+def get_transaction_from_block(conn, transaction_id, block_id):
+    return _document(_execute(
+        conn, 'SELECT {} FROM transactions AS t '
+              'JOIN bigchain AS b ON b.id = t.block_id '
+              'WHERE t.txid = ? AND t.block_id = ?'.format(_TRANSACTION),
+        (transaction_id, block_id)))
+
+
+@register_query(SQLiteConnection)
+def get_transaction_from_backlog(conn, transaction_id):
+    return _document(_execute(
+        conn, "SELECT json_remove(doc, '$.assignee', "
+              "'$.assignment_timestamp') FROM backlog WHERE id = ?",
+        (transaction_id,)))
+
+
+@register_query(SQLiteConnection)
+def get_blocks_status_from_transaction(conn, transaction_id):
+    rows = _execute(
+        conn, "SELECT b.id, json_extract(b.doc, '$.block.voters') "
+              "FROM transactions AS t JOIN bigchain AS b ON b.id = t.block_id "
+              "WHERE t.txid = ?",
+        (transaction_id,))
+    return ({'id': block_id, 'block': {'voters': rapidjson.loads(voters)}}
+            for block_id, voters in rows)
+
+
+@register_query(SQLiteConnection)
+def get_blocks_of_transactions(conn, transaction_ids):
+    rows = _execute(
+        conn, "SELECT t.txid, b.id, json_extract(b.doc, '$.block.voters') "
+              "FROM transactions AS t JOIN bigchain AS b ON b.id = t.block_id "
+              "WHERE t.txid IN (SELECT value FROM json_each(?))",
+        (rapidjson.dumps(list(transaction_ids)),))
+    return ((transaction_id,
+             {'id': block_id, 'block': {'voters': rapidjson.loads(voters)}})
+            for transaction_id, block_id, voters in rows)
+
+
+@register_query(SQLiteConnection)
+def get_transactions_from_blocks(conn, transaction_ids):
+    rows = _execute(
+        conn, "SELECT b.id, json_extract(b.doc, '$.block.voters'), {} "
+              "FROM transactions AS t JOIN bigchain AS b ON b.id = t.block_id "
+              "WHERE t.txid IN (SELECT value FROM json_each(?))"
+              .format(_TRANSACTION),
+        (rapidjson.dumps(list(transaction_ids)),))
+    return (({'id': block_id, 'block': {'voters': rapidjson.loads(voters)}},
+             rapidjson.loads(transaction))
+            for block_id, voters, transaction in rows)
+
+
+@register_query(SQLiteConnection)
+def get_backlog_transaction_ids(conn, transaction_ids):
+    rows = _execute(conn, 'SELECT id FROM backlog '
+                          'WHERE id IN (SELECT value FROM json_each(?))',
+                    (rapidjson.dumps(list(transaction_ids)),))
+    return (transaction_id for transaction_id, in rows)
+
+
+@register_query(SQLiteConnection)
+def get_txids_filtered(conn, asset_id, operation=None, *, last_id=None,
+                       limit=0):
+    match_create = "(t.operation = 'CREATE' AND t.txid = ?)"
+    match_transfer = "(t.operation = 'TRANSFER' AND t.asset_id = ?)"
+
+    if operation == Transaction.CREATE:
+        match, params = match_create, [asset_id]
+    elif operation == Transaction.TRANSFER:
+        match, params = match_transfer, [asset_id]
+    else:
+        match = '({} OR {})'.format(match_create, match_transfer)
+        params = [asset_id, asset_id]
+
+    condition, order, page_params = _page('t.block_id', last_id, limit,
+                                          't.block_id, t.tx_index')
+    rows = _execute(conn, 'SELECT t.block_id, t.txid FROM transactions AS t '
+                          'WHERE {}{}{}'.format(match, condition, order),
+                    params + page_params)
+    return ((block_id, txid) for block_id, txid in rows)
+
+
+@register_query(SQLiteConnection)
+def get_asset_by_id(conn, asset_id):
+    rows = _execute(
+        conn, "SELECT json_extract({}, '$.asset') FROM transactions AS t "
+              "JOIN bigchain AS b ON b.id = t.block_id "
+              "WHERE t.txid = ? AND t.operation = 'CREATE'"
+              .format(_TRANSACTION),
+        (asset_id,))
+    return ({'asset': asset} for asset in _documents(rows))
+
+
+@register_query(SQLiteConnection)
+def get_spent(conn, transaction_id, output):
+    rows = _execute(
+        conn, 'SELECT DISTINCT {} FROM inputs AS t '
+              'JOIN bigchain AS b ON b.id = t.block_id '
+              'WHERE t.transaction_id = ? AND t.output_index = ?'
+              .format(_TRANSACTION),
+        (transaction_id, output))
+    return _documents(rows)
+
+
+@register_query(SQLiteConnection)
+def get_spending_transactions(conn, inputs):
+    rows = _execute(
+        conn, "SELECT DISTINCT b.id, {} FROM json_each(?) AS link "
+              "JOIN inputs AS t ON t.transaction_id = "
+              "json_extract(link.value, '$.transaction_id') AND "
+              "t.output_index = json_extract(link.value, '$.output_index') "
+              "JOIN bigchain AS b ON b.id = t.block_id "
+              "ORDER BY b.rowid, t.tx_index".format(_TRANSACTION),
+        (rapidjson.dumps(inputs),))
+    return ((block_id, rapidjson.loads(transaction))
+            for block_id, transaction in rows)
+
+
+@register_query(SQLiteConnection)
+def get_owned_ids(conn, owner, *, last_id=None, limit=0):
+    condition, order, params = _page('t.block_id', last_id, limit,
+                                     't.block_id, t.tx_index')
+    rows = _execute(
+        conn, 'SELECT b.id, {} FROM outputs AS t '
+              'JOIN bigchain AS b ON b.id = t.block_id '
+              'JOIN transactions AS x '
+              'ON x.block_id = t.block_id AND x.tx_index = t.tx_index '
+              'WHERE t.public_key = ?{}{}'
+              .format(_TRANSACTION, condition, order),
+        [owner] + params)
+    return ((block_id, rapidjson.loads(transaction))
+            for block_id, transaction in rows)
+
+
+@register_query(SQLiteConnection)
+def get_votes_by_block_id(conn, block_id, *, last_id=None, limit=0):
+    condition, order, params = _page("json_extract(doc, '$.node_pubkey')",
+                                     last_id, limit)
+    return _documents(_execute(
+        conn, "SELECT doc FROM votes "
+              "WHERE json_extract(doc, '$.vote.voting_for_block') = ?{}{}"
+              .format(condition, order),
+        [block_id] + params))
+
+
+@register_query(SQLiteConnection)
+def get_votes_for_blocks(conn, block_ids):
+    return _documents(_execute(
+        conn, "SELECT doc FROM votes "
+              "WHERE json_extract(doc, '$.vote.voting_for_block') IN "
+              "(SELECT value FROM json_each(?))",
+        (rapidjson.dumps(list(block_ids)),)))
+
+
+@register_query(SQLiteConnection)
+def get_votes_for_blocks_by_voter(conn, block_ids, node_pubkey):
+    return _documents(_execute(
+        conn, "SELECT doc FROM votes "
+              "WHERE json_extract(doc, '$.vote.voting_for_block') IN "
+              "(SELECT value FROM json_each(?)) "
+              "AND json_extract(doc, '$.node_pubkey') = ?",
+        (rapidjson.dumps(list(block_ids)), node_pubkey)))
+
+
+@register_query(SQLiteConnection)
+def get_votes_by_block_id_and_voter(conn, block_id, node_pubkey):
+    return _documents(_execute(
+        conn, "SELECT doc FROM votes "
+              "WHERE json_extract(doc, '$.vote.voting_for_block') = ? "
+              "AND json_extract(doc, '$.node_pubkey') = ?",
+        (block_id, node_pubkey)))
+
+
+@register_query(SQLiteConnection)
+def write_block(conn, block_dict):
+    return _execute(conn, 'INSERT INTO bigchain (id, doc) VALUES (?, ?)',
+                    (block_dict['id'], rapidjson.dumps(block_dict)))
+
+
+@register_query(SQLiteConnection)
+def get_block(conn, block_id):
+    return _document(_execute(conn, 'SELECT doc FROM bigchain WHERE id = ?',
+                              (block_id,)))
+
+
+@register_query(SQLiteConnection)
+def write_assets(conn, assets):
+    # The same asset can be written multiple times, e.g. when the same
+    # transaction is written into multiple blocks due to invalid blocks.
+    return conn.run(
+        conn.query()
+        .executemany('INSERT OR IGNORE INTO assets (id, doc) VALUES (?, ?)',
+                     [(asset['id'], rapidjson.dumps(asset))
+                      for asset in assets]))
+
+
+@register_query(SQLiteConnection)
+def get_assets(conn, asset_ids):
+    return _documents(_execute(
+        conn, 'SELECT doc FROM assets '
+              'WHERE id IN (SELECT value FROM json_each(?))',
+        (rapidjson.dumps(list(asset_ids)),)))
+
+
+@register_query(SQLiteConnection)
+def count_blocks(conn):
+    return _execute(conn, 'SELECT count(*) FROM bigchain')[0][0]
+
+
+@register_query(SQLiteConnection)
+def count_backlog(conn):
+    return _execute(conn, 'SELECT count(*) FROM backlog')[0][0]
+
+
+@register_query(SQLiteConnection)
+def write_vote(conn, vote):
+    _execute(conn, 'INSERT INTO votes (doc) VALUES (?)',
+             (rapidjson.dumps(vote),))
+    return vote
+
+
+@register_query(SQLiteConnection)
+def get_genesis_block(conn):
+    return _document(_execute(
+        conn, "SELECT b.doc FROM transactions AS t "
+              "JOIN bigchain AS b ON b.id = t.block_id "
+              "WHERE t.operation = 'GENESIS' AND t.tx_index = 0 LIMIT 1"))
+
+
+@register_query(SQLiteConnection)
+def get_last_voted_block_id(conn, node_pubkey):
+    last_voted = list(_execute(
+        conn, "SELECT json_extract(doc, '$.vote.previous_block'), "
+              "json_extract(doc, '$.vote.voting_for_block') FROM votes "
+              "WHERE json_extract(doc, '$.node_pubkey') = ? "
+              "ORDER BY json_extract(doc, '$.vote.timestamp') DESC",
+        (node_pubkey,)))
+
+    if not last_voted:
+        return get_genesis_block(conn)['id']
+
+    mapping = dict(last_voted)
+
+    last_block_id = list(mapping.values())[0]
+
+    explored = set()
+
+    while True:
+        try:
+            if last_block_id in explored:
+                raise CyclicBlockchainError()
+            explored.add(last_block_id)
+            last_block_id = mapping[last_block_id]
+        except KeyError:
+            break
+
+    return last_block_id
+
+
+@register_query(SQLiteConnection)
+def get_votes_by_previous_block_and_voter(conn, previous_block_id,
+                                          node_pubkey):
+    return _documents(_execute(
+        conn, "SELECT doc FROM votes "
+              "WHERE json_extract(doc, '$.vote.previous_block') = ? "
+              "AND json_extract(doc, '$.node_pubkey') = ?",
+        (previous_block_id, node_pubkey)))
+
+
+@register_query(SQLiteConnection)
+def get_vote_checkpoint(conn, node_pubkey):
+    rows = _execute(conn, 'SELECT block_id FROM vote_checkpoints '
+                          'WHERE node_pubkey = ?', (node_pubkey,))
+    return rows[0][0] if rows else None
+
+
+@register_query(SQLiteConnection)
+def write_vote_checkpoint(conn, node_pubkey, block_id):
+    _execute(conn, 'INSERT OR REPLACE INTO vote_checkpoints '
+                   '(node_pubkey, block_id) VALUES (?, ?)',
+             (node_pubkey, block_id))
+
+
+@register_query(SQLiteConnection)
+def get_blocks_after(conn, block_id, *, limit=0):
+    rows = _execute(conn, 'SELECT rowid FROM bigchain WHERE id = ?',
+                    (block_id,))
+    if not rows:
+        return None
+
+    # the rowids of the blocks are in the order of their insertion
+    return _documents(_execute(
+        conn, 'SELECT doc FROM bigchain WHERE rowid > ? '
+              'ORDER BY rowid LIMIT ?',
+        (rows[0][0], limit or -1)))
+
+
+@register_query(SQLiteConnection)
+def get_new_blocks_feed(conn, start_block_id):
+    position = get_insert_position(conn, 'bigchain', start_block_id)
+    feed = get_changes(conn, 'bigchain', ChangeFeed.INSERT, position=position)
+    return (block for _, block, _ in feed)
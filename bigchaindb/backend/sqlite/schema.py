@@ -0,0 +1,180 @@
+"""Utils to initialize and drop the database."""
+
+import logging
+import os
+
+from bigchaindb import backend
+from bigchaindb.common import exceptions
+from bigchaindb.backend.changefeed import ChangeFeed
+from bigchaindb.backend.utils import module_dispatch_registrar
+from bigchaindb.backend.sqlite.connection import SQLiteConnection
+
+
+logger = logging.getLogger(__name__)
+register_schema = module_dispatch_registrar(backend.schema)
+
+
+CHANGELOG_SIZE = 100000
+"""How many changes the change log keeps."""
+
+
+# The documents are stored as JSON text. The transactions of the blocks are
+# indexed in separate tables, filled by triggers when a block is written.
+TABLES = {
+    'bigchain': 'CREATE TABLE bigchain (id TEXT PRIMARY KEY, doc TEXT NOT NULL)',
+    'backlog': 'CREATE TABLE backlog (id TEXT PRIMARY KEY, doc TEXT NOT NULL)',
+    'votes': 'CREATE TABLE votes (doc TEXT NOT NULL)',
+    'assets': 'CREATE TABLE assets (id TEXT PRIMARY KEY, doc TEXT NOT NULL)',
+    'vote_checkpoints': 'CREATE TABLE vote_checkpoints '
+                        '(node_pubkey TEXT PRIMARY KEY, block_id TEXT NOT NULL)',
+    'transactions': 'CREATE TABLE transactions (block_id TEXT, tx_index INTEGER, '
+                    'txid TEXT, operation TEXT, asset_id TEXT)',
+    'inputs': 'CREATE TABLE inputs (block_id TEXT, tx_index INTEGER, '
+              'transaction_id TEXT, output_index INTEGER)',
+    'outputs': 'CREATE TABLE outputs (block_id TEXT, tx_index INTEGER, '
+               'public_key TEXT)',
+    'changes': 'CREATE TABLE changes (position INTEGER PRIMARY KEY AUTOINCREMENT, '
+               'table_name TEXT, operation INTEGER, doc TEXT)',
+    'changefeed': 'CREATE TABLE changefeed '
+                  '(name TEXT PRIMARY KEY, position INTEGER)',
+}
+
+_BLOCK_TRANSACTIONS = "json_each(NEW.doc, '$.block.transactions') AS t"
+
+TRIGGERS = [
+    """CREATE TRIGGER index_block AFTER INSERT ON bigchain BEGIN
+        INSERT INTO transactions
+        SELECT NEW.id, t.key, json_extract(t.value, '$.id'),
+               json_extract(t.value, '$.operation'),
+               json_extract(t.value, '$.asset.id')
+        FROM {transactions};
+
+        INSERT INTO inputs
+        SELECT NEW.id, t.key,
+               json_extract(i.value, '$.fulfills.transaction_id'),
+               json_extract(i.value, '$.fulfills.output_index')
+        FROM {transactions}, json_each(t.value, '$.inputs') AS i
+        WHERE json_type(i.value, '$.fulfills') = 'object';
+
+        INSERT INTO outputs
+        SELECT DISTINCT NEW.id, t.key, k.value
+        FROM {transactions}, json_each(t.value, '$.outputs') AS o,
+             json_each(o.value, '$.public_keys') AS k;
+    END""".format(transactions=_BLOCK_TRANSACTIONS),
+]
+
+# the tables with a changefeed log their changes
+for table, operation, row in [('bigchain', 'INSERT', 'NEW'),
+                              ('backlog', 'INSERT', 'NEW'),
+                              ('backlog', 'UPDATE', 'NEW'),
+                              ('backlog', 'DELETE', 'OLD'),
+                              ('votes', 'INSERT', 'NEW')]:
+    TRIGGERS.append(
+        """CREATE TRIGGER log_{table}_{name} AFTER {operation} ON {table}
+        BEGIN
+            INSERT INTO changes (table_name, operation, doc)
+            VALUES ('{table}', {code}, {row}.doc);
+        END""".format(table=table, name=operation.lower(), operation=operation,
+                      row=row, code=getattr(ChangeFeed, operation)))
+
+# keep the change log bounded, deleting the oldest changes every thousand
+# changes
+TRIM_CHANGES = """CREATE TRIGGER trim_changes AFTER INSERT ON changes
+WHEN NEW.position % 1000 = 0 BEGIN
+    DELETE FROM changes WHERE position <= NEW.position - {};
+END"""
+
+INDEXES = {
+    'bigchain': [
+        # to query the bigchain for a transaction id
+        'CREATE INDEX transaction_id ON transactions (txid)',
+        # secondary index for asset uuid, in the order of the blocks
+        'CREATE INDEX asset_id ON transactions (asset_id, block_id, tx_index)',
+        # to find a transaction of a block
+        'CREATE INDEX block_transaction ON transactions (block_id, tx_index)',
+        # to find the genesis block
+        'CREATE INDEX operation ON transactions (operation)',
+        # secondary index on the inputs of a transaction
+        'CREATE INDEX input_link ON inputs (transaction_id, output_index)',
+        # secondary index on the public keys of the outputs, in the order of
+        # the blocks
+        'CREATE INDEX output_public_key ON outputs '
+        '(public_key, block_id, tx_index)',
+    ],
+    'backlog': [
+        "CREATE INDEX assignment_timestamp ON backlog "
+        "(json_extract(doc, '$.assignment_timestamp'))",
+    ],
+    'votes': [
+        # to query the votes by block id and node, and by block id
+        "CREATE UNIQUE INDEX block_and_voter ON votes "
+        "(json_extract(doc, '$.vote.voting_for_block'), "
+        "json_extract(doc, '$.node_pubkey'))",
+        # to follow the chain of votes of a node
+        "CREATE INDEX previous_block_and_voter ON votes "
+        "(json_extract(doc, '$.vote.previous_block'), "
+        "json_extract(doc, '$.node_pubkey'))",
+        "CREATE INDEX voter ON votes (json_extract(doc, '$.node_pubkey'))",
+    ],
+    'changes': [
+        'CREATE INDEX table_position ON changes (table_name, position)',
+    ],
+}
+
+
+def _run(conn, dbname, statements):
+    if not os.path.exists(conn.filename(dbname)):
+        raise exceptions.DatabaseDoesNotExist(
+            'Database `{}` does not exist'.format(dbname))
+
+    db = conn.open(dbname)
+    try:
+        with db:
+            for statement in statements:
+                db.execute(statement)
+    finally:
+        db.close()
+
+
+@register_schema(SQLiteConnection)
+def create_database(conn, dbname):
+    if os.path.exists(conn.filename(dbname)):
+        raise exceptions.DatabaseAlreadyExists(
+            'Database `{}` already exists'.format(dbname))
+
+    logger.info('Create database `%s`.', dbname)
+    db = conn.open(dbname, create=True)
+    db.execute('PRAGMA journal_mode = WAL')
+    db.close()
+
+
+@register_schema(SQLiteConnection)
+def create_tables(conn, dbname):
+    for table_name in TABLES:
+        logger.info('Create `%s` table.', table_name)
+    _run(conn, dbname, list(TABLES.values()) + TRIGGERS +
+         [TRIM_CHANGES.format(CHANGELOG_SIZE)])
+
+
+@register_schema(SQLiteConnection)
+def create_indexes(conn, dbname):
+    for table_name in INDEXES:
+        logger.info('Create `%s` secondary index.', table_name)
+    _run(conn, dbname, [index for indexes in INDEXES.values()
+                        for index in indexes])
+
+
+@register_schema(SQLiteConnection)
+def drop_database(conn, dbname):
+    filename = conn.filename(dbname)
+    if not os.path.exists(filename):
+        raise exceptions.DatabaseDoesNotExist(
+            'Database `{}` does not exist'.format(dbname))
+
+    if dbname == conn.dbname:
+        conn.close()
+    for suffix in ('', '-wal', '-shm'):
+        try:
+            os.remove(filename + suffix)
+        except FileNotFoundError:
+            pass
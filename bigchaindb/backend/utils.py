@@ -18,3 +18,37 @@ def module_dispatch_registrar(module):
                          func=func_name, module=module.__name__)) from ex
         return wrapper
     return dispatch_wrapper
+
+
+def paginate(query, key, *, last_id=None, size=1000):
+    """Read all the results of a query a page at a time.
+
+    Args:
+        query: a function returning the results with a key greater than
+            its ``last_id`` argument, the first ``limit`` of them in the order
+            of their keys, e.g. a partial of
+            :func:`~bigchaindb.backend.query.get_txids_filtered`.
+        key: a function returning the key of a result.
+        last_id (optional): only read the results with a key greater than
+            ``last_id``.
+        size (int): the number of results of a page.
+
+    Yields:
+        list: the pages of results. The results with the same key are always
+        in the same page.
+    """
+    while True:
+        page = list(query(last_id=last_id, limit=size))
+        if len(page) < size:
+            if page:
+                yield page
+            return
+
+        # the next page starts after the key of the last result, so the
+        # results sharing that key are all left for the next page
+        last_key = key(page[-1])
+        complete = [result for result in page if key(result) != last_key]
+        if complete:
+            page = complete
+        yield page
+        last_id = key(page[-1])
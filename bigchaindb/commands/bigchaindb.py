@@ -8,6 +8,8 @@ import argparse
 import copy
 import json
 import sys
+import time
+from urllib.request import urlopen
 
 from bigchaindb.common import crypto
 from bigchaindb.common.exceptions import (StartupError,
@@ -15,7 +17,7 @@ from bigchaindb.common.exceptions import (StartupError,
                                           KeypairNotFoundException,
                                           DatabaseDoesNotExist)
 import bigchaindb
-from bigchaindb import backend, processes
+from bigchaindb import backend, metrics, processes, profiling, tracing
 from bigchaindb.backend import schema
 from bigchaindb.backend.admin import (set_replicas, set_shards, add_replicas,
                                       remove_replicas)
@@ -49,6 +51,8 @@ def run_show_config(args):
     del config['CONFIGURED']
     private_key = config['keypair']['private']
     config['keypair']['private'] = 'x' * 45 if private_key else None
+    if config['profiling']['request_token']:
+        config['profiling']['request_token'] = 'x' * 8
     print(json.dumps(config, indent=4, sort_keys=True))
 
 
@@ -251,6 +255,72 @@ def run_remove_replicas(args):
         print('Removed {} from the replicaset.'.format(args.replicas))
 
 
+@configure_bigchaindb
+def run_pipelines(args):
+    """Show the instrumentation of the pipelines of the running node"""
+    url = args.url or 'http://{}/metrics'.format(bigchaindb.config['server']['bind'])
+    previous, fetched_at = None, None
+    try:
+        while True:
+            try:
+                text = urlopen(url, timeout=5).read().decode()
+            except OSError as exc:
+                sys.exit('Cannot get the metrics of the node from {}: {}'.format(url, exc))
+            now = time.monotonic()
+            stages = utils.pipeline_stages(metrics.parse(text))
+            table = utils.format_pipeline_stages(
+                stages, previous, fetched_at and now - fetched_at)
+
+            if args.once:
+                print(table)
+                return
+            # redraw the table in place
+            print('\x1b[H\x1b[2J' + table, flush=True)
+            previous, fetched_at = stages, now
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+@configure_bigchaindb
+def run_traces(args):
+    """Report the latencies of the phases of the traced transactions"""
+    paths = args.files or [bigchaindb.config['tracing']['file']]
+    try:
+        traces = tracing.read(*paths)
+    except OSError as exc:
+        sys.exit('Cannot read the traces: {}'.format(exc))
+    if not traces:
+        sys.exit('No traces in {}'.format(', '.join(paths)))
+    print(utils.format_trace_report(tracing.report(traces)))
+
+
+@configure_bigchaindb
+def run_profile(args):
+    """Profile the processes of the running node"""
+    def selected(name):
+        return not args.processes or any(name == process or name.startswith(process + '.')
+                                         for process in args.processes)
+
+    profiled = []
+    for pid, name in sorted(profiling.processes().items()):
+        if not selected(name):
+            continue
+        try:
+            profiling.request(pid, args.seconds)
+        except ProcessLookupError:
+            continue
+        profiled.append((pid, name))
+
+    if not profiled:
+        sys.exit('No process of the node to profile in {}'.format(profiling.directory()))
+    for pid, name in profiled:
+        print(pid, name)
+    seconds = args.seconds or bigchaindb.config['profiling']['seconds']
+    print('The profiles will be written to {} in {} seconds'.format(
+        profiling.directory(), seconds), file=sys.stderr)
+
+
 def create_parser():
     parser = argparse.ArgumentParser(
         description='Control your BigchainDB node.',
@@ -268,9 +338,9 @@ def create_parser():
                                           help='Prepare the config file '
                                                'and create the node keypair')
     config_parser.add_argument('backend',
-                               choices=['rethinkdb', 'mongodb'],
+                               choices=['rethinkdb', 'mongodb', 'memory', 'sqlite'],
                                help='The backend to use. It can be either '
-                                    'rethinkdb or mongodb.')
+                                    'rethinkdb, mongodb, memory or sqlite.')
 
     # parsers for showing/exporting config values
     subparsers.add_parser('show-config',
@@ -341,6 +411,48 @@ def create_parser():
                                     help='A list of space separated hosts to '
                                          'remove from the replicaset. Each host '
                                          'should be in the form `host:port`.')
+    # parser for the instrumentation of the pipelines
+    pipelines_parser = subparsers.add_parser('pipelines',
+                                             help='Inspect the pipelines of the running node')
+    pipelines_subparsers = pipelines_parser.add_subparsers(title='Commands',
+                                                           dest='pipelines_command')
+    pipelines_subparsers.required = True
+    status_parser = pipelines_subparsers.add_parser(
+        'status',
+        help='Show a live table of the items, the busy and waiting time, '
+             'the input queue and the latency of each stage')
+    status_parser.add_argument('--url',
+                               help='The URL of the metrics of the node '
+                                    '(default: the /metrics endpoint of server.bind)')
+    status_parser.add_argument('--interval', type=float, default=2,
+                               help='The seconds between two refreshes of the table')
+    status_parser.add_argument('--once', action='store_true',
+                               help='Print the table once, with the mean latencies '
+                                    'since the node started')
+
+    # parser for the tracing of the transactions
+    traces_parser = subparsers.add_parser('traces',
+                                          help='Inspect the traces of the transactions')
+    traces_subparsers = traces_parser.add_subparsers(title='Commands',
+                                                     dest='traces_command')
+    traces_subparsers.required = True
+    report_parser = traces_subparsers.add_parser(
+        'report',
+        help='Show the percentiles of the latency of each phase of the traces')
+    report_parser.add_argument('files', nargs='*',
+                               help='The trace files, e.g. of the nodes of a federation '
+                                    '(default: tracing.file)')
+
+    # parser for the profiler of the processes
+    profile_parser = subparsers.add_parser('profile',
+                                           help='Profile the processes of the running node')
+    profile_parser.add_argument('processes', nargs='*',
+                                help='The processes to profile, e.g. webapi, block or '
+                                     'vote.validate_tx (default: all of them)')
+    profile_parser.add_argument('--seconds', type=float,
+                                help='The seconds to profile the processes '
+                                     '(default: profiling.seconds)')
+
     return parser
 
 
@@ -14,7 +14,7 @@ from pymongo import uri_parser
 
 import bigchaindb
 import bigchaindb.config_utils
-from bigchaindb import backend
+from bigchaindb import backend, tracing
 from bigchaindb.common.exceptions import StartupError
 from bigchaindb.log.setup import setup_logging
 from bigchaindb.version import __version__
@@ -232,6 +232,105 @@ def mongodb_host(host):
     return host
 
 
+def pipeline_stages(samples):
+    """Return the instrumentation of the stages of the pipelines of a node.
+
+    Args:
+        samples (list): the samples of the metrics of the node, see
+            :func:`bigchaindb.metrics.parse`.
+
+    Returns:
+        dict: the items in and out, the busy and waiting seconds, the calls
+        and the queue depth of each stage, by pipeline and stage name.
+    """
+    fields = {
+        'bigchaindb_pipeline_stage_duration_seconds_sum': 'busy',
+        'bigchaindb_pipeline_stage_duration_seconds_count': 'calls',
+        'bigchaindb_pipeline_stage_wait_seconds_total': 'wait',
+        'bigchaindb_pipeline_stage_queue_depth': 'queue',
+    }
+    stages = {}
+    for name, labels, value in samples:
+        if name == 'bigchaindb_pipeline_stage_items_total':
+            field = labels['direction']
+        elif name in fields:
+            field = fields[name]
+        else:
+            continue
+        stage = stages.setdefault(
+            (labels['pipeline'], labels['stage']),
+            {'in': 0, 'out': 0, 'busy': 0, 'calls': 0, 'wait': 0, 'queue': None})
+        stage[field] = value
+    return stages
+
+
+PIPELINE_STAGES_HEADER = ('PIPELINE', 'STAGE', 'IN', 'OUT', 'IN/S', 'QUEUE',
+                          'BUSY', 'WAIT', 'LATENCY')
+
+
+def format_pipeline_stages(stages, previous=None, elapsed=None):
+    """Return the table of the instrumentation of the stages of the
+    pipelines.
+
+    The rates, the busy and waiting processes (the seconds spent by the
+    processes of a stage per second) and the mean latency of the calls are
+    the ones since the ``previous`` instrumentation, if given, ``elapsed``
+    seconds before. Without it, the mean latency is the one since the node
+    started.
+
+    Args:
+        stages (dict): see :func:`pipeline_stages`.
+        previous (dict): the instrumentation of the stages ``elapsed``
+            seconds before.
+        elapsed (float): the seconds since the previous instrumentation.
+    """
+    rows = [PIPELINE_STAGES_HEADER]
+    for (pipeline, name), stage in sorted(stages.items()):
+        last = (previous or {}).get((pipeline, name))
+        if last and elapsed:
+            def per_second(field):
+                return (stage[field] - last[field]) / elapsed
+            calls = stage['calls'] - last['calls']
+            busy = stage['busy'] - last['busy']
+            in_rate = '{:.1f}'.format(per_second('in'))
+            busy_rate = '{:.2f}'.format(per_second('busy'))
+            wait_rate = '{:.2f}'.format(per_second('wait'))
+        else:
+            calls, busy = stage['calls'], stage['busy']
+            in_rate = busy_rate = wait_rate = '-'
+        queue = '-' if stage['queue'] is None else '{:.0f}'.format(stage['queue'])
+        latency = '{:.1f}ms'.format(busy / calls * 1000) if calls else '-'
+        rows.append((pipeline, name, '{:.0f}'.format(stage['in']),
+                     '{:.0f}'.format(stage['out']), in_rate, queue,
+                     busy_rate, wait_rate, latency))
+
+    widths = [max(len(row[column]) for row in rows)
+              for column in range(len(PIPELINE_STAGES_HEADER))]
+    return '\n'.join('  '.join(cell.ljust(width) if column < 2 else cell.rjust(width)
+                               for column, (cell, width) in enumerate(zip(row, widths)))
+                     for row in rows)
+
+
+def format_trace_report(rows):
+    """Return the table of the latencies of the phases of the traces.
+
+    Args:
+        rows (list): see :func:`bigchaindb.tracing.report`.
+    """
+    header = ('PHASE', 'TRACES',
+              *('P{}'.format(percent) for percent in tracing.PERCENTILES), 'MAX')
+    table = [header]
+    for phase, count, *latencies in rows:
+        table.append((phase, str(count),
+                      *('{:.1f}ms'.format(latency * 1000) for latency in latencies)))
+
+    widths = [max(len(row[column]) for row in table)
+              for column in range(len(header))]
+    return '\n'.join('  '.join(cell.ljust(width) if column == 0 else cell.rjust(width)
+                               for column, (cell, width) in enumerate(zip(row, widths)))
+                     for row in table)
+
+
 base_parser = argparse.ArgumentParser(add_help=False, prog='bigchaindb')
 
 base_parser.add_argument('-c', '--config',
@@ -1,5 +1,6 @@
 import random
-import statsd
+from collections import defaultdict
+from itertools import islice
 from time import time
 
 from bigchaindb import exceptions as core_exceptions
@@ -8,7 +9,8 @@ from bigchaindb.common.utils import gen_timestamp, serialize
 
 import bigchaindb
 
-from bigchaindb import backend, config_utils, fastquery
+from bigchaindb import backend, config_utils, fastquery, tracing
+from bigchaindb.metrics import statsd_client
 from bigchaindb.consensus import BaseConsensusRules
 from bigchaindb.models import Block, Transaction
 
@@ -31,6 +33,9 @@ class Bigchain(object):
     TX_IN_BACKLOG = 'backlog'
     """return if transaction is in backlog"""
 
+    OUTPUTS_BATCH_SIZE = 1000
+    """the number of transactions whose outputs are filtered at once"""
+
     def __init__(self, public_key=None, private_key=None, keyring=[], connection=None, backlog_reassign_delay=None):
         """Initialize the Bigchain instance
 
@@ -72,7 +77,7 @@ class Bigchain(object):
         if not self.me or not self.me_private:
             raise exceptions.KeypairNotFoundException()
 
-        self.statsd = statsd.StatsClient(bigchaindb.config['graphite']['host'])
+        self.statsd = statsd_client(bigchaindb.config['graphite']['host'])
 
     federation = property(lambda self: set(self.nodes_except_me + [self.me]))
     """ Set of federation member public keys """
@@ -89,8 +94,33 @@ class Bigchain(object):
         Returns:
             dict: database response
         """
-        signed_transaction = signed_transaction.to_dict()
+        signed_transaction = self._assign(signed_transaction.to_dict())
+
+        # write to the backlog
+        response = backend.query.write_transaction(self.connection, signed_transaction)
+        tracing.stamp('backlog', signed_transaction['id'])
+        return response
+
+    def write_transactions(self, signed_transactions):
+        """Write many transactions to the backlog with one bulk insert.
+
+        Args:
+            signed_transactions (list of Transaction): transactions with the
+                `signature` included.
+
+        Returns:
+            dict: database response
+        """
+        signed_transactions = [self._assign(transaction.to_dict())
+                               for transaction in signed_transactions]
+        if not signed_transactions:
+            return
+
+        response = backend.query.write_transactions(self.connection, signed_transactions)
+        tracing.stamp('backlog', *(transaction['id'] for transaction in signed_transactions))
+        return response
 
+    def _assign(self, signed_transaction):
         # we will assign this transaction to `one` node. This way we make sure that there are no duplicate
         # transactions on the bigchain
         if self.nodes_except_me:
@@ -101,9 +131,7 @@ class Bigchain(object):
 
         signed_transaction.update({'assignee': assignee})
         signed_transaction.update({'assignment_timestamp': time()})
-
-        # write to the backlog
-        return backend.query.write_transaction(self.connection, signed_transaction)
+        return signed_transaction
 
     def reassign_transaction(self, transaction):
         """Assign a transaction to a new node
@@ -115,15 +143,41 @@ class Bigchain(object):
             dict: database response or None if no reassignment is possible
         """
 
-        other_nodes = tuple(
-            self.federation.difference([transaction['assignee']])
-        )
-        new_assignee = random.choice(other_nodes) if other_nodes else self.me
+        new_assignee = self._choose_new_assignee(transaction['assignee'])
 
         return backend.query.update_transaction(
                 self.connection, transaction['id'],
                 {'assignee': new_assignee, 'assignment_timestamp': time()})
 
+    def reassign_transactions(self, transactions):
+        """Assign many transactions to new nodes.
+
+        The backlog is updated with one bulk operation per new assignee
+        instead of one round trip per transaction.
+
+        Args:
+            transactions (list of dict): assigned transactions
+
+        Returns:
+            list: the database responses, one per new assignee.
+        """
+
+        assignments = defaultdict(list)
+        for transaction in transactions:
+            new_assignee = self._choose_new_assignee(transaction['assignee'])
+            assignments[new_assignee].append(transaction['id'])
+
+        assignment_timestamp = time()
+        return [backend.query.update_transactions(
+                    self.connection, transaction_ids,
+                    {'assignee': new_assignee,
+                     'assignment_timestamp': assignment_timestamp})
+                for new_assignee, transaction_ids in assignments.items()]
+
+    def _choose_new_assignee(self, assignee):
+        other_nodes = tuple(self.federation.difference([assignee]))
+        return random.choice(other_nodes) if other_nodes else self.me
+
     def delete_transaction(self, *transaction_id):
         """Delete a transaction from the backlog.
 
@@ -158,6 +212,38 @@ class Bigchain(object):
 
         return self.consensus.validate_transaction(self, transaction)
 
+    def validate_transactions(self, transactions):
+        """Validate a batch of transactions.
+
+        The transactions spent by the batch are read once for the whole
+        batch, and a transaction spending an output that an earlier
+        transaction of the batch spends is a double spend. A transaction
+        already in the batch is a duplicate.
+
+        Args:
+            transactions (list of Transaction): transactions to validate.
+
+        Returns:
+            list: for each transaction, the transaction if it is valid,
+            else the :exc:`~.ValidationError` describing why it is invalid.
+        """
+        batch = _Batch(self, transactions)
+        results = []
+        valid = set()
+        for transaction in transactions:
+            try:
+                if transaction.id in valid:
+                    raise exceptions.DuplicateTransaction(
+                        'transaction `{}` is twice in the batch'.format(transaction.id))
+                self.consensus.validate_transaction(batch, transaction)
+            except exceptions.ValidationError as e:
+                results.append(e)
+            else:
+                batch.spend(transaction)
+                valid.add(transaction.id)
+                results.append(transaction)
+        return results
+
     def is_new_transaction(self, txid, exclude_block_id=None):
         """
         Return True if the transaction does not exist in any
@@ -290,6 +376,42 @@ class Bigchain(object):
         _, status = self.get_transaction(txid, include_status=True)
         return status
 
+    def get_statuses(self, txids):
+        """Retrieve the statuses of many transactions at once.
+
+        The blocks containing the transactions, the votes on those blocks,
+        and the backlog are each read with one query, and the statuses of
+        the blocks are decided by their elections, as for :meth:`get_status`.
+
+        Args:
+            txids (list): the ids of the transactions to query
+
+        Returns:
+            dict: the status of each transaction by id, as returned by
+            :meth:`get_status`.
+        """
+        statuses = dict.fromkeys(txids)
+        if not statuses:
+            return statuses
+
+        blocks = list(backend.query.get_blocks_of_transactions(
+            self.connection, list(statuses)))
+        blocks_status = self.get_blocks_status(block for _, block in blocks)
+        for txid, block in blocks:
+            status = blocks_status[block['id']]
+            if status == self.BLOCK_VALID:
+                statuses[txid] = self.TX_VALID
+            elif status == self.BLOCK_UNDECIDED and statuses[txid] is None:
+                statuses[txid] = self.TX_UNDECIDED
+
+        # in invalid blocks only, or in none
+        unknown = [txid for txid, status in statuses.items() if status is None]
+        if unknown:
+            for txid in backend.query.get_backlog_transaction_ids(
+                    self.connection, unknown):
+                statuses[txid] = self.TX_IN_BACKLOG
+        return statuses
+
     def get_blocks_status_containing_tx(self, txid):
         """Retrieve block ids and statuses related to a transaction
 
@@ -436,16 +558,72 @@ class Bigchain(object):
         elif spent is False:
             return self.fastquery.filter_spent_outputs(outputs)
 
-    def get_transactions_filtered(self, asset_id, operation=None):
+    def iter_outputs_filtered(self, owner, spent=None, *, last_id=None):
+        """
+        Yield the output links filtered on some criteria, in the order of
+        the blocks of their transactions
+
+        The transactions are read from a single query, and their outputs
+        are filtered a batch at a time, so the outputs of an owner of many
+        transactions can be streamed.
+
+        Args:
+            owner (str): base58 encoded public_key.
+            spent (bool): see :meth:`get_outputs_filtered`.
+            last_id (str): only yield the outputs of the transactions of the
+                blocks with an id greater than ``last_id``.
+
+        Yields:
+            tuple: the id of the block of the transaction, and the
+            TransactionLink pointing to the output
+        """
+        items = iter(backend.query.get_owned_ids(self.connection, owner,
+                                                 last_id=last_id))
+        while True:
+            batch = list(islice(items, self.OUTPUTS_BATCH_SIZE))
+            if not batch:
+                return
+            outputs = self.fastquery.get_block_outputs_of_transactions(
+                batch, owner)
+            if not outputs:
+                continue
+            links = [link for _, link in outputs]
+            if spent is True:
+                links = set(self.fastquery.filter_unspent_outputs(links))
+                outputs = [output for output in outputs if output[1] in links]
+            elif spent is False:
+                links = set(self.fastquery.filter_spent_outputs(links))
+                outputs = [output for output in outputs if output[1] in links]
+            yield from outputs
+
+    def get_transactions_filtered(self, asset_id, operation=None, *,
+                                  last_id=None):
         """
         Get a list of transactions filtered on some criteria
+
+        The transactions are yielded in the order of their blocks, and their
+        ids are read from a single query.
+
+        Args:
+            asset_id (str): the id of the asset of the transactions.
+            operation (str): the operation of the transactions.
+            last_id (str): only yield the transactions of the blocks with an
+                id greater than ``last_id``.
+
+        Yields:
+            tuple: the id of the block of the transaction, and the
+            transaction
         """
-        txids = backend.query.get_txids_filtered(self.connection, asset_id,
-                                                 operation)
-        for txid in txids:
-            tx, status = self.get_transaction(txid, True)
-            if status == self.TX_VALID:
-                yield tx
+        txids = backend.query.get_txids_filtered(
+            self.connection, asset_id, operation, last_id=last_id)
+        for block_id, txid in txids:
+            # a transaction is in more than one block if the first one was
+            # voted invalid, it is only yielded from its valid block
+            statuses = self.get_blocks_status_containing_tx(txid)
+            if statuses.get(block_id) == self.BLOCK_VALID:
+                tx = backend.query.get_transaction_from_block(
+                    self.connection, txid, block_id)
+                yield block_id, Transaction.from_db(self, tx)
 
     def create_block(self, validated_transactions):
         """Creates a block given a list of `validated_transactions`.
@@ -586,16 +764,53 @@ class Bigchain(object):
         return vote_signed
 
     def write_vote(self, vote):
-        """Write the vote to the database."""
-        return backend.query.write_vote(self.connection, vote)
+        """Write the vote to the database, and move the vote checkpoint of
+        the voter to the voted block."""
+        response = backend.query.write_vote(self.connection, vote)
+        backend.query.write_vote_checkpoint(self.connection,
+                                            vote['node_pubkey'],
+                                            vote['vote']['voting_for_block'])
+        return response
 
     def get_last_voted_block(self):
         """Returns the last block that this node voted on."""
 
-        last_block_id = backend.query.get_last_voted_block_id(self.connection,
-                                                              self.me)
+        last_block_id = self.get_last_voted_block_id()
         return Block.from_dict(self.get_block(last_block_id))
 
+    def get_last_voted_block_id(self):
+        """Returns the id of the last block that this node voted on.
+
+        The id is read from the vote checkpoint of the node. Since the
+        checkpoint is written after the vote, it can be behind if the node
+        stopped in between: the votes following it are looked up to catch
+        up. If there is no checkpoint the whole chain of votes is walked to
+        recover it.
+        """
+
+        checkpoint = backend.query.get_vote_checkpoint(self.connection,
+                                                       self.me)
+        if checkpoint is None:
+            last_block_id = backend.query.get_last_voted_block_id(
+                self.connection, self.me)
+        else:
+            last_block_id = checkpoint
+            explored = {last_block_id}
+            while True:
+                votes = list(backend.query.get_votes_by_previous_block_and_voter(
+                    self.connection, last_block_id, self.me))
+                if not votes:
+                    break
+                last_block_id = votes[0]['vote']['voting_for_block']
+                if last_block_id in explored:
+                    raise exceptions.CyclicBlockchainError()
+                explored.add(last_block_id)
+
+        if last_block_id != checkpoint:
+            backend.query.write_vote_checkpoint(self.connection, self.me,
+                                                last_block_id)
+        return last_block_id
+
     def block_election(self, block):
         if type(block) != dict:
             block = block.to_dict()
@@ -609,6 +824,27 @@ class Bigchain(object):
            valid, invalid, or undecided."""
         return self.block_election(block)['status']
 
+    def get_blocks_status(self, blocks):
+        """Tally the votes on some blocks, read with one query.
+
+        Args:
+            blocks (iterable of dict): the blocks, or their election
+                information (``id`` and ``block.voters``).
+
+        Returns:
+            dict: the status of each block (valid, invalid, or undecided),
+            by block id.
+        """
+        blocks = {block['id']: block for block in blocks}
+        votes = defaultdict(list)
+        if blocks:
+            for vote in backend.query.get_votes_for_blocks(self.connection,
+                                                           list(blocks)):
+                votes[vote['vote']['voting_for_block']].append(vote)
+        return {block_id: self.consensus.voting.block_election(
+                    block, votes[block_id], self.federation)['status']
+                for block_id, block in blocks.items()}
+
     def get_assets(self, asset_ids):
         """
         Return a list of assets that match the asset_ids
@@ -632,18 +868,24 @@ class Bigchain(object):
         """
         return backend.query.write_assets(self.connection, assets)
 
-    def text_search(self, search, *, limit=0):
+    def text_search(self, search, *, limit=0, text_score=False, after=None):
         """
         Return an iterator of assets that match the text search
 
         Args:
             search (str): Text search string to query the text index
             limit (int, optional): Limit the number of returned documents.
+            text_score (bool, optional): If ``True`` returns the text score
+                with each asset.
+            after (tuple, optional): the text score and the id of an asset:
+                only return the assets sorted after it.
 
         Returns:
             iter: An iterator of assets that match the text search.
         """
-        assets = backend.query.text_search(self.connection, search, limit=limit)
+        assets = backend.query.text_search(self.connection, search,
+                                           limit=limit, text_score=text_score,
+                                           after=after)
 
         # TODO: This is not efficient. There may be a more efficient way to
         #       query by storing block ids with the assets and using fastquery.
@@ -652,3 +894,145 @@ class Bigchain(object):
             tx, status = self.get_transaction(asset['id'], True)
             if status == self.TX_VALID:
                 yield asset
+
+
+class _Batch:
+    """What the validation of a batch of transactions reads, see
+    :meth:`Bigchain.validate_transactions`.
+
+    The transactions the batch spends, with their status, and the
+    transactions spending their outputs are read before the validation,
+    with a few bulk queries for the whole batch. The batch also remembers
+    the outputs spent by its transactions validated so far.
+
+    It provides what :meth:`~bigchaindb.models.Transaction.validate` reads
+    from a :class:`Bigchain`.
+    """
+
+    TX_VALID = Bigchain.TX_VALID
+    TX_UNDECIDED = Bigchain.TX_UNDECIDED
+    TX_IN_BACKLOG = Bigchain.TX_IN_BACKLOG
+
+    def __init__(self, bigchain, transactions):
+        """Read what the validation of a batch of transactions reads.
+
+        Args:
+            bigchain (Bigchain): the node.
+            transactions (list of Transaction): the batch.
+        """
+        self.bigchain = bigchain
+        # the transactions spent by the batch, with their status
+        self.transactions = {}
+        # the transaction of the database spending each output, or None
+        self.spends = {}
+        # the transaction of the batch spending each output
+        self.spent = {}
+        self.resolve(transactions)
+
+    def resolve(self, transactions):
+        """Read the transactions spent by a batch, and the transactions
+        spending their outputs."""
+        links = {(input_.fulfills.txid, input_.fulfills.output)
+                 for transaction in transactions
+                 for input_ in transaction.inputs
+                 if input_.fulfills}
+        if not links:
+            return
+
+        spending = list(backend.query.get_spending_transactions(
+            self.bigchain.connection,
+            [{'transaction_id': txid, 'output_index': output}
+             for txid, output in links]))
+        spent_txids = {txid for txid, _ in links}
+        found = self.read(spent_txids | {transaction['id']
+                                         for _, transaction in spending})
+
+        create_txids = [txid for txid in spent_txids
+                        if txid in found and found[txid][0]['operation'] in
+                        (Transaction.CREATE, Transaction.GENESIS)]
+        if create_txids:
+            for asset in self.bigchain.get_assets(create_txids):
+                found[asset.pop('id')][0]['asset'] = asset
+        for txid in spent_txids:
+            if txid in found:
+                transaction, status = found[txid]
+                self.transactions[txid] = (Transaction.from_dict(transaction),
+                                           status)
+
+        spenders = defaultdict(dict)
+        for _, transaction in spending:
+            for input_ in transaction['inputs']:
+                fulfills = input_['fulfills']
+                if fulfills:
+                    link = (fulfills['transaction_id'], fulfills['output_index'])
+                    spenders[link][transaction['id']] = transaction
+        statuses = {txid: status for txid, (_, status) in found.items()}
+        requeued = [transaction['id'] for _, transaction in spending
+                    if transaction['id'] not in found]
+        if requeued:
+            for txid in backend.query.get_backlog_transaction_ids(
+                    self.bigchain.connection, requeued):
+                statuses[txid] = Bigchain.TX_IN_BACKLOG
+        for link in links:
+            # the same checks as Bigchain.get_spent
+            spends = [(transaction, statuses[txid])
+                      for txid, transaction in spenders[link].items()
+                      if txid in statuses]
+            if sum(status == Bigchain.TX_VALID for _, status in spends) > 1:
+                raise core_exceptions.CriticalDoubleSpend(
+                    '`{}` was spent more than once. There is a problem'
+                    ' with the chain'.format(link[0]))
+            self.spends[link] = (Transaction.from_dict(spends[0][0])
+                                 if spends else None)
+
+    def read(self, txids):
+        """Read transactions from the valid and undecided blocks.
+
+        Returns:
+            dict: the transaction (a dict, without the asset of a
+            ``CREATE``), and its status, by id.
+        """
+        rows = list(backend.query.get_transactions_from_blocks(
+            self.bigchain.connection, list(txids)))
+        statuses = self.bigchain.get_blocks_status(block for block, _ in rows)
+        found = {}
+        for block, transaction in rows:
+            status = statuses[block['id']]
+            if status == Bigchain.BLOCK_INVALID:
+                continue
+            txid = transaction['id']
+            if txid in found and found[txid][1] == status == Bigchain.BLOCK_VALID:
+                raise core_exceptions.CriticalDoubleInclusion(
+                    'Transaction {tx} is present in multiple valid blocks'
+                    .format(tx=txid))
+            if txid not in found or status == Bigchain.BLOCK_VALID:
+                found[txid] = (transaction, status)
+        return found
+
+    def get_transaction(self, txid, include_status=False):
+        """See :meth:`Bigchain.get_transaction`."""
+        if txid not in self.transactions:
+            # not in a valid or undecided block: in the backlog, if anywhere
+            self.transactions[txid] = self.bigchain.get_transaction(
+                txid, include_status=True)
+        transaction, status = self.transactions[txid]
+        if include_status:
+            return transaction, status
+        return transaction
+
+    def get_spent(self, txid, output):
+        """See :meth:`Bigchain.get_spent`."""
+        spent = self.spent.get((txid, output))
+        if spent is None:
+            if (txid, output) in self.spends:
+                spent = self.spends[(txid, output)]
+            else:
+                spent = self.bigchain.get_spent(txid, output)
+        return spent
+
+    def spend(self, transaction):
+        """Remember the outputs spent by a valid transaction of the batch."""
+        for input_ in transaction.inputs:
+            if input_.fulfills:
+                self.spent.setdefault(
+                    (input_.fulfills.txid, input_.fulfills.output), transaction)
@@ -1,10 +1,28 @@
+import logging
 from enum import Enum
 from multiprocessing import Queue
+from queue import Full
+
+import rapidjson
+
+
+logger = logging.getLogger(__name__)
+
+EVENTS_QUEUE_SIZE = 1000
+"""The maximum number of events waiting for the WebSocket server."""
+
+PUBLISH_TIMEOUT = 10
+"""The seconds :meth:`EventHandler.publish` waits for room in a full events
+queue before dropping an event."""
 
 
 class EventTypes(Enum):
     BLOCK_VALID = 1
     BLOCK_INVALID = 2
+    # the ids of the blocks of the events dropped while the queue was full
+    EVENTS_DROPPED = 3
+    # a transaction of the backlog was invalid, and deleted
+    TRANSACTION_INVALID = 4
 
 
 class Event:
@@ -13,21 +31,103 @@ class Event:
         self.type = event_type
         self.data = event_data
 
+    def serialize(self):
+        """Return the event as bytes, to be sent to another process.
+
+        Sending the bytes spares the queue from pickling the data.
+        """
+        return rapidjson.dumps({'type': self.type.value,
+                                'data': self.data}).encode()
+
+    @classmethod
+    def deserialize(cls, serialized):
+        """Return the event of the bytes of :meth:`serialize`."""
+        event = rapidjson.loads(serialized.decode())
+        return cls(EventTypes(event['type']), event['data'])
+
+
+def block_summary(block):
+    """Return the data of a block event: what the subscribers to the
+    transactions of the block need to know, and nothing else.
+
+    Args:
+        block (dict): the block.
+
+    Returns:
+        dict: the ``id`` of the block, and the ``transactions`` with their
+        ``id``, ``asset_id``, ``operation`` and the ``public_keys`` of their
+        outputs.
+    """
+    return {
+        'id': block['id'],
+        'transactions': [{
+            'id': tx['id'],
+            'asset_id': tx['id'] if tx['operation'] == 'CREATE' else tx['asset']['id'],
+            'operation': tx['operation'],
+            'public_keys': sorted({public_key
+                                   for output in tx['outputs']
+                                   for public_key in output['public_keys']}),
+        } for tx in block['block']['transactions']],
+    }
+
 
 class EventHandler:
 
     def __init__(self, events_queue):
         self.events_queue = events_queue
+        # the ids of the blocks of the events dropped since the queue was
+        # last found full
+        self.dropped = []
 
     def put_event(self, event, timeout=None):
-        # TODO: handle timeouts
-        self.events_queue.put(event, timeout=None)
+        """Put an event in the queue.
+
+        Raises:
+            queue.Full: If the queue is still full after ``timeout``
+                seconds.
+        """
+        self.events_queue.put(event.serialize(), timeout=timeout)
+
+    def publish(self, event, timeout=None):
+        """Put an event in the queue, waiting for the WebSocket server if
+        the queue is full.
+
+        An event still finding the queue full after ``timeout`` seconds is
+        dropped, and so are the next ones, at once, until there is room in
+        the queue again: an :attr:`EventTypes.EVENTS_DROPPED` event then
+        gives the ids of the blocks of the dropped events, for the WebSocket
+        server to read them from the database. The dropped events of the
+        invalid transactions are lost.
+
+        Args:
+            event (:class:`Event`): the event of a block, see
+                :func:`block_summary`, or of an invalid transaction.
+            timeout (float): the seconds to wait for room in the queue
+                (default: :data:`PUBLISH_TIMEOUT`).
+        """
+        if timeout is None:
+            timeout = PUBLISH_TIMEOUT
+        try:
+            if self.dropped:
+                self.put_event(Event(EventTypes.EVENTS_DROPPED,
+                                     {'blocks': self.dropped}), timeout=0)
+                logger.warning('Events queue drained, the events of %s blocks were dropped',
+                               len(self.dropped))
+                self.dropped = []
+            self.put_event(event, timeout=timeout)
+        except Full:
+            if not self.dropped:
+                logger.error('Events queue full for %s seconds, dropping the events',
+                             timeout)
+            if event.type == EventTypes.TRANSACTION_INVALID:
+                logger.warning('Dropped the event of the invalid transaction %s',
+                               event.data['id'])
+            else:
+                self.dropped.append(event.data['id'])
 
     def get_event(self, timeout=None):
-        # TODO: handle timeouts
-        return self.events_queue.get(timeout=None)
+        return Event.deserialize(self.events_queue.get(timeout=timeout))
 
 
 def setup_events_queue():
-    # TODO: set bounds to the queue
-    return Queue()
+    return Queue(maxsize=EVENTS_QUEUE_SIZE)
@@ -47,10 +47,33 @@ class FastQuery:
         """
         Get outputs for a public key
         """
-        res = list(query.get_owned_ids(self.connection, public_key))
-        txs = [tx for _, tx in self.filter_valid_items(res)]
-        return [TransactionLink(tx['id'], index)
-                for tx in txs
+        res = query.get_owned_ids(self.connection, public_key)
+        return self.get_outputs_of_transactions(res, public_key)
+
+    def get_outputs_of_transactions(self, items, public_key):
+        """
+        Get the outputs for a public key of transactions in valid or
+        undecided blocks
+
+        Args:
+            items: list of (block_id, transaction)
+        """
+        return [link for _, link
+                in self.get_block_outputs_of_transactions(items, public_key)]
+
+    def get_block_outputs_of_transactions(self, items, public_key):
+        """
+        Get the outputs for a public key of transactions in valid or
+        undecided blocks, with the ids of their blocks
+
+        Args:
+            items: list of (block_id, transaction)
+
+        Returns:
+            list of (block_id, TransactionLink), in the order of ``items``
+        """
+        return [(block_id, TransactionLink(tx['id'], index))
+                for block_id, tx in self.filter_valid_items(items)
                 for index, output in enumerate(tx['outputs'])
                 if condition_details_has_owner(output['condition']['details'],
                                                public_key)]
@@ -0,0 +1,555 @@
+"""Latency histograms and counters of the node, in the Prometheus text format.
+
+The metrics are recorded in memory by each process of the node: the
+Gunicorn workers of the HTTP API, and the processes of the pipelines. When
+a metrics directory is configured (``metrics.directory``), every process
+writes its metrics to its own file of the directory about once a second,
+and :func:`render` adds up the files of all the processes, so that the
+``/metrics`` endpoint of any worker reports the metrics of the whole node.
+
+A Prometheus server scrapes the ``/metrics`` endpoint. The node also sends
+counters, gauges and timers to the statsd server of ``graphite.host``: the
+:class:`StatsClient` of each process aggregates them, and sends them in
+batches about once a second.
+"""
+
+import contextlib
+import functools
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+import types
+from collections import defaultdict
+
+import rapidjson
+import statsd
+
+import bigchaindb
+
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 1
+"""The seconds between two writes of the metrics of a process to its file."""
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1, 2.5, 5, 10, math.inf)
+"""The upper bounds, in seconds, of the buckets of the histograms."""
+
+
+class _ProcessState:
+    """The state of a process, written out about once a second by a thread
+    of the process.
+
+    A forked process starts with a fresh state: the one it inherited is
+    written out by its parent.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.flusher = None
+        self.dirty = False
+
+    def reset(self):
+        raise NotImplementedError()
+
+    def flushing(self):
+        """Whether the state is written out at all."""
+        return True
+
+    def flush(self):
+        raise NotImplementedError()
+
+    @contextlib.contextmanager
+    def record(self):
+        """Hold the lock of the state to update it."""
+        with self.lock:
+            if self.pid != os.getpid():
+                self.pid = os.getpid()
+                self.flusher = None
+                self.reset()
+            if self.flusher is None and self.flushing():
+                self.flusher = threading.Thread(target=self._flush_forever,
+                                                name='metrics', daemon=True)
+                self.flusher.start()
+            self.dirty = True
+            yield
+
+    def _flush_forever(self):
+        pid = os.getpid()
+        while self.pid == pid:
+            time.sleep(FLUSH_INTERVAL)
+            if not self.dirty or not self.flushing():
+                continue
+            try:
+                self.flush()
+            except OSError as exc:
+                logger.warning('Cannot write out the metrics: %s', exc)
+
+
+class Registry(_ProcessState):
+    """The metrics of a process, and their files in the metrics
+    directory."""
+
+    def __init__(self):
+        super().__init__()
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+
+    def reset(self):
+        for metric in self.metrics:
+            metric.values.clear()
+
+    def flushing(self):
+        return bool(directory())
+
+    def snapshot(self):
+        """Return the values of the metrics, by metric name and by label
+        values."""
+        with self.lock:
+            if self.pid != os.getpid():
+                return {}
+            self.dirty = False
+            return {metric.name: {key: _copy(value)
+                                  for key, value in metric.values.items()}
+                    for metric in self.metrics}
+
+    def flush(self):
+        """Write the values of the metrics of the process to its file."""
+        path = os.path.join(directory(), '{}.json'.format(os.getpid()))
+        values = {name: [[list(key), value] for key, value in by_key.items()]
+                  for name, by_key in self.snapshot().items()}
+        # write a whole file at once, so that it is never read half written
+        with open(path + '.tmp', 'w') as tmp:
+            tmp.write(rapidjson.dumps(values))
+        os.replace(path + '.tmp', path)
+
+    def collect(self):
+        """Return the values of the metrics of all the processes of the
+        node, by metric name and by label values."""
+        values = self.snapshot()
+        for path in _files(directory()):
+            if path == '{}.json'.format(os.getpid()):
+                continue
+            try:
+                with open(os.path.join(directory(), path)) as file:
+                    others = rapidjson.loads(file.read())
+            except (OSError, ValueError):
+                # e.g. the process exited and its file was cleared
+                continue
+            for metric in self.metrics:
+                by_key = values.setdefault(metric.name, {})
+                for key, value in others.get(metric.name, []):
+                    key = tuple(key)
+                    by_key[key] = metric.merge(by_key[key], value) if key in by_key else value
+        return values
+
+
+def _copy(value):
+    return list(value) if isinstance(value, list) else value
+
+
+def _files(path):
+    if not path:
+        return []
+    try:
+        return [name for name in os.listdir(path) if name.endswith('.json')]
+    except FileNotFoundError:
+        return []
+
+
+REGISTRY = Registry()
+
+
+def directory():
+    """Return the metrics directory of the node, or ``None`` if each
+    process only reports its own metrics."""
+    return bigchaindb.config.get('metrics', {}).get('directory')
+
+
+def clear(path):
+    """Remove the metrics files of the processes of a previous run of the
+    node from a metrics directory."""
+    for name in _files(path):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(path, name))
+
+
+MAX_TIMINGS = 1000
+"""The maximum number of durations of a timer sent to statsd per flush."""
+
+
+class StatsClient(_ProcessState, statsd.StatsClient):
+    """A statsd client aggregating the counters, gauges and timers in
+    memory, and sending them about once a second, in as few UDP packets as
+    fit them.
+
+    Beyond :data:`MAX_TIMINGS` durations of a timer between two flushes, a
+    random sample of them is sent, with its sample rate, so that statsd
+    still counts all the durations.
+    """
+
+    def __init__(self, host='localhost', port=8125, **kwargs):
+        _ProcessState.__init__(self)
+        statsd.StatsClient.__init__(self, host, port, **kwargs)
+        self.reset()
+
+    def reset(self):
+        self.counters = defaultdict(int)
+        # the value of each gauge, and whether it is a change of the
+        # gauge rather than its value
+        self.gauges = {}
+        self.timings = defaultdict(list)
+        self.timed = defaultdict(int)
+
+    def incr(self, stat, count=1, rate=1):
+        with self.record():
+            self.counters[stat] += count / rate if rate != 1 else count
+
+    def decr(self, stat, count=1, rate=1):
+        self.incr(stat, -count, rate)
+
+    def gauge(self, stat, value, rate=1, delta=False):
+        with self.record():
+            if delta and stat in self.gauges:
+                previous, previous_delta = self.gauges[stat]
+                self.gauges[stat] = (previous + value, previous_delta)
+            else:
+                self.gauges[stat] = (value, delta)
+
+    def timing(self, stat, delta, rate=1):
+        with self.record():
+            timings = self.timings[stat]
+            self.timed[stat] += 1
+            if len(timings) < MAX_TIMINGS:
+                timings.append(delta)
+            else:
+                # keep a uniform sample of the durations
+                index = random.randrange(self.timed[stat])
+                if index < MAX_TIMINGS:
+                    timings[index] = delta
+
+    def flush(self):
+        """Send the metrics recorded since the last flush."""
+        with self.lock:
+            if self.pid != os.getpid():
+                return
+            counters, gauges = self.counters, self.gauges
+            timings, timed = self.timings, self.timed
+            self.reset()
+            self.dirty = False
+
+        pipe = self.pipeline()
+        for stat, count in counters.items():
+            pipe.incr(stat, count)
+        for stat, (value, delta) in gauges.items():
+            pipe.gauge(stat, value, delta=delta)
+        for stat, deltas in timings.items():
+            rate = len(deltas) / timed[stat]
+            if rate == 1:
+                for delta in deltas:
+                    pipe.timing(stat, delta)
+                continue
+            # the durations are sampled already: the rate given to timing()
+            # would drop some more of them
+            for delta in deltas:
+                pipe._after(pipe._prepare(
+                    stat, '%0.6f|ms|@%s' % (delta, rate), 1))
+        pipe.send()
+
+
+def statsd_client(host=None):
+    """Return the statsd client of the process for a host (by default
+    ``graphite.host``), shared by its threads and its
+    :class:`~bigchaindb.Bigchain` instances."""
+    return _statsd_client(host or bigchaindb.config['graphite']['host'])
+
+
+@functools.lru_cache()
+def _statsd_client(host):
+    return StatsClient(host)
+
+
+class Metric:
+    """A metric with values by label values."""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), *, registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.registry = registry
+        registry.register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError('{} takes the labels {}, not {}'.format(
+                self.name, self.labelnames, tuple(labels)))
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key, **extra):
+        labels = list(zip(self.labelnames, key)) + list(extra.items())
+        if not labels:
+            return ''
+        return '{' + ','.join('{}="{}"'.format(name, _escape(value))
+                              for name, value in labels) + '}'
+
+    @staticmethod
+    def merge(value, other):
+        """Return the value of the metric for the node, from the values of
+        two of its processes."""
+        return value + other
+
+    def render(self, values):
+        """Return the lines of the metric in the Prometheus text format.
+
+        Args:
+            values (dict): the values of the metric, by label values.
+        """
+        lines = ['# HELP {} {}'.format(self.name, self.documentation),
+                 '# TYPE {} {}'.format(self.name, self.type)]
+        for key in sorted(values):
+            lines.extend(self.samples(key, values[key]))
+        return lines
+
+
+class Counter(Metric):
+    """A count of events, e.g. of the responses of the HTTP API."""
+
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.record():
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self, key, value):
+        yield '{}{} {}'.format(self.name, self._labels(key), _format(value))
+
+
+class Gauge(Metric):
+    """A value that goes up and down, e.g. the depth of a queue.
+
+    The value of the node is the highest of the values of its processes.
+    """
+
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.record():
+            self.values[key] = value
+
+    merge = staticmethod(max)
+
+    def samples(self, key, value):
+        yield '{}{} {}'.format(self.name, self._labels(key), _format(value))
+
+
+class Histogram(Metric):
+    """The distribution of durations, in buckets."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), *,
+                 buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry=registry)
+        self.buckets = tuple(buckets)
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.record():
+            # the count of each bucket, then the sum of the values
+            counts = self.values.get(key)
+            if counts is None:
+                counts = self.values[key] = [0] * (len(self.buckets) + 1)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            counts[-1] += value
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        """Record the duration of the ``with`` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    @staticmethod
+    def merge(value, other):
+        return [a + b for a, b in zip(value, other)]
+
+    def samples(self, key, value):
+        cumulative = 0
+        for bound, count in zip(self.buckets, value):
+            cumulative += count
+            yield '{}_bucket{} {}'.format(
+                self.name, self._labels(key, le=_format(bound)), cumulative)
+        yield '{}_sum{} {}'.format(self.name, self._labels(key), _format(value[-1]))
+        yield '{}_count{} {}'.format(self.name, self._labels(key), cumulative)
+
+
+def _escape(value):
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def timed(histogram, **labels):
+    """Decorate a function to record its durations in a histogram."""
+    def decorator(function):
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            with histogram.time(**labels):
+                return function(*args, **kwargs)
+        return timed_function
+    return decorator
+
+
+def render(registry=REGISTRY):
+    """Return the metrics of the node in the Prometheus text format."""
+    values = registry.collect()
+    lines = []
+    for metric in registry.metrics:
+        lines.extend(metric.render(values.get(metric.name, {})))
+    return '\n'.join(lines) + '\n'
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    'bigchaindb_http_request_duration_seconds',
+    'The durations of the requests of the HTTP API, until their response is sent.',
+    ['method', 'route'])
+
+HTTP_RESPONSES = Counter(
+    'bigchaindb_http_responses_total',
+    'The responses of the HTTP API, by status code.',
+    ['method', 'route', 'status'])
+
+PIPELINE_STAGE_DURATION = Histogram(
+    'bigchaindb_pipeline_stage_duration_seconds',
+    'The durations of the calls to the stages of the pipelines.',
+    ['pipeline', 'stage'])
+
+PIPELINE_STAGE_ITEMS = Counter(
+    'bigchaindb_pipeline_stage_items_total',
+    'The items the stages of the pipelines got (in) and passed on (out).',
+    ['pipeline', 'stage', 'direction'])
+
+PIPELINE_STAGE_WAIT = Counter(
+    'bigchaindb_pipeline_stage_wait_seconds_total',
+    'The time the stages of the pipelines waited for their input.',
+    ['pipeline', 'stage'])
+
+PIPELINE_STAGE_QUEUE_DEPTH = Gauge(
+    'bigchaindb_pipeline_stage_queue_depth',
+    'The items in the input queue of the stages of the pipelines.',
+    ['pipeline', 'stage'])
+
+DATABASE_QUERY_DURATION = Histogram(
+    'bigchaindb_database_query_duration_seconds',
+    'The durations of the database queries, until the backend returns their '
+    'results or cursor.')
+
+
+def pipeline_stage(pipeline):
+    """Return a decorator recording the calls to a stage of a pipeline, e.g.::
+
+        stage = pipeline_stage('block')
+
+        class BlockPipeline:
+            @stage
+            def validate_tx(self, tx):
+                ...
+
+    The decorator records the items the stage gets and passes on in
+    :data:`PIPELINE_STAGE_ITEMS`, and the durations of the calls in
+    :data:`PIPELINE_STAGE_DURATION` and in the statsd timer
+    ``pipelines.<pipeline>.<stage>``. The duration of a stage returning a
+    generator lasts until the generator is exhausted.
+    """
+    def decorator(function):
+        labels = {'pipeline': pipeline, 'stage': function.__name__}
+        stat = 'pipelines.{pipeline}.{stage}'.format(**labels)
+
+        def observe(start):
+            duration = time.perf_counter() - start
+            PIPELINE_STAGE_DURATION.observe(duration, **labels)
+            statsd_client().timing(stat, duration * 1000)
+
+        def passed_on(items, start):
+            try:
+                for item in items:
+                    PIPELINE_STAGE_ITEMS.inc(direction='out', **labels)
+                    yield item
+            finally:
+                observe(start)
+
+        @functools.wraps(function)
+        def stage(*args, **kwargs):
+            start = time.perf_counter()
+            if not kwargs.get('timeout'):
+                PIPELINE_STAGE_ITEMS.inc(direction='in', **labels)
+            try:
+                result = function(*args, **kwargs)
+            except Exception:
+                observe(start)
+                raise
+            if isinstance(result, types.GeneratorType):
+                return passed_on(result, start)
+            if result is not None:
+                PIPELINE_STAGE_ITEMS.inc(direction='out', **labels)
+            observe(start)
+            return result
+
+        # for the :class:`~bigchaindb.pipelines.instrumentation.Node` of
+        # the stage
+        stage.metric_labels = labels
+        return stage
+    return decorator
+
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+_UNESCAPED = {'\\\\': '\\', '\\"': '"', '\\n': '\n'}
+
+
+def _unescape(value):
+    return re.sub(r'\\.', lambda match: _UNESCAPED.get(match.group(), match.group()), value)
+
+
+def parse(text):
+    """Parse the samples of metrics in the Prometheus text format, e.g. of
+    the ``/metrics`` endpoint of a node.
+
+    Returns:
+        list: the name, the labels (a dict) and the value of each sample.
+    """
+    samples = []
+    for line in text.splitlines():
+        match = _SAMPLE.match(line)
+        if not match:
+            # e.g. the comments
+            continue
+        name, labels, value = match.groups()
+        labels = {label: _unescape(escaped)
+                  for label, escaped in _LABEL.findall(labels or '')}
+        samples.append((name, labels, float(value)))
+    return samples
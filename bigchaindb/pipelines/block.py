@@ -7,18 +7,21 @@ function.
 
 import logging
 
-from multipipes import Pipeline, Node, Pipe
+from multipipes import Pipeline, Pipe
 
 import bigchaindb
-from bigchaindb import backend
-from bigchaindb.backend.changefeed import ChangeFeed
+from bigchaindb import backend, metrics, tracing
+from bigchaindb.backend.changefeed import ChangeFeed, acknowledge_nothing
 from bigchaindb.models import Transaction
 from bigchaindb.common.exceptions import (ValidationError,
                                           GenesisBlockAlreadyExistsError)
 from bigchaindb import Bigchain
+from bigchaindb.events import EventHandler, Event, EventTypes
+from bigchaindb.pipelines.instrumentation import Node
 
 
 logger = logging.getLogger(__name__)
+stage = metrics.pipeline_stage('block')
 
 
 class BlockPipeline:
@@ -28,14 +31,33 @@ class BlockPipeline:
         Methods of this class will be executed in different processes.
     """
 
-    def __init__(self):
-        """Initialize the BlockPipeline creator"""
+    def __init__(self, events_queue=None, acknowledge=acknowledge_nothing):
+        """Initialize the BlockPipeline creator
+
+        Args:
+            events_queue (optional): the queue of the events of the node,
+                to publish the invalid transactions to, for the requests
+                waiting for them, see :mod:`bigchaindb.web.read_api`.
+            acknowledge (callable): acknowledges the changes of the backlog
+                the pipeline is done with, by the ids of their transactions,
+                see
+                :meth:`~bigchaindb.backend.changefeed.Subscription.acknowledge`.
+        """
         self.bigchain = Bigchain()
         self.txs = tx_collector()
+        self.collected = 0
+        self.acknowledge = acknowledge
+        self.event_handler = None
+        if events_queue:
+            self.event_handler = EventHandler(events_queue)
 
+    @stage
     def filter_tx(self, tx):
         """Filter a transaction.
 
+        The changefeed only emits the transactions assigned to this node,
+        but a transaction might have been reassigned in the meantime.
+
         Args:
             tx (dict): the transaction to process.
 
@@ -44,10 +66,13 @@ class BlockPipeline:
             ``None`` otherwise.
         """
         if tx['assignee'] == self.bigchain.me:
+            tracing.stamp('picked', tx['id'])
             tx.pop('assignee')
             tx.pop('assignment_timestamp')
             return tx
+        self.acknowledge(tx['id'])
 
+    @stage
     def validate_tx(self, tx):
         """Validate a transaction.
 
@@ -64,12 +89,14 @@ class BlockPipeline:
         try:
             tx = Transaction.from_dict(tx)
         except ValidationError:
+            self.acknowledge(tx.get('id'))
             return None
 
         # If transaction is in any VALID or UNDECIDED block we
         # should not include it again
         if not self.bigchain.is_new_transaction(tx.id):
             self.bigchain.delete_transaction(tx.id)
+            self.acknowledge(tx.id)
             return None
 
         # If transaction is not valid it should not be included
@@ -83,12 +110,17 @@ class BlockPipeline:
                 raise GenesisBlockAlreadyExistsError('Duplicate GENESIS transaction')
 
             tx.validate(self.bigchain)
+            tracing.stamp('validated', tx.id)
             return tx
         except ValidationError as e:
             logger.warning('Invalid tx: %s', e)
             self.bigchain.delete_transaction(tx.id)
+            if self.event_handler:
+                self.event_handler.publish(Event(EventTypes.TRANSACTION_INVALID, {'id': tx.id}))
+            self.acknowledge(tx.id)
             return None
 
+    @stage
     def create(self, tx, timeout=False):
         """Create a block.
 
@@ -108,11 +140,18 @@ class BlockPipeline:
             if a block is ready, or ``None``.
         """
         txs = self.txs.send(tx)
+        if tx and len(txs) == self.collected:
+            # refused, as a duplicate
+            self.acknowledge(tx.id)
+        self.collected = len(txs)
         if len(txs) == 1000 or (timeout and txs):
             block = self.bigchain.create_block(txs)
+            tracing.stamp('in_block', *(tx.id for tx in txs))
             self.txs = tx_collector()
+            self.collected = 0
             return block
 
+    @stage
     def write(self, block):
         """Write the block to the Database.
 
@@ -126,10 +165,12 @@ class BlockPipeline:
         logger.info('Write new block %s with %s transactions',
                     block.id, len(block.transactions))
         self.bigchain.write_block(block)
+        tracing.stamp('block_written', *(tx.id for tx in block.transactions))
         self.bigchain.statsd.incr('pipelines.block.throughput',
                                   len(block.transactions))
         return block
 
+    @stage
     def delete_tx(self, block):
         """Delete transactions.
 
@@ -140,7 +181,9 @@ class BlockPipeline:
         Returns:
             :class:`~bigchaindb.models.Block`: The block.
         """
-        self.bigchain.delete_transaction(*[tx.id for tx in block.transactions])
+        txids = [tx.id for tx in block.transactions]
+        self.bigchain.delete_transaction(*txids)
+        self.acknowledge(*txids)
         return block
 
 
@@ -165,14 +208,24 @@ def tx_collector():
     return s
 
 
-def create_pipeline():
+def create_pipeline(inpipe=None, events_queue=None, acknowledge=acknowledge_nothing):
     """Create and return the pipeline of operations to be distributed
-    on different processes."""
+    on different processes.
+
+    Args:
+        inpipe (optional): the bounded pipe to read the backlog changes
+            from. If not given a new one is created.
+        events_queue (optional): see :class:`BlockPipeline`.
+        acknowledge (callable, optional): see :class:`BlockPipeline`.
+    """
 
-    block_pipeline = BlockPipeline()
+    block_pipeline = BlockPipeline(events_queue=events_queue, acknowledge=acknowledge)
+
+    if inpipe is None:
+        inpipe = Pipe(maxsize=1000)
 
     pipeline = Pipeline([
-        Pipe(maxsize=1000),
+        inpipe,
         Node(block_pipeline.filter_tx),
         Node(block_pipeline.validate_tx, fraction_of_cores=1),
         Node(block_pipeline.create, timeout=1),
@@ -184,14 +237,39 @@ def create_pipeline():
 
 
 def get_changefeed():
+    """Create and return a changefeed of the transactions assigned to this
+    node. The filter on the assignee is evaluated by the database."""
     connection = backend.connect(**bigchaindb.config['database'])
-    return backend.get_changefeed(connection, 'backlog',
-                                  ChangeFeed.INSERT | ChangeFeed.UPDATE)
+    return backend.get_changefeed(
+        connection, 'backlog', ChangeFeed.INSERT | ChangeFeed.UPDATE,
+        match={'assignee': bigchaindb.config['keypair']['public']})
+
+
+def subscribe(multiplexer):
+    """Subscribe to the transactions assigned to this node on the
+    changefeed multiplexer of the node."""
+    return multiplexer.subscribe(
+        'backlog', ChangeFeed.INSERT | ChangeFeed.UPDATE,
+        match={'assignee': bigchaindb.config['keypair']['public']})
 
 
-def start():
-    """Create, start, and return the block pipeline."""
-    pipeline = create_pipeline()
-    pipeline.setup(indata=get_changefeed())
+def start(events_queue=None, multiplexer=None):
+    """Create, start, and return the block pipeline.
+
+    Args:
+        events_queue (optional): the queue of the events of the node, see
+            :class:`BlockPipeline`.
+        multiplexer (:class:`~bigchaindb.backend.changefeed.ChangeFeedMultiplexer`, optional):  # noqa
+            the changefeed multiplexer to read the backlog changes from.
+            If not given, the pipeline runs its own changefeed.
+    """
+    if multiplexer:
+        subscription = subscribe(multiplexer)
+        pipeline = create_pipeline(inpipe=subscription.pipe,
+                                   events_queue=events_queue,
+                                   acknowledge=subscription.acknowledge)
+    else:
+        pipeline = create_pipeline(events_queue=events_queue)
+        pipeline.setup(indata=get_changefeed())
     pipeline.start()
     return pipeline
@@ -6,29 +6,33 @@ is specified in ``create_pipeline``.
 """
 import logging
 
-from multipipes import Pipeline, Node
+from multipipes import Pipeline
 
 import bigchaindb
-from bigchaindb import backend
-from bigchaindb.backend.changefeed import ChangeFeed
+from bigchaindb import backend, metrics, tracing
+from bigchaindb.backend.changefeed import ChangeFeed, acknowledge_nothing
 from bigchaindb.models import Block
 from bigchaindb import Bigchain
-from bigchaindb.events import EventHandler, Event, EventTypes
+from bigchaindb.events import EventHandler, Event, EventTypes, block_summary
+from bigchaindb.pipelines.instrumentation import Node
 
 
 logger = logging.getLogger(__name__)
 logger_results = logging.getLogger('pipeline.election.results')
+stage = metrics.pipeline_stage('election')
 
 
 class Election:
     """Election class."""
 
-    def __init__(self, events_queue=None):
+    def __init__(self, events_queue=None, acknowledge=acknowledge_nothing):
         self.bigchain = Bigchain()
+        self.acknowledge = acknowledge
         self.event_handler = None
         if events_queue:
             self.event_handler = EventHandler(events_queue)
 
+    @stage
     def check_for_quorum(self, next_vote):
         """
         Checks if block has enough invalid votes to make a decision
@@ -41,14 +45,18 @@ class Election:
             block_id = next_vote['vote']['voting_for_block']
             node = next_vote['node_pubkey']
         except KeyError:
+            self.acknowledge(vote_key(next_vote))
             return
 
         next_block = self.bigchain.get_block(block_id)
 
         result = self.bigchain.block_election(next_block)
-        self.handle_block_events(result, block_id)
+        self.trace(result, next_block, node)
+        self.handle_block_events(result, next_block)
         if result['status'] == self.bigchain.BLOCK_INVALID:
-            return Block.from_dict(next_block)
+            # acknowledged once the transactions are requeued
+            return Block.from_dict(next_block), vote_key(next_vote)
+        self.acknowledge(vote_key(next_vote))
 
         # Log the result
         if result['status'] != self.bigchain.BLOCK_UNDECIDED:
@@ -61,18 +69,40 @@ class Election:
                 'election_result': result,
             })
 
-    def requeue_transactions(self, invalid_block):
+    @stage
+    def requeue_transactions(self, invalid_block, key=None):
         """
         Liquidates transactions from invalid blocks so they can be processed again
+
+        Args:
+            invalid_block (:class:`~bigchaindb.models.Block`): the block.
+            key (tuple, optional): the key of the vote that decided the
+                block, see :func:`vote_key`.
         """
         logger.info('Rewriting %s transactions from invalid block %s',
                     len(invalid_block.transactions),
                     invalid_block.id)
         for tx in invalid_block.transactions:
             self.bigchain.write_transaction(tx)
+        self.acknowledge(key)
         return invalid_block
 
-    def handle_block_events(self, result, block_id):
+    def trace(self, result, block, voter):
+        """Stamp the vote of another node, and the decision if any, on the
+        transactions of a block, see :mod:`bigchaindb.tracing`.
+
+        The votes of this node are stamped when they are written, by
+        :meth:`bigchaindb.pipelines.vote.Vote.write_vote`.
+        """
+        if not tracing.sample_rate():
+            return
+        txids = [tx['id'] for tx in block['block']['transactions']]
+        if voter != self.bigchain.me:
+            tracing.stamp(tracing.VOTE + voter, *txids)
+        if result['status'] != self.bigchain.BLOCK_UNDECIDED:
+            tracing.stamp('decided', *txids)
+
+    def handle_block_events(self, result, block):
         if self.event_handler:
             if result['status'] == self.bigchain.BLOCK_UNDECIDED:
                 return
@@ -81,12 +111,18 @@ class Election:
             elif result['status'] == self.bigchain.BLOCK_VALID:
                 event_type = EventTypes.BLOCK_VALID
 
-            event = Event(event_type, self.bigchain.get_block(block_id))
-            self.event_handler.put_event(event)
+            self.event_handler.publish(Event(event_type, block_summary(block)))
+
+
+def vote_key(vote):
+    """Return the key of a vote, which has no ``id``, for the changefeed
+    multiplexer, see
+    :meth:`~bigchaindb.backend.changefeed.Subscription.acknowledge`."""
+    return vote.get('node_pubkey'), vote.get('vote', {}).get('voting_for_block')
 
 
-def create_pipeline(events_queue=None):
-    election = Election(events_queue=events_queue)
+def create_pipeline(events_queue=None, acknowledge=acknowledge_nothing):
+    election = Election(events_queue=events_queue, acknowledge=acknowledge)
 
     election_pipeline = Pipeline([
         Node(election.check_for_quorum),
@@ -101,8 +137,20 @@ def get_changefeed():
     return backend.get_changefeed(connection, 'votes', ChangeFeed.INSERT)
 
 
-def start(events_queue=None):
-    pipeline = create_pipeline(events_queue=events_queue)
-    pipeline.setup(indata=get_changefeed())
+def subscribe(multiplexer):
+    """Subscribe to the new votes on the changefeed multiplexer of the
+    node."""
+    return multiplexer.subscribe('votes', ChangeFeed.INSERT, key=vote_key)
+
+
+def start(events_queue=None, multiplexer=None):
+    if multiplexer:
+        subscription = subscribe(multiplexer)
+        pipeline = create_pipeline(events_queue=events_queue,
+                                   acknowledge=subscription.acknowledge)
+        pipeline.setup(indata=subscription.pipe)
+    else:
+        pipeline = create_pipeline(events_queue=events_queue)
+        pipeline.setup(indata=get_changefeed())
     pipeline.start()
     return pipeline
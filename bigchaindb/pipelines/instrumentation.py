@@ -0,0 +1,88 @@
+"""The instrumentation of the nodes of the pipelines.
+
+The stages of the pipelines, decorated with
+:func:`bigchaindb.metrics.pipeline_stage`, record their items and
+durations. The :class:`Node` of a stage also records how long its
+processes wait for their input, and the depth of its input queue.
+"""
+
+import contextlib
+import threading
+import time
+
+import multipipes
+
+from bigchaindb import profiling
+from bigchaindb.metrics import PIPELINE_STAGE_QUEUE_DEPTH, PIPELINE_STAGE_WAIT
+
+
+class WaitedQueue:
+    """The input queue of a node, recording how long the node waits for it."""
+
+    def __init__(self, queue, labels):
+        self.queue = queue
+        self.labels = labels
+
+    def get(self, *args, **kwargs):
+        try:
+            PIPELINE_STAGE_QUEUE_DEPTH.set(self.queue.qsize(), **self.labels)
+        except NotImplementedError:
+            # e.g. on macOS
+            pass
+
+        start = time.perf_counter()
+        try:
+            return self.queue.get(*args, **kwargs)
+        finally:
+            PIPELINE_STAGE_WAIT.inc(time.perf_counter() - start, **self.labels)
+
+    def __getattr__(self, name):
+        return getattr(self.queue, name)
+
+
+_threaded = False
+
+
+@contextlib.contextmanager
+def threaded(enabled=True):
+    """Run the nodes created in the context in threads of the current
+    process instead of processes, e.g. for the memory backend, whose
+    databases are the ones of a process.
+
+    Args:
+        enabled (bool): if ``False``, the nodes run in processes.
+    """
+    global _threaded
+    _threaded = enabled
+    try:
+        yield
+    finally:
+        _threaded = False
+
+
+class Node(multipipes.Node):
+    """A :class:`multipipes.Node` recording how long it waits for its input,
+    if its target is a stage decorated with
+    :func:`~bigchaindb.metrics.pipeline_stage`.
+
+    Its processes install the profiler of :mod:`bigchaindb.profiling`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if _threaded:
+            # threads have no ``terminate``: they run until the node exits
+            self.processes = [threading.Thread(target=self.safe_run_forever,
+                                               name=self.name, daemon=True)
+                              for _ in self.processes]
+
+    def safe_run_forever(self):
+        # in the processes of the node
+        labels = getattr(self.target, 'metric_labels', None)
+        if self.inqueue is not None and labels:
+            self.inqueue = WaitedQueue(self.inqueue, labels)
+        if labels:
+            profiling.install('{pipeline}.{stage}'.format(**labels))
+        else:
+            profiling.install(self.name)
+        super().safe_run_forever()
@@ -5,12 +5,14 @@ remain in the backlog past a certain amount of time.
 """
 
 import logging
-from multipipes import Pipeline, Node
-from bigchaindb import Bigchain
-from time import sleep
+from multipipes import Pipeline
+from bigchaindb import backend, metrics, Bigchain
+from bigchaindb.pipelines.instrumentation import Node
+from time import sleep, time
 
 
 logger = logging.getLogger(__name__)
+stage = metrics.pipeline_stage('stale')
 
 
 class StaleTransactionMonitor:
@@ -24,7 +26,8 @@ class StaleTransactionMonitor:
         """Initialize StaleTransaction monitor
 
         Args:
-            timeout: how often to check for stale tx (in sec)
+            timeout: the minimum time between two checks for stale tx
+                (in sec)
             backlog_reassign_delay: How stale a transaction should
                 be before reassignment (in sec). If supplied, overrides
                 the Bigchain default value.
@@ -32,26 +35,50 @@ class StaleTransactionMonitor:
         self.bigchain = Bigchain(backlog_reassign_delay=backlog_reassign_delay)
         self.timeout = timeout
 
+    def poll_interval(self):
+        """Compute how long to wait before polling the backlog again.
+
+        The wait adapts to the age of the backlog: the monitor sleeps
+        until the oldest assigned transaction becomes stale, but never
+        less than ``timeout`` nor more than the reassign delay.
+
+        Returns:
+            float: the number of seconds to wait.
+        """
+        reassign_delay = self.bigchain.backlog_reassign_delay
+        oldest = backend.query.get_oldest_assignment_timestamp(
+            self.bigchain.connection)
+
+        if oldest is None:
+            interval = reassign_delay
+        else:
+            interval = oldest + reassign_delay - time()
+
+        return max(self.timeout, min(interval, reassign_delay))
+
     def check_transactions(self):
         """Poll backlog for stale transactions
 
         Returns:
             txs (list): txs to be re assigned
         """
-        sleep(self.timeout)
-        for tx in self.bigchain.get_stale_transactions():
-            yield tx
+        sleep(self.poll_interval())
+        return list(self.bigchain.get_stale_transactions())
 
-    def reassign_transactions(self, tx):
-        """Put tx back in backlog with new assignee
+    @stage
+    def reassign_transactions(self, txs):
+        """Put txs back in backlog with new assignees
+
+        Args:
+            txs (list): the stale transactions.
 
         Returns:
-            transaction
+            generator of the reassigned transactions
         """
-        # NOTE: Maybe this is to verbose?
-        logger.info('Reassigning transaction with id %s', tx['id'])
-        self.bigchain.reassign_transaction(tx)
-        return tx
+        if txs:
+            logger.info('Reassigning %s stale transactions', len(txs))
+            self.bigchain.reassign_transactions(txs)
+        return (tx for tx in txs)
 
 
 def create_pipeline(timeout=5, backlog_reassign_delay=5):
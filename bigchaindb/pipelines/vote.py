@@ -8,14 +8,17 @@ function.
 import logging
 from collections import Counter
 
-from multipipes import Pipeline, Node
+from multipipes import Pipeline
 
-from bigchaindb import backend, Bigchain
+from bigchaindb import backend, metrics, tracing, Bigchain
+from bigchaindb.backend.changefeed import ChangeFeed, acknowledge_nothing
 from bigchaindb.models import Transaction, Block, FastTransaction
 from bigchaindb.common import exceptions
+from bigchaindb.pipelines.instrumentation import Node
 
 
 logger = logging.getLogger(__name__)
+stage = metrics.pipeline_stage('vote')
 
 
 class Vote:
@@ -25,8 +28,14 @@ class Vote:
         Methods of this class will be executed in different processes.
     """
 
-    def __init__(self):
-        """Initialize the Block voter."""
+    def __init__(self, acknowledge=acknowledge_nothing):
+        """Initialize the Block voter.
+
+        Args:
+            acknowledge (callable): acknowledges the new blocks the voter is
+                done with, by their ids, see
+                :meth:`~bigchaindb.backend.changefeed.Subscription.acknowledge`.
+        """
 
         # Since cannot share a connection to RethinkDB using multiprocessing,
         # we need to create a temporary instance of BigchainDB that we use
@@ -36,15 +45,17 @@ class Vote:
         # by all the subprocesses
 
         self.bigchain = Bigchain()
-        self.last_voted_id = Bigchain().get_last_voted_block().id
+        self.last_voted_id = Bigchain().get_last_voted_block_id()
 
         self.counters = Counter()
         self.blocks_validity_status = {}
+        self.acknowledge = acknowledge
 
         dummy_tx = Transaction.create([self.bigchain.me],
                                       [([self.bigchain.me], 1)]).to_dict()
         self.invalid_dummy_tx = dummy_tx
 
+    @stage
     def validate_block(self, block_dict):
         if not self.bigchain.has_previous_vote(block_dict['id']):
             try:
@@ -68,7 +79,9 @@ class Vote:
                 # pipeline.
                 return block.id, [self.invalid_dummy_tx]
             return block.id, block_dict['block']['transactions']
+        self.acknowledge(block_dict['id'])
 
+    @stage
     def ungroup(self, block_id, transactions):
         """Given a block, ungroup the transactions in it.
 
@@ -87,6 +100,7 @@ class Vote:
         for tx in transactions:
             yield tx, block_id, num_tx
 
+    @stage
     def validate_tx(self, tx_dict, block_id, num_tx):
         """Validate a transaction. Transaction must also not be in any VALID
            block.
@@ -114,6 +128,7 @@ class Vote:
 
         return valid, block_id, num_tx
 
+    @stage
     def vote(self, tx_validity, block_id, num_tx):
         """Collect the validity of transactions and cast a vote when ready.
 
@@ -139,6 +154,7 @@ class Vote:
             del self.blocks_validity_status[block_id]
             return vote, num_tx
 
+    @stage
     def write_vote(self, vote, num_tx):
         """Write vote to the database.
 
@@ -149,15 +165,32 @@ class Vote:
         logger.info("Voting '%s' for block %s", validity,
                     vote['vote']['voting_for_block'])
         self.bigchain.write_vote(vote)
+        self.trace(vote)
+        self.acknowledge(vote['vote']['voting_for_block'])
         self.bigchain.statsd.incr('pipelines.vote.throughput', num_tx)
         return vote
 
+    def trace(self, vote):
+        """Stamp the vote of this node on the transactions of its block,
+        see :mod:`bigchaindb.tracing`."""
+        if not tracing.sample_rate():
+            return
+        # the transactions of the block are not passed down the pipeline
+        block = self.bigchain.get_block(vote['vote']['voting_for_block'])
+        if block:
+            tracing.stamp(tracing.VOTE + vote['node_pubkey'],
+                          *(tx['id'] for tx in block['block']['transactions']))
 
-def create_pipeline():
+
+def create_pipeline(acknowledge=acknowledge_nothing):
     """Create and return the pipeline of operations to be distributed
-    on different processes."""
+    on different processes.
 
-    voter = Vote()
+    Args:
+        acknowledge (callable, optional): see :class:`Vote`.
+    """
+
+    voter = Vote(acknowledge=acknowledge)
 
     return Pipeline([
         Node(voter.validate_block),
@@ -172,15 +205,31 @@ def get_changefeed():
     """Create and return ordered changefeed of blocks starting from
        last voted block"""
     b = Bigchain()
-    last_block_id = b.get_last_voted_block().id
+    last_block_id = b.get_last_voted_block_id()
     feed = backend.query.get_new_blocks_feed(b.connection, last_block_id)
     return Node(feed.__next__, name='changefeed')
 
 
-def start():
+def subscribe(multiplexer):
+    """Subscribe to the new blocks, starting from the last voted block, on
+    the changefeed multiplexer of the node."""
+    b = Bigchain()
+    last_block_id = b.get_last_voted_block_id()
+    position = backend.changefeed.get_insert_position(
+        b.connection, 'bigchain', last_block_id)
+    return multiplexer.subscribe('bigchain', ChangeFeed.INSERT,
+                                 position=position)
+
+
+def start(multiplexer=None):
     """Create, start, and return the block pipeline."""
 
-    pipeline = create_pipeline()
-    pipeline.setup(indata=get_changefeed())
+    if multiplexer:
+        subscription = subscribe(multiplexer)
+        pipeline = create_pipeline(acknowledge=subscription.acknowledge)
+        pipeline.setup(indata=subscription.pipe)
+    else:
+        pipeline = create_pipeline()
+        pipeline.setup(indata=get_changefeed())
     pipeline.start()
     return pipeline
@@ -1,8 +1,15 @@
+import asyncio
 import logging
+import os
 import multiprocessing as mp
+import tempfile
+import threading
 
 import bigchaindb
+from bigchaindb import metrics, profiling
+from bigchaindb.backend.changefeed import ChangeFeedMultiplexer
 from bigchaindb.pipelines import vote, block, election, stale
+from bigchaindb.pipelines.instrumentation import threaded
 from bigchaindb.events import setup_events_queue
 from bigchaindb.web import server, websocket_server
 
@@ -24,27 +31,62 @@ BANNER = """
 
 
 def start():
+    """Start the node: its pipelines, changefeed, HTTP API and WebSocket
+    server, each in its own processes.
+
+    The in-memory databases are the ones of a process, so with the memory
+    backend they all run in threads of the current process instead, and
+    this function serves the HTTP API until the node stops.
+    """
+    in_threads = bigchaindb.config['database']['backend'] == 'memory'
+
     logger.info('Initializing BigchainDB...')
 
+    # The processes started below write their metrics to the metrics
+    # directory, where the /metrics endpoint of the web API adds them up.
+    if not bigchaindb.config['metrics']['directory']:
+        bigchaindb.config['metrics']['directory'] = tempfile.mkdtemp(
+            prefix='bigchaindb-metrics-')
+    metrics.clear(bigchaindb.config['metrics']['directory'])
+
+    # The processes register in the profiling directory, where
+    # `bigchaindb profile` finds them.
+    os.makedirs(profiling.directory(), exist_ok=True)
+    profiling.clear(profiling.directory())
+    if in_threads:
+        profiling.install('node')
+
     # Create the events queue
     # The events queue needs to be initialized once and shared between
     # processes. This seems the best way to do it
-    # At this point only the election processs and the event consumer require
-    # this queue.
+    # At this point only the block and election processes and the event
+    # consumer require this queue.
     events_queue = setup_events_queue()
 
+    # A single process tails the changes of the database and publishes
+    # them to the pipelines. Pipelines need to subscribe before it starts.
+    multiplexer = ChangeFeedMultiplexer()
+
     # start the processes
-    logger.info('Starting block')
-    block.start()
+    with threaded(in_threads):
+        logger.info('Starting block')
+        block.start(events_queue=events_queue, multiplexer=multiplexer)
+
+        logger.info('Starting voter')
+        vote.start(multiplexer=multiplexer)
+
+        logger.info('Starting stale transaction monitor')
+        stale.start()
 
-    logger.info('Starting voter')
-    vote.start()
+        logger.info('Starting election')
+        election.start(events_queue=events_queue, multiplexer=multiplexer)
 
-    logger.info('Starting stale transaction monitor')
-    stale.start()
+    logger.info('Starting changefeed')
+    multiplexer.start(thread=in_threads)
 
-    logger.info('Starting election')
-    election.start(events_queue=events_queue)
+    if in_threads:
+        _start_in_threads(events_queue)
+        return
 
     # start the web api
     app_server = server.create_server(bigchaindb.config['server'])
@@ -59,3 +101,23 @@ def start():
 
     # start message
     logger.info(BANNER.format(bigchaindb.config['server']['bind']))
+
+
+def _start_in_threads(events_queue):
+    """Start the WebSocket server in a thread, and serve the HTTP API in the
+    current one."""
+    thread = threading.Thread(name='ws', target=_run_websocket_server,
+                              args=(events_queue,), daemon=True)
+    thread.start()
+    logger.info('WebSocket server started')
+
+    app_server = server.create_threaded_server(bigchaindb.config['server'])
+    logger.info(BANNER.format(bigchaindb.config['server']['bind']))
+    app_server.serve_forever()
+
+
+def _run_websocket_server(events_queue):
+    # a thread has no event loop of its own, and cannot handle signals
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    websocket_server.start(events_queue, loop=loop, handle_signals=False)
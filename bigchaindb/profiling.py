@@ -0,0 +1,261 @@
+"""An on-demand sampling profiler of the processes of the node.
+
+Each process of the node (the processes of the stages of the pipelines, the
+changefeed, the Gunicorn workers of the HTTP API and the WebSocket server)
+installs the profiler, under a name, e.g. ``block.validate_tx`` or
+``webapi``. The profiler is idle until the process gets :data:`SIGNAL`,
+e.g. from ``bigchaindb profile``: it then samples the stacks of the threads
+of the process for some seconds, and writes them, collapsed, to the
+profiling directory, as ``<name>.<pid>.<time>.collapsed``. The collapsed
+stacks are the input of the flame graph tools, e.g. ``flamegraph.pl`` or
+https://www.speedscope.app.
+
+The processes register in the profiling directory, as ``<pid>.process``
+files holding their name and their start time, so that ``bigchaindb profile``
+can signal them. A process removes its registration when it exits; the
+registration of a process which was killed is forgotten once its pid is gone,
+or reused by a process started at another time.
+"""
+
+import collections
+import glob
+import logging
+import multiprocessing.util
+import os
+import signal
+import sys
+import threading
+import time
+
+import bigchaindb
+
+
+logger = logging.getLogger(__name__)
+
+SIGNAL = signal.SIGUSR2
+"""The signal switching the profiler of a process on."""
+
+INTERVAL = 0.01
+"""The seconds between two samples of the stacks."""
+
+_profiler = None
+
+
+def directory():
+    """Return the profiling directory of the node."""
+    return bigchaindb.config['profiling']['directory']
+
+
+class Profiler:
+    """A sampling profiler of the threads of the process."""
+
+    def __init__(self, name, *, interval=INTERVAL):
+        """Create a new profiler.
+
+        Args:
+            name (str): the name of the process, in the names of the
+                profiles.
+            interval (float): the seconds between two samples.
+        """
+        self.name = name
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.thread = None
+
+    def start(self, seconds):
+        """Profile the process for some seconds, in the background.
+
+        Returns:
+            bool: ``False`` if the process is already being profiled.
+        """
+        if self.thread and self.thread.is_alive():
+            return False
+        self.thread = threading.Thread(target=self.run, args=(seconds,),
+                                       name='profiler', daemon=True)
+        self.thread.start()
+        return True
+
+    def run(self, seconds):
+        """Profile the process for some seconds, and write the profile."""
+        logger.info('Profiling %s for %s seconds', self.name, seconds)
+        self.stacks.clear()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self.sample()
+            time.sleep(self.interval)
+        path = self.write()
+        logger.info('Profile of %s written to %s', self.name, path)
+
+    def sample(self):
+        """Sample the stacks of the threads, but the one of the profiler."""
+        ident = threading.get_ident()
+        for thread, frame in sys._current_frames().items():
+            if thread != ident:
+                self.stacks[collapse(frame)] += 1
+
+    def write(self):
+        """Write the collapsed stacks, and their number of samples, to the
+        profiling directory.
+
+        Returns:
+            str: the path of the profile.
+        """
+        path = os.path.join(directory(), '{}.{}.{}.collapsed'.format(
+            self.name, os.getpid(), int(time.time())))
+        with open(path, 'w') as profile:
+            for stack, samples in sorted(self.stacks.items()):
+                profile.write('{} {}\n'.format(stack, samples))
+        return path
+
+
+def collapse(frame):
+    """Return the stack of a frame, from the outermost call, in the
+    collapsed format: the calls separated by ``;``."""
+    calls = []
+    while frame is not None:
+        code = frame.f_code
+        calls.append('{} ({}:{})'.format(
+            code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    return ';'.join(reversed(calls))
+
+
+def install(name):
+    """Install the profiler in the process, and register the process in
+    the profiling directory.
+
+    Only the main thread of the process installs it: the other threads,
+    e.g. the ones of a node running in a single process, are profiled with
+    it.
+
+    Args:
+        name (str): the name of the process, e.g. ``block.validate_tx``.
+    """
+    global _profiler
+    if threading.current_thread() is not threading.main_thread():
+        return
+    pid = os.getpid()
+    registration = _registration(pid)
+    try:
+        os.makedirs(directory(), exist_ok=True)
+        with open(registration, 'w') as process:
+            process.write('{}\n{}'.format(name, _started(pid) or ''))
+    except OSError as exc:
+        logger.warning('Cannot register %s for profiling: %s', name, exc)
+        return
+    # run at the exit of the processes started by multiprocessing too, unlike
+    # the atexit functions
+    multiprocessing.util.Finalize(None, _unregister, args=(registration, pid),
+                                  exitpriority=0)
+    _profiler = Profiler(name)
+    signal.signal(SIGNAL, _handle)
+
+
+def _registration(pid):
+    return os.path.join(directory(), '{}.process'.format(pid))
+
+
+def _unregister(registration, pid):
+    # the processes forked afterwards inherit the finalizer
+    if os.getpid() == pid:
+        _remove(registration)
+
+
+def _remove(registration):
+    try:
+        os.remove(registration)
+    except FileNotFoundError:
+        pass
+
+
+def _started(pid):
+    """Return the start time of a process, in clock ticks since the boot, or
+    ``None`` without ``/proc``, or without the process."""
+    try:
+        with open('/proc/{}/stat'.format(pid)) as stat:
+            # the 22nd field, counted after the command, which may hold
+            # spaces and parentheses
+            return stat.read().rsplit(')', 1)[1].split()[19]
+    except (OSError, IndexError):
+        return None
+
+
+def _registered(pid, registration):
+    """Return the name of a registered process, or ``None`` if the process
+    is gone, even if its pid was reused by another process."""
+    try:
+        with open(registration) as process:
+            name, _, started = process.read().partition('\n')
+    except FileNotFoundError:
+        # unregistered meanwhile
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return None
+    except PermissionError:
+        # running, as another user
+        pass
+    if started and _started(pid) != started:
+        return None
+    return name
+
+
+def _handle(signum, frame):
+    seconds = bigchaindb.config['profiling']['seconds']
+    request = os.path.join(directory(), '{}.seconds'.format(os.getpid()))
+    try:
+        with open(request) as requested:
+            seconds = float(requested.read())
+        os.remove(request)
+    except (OSError, ValueError):
+        pass
+    if not _profiler.start(seconds):
+        logger.info('%s is already being profiled', _profiler.name)
+
+
+def processes():
+    """Return the running processes registered in the profiling directory.
+
+    The files of the processes which are gone are removed.
+
+    Returns:
+        dict: the name of each process, by pid.
+    """
+    names = {}
+    for registration in glob.glob(os.path.join(directory(), '*.process')):
+        pid = int(os.path.basename(registration).split('.')[0])
+        name = _registered(pid, registration)
+        if name is None:
+            _remove(registration)
+        else:
+            names[pid] = name
+    return names
+
+
+def request(pid, seconds=None):
+    """Switch the profiler of a process on.
+
+    Args:
+        pid (int): the process.
+        seconds (float): the seconds to profile the process (default:
+            ``profiling.seconds``).
+
+    Raises:
+        ProcessLookupError: if the process is not a registered process
+            of the node, e.g. it is gone and its pid was reused.
+    """
+    if _registered(pid, _registration(pid)) is None:
+        raise ProcessLookupError('No registered process {}'.format(pid))
+    if seconds is not None:
+        with open(os.path.join(directory(), '{}.seconds'.format(pid)), 'w') as requested:
+            requested.write(str(seconds))
+    os.kill(pid, SIGNAL)
+
+
+def clear(path):
+    """Remove the registrations of the processes of a previous run of the
+    node from a profiling directory. The profiles are kept."""
+    for pattern in ('*.process', '*.seconds'):
+        for stale in glob.glob(os.path.join(path, pattern)):
+            os.remove(stale)
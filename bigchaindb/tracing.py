@@ -0,0 +1,208 @@
+"""Sampled tracing of the transactions through the node.
+
+A sample of the transactions is traced: at each point of the way of a
+transaction, from the POST of the HTTP API to the event of the WebSocket
+server, the node appends a stamp, i.e. the id of the transaction (the id of
+the trace), the point and the time, to the trace file of the node. The
+``bigchaindb traces report`` command reads the trace files and reports the
+percentiles of the latency of each phase between two points.
+
+The votes on the block of a transaction are stamped by voter, as
+``vote:<public key>`` points: each node stamps its own vote when it writes
+it, and the votes of the other nodes when its election gets them. The report
+derives the first vote, the vote the block was decided with, and the last
+vote from them.
+
+The sample is chosen from the transaction id, so that every process, and
+every node of a federation with the same sample rate, traces the same
+transactions.
+"""
+
+import math
+import time
+
+import bigchaindb
+
+
+POINTS = (
+    'post',           # the HTTP API accepted the transaction
+    'backlog',        # the transaction is written to the backlog
+    'picked',         # BlockPipeline.filter_tx picked the transaction up
+    'validated',      # BlockPipeline.validate_tx validated it
+    'in_block',       # it is in a block, created by BlockPipeline.create
+    'block_written',  # the block is written, by BlockPipeline.write
+    'first_vote',     # the first vote on the block
+    'quorum_vote',    # the last vote before the block was decided
+    'decided',        # the election decided the block is valid or invalid
+    'event',          # the WebSocket server published the valid block
+)
+"""The points of the way of a transaction, in order."""
+
+VOTE = 'vote:'
+"""The prefix of the points of the votes, followed by the public key of the
+voter."""
+
+LAST_VOTE = 'last_vote'
+"""The point of the last vote on the block, reported apart from the way of
+the transaction, as the phase from the first vote."""
+
+PERCENTILES = (50, 90, 99)
+
+_SAMPLE_SPACE = 2 ** 32
+
+_file = None
+_path = None
+
+
+def sample_rate():
+    """Return the fraction of the transactions that are traced, between
+    0 (no tracing) and 1."""
+    return bigchaindb.config.get('tracing', {}).get('sample_rate') or 0
+
+
+def sampled(txid, rate=None):
+    """Tell if a transaction is traced.
+
+    Args:
+        txid (str): the id of the transaction, a hex digest.
+        rate (float): the sample rate (default: the one of the config).
+    """
+    if rate is None:
+        rate = sample_rate()
+    if rate <= 0:
+        return False
+    try:
+        return int(txid[:8], 16) < rate * _SAMPLE_SPACE
+    except (TypeError, ValueError):
+        return False
+
+
+def stamp(point, *txids):
+    """Stamp the transactions of the sample that reached a point.
+
+    Args:
+        point (str): one of :data:`POINTS`, or a vote (see :data:`VOTE`).
+        *txids (str): the ids of the transactions.
+    """
+    rate = sample_rate()
+    if rate <= 0:
+        return
+    now = time.time()
+    lines = ''.join('{} {} {:.6f}\n'.format(txid, point, now)
+                    for txid in txids if sampled(txid, rate))
+    if lines:
+        _write(lines)
+
+
+def _write(lines):
+    global _file, _path
+    path = bigchaindb.config['tracing']['file']
+    if _file is None or path != _path:
+        if _file is not None:
+            _file.close()
+        # unbuffered, so that the stamps of a call are appended at once,
+        # even by the processes forked with the file open
+        _file = open(path, 'ab', buffering=0)
+        _path = path
+    _file.write(lines.encode())
+
+
+def read(*paths):
+    """Read the stamps of trace files, e.g. the files of the nodes of a
+    federation.
+
+    Returns:
+        dict: the first time each transaction reached each point, by
+        transaction id and point. The votes are by voter, see
+        :data:`VOTE`.
+    """
+    traces = {}
+    for path in paths:
+        with open(path) as lines:
+            for line in lines:
+                try:
+                    txid, point, timestamp = line.split()
+                    timestamp = float(timestamp)
+                except ValueError:
+                    # e.g. the line of a write interrupted by a crash
+                    continue
+                trace = traces.setdefault(txid, {})
+                if timestamp < trace.get(point, float('inf')):
+                    trace[point] = timestamp
+    return traces
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of sorted values."""
+    rank = max(math.ceil(len(values) * percent / 100), 1)
+    return values[rank - 1]
+
+
+def votes(trace):
+    """Return a trace with the first, quorum and last votes of its votes.
+
+    The quorum vote is the last vote stamped before the block was decided.
+
+    Args:
+        trace (dict): a trace, see :func:`read`.
+    """
+    times = sorted(timestamp for point, timestamp in trace.items()
+                   if point.startswith(VOTE))
+    trace = {point: timestamp for point, timestamp in trace.items()
+             if not point.startswith(VOTE)}
+    if times:
+        trace['first_vote'] = times[0]
+        trace[LAST_VOTE] = times[-1]
+        if 'decided' in trace:
+            before = [timestamp for timestamp in times
+                      if timestamp <= trace['decided']]
+            if before:
+                trace['quorum_vote'] = before[-1]
+    return trace
+
+
+def report(traces):
+    """Return the percentiles of the latency of the phases of the traces.
+
+    A phase goes from a point to the next point of the trace: a trace
+    missing a point, e.g. because the transaction was posted to another
+    node, has a phase from the point before to the point after. The spread
+    of the votes is the phase from the first to the last vote.
+
+    Args:
+        traces (dict): see :func:`read`.
+
+    Returns:
+        list: the phase (``'<point>-><point>'``, and ``'total'``), the
+        number of traces, and the percentiles of :data:`PERCENTILES` and
+        the maximum of the latency in seconds, of each phase, in the order
+        of the points.
+    """
+    latencies = {}
+    for trace in traces.values():
+        trace = votes(trace)
+        points = [point for point in POINTS if point in trace]
+        for start, end in zip(points, points[1:]):
+            latency = trace[end] - trace[start]
+            latencies.setdefault((start, end), []).append(latency)
+        if LAST_VOTE in trace:
+            latency = trace[LAST_VOTE] - trace['first_vote']
+            latencies.setdefault(('first_vote', LAST_VOTE), []).append(latency)
+        if len(points) > 1:
+            latency = trace[points[-1]] - trace[points[0]]
+            latencies.setdefault('total', []).append(latency)
+
+    def order(phase):
+        if phase == 'total':
+            return (len(POINTS) + 1, 0)
+        return tuple(POINTS.index(point) if point in POINTS else len(POINTS)
+                     for point in phase)
+
+    rows = []
+    for phase in sorted(latencies, key=order):
+        values = sorted(latencies[phase])
+        name = phase if phase == 'total' else '->'.join(phase)
+        rows.append((name, len(values),
+                     *(percentile(values, percent) for percent in PERCENTILES),
+                     values[-1]))
+    return rows
@@ -0,0 +1,100 @@
+"""HTTP caching of the immutable resources of the API.
+
+A block that was decided valid, and a transaction in such a block, never
+change. Their responses carry a strong ETag, the id of the resource, and a
+``Cache-Control`` header telling clients and proxies they can be cached
+forever. Each worker can keep the serialized responses in a least recently
+used cache. A conditional request for such a resource is answered with a
+``304 Not Modified`` once the resource is known to be valid: from the cache,
+without reading the database, or else after reading it.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+from flask import current_app, request
+
+from bigchaindb.web.encoding import dumps
+
+
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+"""The ``Cache-Control`` header of the immutable resources."""
+
+
+class ResponseCache:
+    """A least recently used cache of serialized JSON responses.
+
+    A cache of size 0 does not keep anything.
+    """
+
+    def __init__(self, size=0):
+        """Create a new cache.
+
+        Args:
+            size (int): the maximum number of responses to keep.
+        """
+        self.size = size
+        self.responses = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        """Return the response cached for ``key``, or ``None``."""
+        with self.lock:
+            try:
+                self.responses.move_to_end(key)
+            except KeyError:
+                return None
+            return self.responses[key]
+
+    def put(self, key, body):
+        """Cache the response of ``key``, evicting the least recently used
+        one if the cache is full."""
+        if self.size <= 0:
+            return
+        with self.lock:
+            self.responses[key] = body
+            self.responses.move_to_end(key)
+            while len(self.responses) > self.size:
+                self.responses.popitem(last=False)
+
+
+def _response(resource_id, body):
+    if request.if_none_match.contains(resource_id):
+        response = current_app.response_class(b'', status=304)
+    else:
+        response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(resource_id)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+def cached_response(resource_id):
+    """Return the response of an immutable resource without reading the
+    database, if possible.
+
+    Args:
+        resource_id (str): the id of the requested block or transaction.
+
+    Returns:
+        The cached response of the resource, or ``None`` if it is not
+        cached. The response is a ``304 Not Modified`` if the request has
+        the ETag of the resource.
+    """
+    body = current_app.config['response_cache'].get(request.path)
+    if body is not None:
+        return _response(resource_id, body)
+
+
+def immutable_response(resource_id, data):
+    """Return the response of an immutable resource and cache it.
+
+    The response is a ``304 Not Modified`` if the request has the ETag of
+    the resource.
+
+    Args:
+        resource_id (str): the id of the block or transaction.
+        data (dict): the block or transaction.
+    """
+    body = dumps(data)
+    current_app.config['response_cache'].put(request.path, body)
+    return _response(resource_id, body)
@@ -0,0 +1,42 @@
+"""JSON decoding of the requests and encoding of the responses of the HTTP
+API, with rapidjson.
+
+The standard library encoder of Flask and Flask-RESTful takes a large share
+of the time of the requests with large bodies, e.g. the posted batches of
+transactions or a block of a thousand transactions.
+"""
+
+import rapidjson
+from flask import current_app, make_response, request
+from werkzeug.exceptions import BadRequest
+
+
+def dumps(data):
+    """Return the JSON string of ``data``."""
+    return rapidjson.dumps(data)
+
+
+def json_response(data, status=200):
+    """Return a JSON response, like :func:`flask.jsonify`."""
+    return current_app.response_class(dumps(data), status=status,
+                                      mimetype='application/json')
+
+
+def output_json(data, code, headers=None):
+    """The JSON representation of the Flask-RESTful resources."""
+    response = make_response(dumps(data), code)
+    response.headers.extend(headers or {})
+    return response
+
+
+def get_json():
+    """Return the decoded JSON body of the request, whatever its
+    ``Content-Type``.
+
+    Raises:
+        :exc:`~werkzeug.exceptions.BadRequest`: If the body is not JSON.
+    """
+    try:
+        return rapidjson.loads(request.get_data(as_text=True))
+    except ValueError:
+        raise BadRequest('Failed to decode JSON object')
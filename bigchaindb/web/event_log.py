@@ -0,0 +1,155 @@
+"""A bounded log, on disk, of the valid block events of the WebSocket server.
+
+The log numbers the events it keeps, so that a client reconnecting to the
+event stream can ask for the events it missed since the last one it got.
+
+It keeps at most ``size`` events in two files: the events are appended to
+the current file, and when it holds half of them, it replaces the previous
+file, and a new current file starts.
+"""
+
+import logging
+import os
+
+import rapidjson
+
+
+logger = logging.getLogger(__name__)
+
+
+class EventLog:
+    """A bounded log of the summaries of the valid blocks, see
+    :func:`bigchaindb.events.block_summary`.
+
+    The log is appended to and read from a single thread, while
+    :attr:`first`, :attr:`last` and :meth:`position` can be read from
+    others.
+    """
+
+    def __init__(self, path, *, size=1000):
+        """Open a log, or create it if the files don't exist.
+
+        Args:
+            path (str): the path of the current file of the log. The
+                previous file has the same path, with a ``.old`` suffix.
+            size (int): the maximum number of events of the log.
+        """
+        self.path = path
+        self.old_path = path + '.old'
+        self.segment_size = max(size // 2, 1)
+
+        # the sequence numbers of the blocks of the log, by block id
+        self.positions = {}
+        self.segment_length = 0
+        self.last = 0
+        for segment in (self.old_path, self.path):
+            self.segment_length = 0
+            for sequence, block in self._records(segment):
+                self.positions[block['id']] = sequence
+                self.last = sequence
+                self.segment_length += 1
+        # the sequence number of the oldest event of the log, or None if
+        # the log is empty
+        self.first = min(self.positions.values(), default=None)
+
+        self.file = open(self.path, 'a')
+        if self.file.tell() and not self._terminated():
+            # don't append to the line of an interrupted write
+            self.file.write('\n')
+        logger.info('Event log %s opened at event %s', path, self.last)
+
+    def _terminated(self):
+        with open(self.path, 'rb') as current:
+            current.seek(-1, os.SEEK_END)
+            return current.read() == b'\n'
+
+    @staticmethod
+    def _records(path):
+        try:
+            with open(path) as segment:
+                yield from _parse(segment)
+        except FileNotFoundError:
+            return
+
+    def append(self, block):
+        """Append the summary of a block.
+
+        Returns:
+            int: the sequence number of the event.
+        """
+        if self.segment_length == self.segment_size:
+            self._rotate()
+
+        self.last += 1
+        self.file.write('{} {}\n'.format(self.last, rapidjson.dumps(block)))
+        self.file.flush()
+        self.positions[block['id']] = self.last
+        self.segment_length += 1
+        if self.first is None:
+            self.first = self.last
+        return self.last
+
+    def _rotate(self):
+        self.file.close()
+        os.replace(self.path, self.old_path)
+        self.file = open(self.path, 'a')
+        self.segment_length = 0
+
+        first = self.last - self.segment_size + 1
+        self.positions = {block_id: sequence
+                          for block_id, sequence in self.positions.items()
+                          if sequence >= first}
+        self.first = min(self.positions.values(), default=None)
+
+    def position(self, block_id):
+        """Return the sequence number of the event of a block, or ``None``
+        if the block is not in the log."""
+        return self.positions.get(block_id)
+
+    def read(self, after, before):
+        """Read the events between two sequence numbers.
+
+        The files are opened right away, so that the events are still read
+        if the log drops them in the meantime.
+
+        Args:
+            after (int): the events read come after this one.
+            before (int): the events read come before this one.
+
+        Returns:
+            An iterator of the sequence numbers and blocks of the events.
+        """
+        segments = []
+        for path in (self.old_path, self.path):
+            try:
+                segments.append(open(path))
+            except FileNotFoundError:
+                pass
+
+        def records():
+            try:
+                for segment in segments:
+                    for sequence, block in _parse(segment):
+                        if sequence >= before:
+                            return
+                        if sequence > after:
+                            yield sequence, block
+            finally:
+                for segment in segments:
+                    segment.close()
+
+        return records()
+
+    def close(self):
+        self.file.close()
+
+
+def _parse(lines):
+    for line in lines:
+        try:
+            sequence, block = line.split(' ', 1)
+            sequence, block = int(sequence), rapidjson.loads(block)
+        except ValueError:
+            # e.g. the line of a write interrupted by a crash
+            continue
+        yield sequence, block
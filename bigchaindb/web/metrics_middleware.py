@@ -0,0 +1,61 @@
+import time
+
+from werkzeug.exceptions import HTTPException
+from werkzeug.wsgi import ClosingIterator
+
+from bigchaindb.metrics import HTTP_REQUEST_DURATION, HTTP_RESPONSES
+
+
+UNMATCHED = '<unmatched>'
+"""The route of the requests to a path of no route, e.g. of a 404."""
+
+
+class MetricsMiddleware:
+    """WSGI middleware to record the latency and the status code of the
+    responses, by route."""
+
+    def __init__(self, app, url_map):
+        """Create the new middleware.
+
+        Args:
+            app: a WSGI application.
+            url_map (:class:`~werkzeug.routing.Map`): the routes of the
+                application, so that the metrics of e.g.
+                ``/api/v1/transactions/<tx_id>`` are not split by
+                transaction id.
+        """
+        self.app = app
+        self.url_map = url_map
+
+    def route(self, environ):
+        try:
+            rule, _ = self.url_map.bind_to_environ(environ).match(return_rule=True)
+        except HTTPException:
+            # e.g. a 404, or a redirect
+            return UNMATCHED
+        return rule.rule
+
+    def __call__(self, environ, start_response):
+        """Call the WSGI application, and record the metrics of the
+        response once its body is sent."""
+        start = time.perf_counter()
+        method = environ['REQUEST_METHOD']
+        route = self.route(environ)
+        status = []
+
+        def recording_start_response(status_line, headers, exc_info=None):
+            status[:] = [status_line.split(' ', 1)[0]]
+            return start_response(status_line, headers, exc_info)
+
+        def record():
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start,
+                                          method=method, route=route)
+            HTTP_RESPONSES.inc(method=method, route=route,
+                               status=status[0] if status else '500')
+
+        try:
+            response = self.app(environ, recording_start_response)
+        except Exception:
+            record()
+            raise
+        return ClosingIterator(response, record)
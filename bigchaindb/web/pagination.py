@@ -0,0 +1,167 @@
+"""Cursor pagination and streaming of the list endpoints of the API.
+
+With a ``limit``, a list endpoint returns a page of results and, if there are
+more, a ``Link`` header to the next page. The link carries an opaque
+``cursor``: the key of the last result of the page, from which the database
+query of the next page starts.
+
+Without a ``limit``, the whole list is streamed in chunks, so that exporting
+a long list does not need to hold it in memory.
+"""
+
+import base64
+import binascii
+from itertools import islice
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+from bigchaindb.web.encoding import dumps, json_response
+
+
+MAX_LIMIT = 1000
+"""The maximum number of results of a page."""
+
+CHUNK_SIZE = 100
+"""The number of results in a chunk of a streamed response."""
+
+_END = object()
+
+
+def encode_cursor(key):
+    """Return the opaque cursor of a key."""
+    return base64.urlsafe_b64encode(str(key).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return the key of an opaque cursor.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    try:
+        return base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+
+def _close(results):
+    # release what the results hold, e.g. a Bigchain instance of the pool
+    close = getattr(results, 'close', None)
+    if close:
+        close()
+
+
+def pooled_results(query):
+    """Return the results of a query holding a Bigchain instance of the pool
+    until they are all read or closed.
+
+    Args:
+        query: a function of a :class:`~bigchaindb.Bigchain` returning an
+            iterable of results.
+    """
+    pool = current_app.config['bigchain_pool']
+
+    def results():
+        with pool() as bigchain:
+            try:
+                yield from query(bigchain)
+            except GeneratorExit:
+                # leave the block normally, so the instance goes back to
+                # the pool
+                return
+
+    return results()
+
+
+def take_page(results, limit, key):
+    """Read a page of results.
+
+    The page has the first ``limit`` results, and the following ones with
+    the same key as the last of them, so that the next page can start after
+    that key.
+
+    Args:
+        results: an iterable of the results, in the order of their keys.
+        limit (int): the number of results of the page.
+        key: a function returning the key of a result.
+
+    Returns:
+        tuple: the page, and the cursor of the next page or ``None`` if
+        there are no more results.
+    """
+    results = iter(results)
+    try:
+        page = list(islice(results, limit))
+        following = next(results, _END)
+        while following is not _END and key(following) == key(page[-1]):
+            page.append(following)
+            following = next(results, _END)
+    finally:
+        _close(results)
+
+    if following is _END:
+        return page, None
+    return page, encode_cursor(key(page[-1]))
+
+
+def next_page_link(path, args, cursor):
+    """Return the ``Link`` header to the next page of a list endpoint."""
+    args = dict(args, cursor=cursor)
+    return '<{}?{}>; rel="next"'.format(path, urlencode(args))
+
+
+def paginated_response(results, limit, key, serialize=lambda result: result):
+    """Return a response with a page of results.
+
+    Args:
+        results: an iterable of the results, in the order of their keys.
+        limit (int): the number of results of the page.
+        key: a function returning the key of a result.
+        serialize: a function returning the JSON serializable form of a
+            result.
+    """
+    page, cursor = take_page(results, limit, key)
+
+    response = json_response([serialize(result) for result in page])
+    if cursor:
+        response.headers['Link'] = next_page_link(
+            request.path, request.args.to_dict(), cursor)
+    return response
+
+
+def streamed_response(results, serialize=lambda result: result):
+    """Return a response streaming the results as a JSON list.
+
+    The first result is read before the response starts, so that the
+    errors of the query can still be reported with an error status.
+
+    Args:
+        results: an iterable of the results.
+        serialize: a function returning the JSON serializable form of a
+            result.
+    """
+    results = iter(results)
+    first = next(results, _END)
+
+    def generate():
+        if first is _END:
+            yield '[]'
+            return
+
+        try:
+            chunk = [dumps(serialize(first))]
+            separator = '['
+            for result in results:
+                chunk.append(dumps(serialize(result)))
+                if len(chunk) == CHUNK_SIZE:
+                    yield separator + ','.join(chunk)
+                    chunk, separator = [], ','
+            if chunk:
+                yield separator + ','.join(chunk)
+            yield ']'
+        finally:
+            _close(results)
+
+    return current_app.response_class(generate(),
+                                      mimetype='application/json')
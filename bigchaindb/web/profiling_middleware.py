@@ -0,0 +1,176 @@
+import cProfile
+import hmac
+import os
+import pstats
+import re
+import threading
+import time
+
+from pymongo import monitoring
+
+from bigchaindb import profiling
+from bigchaindb.backend import query
+
+
+HEADER = 'X-BigchainDB-Profile'
+"""The header of the requests to profile, with the token of
+``profiling.request_token``, and of the responses, with the name of the
+file of the profile."""
+
+_QUERY_MODULE = re.compile(r'[\\/]backend[\\/]\w+[\\/]query\.py$')
+_CONNECTION_MODULE = re.compile(r'[\\/]backend[\\/]\w+[\\/]connection\.py$')
+
+# the seconds of the MongoDB commands of the request profiled by the thread
+_commands = threading.local()
+_listener = None
+
+
+class CommandListener(monitoring.CommandListener):
+    """Records the durations of the MongoDB commands of the profiled
+    requests, including the ``getMore`` commands of the cursors, which run
+    while the results are iterated, after the query returned.
+
+    The commands are published in the thread running them.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.record(event)
+
+    def failed(self, event):
+        self.record(event)
+
+    @staticmethod
+    def record(event):
+        durations = getattr(_commands, 'durations', None)
+        if durations is not None:
+            durations.append(event.duration_micros / 1e6)
+
+
+class ProfilingMiddleware:
+    """WSGI middleware to profile the requests with the profiling token.
+
+    The response of a profiled request gets a ``Server-Timing`` header with
+    the duration of the request, the round trips to the database (the
+    commands seen by a :class:`CommandListener` with MongoDB), and the
+    calls and the duration of each function of ``backend.query``, see
+    :func:`queries`. The full
+    profile is written to the profiling directory, as a :mod:`pstats`
+    file, whose name is in the :data:`HEADER` header of the response.
+    """
+
+    def __init__(self, app, token):
+        """Create the new middleware.
+
+        Args:
+            app: a WSGI application.
+            token (str): the secret token of the requests to profile.
+        """
+        self.app = app
+        self.token = token.encode()
+
+        global _listener
+        if _listener is None:
+            # seen by the MongoDB clients created afterwards, before the
+            # workers connect
+            _listener = CommandListener()
+            monitoring.register(_listener)
+
+    def __call__(self, environ, start_response):
+        token = environ.get('HTTP_' + HEADER.upper().replace('-', '_'))
+        if token and hmac.compare_digest(token.encode(), self.token):
+            return self.profile(environ, start_response)
+        return self.app(environ, start_response)
+
+    def profile(self, environ, start_response):
+        """Call the WSGI application under the profiler.
+
+        The body is read before the response starts, so that the headers
+        have the profile of the whole request.
+        """
+        response = []
+        body = []
+
+        def buffering_start_response(status, headers, exc_info=None):
+            response[:] = [status, headers, exc_info]
+            return body.append
+
+        profiler = cProfile.Profile()
+        _commands.durations = []
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            iterable = self.app(environ, buffering_start_response)
+            try:
+                body.extend(iterable)
+            finally:
+                if hasattr(iterable, 'close'):
+                    iterable.close()
+        finally:
+            profiler.disable()
+            commands, _commands.durations = _commands.durations, None
+        duration = time.perf_counter() - start
+
+        stats = pstats.Stats(profiler)
+        os.makedirs(profiling.directory(), exist_ok=True)
+        path = os.path.join(profiling.directory(), 'request.{}.{}.prof'.format(
+            os.getpid(), int(time.time() * 1000)))
+        stats.dump_stats(path)
+
+        status, headers, exc_info = response
+        headers = headers + [
+            ('Server-Timing', server_timing(duration, *queries(stats, commands))),
+            (HEADER, os.path.basename(path)),
+        ]
+        start_response(status, headers, exc_info)
+        return body
+
+
+def queries(stats, commands=None):
+    """Return the database queries of a profile.
+
+    With MongoDB, the round trips are the commands of the request, including
+    the ``getMore`` commands fetching the next batches of a cursor. With the
+    other backends, they are the calls to the ``run`` method of the
+    connection, which miss the later fetches of a RethinkDB cursor.
+
+    The functions are the implementations of the functions of
+    ``backend.query``, not the helpers, lambdas or comprehensions of the
+    query modules. The seconds of a function are the time of its calls: the
+    functions returning a cursor or a generator, e.g. ``get_owned_ids``,
+    read the database later, when the caller iterates the results, and that
+    time is not counted in the function, only in the round trips.
+
+    Args:
+        stats (:class:`pstats.Stats`): the profile.
+        commands (list): the seconds of each MongoDB command of the
+            request, see :class:`CommandListener`.
+
+    Returns:
+        tuple: the round trips to the database, the seconds they took, and
+        the calls and the seconds of each function of ``backend.query``, by
+        name.
+    """
+    round_trips, database, functions = 0, 0, {}
+    for (filename, _, name), (_, calls, _, cumulative, _) in stats.stats.items():
+        if name == 'run' and _CONNECTION_MODULE.search(filename):
+            round_trips += calls
+            database += cumulative
+        elif name in vars(query) and _QUERY_MODULE.search(filename):
+            previous_calls, previous_time = functions.get(name, (0, 0))
+            functions[name] = (previous_calls + calls, previous_time + cumulative)
+    if commands:
+        round_trips, database = len(commands), sum(commands)
+    return round_trips, database, functions
+
+
+def server_timing(duration, round_trips, database, functions):
+    """Return the ``Server-Timing`` header of a profiled request, see
+    :func:`queries`. The functions come slowest first."""
+    metrics = ['total;dur={:.1f}'.format(duration * 1000),
+               'db;dur={:.1f};desc="{} round trips"'.format(database * 1000, round_trips)]
+    for name, (calls, seconds) in sorted(functions.items(), key=lambda item: -item[1][1]):
+        metrics.append('query.{};dur={:.1f};desc="{} calls"'.format(name, seconds * 1000, calls))
+    return ', '.join(metrics)
@@ -0,0 +1,296 @@
+"""Asynchronous read API, served by the WebSocket server.
+
+The read endpoints of the HTTP API do little more than wait on the
+database. Served by the event loop of the WebSocket server, each request
+only takes a thread of an executor for the time of its queries, so a
+process can serve many concurrent reads, while the Flask app of the HTTP
+API keeps serving the writes.
+
+The endpoints have the same paths, parameters and responses as their
+Flask counterparts.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from bigchaindb import Bigchain
+from bigchaindb.web.caching import CACHE_CONTROL
+from bigchaindb.web.pagination import MAX_LIMIT, decode_cursor, next_page_link, take_page
+from bigchaindb.web.views import parameters
+from bigchaindb.web.views.statuses import DECIDED_BLOCK, DECIDED_TRANSACTION
+
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def local_bigchain():
+    """Return the :class:`~bigchaindb.Bigchain` of the current thread.
+
+    Each thread of an executor has its own instance, and so its own
+    database connection.
+    """
+    try:
+        return _local.bigchain
+    except AttributeError:
+        _local.bigchain = Bigchain()
+        return _local.bigchain
+
+
+def _query(request, func):
+    """Run ``func`` with a :class:`~bigchaindb.Bigchain` in the executor
+    of the read API."""
+    app = request.app
+    return app.loop.run_in_executor(app['read_executor'],
+                                    lambda: func(local_bigchain()))
+
+
+def _error(status_code, message=None):
+    if status_code == 404 and message is None:
+        message = 'Not found'
+    return web.json_response({'status': status_code, 'message': message},
+                             status=status_code)
+
+
+def _parse(request, arguments):
+    """Parse and validate the query parameters of a request.
+
+    Args:
+        arguments (dict): the parsers of the accepted parameters, by name.
+            The required parameters are marked by a ``(parser, True)``
+            tuple.
+
+    Returns:
+        tuple: the parsed parameters, or ``None``, and the error response.
+    """
+    query = request.query
+    unknown = set(query) - set(arguments)
+    if unknown:
+        return None, _error(400, 'Unknown arguments: {}'.format(', '.join(sorted(unknown))))
+
+    args = {}
+    for name, parser in arguments.items():
+        parser, required = parser if isinstance(parser, tuple) else (parser, False)
+        if name not in query:
+            if required:
+                return None, _error(400, {name: 'Missing required parameter'})
+            args[name] = None
+            continue
+        try:
+            args[name] = parser(query[name])
+        except ValueError as e:
+            return None, _error(400, {name: str(e)})
+    return args, None
+
+
+def _immutable_response(request, resource_id, body):
+    """Return the response of a resource which never changes, with its id
+    as ETag, see :mod:`bigchaindb.web.caching`: a ``304 Not Modified`` if
+    the request has a matching ``If-None-Match``."""
+    etag = '"{}"'.format(resource_id)
+    tags = {tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')}
+    if tags & {'*', etag, 'W/' + etag}:
+        response = web.Response(status=304)
+    else:
+        response = web.json_response(body)
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+@asyncio.coroutine
+def get_transaction(request):
+    """Return a transaction of a valid block."""
+    tx_id = request.match_info['tx_id']
+    tx, status = yield from _query(
+        request, lambda bigchain: bigchain.get_transaction(tx_id, include_status=True))
+
+    if not tx or status != Bigchain.TX_VALID:
+        return _error(404)
+
+    return _immutable_response(request, tx_id, tx.to_dict())
+
+
+@asyncio.coroutine
+def get_status(request):
+    """Return the status of a transaction or a block.
+
+    With a ``wait``, the request waits up to ``wait`` seconds for the
+    transaction to be in a valid block, or for the block to be decided. The
+    waiting requests are woken up by the block events of the election,
+    without querying the database.
+    """
+    args, error = _parse(request, {'transaction_id': str, 'block_id': str,
+                                   'wait': parameters.valid_wait})
+    if error:
+        return error
+
+    tx_id = args['transaction_id']
+    block_id = args['block_id']
+
+    # logical xor - exactly one query argument required
+    if bool(tx_id) == bool(block_id):
+        return _error(400, 'Provide exactly one query parameter. Choices are: block_id, transaction_id')
+
+    def status(bigchain):
+        if tx_id:
+            return bigchain.get_status(tx_id)
+        _, status = bigchain.get_block(block_id=block_id, include_status=True)
+        return status
+
+    if not args['wait']:
+        status = yield from _query(request, status)
+    else:
+        decided = DECIDED_TRANSACTION if tx_id else DECIDED_BLOCK
+        status = yield from _wait_for_status(request, tx_id or block_id, status,
+                                             args['wait'], decided)
+
+    if not status:
+        return _error(404)
+
+    return web.json_response({'status': status})
+
+
+@asyncio.coroutine
+def _wait_for_status(request, key, status, timeout, decided):
+    dispatcher = request.app['dispatcher']
+    deadline = asyncio.get_event_loop().time() + timeout
+    while True:
+        # waiting from before the query, so that no event is missed
+        waiter = dispatcher.waiter(key)
+        try:
+            current = yield from _query(request, status)
+            remaining = deadline - asyncio.get_event_loop().time()
+            if current in decided or remaining <= 0:
+                return current
+
+            # a transaction of an invalid block goes back to the backlog,
+            # and on to another block, so the wait goes on after any event
+            try:
+                yield from asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                return (yield from _query(request, status))
+        finally:
+            dispatcher.forget(key, waiter)
+
+
+@asyncio.coroutine
+def get_block(request):
+    """Return a block."""
+    block_id = request.match_info['block_id']
+    block, status = yield from _query(
+        request, lambda bigchain: bigchain.get_block(block_id=block_id, include_status=True))
+
+    if not block:
+        return _error(404)
+
+    # the votes can still change the status of an undecided block
+    if status == Bigchain.BLOCK_VALID:
+        return _immutable_response(request, block_id, block)
+    return web.json_response(block)
+
+
+def _valid_block_status(status):
+    status = status.lower()
+    if status in (Bigchain.BLOCK_VALID, Bigchain.BLOCK_INVALID, Bigchain.BLOCK_UNDECIDED):
+        return status
+    raise ValueError('Status must be one of valid, invalid, undecided')
+
+
+@asyncio.coroutine
+def get_blocks(request):
+    """Return the ids of the blocks containing a transaction."""
+    args, error = _parse(request, {'transaction_id': (str, True),
+                                   'status': _valid_block_status})
+    if error:
+        return error
+
+    block_statuses = yield from _query(
+        request, lambda bigchain: bigchain.get_blocks_status_containing_tx(args['transaction_id']))
+
+    return web.json_response([block_id for block_id, block_status in block_statuses.items()
+                              if not args['status'] or block_status == args['status']])
+
+
+@asyncio.coroutine
+def get_outputs(request):
+    """Return the links to the outputs of a public key.
+
+    Without a ``limit``, the outputs are streamed, read a page of
+    :data:`~bigchaindb.web.pagination.MAX_LIMIT` outputs at once, as in
+    :func:`~bigchaindb.web.pagination.streamed_response`.
+    """
+    args, error = _parse(request, {'public_key': (parameters.valid_ed25519, True),
+                                   'spent': parameters.valid_bool,
+                                   'limit': parameters.valid_limit,
+                                   'cursor': parameters.valid_cursor})
+    if error:
+        return error
+
+    def page(last_id, limit):
+        def outputs(bigchain):
+            outputs = bigchain.iter_outputs_filtered(
+                args['public_key'], args['spent'], last_id=last_id)
+            # the outputs of a block are never split across pages
+            outputs, cursor = take_page(outputs, limit, key=lambda output: output[0])
+            return [{'transaction_id': link.txid, 'output_index': link.output}
+                    for _, link in outputs], cursor
+        return _query(request, outputs)
+
+    if args['limit']:
+        outputs, cursor = yield from page(args['cursor'], args['limit'])
+        response = web.json_response(outputs)
+        if cursor:
+            response.headers['Link'] = next_page_link(request.path, request.query, cursor)
+        return response
+
+    # the first page is read before the response starts, so that the errors
+    # of the query can still be reported with an error status
+    outputs, cursor = yield from page(args['cursor'], MAX_LIMIT)
+    response = web.StreamResponse(headers={'Content-Type': 'application/json'})
+    yield from response.prepare(request)
+    separator = '['
+    while True:
+        if outputs:
+            yield from response.write(
+                (separator + ','.join(map(json.dumps, outputs))).encode())
+            separator = ','
+        if not cursor:
+            break
+        outputs, cursor = yield from page(decode_cursor(cursor), MAX_LIMIT)
+    yield from response.write(b'[]' if separator == '[' else b']')
+    yield from response.write_eof()
+    return response
+
+
+PREFIX = '/api/v1/'
+
+ROUTES = [
+    ('blocks/{block_id}', get_block),
+    ('blocks/', get_blocks),
+    ('statuses/', get_status),
+    ('transactions/{tx_id}', get_transaction),
+    ('outputs/', get_outputs),
+]
+
+
+def add_routes(app, *, threads):
+    """Serve the read API from an aiohttp application.
+
+    Args:
+        app: an aiohttp application.
+        threads (int): the number of threads running the queries.
+    """
+    app['read_executor'] = ThreadPoolExecutor(max_workers=threads)
+    for path, handler in ROUTES:
+        app.router.add_get(PREFIX + path, handler)
+        if path.endswith('/'):
+            # like the Flask app, accept the paths without a trailing slash
+            app.router.add_get(PREFIX + path.rstrip('/'), handler)
+    logger.info('Read API served with %s threads', threads)
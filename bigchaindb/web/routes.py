@@ -1,9 +1,12 @@
 """ API routes definition """
 from flask_restful import Api
+
+from bigchaindb.web.encoding import output_json
 from bigchaindb.web.views import (
     assets,
     blocks,
     info,
+    metrics,
     statuses,
     transactions as tx,
     outputs,
@@ -15,6 +18,7 @@ def add_routes(app):
     """ Add the routes to an app """
     for (prefix, routes) in API_SECTIONS:
         api = Api(app, prefix=prefix)
+        api.representations['application/json'] = output_json
         for ((pattern, resource, *args), kwargs) in routes:
             kwargs.setdefault('strict_slashes', False)
             api.add_resource(resource, pattern, *args, **kwargs)
@@ -30,6 +34,7 @@ ROUTES_API_V1 = [
     r('blocks/<string:block_id>', blocks.BlockApi),
     r('blocks/', blocks.BlockListApi),
     r('statuses/', statuses.StatusApi),
+    r('transactions/batch', tx.TransactionBatchApi),
     r('transactions/<string:tx_id>', tx.TransactionApi),
     r('transactions', tx.TransactionListApi),
     r('outputs/', outputs.OutputListApi),
@@ -38,6 +43,7 @@ ROUTES_API_V1 = [
 
 
 API_SECTIONS = [
-    (None, [r('/', info.RootIndex)]),
+    (None, [r('/', info.RootIndex),
+            r('/metrics', metrics.MetricsApi)]),
     ('/api/v1/', ROUTES_API_V1),
 ]
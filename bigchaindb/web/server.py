@@ -5,13 +5,20 @@ The application is implemented in Flask and runs using Gunicorn.
 
 import copy
 import multiprocessing
+from functools import partial
 
 from flask import Flask
 from flask_cors import CORS
 import gunicorn.app.base
+from werkzeug.serving import make_server
 
-from bigchaindb import utils
+import bigchaindb
+from bigchaindb import backend
+from bigchaindb import profiling, utils
 from bigchaindb import Bigchain
+from bigchaindb.web.caching import ResponseCache
+from bigchaindb.web.metrics_middleware import MetricsMiddleware
+from bigchaindb.web.profiling_middleware import ProfilingMiddleware
 from bigchaindb.web.routes import add_routes
 from bigchaindb.web.strip_content_type_middleware import StripContentTypeMiddleware
 
@@ -49,13 +56,15 @@ class StandaloneApplication(gunicorn.app.base.BaseApplication):
         return self.application
 
 
-def create_app(*, debug=False, threads=1):
+def create_app(*, debug=False, threads=1, cache_size=0):
     """Return an instance of the Flask application.
 
     Args:
         debug (bool): a flag to activate the debug mode for the app
             (default: False).
         threads (int): number of threads to use
+        cache_size (int): number of immutable responses to cache
+            (default: 0).
     Return:
         an instance of the Flask application.
     """
@@ -67,13 +76,32 @@ def create_app(*, debug=False, threads=1):
 
     app.debug = debug
 
-    app.config['bigchain_pool'] = utils.pool(Bigchain, size=threads)
+    builder = Bigchain
+    if threads > 1:
+        # The connection does not connect before its first query, which a
+        # worker makes after the fork, so the threads of each worker share
+        # their own connection.
+        connection = backend.connect(**bigchaindb.config['database'])
+        if connection.thread_safe:
+            builder = partial(Bigchain, connection=connection)
+
+    app.config['bigchain_pool'] = utils.pool(builder, size=threads)
+    app.config['response_cache'] = ResponseCache(cache_size)
 
     add_routes(app)
+    token = bigchaindb.config['profiling']['request_token']
+    if token:
+        app.wsgi_app = ProfilingMiddleware(app.wsgi_app, token)
+    app.wsgi_app = MetricsMiddleware(app.wsgi_app, app.url_map)
 
     return app
 
 
+def _install_profiler(worker):
+    # after the worker set its own signal handlers up
+    profiling.install('webapi')
+
+
 def create_server(settings):
     """Wrap and return an application ready to be run.
 
@@ -91,13 +119,37 @@ def create_server(settings):
         settings['workers'] = (multiprocessing.cpu_count() * 2) + 1
 
     if not settings.get('threads'):
-        # Note: Threading is not recommended currently, as the frontend workload
-        # is largely CPU bound and parallisation across Python threads makes it
-        # slower.
+        # Note: Threading only helps the requests waiting on the database,
+        # e.g. the reads of a read heavy deployment. The validation of the
+        # posted transactions is CPU bound and parallelising it across
+        # Python threads makes it slower.
         settings['threads'] = 1
+    settings['threads'] = int(settings['threads'])
 
     settings['logger_class'] = 'bigchaindb.log.loggers.HttpServerLogger'
+    settings['post_worker_init'] = _install_profiler
     app = create_app(debug=settings.get('debug', False),
-                     threads=settings['threads'])
+                     threads=settings['threads'],
+                     cache_size=settings.get('cache_size', 0))
     standalone = StandaloneApplication(app, options=settings)
     return standalone
+
+
+def create_threaded_server(settings):
+    """Return a server running the application in threads of the current
+    process instead of Gunicorn workers, e.g. for the memory backend, whose
+    databases are the ones of a process.
+
+    Args:
+        settings (dict): the settings of :func:`create_server`, of which
+            ``bind``, ``threads``, ``debug`` and ``cache_size`` apply.
+
+    Return:
+        a :class:`werkzeug.serving.BaseWSGIServer`, to run with
+        ``serve_forever``.
+    """
+    host, _, port = settings['bind'].rpartition(':')
+    app = create_app(debug=settings.get('debug', False),
+                     threads=int(settings.get('threads') or 1),
+                     cache_size=settings.get('cache_size', 0))
+    return make_server(host, int(port), app, threaded=True)
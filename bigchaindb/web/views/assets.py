@@ -5,9 +5,11 @@ For more information please refer to the documentation: http://bigchaindb.com/ht
 import logging
 
 from flask_restful import reqparse, Resource
-from flask import current_app
 
 from bigchaindb.backend.exceptions import OperationError
+from bigchaindb.web.pagination import (paginated_response, pooled_results,
+                                       streamed_response)
+from bigchaindb.web.views import parameters
 from bigchaindb.web.views.base import make_error
 
 logger = logging.getLogger(__name__)
@@ -20,31 +22,54 @@ class AssetListApi(Resource):
         Args:
             search (str): Text search string to query the text index
             limit (int, optional): Limit the number of returned documents.
+            cursor (str, optional): The cursor of the page to return.
 
         Return:
             A list of assets that match the query.
         """
         parser = reqparse.RequestParser()
         parser.add_argument('search', type=str, required=True)
-        parser.add_argument('limit', type=int)
+        parser.add_argument('limit', type=parameters.valid_limit)
+        parser.add_argument('cursor', type=parameters.valid_cursor)
         args = parser.parse_args()
 
         if not args['search']:
             return make_error(400, 'text_search cannot be empty')
-        if not args['limit']:
-            # if the limit is not specified do not pass None to `text_search`
-            del args['limit']
 
-        pool = current_app.config['bigchain_pool']
+        # the assets are sorted by text score and id, so the cursor of a
+        # page is the score and the id of its last asset, from which the
+        # search of the next page starts
+        try:
+            after = _parse_rank(args['cursor']) if args['cursor'] else None
+        except ValueError:
+            return make_error(400, 'Invalid cursor')
 
-        with pool() as bigchain:
-            assets = bigchain.text_search(**args)
+        assets = pooled_results(
+            lambda bigchain: bigchain.text_search(args['search'],
+                                                  text_score=True,
+                                                  after=after))
 
         try:
             # This only works with MongoDB as the backend
-            return list(assets)
+            if args['limit']:
+                return paginated_response(assets, args['limit'],
+                                          key=_rank, serialize=_asset)
+            return streamed_response(assets, serialize=_asset)
         except OperationError as e:
             return make_error(
                 400,
                 '({}): {}'.format(type(e).__name__, e)
             )
+
+
+def _rank(asset):
+    return '{!r}:{}'.format(asset['score'], asset['id'])
+
+
+def _parse_rank(rank):
+    score, asset_id = rank.split(':', 1)
+    return float(score), asset_id
+
+
+def _asset(asset):
+    return {key: value for key, value in asset.items() if key != 'score'}
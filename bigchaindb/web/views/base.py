@@ -3,9 +3,10 @@ Common classes and methods for API handlers
 """
 import logging
 
-from flask import jsonify, request
+from flask import request
 
 from bigchaindb import config
+from bigchaindb.web.encoding import json_response
 
 
 logger = logging.getLogger(__name__)
@@ -21,9 +22,7 @@ def make_error(status_code, message=None):
 
     logger.error('HTTP API error: %(status)s - %(method)s:%(path)s - %(message)s', request_info)
 
-    response = jsonify(response_content)
-    response.status_code = status_code
-    return response
+    return json_response(response_content, status=status_code)
 
 
 def base_ws_uri():
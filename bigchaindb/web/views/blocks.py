@@ -6,6 +6,7 @@ from flask import current_app
 from flask_restful import Resource, reqparse
 
 from bigchaindb import Bigchain
+from bigchaindb.web.caching import cached_response, immutable_response
 from bigchaindb.web.views.base import make_error
 
 
@@ -20,14 +21,23 @@ class BlockApi(Resource):
             A JSON string containing the data about the block.
         """
 
+        response = cached_response(block_id)
+        if response:
+            return response
+
         pool = current_app.config['bigchain_pool']
 
         with pool() as bigchain:
-            block = bigchain.get_block(block_id=block_id)
+            block, status = bigchain.get_block(block_id=block_id,
+                                               include_status=True)
 
         if not block:
             return make_error(404)
 
+        # the votes can still change the status of an undecided block
+        if status == bigchain.BLOCK_VALID:
+            return immutable_response(block_id, block)
+
         return block
 
 
@@ -1,9 +1,9 @@
 """ API Index endpoint """
 
-import flask
 from flask_restful import Resource
 
 import bigchaindb
+from bigchaindb.web.encoding import json_response
 from bigchaindb.web.views.base import base_ws_uri
 from bigchaindb import version
 from bigchaindb.web.websocket_server import EVENTS_ENDPOINT
@@ -15,7 +15,7 @@ class RootIndex(Resource):
             'https://docs.bigchaindb.com/projects/server/en/v',
             version.__version__ + '/'
         ]
-        return flask.jsonify({
+        return json_response({
             'api': {
                 'v1': get_api_v1_info('/api/v1/')
             },
@@ -29,7 +29,7 @@ class RootIndex(Resource):
 
 class ApiV1Index(Resource):
     def get(self):
-        return flask.jsonify(get_api_v1_info('/'))
+        return json_response(get_api_v1_info('/'))
 
 
 def get_api_v1_info(api_prefix):
@@ -0,0 +1,25 @@
+"""This module provides the blueprint for the metrics endpoint.
+
+For more information please refer to the documentation: http://bigchaindb.com/http-api
+"""
+
+from flask import current_app
+from flask_restful import Resource
+
+from bigchaindb import metrics
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+"""The content type of the Prometheus text format."""
+
+
+class MetricsApi(Resource):
+    def get(self):
+        """API endpoint to get the metrics of the node.
+
+        Return:
+            The latency histograms and the counters of the node, in the
+            Prometheus text format.
+        """
+        return current_app.response_class(metrics.render(),
+                                          content_type=CONTENT_TYPE)
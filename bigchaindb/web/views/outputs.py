@@ -1,6 +1,7 @@
-from flask import current_app
 from flask_restful import reqparse, Resource
 
+from bigchaindb.web.pagination import (paginated_response, pooled_results,
+                                       streamed_response)
 from bigchaindb.web.views import parameters
 
 
@@ -10,17 +11,28 @@ class OutputListApi(Resource):
         outputs.
 
             Returns:
-                A :obj:`list` of :cls:`str` of links to outputs.
+                A :obj:`list` of :cls:`str` of links to outputs, a page of
+                them if a ``limit`` is given.
         """
         parser = reqparse.RequestParser()
         parser.add_argument('public_key', type=parameters.valid_ed25519,
                             required=True)
         parser.add_argument('spent', type=parameters.valid_bool)
+        parser.add_argument('limit', type=parameters.valid_limit)
+        parser.add_argument('cursor', type=parameters.valid_cursor)
         args = parser.parse_args(strict=True)
 
-        pool = current_app.config['bigchain_pool']
-        with pool() as bigchain:
-            outputs = bigchain.get_outputs_filtered(args['public_key'],
-                                                    args['spent'])
-            return [{'transaction_id': output.txid, 'output_index': output.output}
-                    for output in outputs]
+        outputs = pooled_results(
+            lambda bigchain: bigchain.iter_outputs_filtered(
+                args['public_key'], args['spent'], last_id=args['cursor']))
+
+        def serialize(output):
+            _, link = output
+            return {'transaction_id': link.txid, 'output_index': link.output}
+
+        if args['limit']:
+            # the outputs of a block are never split across pages
+            return paginated_response(outputs, args['limit'],
+                                      key=lambda output: output[0],
+                                      serialize=serialize)
+        return streamed_response(outputs, serialize=serialize)
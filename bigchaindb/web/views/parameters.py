@@ -1,5 +1,11 @@
 import re
 
+from bigchaindb.web.pagination import MAX_LIMIT, decode_cursor
+
+
+MAX_WAIT = 60
+"""The maximum number of seconds a request waits for a status."""
+
 
 def valid_txid(txid):
     if re.match('^[a-fA-F0-9]{64}$', txid):
@@ -30,3 +36,21 @@ def valid_operation(op):
     if op == 'TRANSFER':
         return 'TRANSFER'
     raise ValueError('Operation must be "CREATE" or "TRANSFER')
+
+
+def valid_limit(limit):
+    limit = int(limit)
+    if 0 < limit <= MAX_LIMIT:
+        return limit
+    raise ValueError('Limit must be between 1 and {}'.format(MAX_LIMIT))
+
+
+def valid_cursor(cursor):
+    return decode_cursor(cursor)
+
+
+def valid_wait(wait):
+    wait = float(wait)
+    if 0 < wait <= MAX_WAIT:
+        return wait
+    raise ValueError('Wait must be between 0 and {} seconds'.format(MAX_WAIT))
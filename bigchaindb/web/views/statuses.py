@@ -2,16 +2,39 @@
 
 For more information please refer to the documentation: http://bigchaindb.com/http-api
 """
-from flask import current_app
+from flask import current_app, redirect, request
 from flask_restful import Resource, reqparse
 
+import bigchaindb
+from bigchaindb import Bigchain
+from bigchaindb.web.encoding import get_json
 from bigchaindb.web.views.base import make_error
+from bigchaindb.web.views.parameters import valid_txid, valid_wait
+
+
+MAX_BATCH_SIZE = 1000
+"""The maximum number of transactions of a status request."""
+
+DECIDED_TRANSACTION = (Bigchain.TX_VALID, None)
+"""The statuses a request waiting for a transaction returns at once: the
+transaction is valid, or it is not found, e.g. it was invalid and deleted
+from the backlog. A transaction of an invalid block goes back to the
+backlog."""
+
+DECIDED_BLOCK = (Bigchain.BLOCK_VALID, Bigchain.BLOCK_INVALID)
+"""The statuses a request waiting for a block returns at once."""
 
 
 class StatusApi(Resource):
     def get(self):
         """API endpoint to get details about the status of a transaction or a block.
 
+        A request with a ``wait``, waiting for the transaction or the block
+        to be decided, is redirected to the read API of the WebSocket
+        server, whose waiting requests are woken up by the events of the
+        node, see :mod:`bigchaindb.web.read_api`. Without the read API,
+        ``wait`` is rejected: the workers of this server can't wait.
+
         Return:
             A ``dict`` in the format ``{'status': <status>}``, where
             ``<status>`` is one of "valid", "invalid", "undecided", "backlog".
@@ -19,6 +42,7 @@ class StatusApi(Resource):
         parser = reqparse.RequestParser()
         parser.add_argument('transaction_id', type=str)
         parser.add_argument('block_id', type=str)
+        parser.add_argument('wait', type=valid_wait)
 
         args = parser.parse_args(strict=True)
         tx_id = args['transaction_id']
@@ -28,13 +52,17 @@ class StatusApi(Resource):
         if bool(tx_id) == bool(block_id):
             return make_error(400, 'Provide exactly one query parameter. Choices are: block_id, transaction_id')
 
-        pool = current_app.config['bigchain_pool']
-        status = None
+        if args['wait']:
+            if not bigchaindb.config['wsserver']['read_threads']:
+                return make_error(400, 'wait is only served by the read API of the WebSocket server, '
+                                       'which is off')
+            return redirect(read_api_uri() + request.full_path, code=307)
 
+        pool = current_app.config['bigchain_pool']
         with pool() as bigchain:
             if tx_id:
                 status = bigchain.get_status(tx_id)
-            elif block_id:
+            else:
                 _, status = bigchain.get_block(block_id=block_id, include_status=True)
 
         if not status:
@@ -43,3 +71,37 @@ class StatusApi(Resource):
         return {
             'status': status
         }
+
+    def post(self):
+        """API endpoint to get the statuses of many transactions at once.
+
+        The body is the list of the ids of the transactions.
+
+        Return:
+            A ``dict`` with the status of each transaction by id, one of
+            "valid", "undecided", "backlog", or ``None`` if the transaction
+            was not found.
+        """
+        txids = get_json()
+        if not isinstance(txids, list):
+            return make_error(400, 'The body must be a list of transaction ids')
+        if len(txids) > MAX_BATCH_SIZE:
+            return make_error(
+                400, 'The list has more than {} transaction ids'.format(MAX_BATCH_SIZE))
+        try:
+            txids = [valid_txid(txid) for txid in txids]
+        except (TypeError, ValueError):
+            return make_error(400, 'The body must be a list of transaction ids')
+
+        pool = current_app.config['bigchain_pool']
+        with pool() as bigchain:
+            return bigchain.get_statuses(txids)
+
+
+def read_api_uri():
+    """Return the base URL of the read API of the WebSocket server, as
+    advertised to the clients."""
+    config = bigchaindb.config['wsserver']
+    scheme = 'https' if config['advertised_scheme'] == 'wss' else 'http'
+    return '{}://{}:{}'.format(scheme, config['advertised_host'],
+                               config['advertised_port'])
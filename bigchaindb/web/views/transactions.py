@@ -4,16 +4,24 @@ For more information please refer to the documentation: http://bigchaindb.com/ht
 """
 import logging
 
-from flask import current_app, request, jsonify
+from flask import current_app, request
 from flask_restful import Resource, reqparse
 
+from bigchaindb import tracing
 from bigchaindb.common.exceptions import SchemaValidationError, ValidationError
 from bigchaindb.models import Transaction
+from bigchaindb.web.caching import cached_response, immutable_response
+from bigchaindb.web.encoding import get_json, json_response
+from bigchaindb.web.pagination import (paginated_response, pooled_results,
+                                       streamed_response)
 from bigchaindb.web.views.base import make_error
 from bigchaindb.web.views import parameters
 
 logger = logging.getLogger(__name__)
 
+MAX_BATCH_SIZE = 1000
+"""The maximum number of transactions in a batch."""
+
 
 class TransactionApi(Resource):
     def get(self, tx_id):
@@ -25,6 +33,11 @@ class TransactionApi(Resource):
         Return:
             A JSON string containing the data about the transaction.
         """
+        # only transactions in valid blocks are returned, they never change
+        response = cached_response(tx_id)
+        if response:
+            return response
+
         pool = current_app.config['bigchain_pool']
 
         with pool() as bigchain:
@@ -33,21 +46,41 @@ class TransactionApi(Resource):
         if not tx or status is not bigchain.TX_VALID:
             return make_error(404)
 
-        return tx.to_dict()
+        return immutable_response(tx_id, tx.to_dict())
 
 
 class TransactionListApi(Resource):
     def get(self):
+        """API endpoint to get the valid transactions of an asset.
+
+        Return:
+            A page of the transactions if a ``limit`` is given, else all of
+            them in a streamed response.
+        """
         parser = reqparse.RequestParser()
         parser.add_argument('operation', type=parameters.valid_operation)
         parser.add_argument('asset_id', type=parameters.valid_txid,
                             required=True)
+        parser.add_argument('limit', type=parameters.valid_limit)
+        parser.add_argument('cursor', type=parameters.valid_cursor)
         args = parser.parse_args()
+        limit = args.pop('limit')
+        cursor = args.pop('cursor')
+
+        transactions = pooled_results(
+            lambda bigchain: bigchain.get_transactions_filtered(last_id=cursor,
+                                                                **args))
 
-        with current_app.config['bigchain_pool']() as bigchain:
-            txs = bigchain.get_transactions_filtered(**args)
+        def serialize(transaction):
+            _, tx = transaction
+            return tx.to_dict()
 
-        return [tx.to_dict() for tx in txs]
+        if limit:
+            # the transactions of a block are never split across pages
+            return paginated_response(transactions, limit,
+                                      key=lambda transaction: transaction[0],
+                                      serialize=serialize)
+        return streamed_response(transactions, serialize=serialize)
 
     def post(self):
         """API endpoint to push transactions to the Federation.
@@ -57,9 +90,9 @@ class TransactionListApi(Resource):
         """
         pool = current_app.config['bigchain_pool']
 
-        # `force` will try to format the body of the POST request even if the
-        # `content-type` header is not set to `application/json`
-        tx = request.get_json(force=True)
+        # the body is decoded even if the `content-type` header is not set
+        # to `application/json`
+        tx = get_json()
 
         try:
             tx_obj = Transaction.from_dict(tx)
@@ -85,10 +118,10 @@ class TransactionListApi(Resource):
                     'Invalid transaction ({}): {}'.format(type(e).__name__, e)
                 )
             else:
+                tracing.stamp('post', tx_obj.id)
                 bigchain.write_transaction(tx_obj)
 
-        response = jsonify(tx)
-        response.status_code = 202
+        response = json_response(tx, status=202)
 
         # NOTE: According to W3C, sending a relative URI is not allowed in the
         # Location Header:
@@ -100,3 +133,72 @@ class TransactionListApi(Resource):
         status_monitor = '../statuses?transaction_id={}'.format(tx_obj.id)
         response.headers['Location'] = status_monitor
         return response
+
+
+class TransactionBatchApi(Resource):
+    def post(self):
+        """API endpoint to push a batch of transactions to the Federation.
+
+        The transactions are validated together, a transaction that spends
+        an output spent by an earlier transaction of the batch is rejected
+        as a double spend, and the accepted ones are written to the backlog
+        at once.
+
+        Return:
+            A ``list`` with the result of each transaction, in the order of
+            the batch.
+        """
+        pool = current_app.config['bigchain_pool']
+
+        txs = get_json()
+        if not isinstance(txs, list):
+            return make_error(400, 'The batch must be a list of transactions')
+        if len(txs) > MAX_BATCH_SIZE:
+            return make_error(
+                400, 'The batch has more than {} transactions'.format(MAX_BATCH_SIZE))
+
+        results = [None] * len(txs)
+        tx_objs = []
+        for index, tx in enumerate(txs):
+            try:
+                tx_objs.append((index, Transaction.from_dict(tx)))
+            except SchemaValidationError as e:
+                results[index] = _rejected(
+                    tx, 'Invalid transaction schema: {}'.format(e.__cause__.message))
+            except ValidationError as e:
+                results[index] = _rejected(
+                    tx, 'Invalid transaction ({}): {}'.format(type(e).__name__, e))
+
+        with pool() as bigchain:
+            bigchain.statsd.incr('web.tx.post', len(txs))
+            validated = bigchain.validate_transactions(
+                [tx_obj for _, tx_obj in tx_objs])
+
+            accepted = []
+            for (index, tx_obj), result in zip(tx_objs, validated):
+                if isinstance(result, ValidationError):
+                    results[index] = _rejected(
+                        txs[index],
+                        'Invalid transaction ({}): {}'.format(type(result).__name__, result))
+                else:
+                    accepted.append(tx_obj)
+                    results[index] = {
+                        'id': tx_obj.id,
+                        'status': 202,
+                        'location': '../statuses?transaction_id={}'.format(tx_obj.id),
+                    }
+
+            tracing.stamp('post', *(tx_obj.id for tx_obj in accepted))
+            bigchain.write_transactions(accepted)
+
+        return results
+
+
+def _rejected(tx, message):
+    """Return the result of a rejected transaction of a batch."""
+    result = {'id': tx.get('id') if isinstance(tx, dict) else None,
+              'status': 400,
+              'message': message}
+    logger.error('HTTP API error: %(status)s - %(method)s:%(path)s - %(message)s',
+                 dict(result, method=request.method, path=request.path))
+    return result
@@ -2,10 +2,15 @@
 
 For more information please refer to the documentation: http://bigchaindb.com/http-api
 """
-from flask import current_app
+from functools import partial
+
 from flask_restful import Resource, reqparse
 
 from bigchaindb import backend
+from bigchaindb.backend.utils import paginate
+from bigchaindb.web.pagination import (paginated_response, pooled_results,
+                                       streamed_response)
+from bigchaindb.web.views import parameters
 
 
 class VotesApi(Resource):
@@ -13,15 +18,27 @@ class VotesApi(Resource):
         """API endpoint to get details about votes on a block.
 
         Return:
-            A list of votes voting for a block with ID ``block_id``.
+            A list of votes voting for a block with ID ``block_id``, a page
+            of them if a ``limit`` is given.
         """
         parser = reqparse.RequestParser()
         parser.add_argument('block_id', type=str, required=True)
+        parser.add_argument('limit', type=parameters.valid_limit)
+        parser.add_argument('cursor', type=parameters.valid_cursor)
 
         args = parser.parse_args(strict=True)
 
-        pool = current_app.config['bigchain_pool']
-        with pool() as bigchain:
-            votes = list(backend.query.get_votes_by_block_id(bigchain.connection, args['block_id']))
+        def votes(bigchain):
+            get_votes = partial(backend.query.get_votes_by_block_id,
+                                bigchain.connection, args['block_id'])
+            for page in paginate(get_votes, _voter, last_id=args['cursor']):
+                yield from page
+
+        if args['limit']:
+            return paginated_response(pooled_results(votes), args['limit'],
+                                      key=_voter)
+        return streamed_response(pooled_results(votes))
+
 
-        return votes
+def _voter(vote):
+    return vote['node_pubkey']
@@ -15,19 +15,51 @@ import json
 import asyncio
 import logging
 import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from uuid import uuid4
 
 import aiohttp
 from aiohttp import web
 
-from bigchaindb import config
-from bigchaindb.events import EventTypes
+from bigchaindb import Bigchain, backend, config, profiling, tracing
+from bigchaindb.events import Event, EventTypes, block_summary
+from bigchaindb.metrics import statsd_client
+from bigchaindb.web import read_api
+from bigchaindb.web.event_log import EventLog
+from bigchaindb.web.views import parameters
 
 
 logger = logging.getLogger(__name__)
 POISON_PILL = 'POISON_PILL'
 EVENTS_ENDPOINT = '/api/v1/streams/valid_transactions'
 
+SUBSCRIPTION_FILTERS = {
+    'asset_id': parameters.valid_txid,
+    'public_key': parameters.valid_ed25519,
+    'block_id': parameters.valid_txid,
+    'operation': parameters.valid_operation,
+}
+"""The filters a subscriber can give when connecting, from the most to the
+least selective."""
+
+STREAM_PARAMETERS = ('batch_size', 'since')
+"""The query parameters of a connection which are not filters."""
+
+MAX_BATCH_SIZE = 100
+"""The maximum number of events a subscriber can ask per message."""
+
+REPLAY_CHUNK_SIZE = 100
+"""The number of blocks read at once from the database, or from the event
+log, to replay the events a subscriber missed."""
+
+DROP = 'drop'
+DISCONNECT = 'disconnect'
+SLOW_CONSUMER_POLICIES = (DROP, DISCONNECT)
+"""What to do with the events of a subscriber whose queue is full: drop
+them, or disconnect the subscriber."""
+
 
 def _multiprocessing_to_asyncio(in_queue, out_queue, loop):
     """Bridge between a synchronous multiprocessing queue
@@ -40,35 +72,389 @@ def _multiprocessing_to_asyncio(in_queue, out_queue, loop):
 
     while True:
         value = in_queue.get()
+        if isinstance(value, bytes):
+            value = Event.deserialize(value)
         loop.call_soon_threadsafe(out_queue.put_nowait, value)
 
 
+class Subscriber:
+    """A websocket, and the events waiting to be sent to it.
+
+    The events are queued, and a task sends them as fast as the websocket
+    takes them, so that a slow client does not hold up the others.
+    """
+
+    def __init__(self, websocket, *, queue_size=1000, batch_size=1):
+        """Create a new instance.
+
+        Args:
+            websocket: the websocket to send the events to.
+            queue_size (int): the maximum number of events waiting to be
+                sent.
+            batch_size (int): the maximum number of events of a message.
+                If greater than 1, each message is a JSON list of events.
+        """
+
+        self.websocket = websocket
+        self.batch_size = batch_size
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.task = None
+
+    def put(self, event):
+        """Queue a serialized event.
+
+        Returns:
+            bool: ``False`` if the queue is full and the event was not
+            queued.
+        """
+
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    @asyncio.coroutine
+    def send_message(self, events):
+        """Send a message of at most ``batch_size`` serialized events."""
+
+        if self.batch_size == 1:
+            message = events[0]
+        else:
+            message = '[{}]'.format(','.join(events))
+
+        sent = self.websocket.send_str(message)
+        if sent is not None:
+            # the websockets of newer aiohttp versions wait for the
+            # transport to take the message
+            yield from sent
+
+    @asyncio.coroutine
+    def send_events(self, events):
+        """Send serialized events, bypassing the queue."""
+
+        for start in range(0, len(events), self.batch_size):
+            yield from self.send_message(events[start:start + self.batch_size])
+
+    @asyncio.coroutine
+    def send(self):
+        """Send the queued events to the websocket, until cancelled."""
+
+        while True:
+            events = [(yield from self.queue.get())]
+            while len(events) < self.batch_size and not self.queue.empty():
+                events.append(self.queue.get_nowait())
+            yield from self.send_message(events)
+
+
 class Dispatcher:
     """Dispatch events to websockets.
 
     This class implements a simple publish/subscribe pattern.
     """
 
-    def __init__(self, event_source):
+    def __init__(self, event_source, *, queue_size=1000, slow_consumer=DISCONNECT,
+                 event_log=None):
         """Create a new instance.
 
         Args:
             event_source: a source of events. Elements in the queue
             should be strings.
+            queue_size (int): the maximum number of events waiting to be
+                sent to a subscriber.
+            slow_consumer (str): one of :data:`SLOW_CONSUMER_POLICIES`,
+                what to do with a subscriber whose queue is full.
+            event_log (:class:`~bigchaindb.web.event_log.EventLog`,
+                optional): the log of the valid block events, to replay
+                them to the subscribers resuming the stream. Without it,
+                the stream can't be resumed.
         """
 
         self.event_source = event_source
+        self.queue_size = queue_size
+        self.slow_consumer = slow_consumer
+        self.event_log = event_log
+        # the files of the event log are written and read in a thread of
+        # their own, one operation at a time and in order
+        self.log_executor = None
+        if event_log:
+            self.log_executor = ThreadPoolExecutor(max_workers=1)
+        self.metrics = statsd_client(config['graphite']['host'])
         self.subscribers = {}
-
-    def subscribe(self, uuid, websocket):
+        self.filters = {}
+        # the futures of the requests waiting for a transaction or a block
+        # to be decided, by id
+        self.waiters = defaultdict(set)
+
+        # The subscribers without filters, and the others under their most
+        # selective filter, so that an event is only matched against the
+        # subscribers that might want it.
+        self.unfiltered = set()
+        self.index = defaultdict(set)
+
+    def subscribe(self, uuid, websocket, filters=None, *, batch_size=1, since=None,
+                  blocks=None):
         """Add a websocket to the list of subscribers.
 
         Args:
             uuid (str): a unique identifier for the websocket.
             websocket: the websocket to publish information.
+            filters (dict, optional): the values the transaction events
+                sent to the websocket must have, by the names of
+                :data:`SUBSCRIPTION_FILTERS`.
+            batch_size (int): the maximum number of events of a message.
+            since (int or str, optional): the sequence number of an event
+                or the id of a block, see :meth:`valid_since`. The events
+                which came after it are replayed before the new ones.
+            blocks (optional): the blocks of the database written after
+                the block ``since``, see :meth:`blocks_since`.
+        """
+
+        subscriber = Subscriber(websocket, queue_size=self.queue_size,
+                                batch_size=batch_size)
+        if since is None:
+            subscriber.task = asyncio.ensure_future(subscriber.send())
+        else:
+            # the new events are queued while the older ones are replayed
+            subscriber.task = asyncio.ensure_future(self.resume(
+                subscriber, filters, since, before=self.event_log.last + 1,
+                blocks=blocks))
+
+        filters = set((filters or {}).items())
+        self.subscribers[uuid] = subscriber
+        self.filters[uuid] = filters
+        if filters:
+            self.index[_index_key(filters)].add(uuid)
+        else:
+            self.unfiltered.add(uuid)
+
+    def unsubscribe(self, uuid):
+        """Remove a websocket from the list of subscribers.
+
+        Args:
+            uuid (str): the identifier of the websocket.
+        """
+
+        subscriber = self.subscribers.pop(uuid, None)
+        if subscriber is None:
+            # already disconnected as a slow consumer
+            return
+        subscriber.task.cancel()
+
+        filters = self.filters.pop(uuid)
+        if filters:
+            key = _index_key(filters)
+            self.index[key].discard(uuid)
+            if not self.index[key]:
+                del self.index[key]
+        else:
+            self.unfiltered.discard(uuid)
+
+    def matching(self, attributes):
+        """Return the subscribers of an event.
+
+        Args:
+            attributes (set): the ``(name, value)`` pairs of the event,
+                e.g. ``('operation', 'CREATE')``.
+        """
+
+        uuids = set(self.unfiltered)
+        for attribute in attributes:
+            uuids.update(uuid for uuid in self.index.get(attribute, ())
+                         if self.filters[uuid] <= attributes)
+        return uuids
+
+    def valid_since(self, since):
+        """Validate the position from which a subscriber resumes the stream.
+
+        Args:
+            since (str): the sequence number of the last event the
+                subscriber got, or the id of the last block it got events
+                of.
+
+        Returns:
+            int or str: the sequence number, or the block id.
+
+        Raises:
+            ValueError: If the stream can't be resumed from ``since``.
+        """
+
+        if self.event_log is None:
+            raise ValueError('The event stream of this node cannot be resumed')
+
+        if not since.isdigit():
+            return parameters.valid_txid(since)
+
+        since = int(since)
+        first = self.event_log.first
+        if first is not None and since < first - 1:
+            raise ValueError('The events before {} are no longer kept, resume '
+                             'from a block id'.format(first))
+        return since
+
+    @asyncio.coroutine
+    def blocks_since(self, since):
+        """Return the blocks of the database to replay to a subscriber
+        resuming the stream from a block that is not in the event log.
+
+        Args:
+            since (int or str): see :meth:`valid_since`.
+
+        Returns:
+            An iterator of the blocks written after the block ``since``, or
+            ``None`` if the events since ``since`` are in the event log.
+
+        Raises:
+            ValueError: If the database no longer knows which blocks were
+                written after ``since``, so that the events the subscriber
+                missed can't all be replayed.
+        """
+
+        if isinstance(since, int) or self.event_log.position(since) is not None:
+            return None
+
+        loop = asyncio.get_event_loop()
+        blocks = yield from loop.run_in_executor(None, _blocks_after, since)
+        if blocks is None:
+            raise ValueError('The blocks written after {} are no longer known, '
+                             'resume from a more recent block'.format(since))
+        return blocks
+
+    @asyncio.coroutine
+    def resume(self, subscriber, filters, since, before, blocks=None):
+        """Replay the events a subscriber missed, then send it the queued
+        ones.
+
+        If the subscriber gives a block that is not in the event log
+        anymore, the events of the blocks written after it are read from the
+        database, up to the first block of the log, and then the whole log
+        is replayed.
+
+        Args:
+            subscriber (:class:`Subscriber`): the subscriber.
+            filters (dict): the subscription filters.
+            since (int or str): see :meth:`valid_since`.
+            before (int): the sequence number of the first event queued for
+                the subscriber.
+            blocks (optional): see :meth:`blocks_since`.
         """
 
-        self.subscribers[uuid] = websocket
+        filters = set((filters or {}).items())
+        after = since
+        if not isinstance(since, int):
+            after = self.event_log.position(since)
+            if after is None:
+                if blocks is None:
+                    # the block left the event log since the subscriber
+                    # connected
+                    try:
+                        blocks = yield from self.blocks_since(since)
+                    except ValueError as exc:
+                        logger.warning('Unable to resume the events of a subscriber: %s', exc)
+                        yield from subscriber.websocket.close()
+                        return
+                yield from self.replay_from_database(subscriber, filters, blocks)
+                after = 0
+
+        loop = asyncio.get_event_loop()
+        records = yield from loop.run_in_executor(self.log_executor, self.event_log.read,
+                                                  after, before)
+        while True:
+            chunk = yield from loop.run_in_executor(self.log_executor, _take, records)
+            if not chunk:
+                break
+            for sequence, block in chunk:
+                yield from _replay_block(subscriber, filters, block, sequence)
+
+        yield from subscriber.send()
+
+    @asyncio.coroutine
+    def replay_from_database(self, subscriber, filters, blocks):
+        """Replay the events of the valid blocks of the database, up to the
+        first block which is in the event log.
+
+        Args:
+            subscriber (:class:`Subscriber`): the subscriber.
+            filters (set): the subscription filters.
+            blocks: the blocks, see :meth:`blocks_since`. They are read a
+                chunk at a time, in a thread of the executor.
+        """
+
+        loop = asyncio.get_event_loop()
+        try:
+            while True:
+                chunk = yield from loop.run_in_executor(None, _read_chunk, blocks)
+                if not chunk:
+                    return
+
+                for block, status in chunk:
+                    if self.event_log.position(block['id']) is not None:
+                        return
+                    if status == Bigchain.BLOCK_VALID:
+                        yield from _replay_block(subscriber, filters, block_summary(block))
+        finally:
+            close = getattr(blocks, 'close', None)
+            if close:
+                close()
+
+    def send(self, uuids, event):
+        """Queue a serialized event for some subscribers.
+
+        Args:
+            uuids: the identifiers of the subscribers.
+            event (str): the event.
+        """
+
+        for uuid in uuids:
+            subscriber = self.subscribers[uuid]
+            if subscriber.put(event):
+                continue
+
+            self.metrics.incr('websocket.dropped')
+            if self.slow_consumer == DISCONNECT:
+                logger.info('Disconnecting slow websocket subscriber %s', uuid)
+                self.metrics.incr('websocket.disconnected')
+                self.unsubscribe(uuid)
+                asyncio.ensure_future(subscriber.websocket.close())
+
+    def waiter(self, key):
+        """Return a future, done with the type of the event of the next
+        decided block having ``key`` as id, or as the id of one of its
+        transactions, or of the next invalid transaction of id ``key``.
+
+        The future must be given back to :meth:`forget` when done with.
+        """
+
+        future = asyncio.Future()
+        self.waiters[key].add(future)
+        return future
+
+    def forget(self, key, future):
+        waiters = self.waiters.get(key)
+        if waiters is not None:
+            waiters.discard(future)
+            if not waiters:
+                del self.waiters[key]
+
+    def notify(self, event):
+        """Wake up the waiters of a block event, or of the event of an
+        invalid transaction."""
+
+        if not self.waiters:
+            return
+
+        keys = [event.data['id']] + [tx['id'] for tx in event.data.get('transactions', ())]
+        for key in keys:
+            for future in self.waiters.pop(key, ()):
+                if not future.done():
+                    future.set_result(event.type)
+
+    def report(self):
+        """Report the number of subscribers and the depth of their queues."""
+
+        depths = [subscriber.queue.qsize() for subscriber in self.subscribers.values()]
+        self.metrics.gauge('websocket.subscribers', len(depths))
+        self.metrics.gauge('websocket.queue_depth', max(depths, default=0))
 
     @asyncio.coroutine
     def publish(self):
@@ -76,27 +462,142 @@ class Dispatcher:
 
         while True:
             event = yield from self.event_source.get()
-            str_buffer = []
 
             if event == POISON_PILL:
                 return
 
             if isinstance(event, str):
-                str_buffer.append(event)
+                self.send(list(self.subscribers), event)
+                continue
 
-            elif event.type == EventTypes.BLOCK_VALID:
-                block = event.data
+            if event.type == EventTypes.EVENTS_DROPPED:
+                yield from self.recover(event.data['blocks'])
+            else:
+                yield from self.dispatch(event)
 
-                for tx in block['block']['transactions']:
-                    asset_id = tx['id'] if tx['operation'] == 'CREATE' else tx['asset']['id']
-                    data = {'block_id': block['id'],
-                            'asset_id': asset_id,
-                            'transaction_id': tx['id']}
-                    str_buffer.append(json.dumps(data))
+            self.report()
 
-            for _, websocket in self.subscribers.items():
-                for str_item in str_buffer:
-                    websocket.send_str(str_item)
+    @asyncio.coroutine
+    def dispatch(self, event):
+        """Wake up the waiters of a block event, and publish the events of
+        the transactions of a valid block."""
+
+        self.notify(event)
+
+        if event.type == EventTypes.BLOCK_VALID:
+            # the block summary of bigchaindb.events.block_summary
+            block = event.data
+            tracing.stamp('event', *(tx['id'] for tx in block['transactions']))
+            sequence = None
+            if self.event_log:
+                loop = asyncio.get_event_loop()
+                sequence = yield from loop.run_in_executor(
+                    self.log_executor, self.event_log.append, block)
+
+            for attributes, data in _transaction_events(block, sequence):
+                uuids = self.matching(attributes)
+                if uuids:
+                    # serialized once for all the subscribers
+                    self.send(uuids, json.dumps(data))
+
+    @asyncio.coroutine
+    def recover(self, block_ids):
+        """Dispatch the events the election dropped while the events queue
+        was full, from the blocks of the database, see
+        :meth:`bigchaindb.events.EventHandler.publish`."""
+
+        logger.warning('Recovering the dropped events of %s blocks', len(block_ids))
+        self.metrics.incr('websocket.recovered', len(block_ids))
+        loop = asyncio.get_event_loop()
+        blocks = yield from loop.run_in_executor(None, _read_blocks, block_ids)
+        for block, status in blocks:
+            if status == Bigchain.BLOCK_VALID:
+                yield from self.dispatch(Event(EventTypes.BLOCK_VALID, block_summary(block)))
+            elif status == Bigchain.BLOCK_INVALID:
+                yield from self.dispatch(Event(EventTypes.BLOCK_INVALID, block_summary(block)))
+
+
+def _transaction_events(block, sequence=None):
+    """Return the attributes to match against the subscription filters, and
+    the data, of the events of the transactions of a block summary."""
+
+    for tx in block['transactions']:
+        data = {'block_id': block['id'],
+                'asset_id': tx['asset_id'],
+                'transaction_id': tx['id']}
+        if sequence is not None:
+            data['sequence'] = sequence
+        attributes = {('block_id', block['id']),
+                      ('asset_id', tx['asset_id']),
+                      ('operation', tx['operation'])}
+        attributes.update(('public_key', public_key)
+                          for public_key in tx['public_keys'])
+        yield attributes, data
+
+
+@asyncio.coroutine
+def _replay_block(subscriber, filters, block, sequence=None):
+    events = [json.dumps(data)
+              for attributes, data in _transaction_events(block, sequence)
+              if filters <= attributes]
+    if events:
+        yield from subscriber.send_events(events)
+    else:
+        # let the live events through
+        yield from asyncio.sleep(0)
+
+
+def _blocks_after(block_id):
+    bigchain = read_api.local_bigchain()
+    return backend.query.get_blocks_after(bigchain.connection, block_id)
+
+
+def _read_chunk(blocks):
+    bigchain = read_api.local_bigchain()
+    return [(block, bigchain.block_election_status(block))
+            for block in islice(blocks, REPLAY_CHUNK_SIZE)]
+
+
+def _take(records):
+    return list(islice(records, REPLAY_CHUNK_SIZE))
+
+
+def _read_blocks(block_ids):
+    bigchain = read_api.local_bigchain()
+    blocks = []
+    for block_id in block_ids:
+        block, status = bigchain.get_block(block_id, include_status=True)
+        if block:
+            blocks.append((block, status))
+    return blocks
+
+
+def _index_key(filters):
+    """Return the most selective of the ``(name, value)`` filters."""
+    return min(filters, key=lambda item: list(SUBSCRIPTION_FILTERS).index(item[0]))
+
+
+def _valid_batch_size(batch_size):
+    batch_size = int(batch_size)
+    if 0 < batch_size <= MAX_BATCH_SIZE:
+        return batch_size
+    raise ValueError('Batch size must be between 1 and {}'.format(MAX_BATCH_SIZE))
+
+
+def _subscription_filters(query):
+    """Return the subscription filters of the query of a connection.
+
+    Raises:
+        ValueError: If a filter is unknown or invalid.
+    """
+    filters = {}
+    for name, value in query.items():
+        if name in STREAM_PARAMETERS:
+            continue
+        if name not in SUBSCRIPTION_FILTERS:
+            raise ValueError('Unknown filter: {}'.format(name))
+        filters[name] = SUBSCRIPTION_FILTERS[name](value)
+    return filters
 
 
 @asyncio.coroutine
@@ -104,32 +605,63 @@ def websocket_handler(request):
     """Handle a new socket connection."""
 
     logger.debug('New websocket connection.')
+    dispatcher = request.app['dispatcher']
+    try:
+        filters = _subscription_filters(request.query)
+        batch_size = _valid_batch_size(request.query.get('batch_size', 1))
+        since, blocks = request.query.get('since'), None
+        if since is not None:
+            since = dispatcher.valid_since(since)
+            blocks = yield from dispatcher.blocks_since(since)
+    except ValueError as e:
+        return web.Response(status=400, text=str(e))
+
     websocket = web.WebSocketResponse()
     yield from websocket.prepare(request)
     uuid = uuid4()
-    request.app['dispatcher'].subscribe(uuid, websocket)
+    dispatcher.subscribe(uuid, websocket, filters, batch_size=batch_size,
+                         since=since, blocks=blocks)
 
-    while True:
-        # Consume input buffer
-        try:
-            msg = yield from websocket.receive()
-        except RuntimeError as e:
-            logger.debug('Websocket exception: %s', str(e))
-            return websocket
+    try:
+        while True:
+            # Consume input buffer
+            try:
+                msg = yield from websocket.receive()
+            except RuntimeError as e:
+                logger.debug('Websocket exception: %s', str(e))
+                return websocket
+
+            if msg.type == aiohttp.WSMsgType.ERROR:
+                logger.debug('Websocket exception: %s', websocket.exception())
+                return websocket
 
-        if msg.type == aiohttp.WSMsgType.ERROR:
-            logger.debug('Websocket exception: %s', websocket.exception())
-            return websocket
+            if msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING,
+                            aiohttp.WSMsgType.CLOSED):
+                return websocket
+    finally:
+        dispatcher.unsubscribe(uuid)
 
 
-def init_app(event_source, *, loop=None):
+def init_app(event_source, *, loop=None, read_threads=0):
     """Init the application server.
 
+    Args:
+        read_threads (int): the number of threads of the read API. If 0,
+            the read API is not served.
+
     Return:
         An aiohttp application.
     """
 
-    dispatcher = Dispatcher(event_source)
+    event_log = None
+    if config['wsserver']['event_log']:
+        event_log = EventLog(config['wsserver']['event_log'],
+                             size=config['wsserver']['event_log_size'])
+
+    dispatcher = Dispatcher(event_source,
+                            queue_size=config['wsserver']['queue_size'],
+                            slow_consumer=config['wsserver']['slow_consumer'],
+                            event_log=event_log)
 
     # Schedule the dispatcher
     loop.create_task(dispatcher.publish())
@@ -137,15 +669,26 @@ def init_app(event_source, *, loop=None):
     app = web.Application(loop=loop)
     app['dispatcher'] = dispatcher
     app.router.add_get(EVENTS_ENDPOINT, websocket_handler)
+    if read_threads:
+        read_api.add_routes(app, threads=read_threads)
     return app
 
 
-def start(sync_event_source, loop=None):
-    """Create and start the WebSocket server."""
+def start(sync_event_source, loop=None, *, handle_signals=True):
+    """Create and start the WebSocket server.
+
+    Args:
+        sync_event_source: the queue of the events of the node.
+        loop (optional): the event loop to run the server in. Defaults to
+            the event loop of the current thread.
+        handle_signals (bool): stop the server on ``SIGINT`` and
+            ``SIGTERM``, which only the main thread of a process can do.
+    """
 
     if not loop:
         loop = asyncio.get_event_loop()
 
+    profiling.install('websocket')
     event_source = asyncio.Queue(loop=loop)
 
     bridge = threading.Thread(target=_multiprocessing_to_asyncio,
@@ -153,7 +696,10 @@ def start(sync_event_source, loop=None):
                               daemon=True)
     bridge.start()
 
-    app = init_app(event_source, loop=loop)
+    app = init_app(event_source, loop=loop,
+                   read_threads=config['wsserver']['read_threads'])
     aiohttp.web.run_app(app,
                         host=config['wsserver']['host'],
-                        port=config['wsserver']['port'])
+                        port=config['wsserver']['port'],
+                        loop=loop,
+                        handle_signals=handle_signals)
@@ -0,0 +1,109 @@
+"""Measure the write and read throughput of a database backend.
+
+Run it once per backend on the same machine to compare them, e.g.:
+
+    $ python3 scripts/benchmarks/backend_throughput.py mongodb
+    $ python3 scripts/benchmarks/backend_throughput.py sqlite
+
+The other database settings are read from the BIGCHAINDB_DATABASE_*
+environment variables. The benchmark uses its own database, which it drops
+at the end.
+"""
+
+import argparse
+import random
+import time
+
+
+def transactions(n):
+    from bigchaindb.common.crypto import generate_key_pair
+    from bigchaindb.models import Transaction
+
+    priv, pub = generate_key_pair()
+    create = Transaction.create([pub], [([pub], 1)] * n).sign([priv])
+    yield create
+    for i, input_ in enumerate(create.to_inputs()):
+        yield Transaction.transfer([input_], [([pub], 1)], create.id,
+                                   metadata={'n': i}).sign([priv])
+
+
+def measure(name, count, run):
+    start = time.time()
+    run()
+    elapsed = time.time() - start
+    print('{:<32} {:>10.0f}/s'.format(name, count / elapsed))
+
+
+def main():
+    import bigchaindb
+    from bigchaindb import backend
+    from bigchaindb.backend import query, schema
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('backend')
+    parser.add_argument('--transactions', type=int, default=10000)
+    parser.add_argument('--block-size', type=int, default=1000)
+    parser.add_argument('--reads', type=int, default=10000)
+    args = parser.parse_args()
+
+    config = dict(bigchaindb._database_map[args.backend],
+                  name='bigchain_benchmark')
+    conn = backend.connect(**config)
+    schema.init_database(conn, config['name'])
+
+    try:
+        print('Preparing {} transactions'.format(args.transactions))
+        txs = [tx.to_dict() for tx in transactions(args.transactions - 1)]
+
+        def write_transactions():
+            for tx in txs:
+                query.write_transaction(conn, tx)
+
+        def delete_transactions():
+            for i in range(0, len(txs), args.block_size):
+                query.delete_transaction(
+                    conn, *(tx['id'] for tx in txs[i:i + args.block_size]))
+
+        def write_blocks():
+            for i in range(0, len(txs), args.block_size):
+                query.write_block(conn, {
+                    'id': str(i),
+                    'block': {
+                        'timestamp': str(int(time.time())),
+                        'transactions': txs[i:i + args.block_size],
+                        'node_pubkey': 'benchmark',
+                        'voters': [],
+                    },
+                    'signature': None,
+                })
+
+        txids = [(tx['id'], str(i - i % args.block_size))
+                 for i, tx in enumerate(txs)]
+        owner = txs[0]['outputs'][0]['public_keys'][0]
+
+        def read_transactions():
+            for _ in range(args.reads):
+                txid, block_id = random.choice(txids)
+                list(query.get_blocks_status_from_transaction(conn, txid))
+                query.get_transaction_from_block(conn, txid, block_id)
+
+        def read_spent():
+            for _ in range(args.reads):
+                list(query.get_spent(conn, txs[0]['id'],
+                                     random.randrange(len(txs) - 1)))
+
+        print('Backend: {}'.format(args.backend))
+        measure('backlog writes', len(txs), write_transactions)
+        measure('backlog deletes', len(txs), delete_transactions)
+        measure('block writes (transactions)', len(txs), write_blocks)
+        measure('transaction reads', args.reads, read_transactions)
+        measure('spent output reads', args.reads, read_spent)
+        measure('owned outputs reads', 10,
+                lambda: [list(query.get_owned_ids(conn, owner))
+                         for _ in range(10)])
+    finally:
+        schema.drop_database(conn, config['name'])
+
+
+if __name__ == '__main__':
+    main()
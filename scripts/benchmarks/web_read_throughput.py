@@ -0,0 +1,106 @@
+"""Measure the GET throughput of the HTTP API against its threads per worker.
+
+Run it against a node's database, e.g.:
+
+    $ python3 scripts/benchmarks/web_read_throughput.py --threads 1 2 4 8
+
+For each thread count, the benchmark starts the HTTP API with one Gunicorn
+worker having that many threads, and measures how many requests per second
+concurrent clients get answered. The database settings are read from the
+BIGCHAINDB_DATABASE_* environment variables. The benchmark writes its own
+transactions to the database, and leaves them there.
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import urlopen
+
+
+def prepare(count):
+    from bigchaindb import Bigchain
+    from bigchaindb.common.crypto import generate_key_pair
+    from bigchaindb.models import Transaction
+
+    bigchain = Bigchain()
+    _, pub = generate_key_pair()
+    txs = [Transaction.create([bigchain.me], [([pub], 1)],
+                              metadata={'n': i}).sign([bigchain.me_private])
+           for i in range(count)]
+    block = bigchain.create_block(txs)
+    bigchain.write_block(block)
+    bigchain.write_vote(bigchain.vote(block.id,
+                                      bigchain.get_last_voted_block().id,
+                                      True))
+    return [tx.id for tx in txs], pub
+
+
+def serve(bind, threads):
+    import bigchaindb
+    from bigchaindb.web import server
+
+    settings = dict(bigchaindb.config['server'], bind=bind, workers=1,
+                    threads=threads, loglevel='error')
+    server.create_server(settings).run()
+
+
+def wait_until_up(url, timeout=10):
+    deadline = time.time() + timeout
+    while True:
+        try:
+            return urlopen(url).read()
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def measure(base_url, urls, clients, duration):
+    deadline = time.time() + duration
+
+    def client():
+        count = 0
+        while time.time() < deadline:
+            json.loads(urlopen(base_url + random.choice(urls)).read())
+            count += 1
+        return count
+
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        counts = [executor.submit(client) for _ in range(clients)]
+        return sum(count.result() for count in counts) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--transactions', type=int, default=100)
+    parser.add_argument('--bind', default='localhost:9986')
+    args = parser.parse_args()
+
+    print('Preparing {} transactions'.format(args.transactions))
+    txids, owner = prepare(args.transactions)
+    urls = ['/api/v1/statuses?transaction_id=' + txid for txid in txids]
+    urls += ['/api/v1/outputs?public_key=' + owner]
+    base_url = 'http://' + args.bind
+
+    for threads in args.threads:
+        process = multiprocessing.Process(target=serve,
+                                          args=(args.bind, threads))
+        process.start()
+        try:
+            wait_until_up(base_url + '/api/v1/')
+            rate = measure(base_url, urls, args.clients, args.duration)
+            print('{:>3} threads per worker {:>10.0f} requests/s'.format(
+                threads, rate))
+        finally:
+            process.terminate()
+            process.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+from unittest import mock
+
+import pytest
+
+from multipipes import Pipe
+
+
+pytestmark = [
+    pytest.mark.bdb,
+    pytest.mark.usefixtures('feed_stop'),
+]
+
+
+@pytest.fixture
+def feed_stop():
+    with mock.patch('bigchaindb.backend.memory.changefeed._FEED_STOP', True):
+        yield
+
+
+def write_changes(conn):
+    conn.run(conn.table('backlog').insert({'id': 'a', 'msg': 'insert'}))
+    conn.run(conn.table('backlog').update('a', {'msg': 'update'}))
+    conn.run(conn.table('backlog').delete('a'))
+
+
+@pytest.fixture
+def changes(conn):
+    write_changes(conn)
+
+
+@pytest.fixture
+def conn():
+    from bigchaindb.backend import connect
+    return connect()
+
+
+@pytest.mark.parametrize('operation,msg', [
+    ('INSERT', 'insert'),
+    ('UPDATE', 'update'),
+    ('DELETE', 'update'),
+])
+def test_changefeed(conn, operation, msg):
+    from threading import Timer
+    from bigchaindb.backend import get_changefeed
+    from bigchaindb.backend.changefeed import ChangeFeed
+
+    # the changes already in the log are not part of the changefeed
+    conn.run(conn.table('backlog').insert({'id': 'b', 'msg': 'before'}))
+
+    outpipe = Pipe()
+    changefeed = get_changefeed(conn, 'backlog',
+                                getattr(ChangeFeed, operation))
+    changefeed.outqueue = outpipe
+
+    changes = Timer(0.1, write_changes, args=(conn,))
+    changes.start()
+    changefeed.run_forever()
+    changes.join()
+
+    assert outpipe.get()['msg'] == msg
+    assert outpipe.qsize() == 0
+
+
+@pytest.mark.usefixtures('changes')
+def test_get_changes_from_position(conn):
+    from bigchaindb.backend.changefeed import (ChangeFeed, get_changes,
+                                               get_insert_position)
+
+    position = get_insert_position(conn, 'backlog', 'a')
+    changes = list(get_changes(conn, 'backlog', ChangeFeed.UPDATE,
+                               position=position))
+    assert changes == [(ChangeFeed.UPDATE, {'id': 'a', 'msg': 'update'},
+                        position + 1)]
+
+    changes = list(get_changes(conn, 'backlog', ChangeFeed.INSERT,
+                               position=position - 1))
+    assert changes == [(ChangeFeed.INSERT, {'id': 'a', 'msg': 'insert'},
+                        position)]
+
+
+def test_get_changes_with_match(conn):
+    from bigchaindb.backend.changefeed import ChangeFeed, get_changes
+
+    position = conn.run(conn.table('backlog').log).next_position - 1
+    conn.run(conn.table('backlog').insert({'id': 'a', 'assignee': 'me'}))
+    conn.run(conn.table('backlog').insert({'id': 'b', 'assignee': 'you'}))
+
+    changes = get_changes(conn, 'backlog', ChangeFeed.INSERT,
+                          position=position, match={'assignee': 'me'})
+    assert [document['id'] for _, document, _ in changes] == ['a']
+
+
+def test_stored_position(conn):
+    from bigchaindb.backend.changefeed import (get_stored_position,
+                                               store_position)
+
+    assert get_stored_position(conn, 'node.backlog') is None
+    store_position(conn, 'node.backlog', 3)
+    assert get_stored_position(conn, 'node.backlog') == 3
+
+
+def test_change_log_drops_the_oldest_changes():
+    from bigchaindb.backend.changefeed import ChangeFeed
+    from bigchaindb.backend.memory.store import ChangeLog
+
+    log = ChangeLog(2)
+    for i in range(3):
+        log.append(ChangeFeed.INSERT, {'id': i})
+
+    assert log.read(-1) == [(ChangeFeed.INSERT, {'id': 1}, 1),
+                            (ChangeFeed.INSERT, {'id': 2}, 2)]
+    assert log.read(1) == [(ChangeFeed.INSERT, {'id': 2}, 2)]
+    assert log.read(2, timeout=0) == []
+    assert log.find(ChangeFeed.INSERT, 'id', 0) is None
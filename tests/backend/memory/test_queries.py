@@ -0,0 +1,322 @@
+from unittest import mock
+
+import pytest
+
+pytestmark = pytest.mark.bdb
+
+
+def test_write_transaction(signed_create_tx):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    query.write_transaction(conn, signed_create_tx.to_dict())
+
+    tx_db = conn.db['backlog'].get(signed_create_tx.id)
+    assert tx_db == signed_create_tx.to_dict()
+
+
+def test_write_transaction_copies_the_document(signed_create_tx):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    tx = signed_create_tx.to_dict()
+    query.write_transaction(conn, tx)
+    tx['metadata'] = {'changed': True}
+
+    tx_db = conn.db['backlog'].get(signed_create_tx.id)
+    tx_db['metadata'] = {'changed': True}
+    assert conn.db['backlog'].get(tx['id']) == signed_create_tx.to_dict()
+
+
+def test_write_transactions(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    query.write_transaction(conn, signed_create_tx.to_dict())
+    query.write_transactions(conn, [signed_create_tx.to_dict(),
+                                    signed_transfer_tx.to_dict()])
+
+    assert query.count_backlog(conn) == 2
+    tx_db = conn.db['backlog'].get(signed_transfer_tx.id)
+    assert tx_db == signed_transfer_tx.to_dict()
+
+
+def test_update_transactions(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    txs = [signed_create_tx.to_dict(), signed_transfer_tx.to_dict()]
+    for tx in txs:
+        tx.update({'assignee': 'aaa', 'assignment_timestamp': 10})
+        query.write_transaction(conn, tx)
+
+    query.update_transactions(conn, [tx['id'] for tx in txs],
+                              {'assignee': 'bbb', 'assignment_timestamp': 20})
+
+    assert query.get_oldest_assignment_timestamp(conn) == 20
+    assert [tx['assignee'] for tx in conn.db['backlog'].filter(bool)] == \
+        ['bbb', 'bbb']
+
+
+def test_get_stale_transactions(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    stale, fresh = signed_create_tx.to_dict(), signed_transfer_tx.to_dict()
+    stale.update({'assignee': 'aaa', 'assignment_timestamp': 0})
+    fresh.update({'assignee': 'aaa', 'assignment_timestamp': 2 ** 40})
+    query.write_transaction(conn, stale)
+    query.write_transaction(conn, fresh)
+
+    txs = query.get_stale_transactions(conn, 10)
+    assert [tx['id'] for tx in txs] == [stale['id']]
+
+
+def test_get_txids_filtered(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block, Transaction
+    conn = connect()
+
+    query.write_block(conn, Block(transactions=[signed_create_tx]).to_dict())
+    query.write_block(conn, Block(transactions=[signed_transfer_tx]).to_dict())
+
+    asset_id = Transaction.get_asset_id([signed_create_tx, signed_transfer_tx])
+
+    txids = {txid for _, txid in
+             query.get_txids_filtered(conn, asset_id)}
+    assert txids == {signed_create_tx.id, signed_transfer_tx.id}
+
+    txids = {txid for _, txid in
+             query.get_txids_filtered(conn, asset_id, Transaction.CREATE)}
+    assert txids == {signed_create_tx.id}
+
+    txids = {txid for _, txid in
+             query.get_txids_filtered(conn, asset_id, Transaction.TRANSFER)}
+    assert txids == {signed_transfer_tx.id}
+
+
+def test_get_txids_filtered_paginated(user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block, Transaction
+    conn = connect()
+
+    create = Transaction.create([user_pk], [([user_pk], 3)])
+    transfers = [Transaction.transfer([input_], [([user_pk], 1)], create.id)
+                 for input_ in create.to_inputs()]
+    blocks = [Block(transactions=[create]), Block(transactions=transfers)]
+    for block in blocks:
+        query.write_block(conn, block.to_dict())
+    # in the order of the blocks, then of the transactions in a block
+    txids = [(block.id, tx.id)
+             for block in sorted(blocks, key=lambda block: block.id)
+             for tx in block.transactions]
+    first = txids[0][0]
+    after_first = [txid for txid in txids if txid[0] > first]
+
+    assert list(query.get_txids_filtered(conn, create.id, limit=2)) == \
+        txids[:2]
+    assert list(query.get_txids_filtered(conn, create.id, last_id=first,
+                                         limit=1)) == after_first[:1]
+    assert list(query.get_txids_filtered(conn, create.id,
+                                         last_id=first)) == after_first
+    assert list(query.get_txids_filtered(conn, create.id)) == txids
+
+
+def test_get_owned_ids_paginated(user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block, Transaction
+    conn = connect()
+
+    txs = [Transaction.create([user_pk], [([user_pk], 1)], {'i': i})
+           for i in range(3)]
+    blocks = [Block(transactions=txs[:2]), Block(transactions=txs[2:])]
+    for block in blocks:
+        query.write_block(conn, block.to_dict())
+    txids = [(block.id, tx.id)
+             for block in sorted(blocks, key=lambda block: block.id)
+             for tx in block.transactions]
+    first = txids[0][0]
+
+    owned = list(query.get_owned_ids(conn, user_pk, limit=2))
+    assert [(block_id, tx['id']) for block_id, tx in owned] == txids[:2]
+    owned = list(query.get_owned_ids(conn, user_pk, last_id=first))
+    assert [(block_id, tx['id']) for block_id, tx in owned] == \
+        [txid for txid in txids if txid[0] > first]
+
+
+def test_get_votes_by_block_id_paginated(structurally_valid_vote):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    block_id = structurally_valid_vote['vote']['voting_for_block']
+    for voter in 'abc':
+        vote = dict(structurally_valid_vote, node_pubkey=voter * 44)
+        query.write_vote(conn, vote)
+
+    votes = query.get_votes_by_block_id(conn, block_id, limit=2)
+    assert [vote['node_pubkey'] for vote in votes] == ['a' * 44, 'b' * 44]
+    votes = query.get_votes_by_block_id(conn, block_id, last_id='a' * 44)
+    assert sorted(vote['node_pubkey'] for vote in votes) == \
+        ['b' * 44, 'c' * 44]
+
+
+def test_get_spending_transactions(user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block, Transaction
+    conn = connect()
+
+    out = [([user_pk], 1)]
+    tx1 = Transaction.create([user_pk], out * 3)
+    inputs = tx1.to_inputs()
+    tx2 = Transaction.transfer([inputs[0]], out, tx1.id)
+    tx3 = Transaction.transfer([inputs[1]], out, tx1.id)
+    tx4 = Transaction.transfer([inputs[2]], out, tx1.id)
+    block = Block([tx1, tx2, tx3, tx4])
+    query.write_block(conn, block.to_dict())
+
+    links = [inputs[0].fulfills.to_dict(), inputs[2].fulfills.to_dict()]
+    res = list(query.get_spending_transactions(conn, links))
+
+    # tx3 not a member because input 1 not asked for
+    assert res == [(block.id, tx2.to_dict()), (block.id, tx4.to_dict())]
+
+    spent = list(query.get_spent(conn, tx1.id, 1))
+    assert spent == [tx3.to_dict()]
+
+
+def test_duplicate_vote_raises_duplicate_key(structurally_valid_vote):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.backend.exceptions import DuplicateKeyError
+    conn = connect()
+
+    query.write_vote(conn, structurally_valid_vote)
+    with pytest.raises(DuplicateKeyError):
+        query.write_vote(conn, structurally_valid_vote)
+
+
+def test_vote_checkpoint():
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    assert query.get_vote_checkpoint(conn, 'aaa') is None
+    query.write_vote_checkpoint(conn, 'aaa', 'block1')
+    query.write_vote_checkpoint(conn, 'aaa', 'block2')
+    assert query.get_vote_checkpoint(conn, 'aaa') == 'block2'
+
+
+@mock.patch('bigchaindb.backend.memory.changefeed._FEED_STOP', True)
+def test_get_new_blocks_feed(b, create_tx):
+    from bigchaindb.backend import query
+    from bigchaindb.models import Block
+    import random
+
+    def create_block():
+        ts = str(random.random())
+        block = Block(transactions=[create_tx], timestamp=ts)
+        b.write_block(block)
+        return block.decouple_assets()[1]
+
+    create_block()
+    b1 = create_block()
+    b2 = create_block()
+
+    feed = query.get_new_blocks_feed(b.connection, b1['id'])
+
+    assert feed.__next__() == b2
+
+    b3 = create_block()
+
+    assert list(feed) == [b3]
+
+
+def test_get_blocks_after(b, create_tx):
+    from bigchaindb.backend import query
+    from bigchaindb.models import Block
+    import random
+
+    def create_block():
+        block = Block(transactions=[create_tx], timestamp=str(random.random()))
+        b.write_block(block)
+        return block.decouple_assets()[1]
+
+    b1, b2, b3 = create_block(), create_block(), create_block()
+
+    assert list(query.get_blocks_after(b.connection, b1['id'])) == [b2, b3]
+    assert list(query.get_blocks_after(b.connection, b1['id'], limit=1)) == [b2]
+    assert list(query.get_blocks_after(b.connection, b3['id'])) == []
+    assert query.get_blocks_after(b.connection, 'a' * 64) is None
+
+
+def test_get_blocks_of_transactions_and_backlog_transaction_ids(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect()
+
+    block = Block(transactions=[signed_create_tx, signed_transfer_tx])
+    query.write_block(conn, block.to_dict())
+    query.write_transaction(conn, signed_transfer_tx.to_dict())
+
+    txids = [signed_create_tx.id, signed_transfer_tx.id, 'a' * 64]
+    assert list(query.get_blocks_of_transactions(conn, txids[:1] + txids[2:])) == \
+        [(signed_create_tx.id, {'id': block.id, 'block': {'voters': block.voters}})]
+    assert list(query.get_backlog_transaction_ids(conn, txids)) == [signed_transfer_tx.id]
+
+
+def test_get_transactions_from_blocks_and_votes_for_blocks(signed_create_tx,
+                                                           signed_transfer_tx,
+                                                           structurally_valid_vote):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect()
+
+    blocks = [Block(transactions=[signed_create_tx, signed_transfer_tx], voters=['a']),
+              Block(transactions=[signed_transfer_tx], voters=['b'])]
+    for block in blocks:
+        query.write_block(conn, block.to_dict())
+
+    found = query.get_transactions_from_blocks(conn, [signed_transfer_tx.id, 'a' * 64])
+    assert sorted((block['id'], block['block']['voters'], transaction['id'])
+                  for block, transaction in found) == \
+        sorted((block.id, block.voters, signed_transfer_tx.id) for block in blocks)
+
+    vote = structurally_valid_vote
+    query.write_vote(conn, vote)
+    assert list(query.get_votes_for_blocks(
+        conn, [vote['vote']['voting_for_block'], 'other'])) == [vote]
+    assert list(query.get_votes_for_blocks(conn, ['other'])) == []
+
+
+def test_text_search():
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    assets = [
+        {'id': 1, 'subject': 'coffee', 'author': 'xyz', 'views': 50},
+        {'id': 2, 'subject': 'Coffee Shopping', 'author': 'efg', 'views': 5},
+        {'id': 3, 'subject': 'Baking a cake', 'author': 'abc', 'views': 90},
+    ]
+    query.write_assets(conn, assets)
+
+    assert [asset['id'] for asset in query.text_search(conn, 'coffee')] == \
+        [1, 2]
+    assert list(query.text_search(conn, 'Coffee', case_sensitive=True)) == \
+        [assets[1]]
+
+    results = list(query.text_search(conn, 'coffee shopping',
+                                     text_score=True, limit=1))
+    assert results == [dict(assets[1], score=2)]
+
+    # the assets sorted after the first one
+    results = list(query.text_search(conn, 'coffee', after=(1, 1)))
+    assert [asset['id'] for asset in results] == [2]
+
+
+def test_latency(monkeypatch):
+    from bigchaindb.backend import connect, query
+
+    sleeps = []
+    monkeypatch.setattr('time.sleep', sleeps.append)
+
+    conn = connect(latency=0.01)
+    query.count_blocks(conn)
+    assert sleeps == [0.01]
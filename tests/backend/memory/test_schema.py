@@ -0,0 +1,56 @@
+import pytest
+
+
+pytestmark = pytest.mark.bdb
+
+
+def test_init_creates_db_tables_and_indexes():
+    import bigchaindb
+    from bigchaindb import backend
+    from bigchaindb.backend.schema import init_database
+
+    conn = backend.connect()
+    dbname = bigchaindb.config['database']['name']
+
+    # the db is set up by the fixture so we need to remove it
+    conn.conn.databases.pop(dbname)
+
+    init_database()
+
+    tables = conn.conn[dbname].tables
+    assert sorted(tables) == ['assets', 'backlog', 'bigchain', 'changefeed',
+                              'vote_checkpoints', 'votes']
+
+    assert sorted(tables['bigchain'].indexes) == [
+        'asset_id', 'inputs', 'operation', 'outputs', 'transaction_id']
+    assert sorted(tables['votes'].indexes) == [
+        'block', 'block_and_voter', 'previous_block_and_voter', 'voter']
+
+
+def test_init_database_fails_if_db_exists():
+    from bigchaindb.backend.schema import init_database
+    from bigchaindb.common import exceptions
+
+    # The db is set up by the fixtures
+    with pytest.raises(exceptions.DatabaseAlreadyExists):
+        init_database()
+
+
+def test_drop(dummy_db):
+    from bigchaindb import backend
+    from bigchaindb.backend import schema
+
+    conn = backend.connect()
+    assert dummy_db in conn.conn.databases
+    schema.drop_database(conn, dummy_db)
+    assert dummy_db not in conn.conn.databases
+
+
+def test_drop_non_existent_db_raises_an_error():
+    from bigchaindb import backend
+    from bigchaindb.backend import schema
+    from bigchaindb.common import exceptions
+
+    conn = backend.connect()
+    with pytest.raises(exceptions.DatabaseDoesNotExist):
+        schema.drop_database(conn, 'does_not_exist')
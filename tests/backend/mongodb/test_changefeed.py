@@ -147,3 +147,152 @@ def test_connection_failure():
     with pytest.raises(RuntimeError):
         for record in changefeed:
             assert False, 'Shouldn\'t get here'
+
+
+def test_run_changefeed_with_match():
+    from bigchaindb.backend.mongodb.changefeed import run_changefeed
+
+    conn = mock.MagicMock()
+    conn.dbname = 'bigchain'
+    conn.run.side_effect = [RuntimeError()]
+    changefeed = run_changefeed(conn, 'backlog', -1, match={'assignee': 'me'})
+    with pytest.raises(RuntimeError):
+        next(changefeed)
+
+    query = conn.query().local.oplog.rs.find
+    spec = query.call_args[0][0]
+    assert spec == {
+        'ns': 'bigchain.backlog',
+        'ts': {'$gt': -1},
+        '$or': [{'o.assignee': 'me'}, {'o.$set.assignee': 'me'}],
+    }
+
+
+@pytest.mark.bdb
+@mock.patch('bigchaindb.backend.mongodb.changefeed._FEED_STOP', True)
+@mock.patch('pymongo.collection.Collection.find_one')
+@mock.patch('pymongo.cursor.Cursor.next')
+def test_changefeed_update_with_match(mock_cursor_next, mock_cursor_find_one,
+                                      mock_changefeed_data):
+    from bigchaindb.backend import get_changefeed, connect
+    from bigchaindb.backend.changefeed import ChangeFeed
+
+    conn = connect()
+    mock_cursor_next.side_effect = [mock.DEFAULT] + mock_changefeed_data
+    # the document was reassigned before the lookup
+    mock_cursor_find_one.return_value = None
+
+    outpipe = Pipe()
+    changefeed = get_changefeed(conn, 'backlog', ChangeFeed.UPDATE,
+                                match={'assignee': 'me'})
+    changefeed.outqueue = outpipe
+    changefeed.run_forever()
+
+    assert outpipe.qsize() == 0
+    mock_cursor_find_one.assert_called_once_with(
+        {'_id': 'some-id', 'assignee': 'me'}, {'_id': False})
+
+
+def test_change_stream_pipeline():
+    from bigchaindb.backend.changefeed import ChangeFeed
+    from bigchaindb.backend.mongodb.changefeed import change_stream_pipeline
+
+    pipeline = change_stream_pipeline(ChangeFeed.INSERT | ChangeFeed.UPDATE,
+                                      match={'assignee': 'me'})
+    assert pipeline == [{'$match': {
+        'operationType': {'$in': ['insert', 'update', 'replace']},
+        '$or': [{'fullDocument.assignee': 'me'},
+                {'updateDescription.updatedFields.assignee': 'me'}],
+    }}]
+
+
+@mock.patch('bigchaindb.backend.mongodb.changefeed._FEED_STOP', True)
+def test_run_change_stream_resumes_after_error():
+    from bson.timestamp import Timestamp
+    from bigchaindb.backend.exceptions import ConnectionError
+    from bigchaindb.backend.mongodb.changefeed import run_change_stream
+
+    def stream_then_fail():
+        yield {'_id': {'_data': 'token-2'}, 'clusterTime': Timestamp(2, 0)}
+        raise ConnectionError()
+
+    conn = mock.MagicMock()
+    conn.run.side_effect = [
+        stream_then_fail(),
+        iter([{'_id': {'_data': 'token-3'}, 'clusterTime': Timestamp(3, 0)}]),
+    ]
+
+    with mock.patch('time.sleep'):
+        changes = list(run_change_stream(conn, 'backlog', [],
+                                         position=Timestamp(1, 0)))
+
+    assert [change['_id'] for change in changes] == [{'_data': 'token-2'},
+                                                     {'_data': 'token-3'}]
+    watch = conn.collection.return_value.watch
+    assert watch.call_args_list == [
+        mock.call([], full_document='updateLookup',
+                  start_at_operation_time=Timestamp(1, 0)),
+        mock.call([], full_document='updateLookup',
+                  resume_after={'_data': 'token-2'}),
+    ]
+
+
+@mock.patch('bigchaindb.backend.mongodb.changefeed._FEED_STOP', True)
+def test_run_change_stream_skips_start_operation():
+    from bson.timestamp import Timestamp
+    from bigchaindb.backend.mongodb.changefeed import run_change_stream
+
+    conn = mock.MagicMock()
+    conn.run.return_value = iter([
+        {'_id': 'token-1', 'clusterTime': Timestamp(1, 0)},
+        {'_id': 'token-2', 'clusterTime': Timestamp(2, 0)},
+    ])
+
+    changes = list(run_change_stream(conn, 'bigchain', [],
+                                     position=Timestamp(1, 0)))
+    assert [change['_id'] for change in changes] == ['token-2']
+
+
+@mock.patch('bigchaindb.backend.mongodb.changefeed.run_change_stream')
+def test_get_changes_from_change_stream(mock_run_change_stream):
+    from bigchaindb.backend.changefeed import ChangeFeed, get_changes
+    from bigchaindb.backend.mongodb.connection import MongoDBConnection
+
+    mock_run_change_stream.return_value = [
+        {'_id': 1, 'operationType': 'insert',
+         'fullDocument': {'_id': 'x', 'id': 'a', 'assignee': 'me'}},
+        {'_id': 2, 'operationType': 'update',
+         'fullDocument': {'_id': 'y', 'id': 'b', 'assignee': 'you'}},
+        {'_id': 3, 'operationType': 'update', 'fullDocument': None},
+        {'_id': 4, 'operationType': 'replace',
+         'fullDocument': {'_id': 'z', 'id': 'c', 'assignee': 'me'}},
+    ]
+    conn = MongoDBConnection(changefeed='change_stream')
+
+    changes = list(get_changes(conn, 'backlog',
+                               ChangeFeed.INSERT | ChangeFeed.UPDATE,
+                               position={'_data': 'token'},
+                               match={'assignee': 'me'}))
+
+    assert changes == [
+        (ChangeFeed.INSERT, {'id': 'a', 'assignee': 'me'}, 1),
+        (ChangeFeed.UPDATE, {'id': 'c', 'assignee': 'me'}, 4),
+    ]
+    args = mock_run_change_stream.call_args[0]
+    assert args[:2] == (conn, 'backlog')
+    assert args[3] == {'_data': 'token'}
+
+
+def test_stored_position():
+    from bigchaindb.backend.changefeed import (get_stored_position,
+                                               store_position)
+    from bigchaindb.backend.mongodb.connection import MongoDBConnection
+
+    conn = MongoDBConnection()
+    with mock.patch.object(conn, 'run') as run:
+        run.return_value = None
+        assert get_stored_position(conn, 'node.votes') is None
+        run.return_value = {'_id': 'node.votes', 'position': 42}
+        assert get_stored_position(conn, 'node.votes') == 42
+        store_position(conn, 'node.votes', 43)
+        assert run.call_count == 3
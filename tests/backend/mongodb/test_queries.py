@@ -21,6 +21,22 @@ def test_write_transaction(signed_create_tx):
     assert tx_db == signed_create_tx.to_dict()
 
 
+def test_write_transactions(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    query.write_transaction(conn, signed_create_tx.to_dict())
+
+    # the transactions already in the backlog are ignored
+    query.write_transactions(conn, [signed_create_tx.to_dict(),
+                                    signed_transfer_tx.to_dict()])
+
+    assert conn.db.backlog.count() == 2
+    tx_db = conn.db.backlog.find_one({'id': signed_transfer_tx.id},
+                                     {'_id': False})
+    assert tx_db == signed_transfer_tx.to_dict()
+
+
 def test_update_transaction(signed_create_tx):
     from bigchaindb.backend import connect, query
     conn = connect()
@@ -41,6 +57,23 @@ def test_update_transaction(signed_create_tx):
     assert tx_db['assignment_timestamp'] == 20
 
 
+def test_update_transactions(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    txs = [signed_create_tx.to_dict(), signed_transfer_tx.to_dict()]
+    for tx in txs:
+        tx.update({'assignee': 'aaa', 'assignment_timestamp': 10})
+    conn.db.backlog.insert_many(txs)
+
+    query.update_transactions(conn, [tx['id'] for tx in txs],
+                              {'assignee': 'bbb', 'assignment_timestamp': 20})
+
+    for tx_db in conn.db.backlog.find({}, {'_id': False}):
+        assert tx_db['assignee'] == 'bbb'
+        assert tx_db['assignment_timestamp'] == 20
+
+
 def test_delete_transaction(signed_create_tx):
     from bigchaindb.backend import connect, query
     conn = connect()
@@ -77,6 +110,22 @@ def test_get_stale_transactions(signed_create_tx):
     assert stale_txs[0]['id'] == 'stale'
 
 
+def test_get_oldest_assignment_timestamp(signed_create_tx):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    assert query.get_oldest_assignment_timestamp(conn) is None
+
+    tx1 = signed_create_tx.to_dict()
+    tx1.update({'id': 'newer', 'assignment_timestamp': 20})
+    tx2 = signed_create_tx.to_dict()
+    tx2.update({'id': 'older', 'assignment_timestamp': 10})
+    conn.db.backlog.insert_one(tx1)
+    conn.db.backlog.insert_one(tx2)
+
+    assert query.get_oldest_assignment_timestamp(conn) == 10
+
+
 def test_get_transaction_from_block(user_pk):
     from bigchaindb.backend import connect, query
     from bigchaindb.models import Transaction, Block
@@ -266,6 +315,40 @@ def test_get_votes_by_block_id_and_voter(signed_create_tx,
     assert votes[0]['node_pubkey'] == 'aaa'
 
 
+def test_get_votes_by_previous_block_and_voter(structurally_valid_vote):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    structurally_valid_vote['vote']['previous_block'] = 'b1'
+    structurally_valid_vote['node_pubkey'] = 'aaa'
+    conn.db.votes.insert_one(structurally_valid_vote)
+    structurally_valid_vote['node_pubkey'] = 'bbb'
+    structurally_valid_vote.pop('_id')
+    conn.db.votes.insert_one(structurally_valid_vote)
+
+    votes = list(query.get_votes_by_previous_block_and_voter(conn, 'b1',
+                                                             'aaa'))
+
+    assert len(votes) == 1
+    assert votes[0]['node_pubkey'] == 'aaa'
+    assert '_id' not in votes[0]
+
+
+def test_vote_checkpoint():
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    assert query.get_vote_checkpoint(conn, 'aaa') is None
+
+    query.write_vote_checkpoint(conn, 'aaa', 'b1')
+    query.write_vote_checkpoint(conn, 'aaa', 'b2')
+    query.write_vote_checkpoint(conn, 'bbb', 'b1')
+
+    assert query.get_vote_checkpoint(conn, 'aaa') == 'b2'
+    assert query.get_vote_checkpoint(conn, 'bbb') == 'b1'
+    assert conn.db.vote_checkpoints.count() == 2
+
+
 def test_write_block(signed_create_tx):
     from bigchaindb.backend import connect, query
     from bigchaindb.models import Block
@@ -397,18 +480,86 @@ def test_get_txids_filtered(signed_create_tx, signed_transfer_tx):
     asset_id = Transaction.get_asset_id([signed_create_tx, signed_transfer_tx])
 
     # Test get by just asset id
-    txids = set(query.get_txids_filtered(conn, asset_id))
+    txids = {txid for _, txid in
+             query.get_txids_filtered(conn, asset_id)}
     assert txids == {signed_create_tx.id, signed_transfer_tx.id}
 
     # Test get by asset and CREATE
-    txids = set(query.get_txids_filtered(conn, asset_id, Transaction.CREATE))
+    txids = {txid for _, txid in
+             query.get_txids_filtered(conn, asset_id, Transaction.CREATE)}
     assert txids == {signed_create_tx.id}
 
     # Test get by asset and TRANSFER
-    txids = set(query.get_txids_filtered(conn, asset_id, Transaction.TRANSFER))
+    txids = {txid for _, txid in
+             query.get_txids_filtered(conn, asset_id, Transaction.TRANSFER)}
     assert txids == {signed_transfer_tx.id}
 
 
+def test_get_txids_filtered_paginated(user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block, Transaction
+    conn = connect()
+
+    create = Transaction.create([user_pk], [([user_pk], 3)])
+    transfers = [Transaction.transfer([input_], [([user_pk], 1)], create.id)
+                 for input_ in create.to_inputs()]
+    blocks = [Block(transactions=[create]), Block(transactions=transfers)]
+    for block in blocks:
+        query.write_block(conn, block.to_dict())
+    # in the order of the blocks, then of the transactions in a block
+    txids = [(block.id, tx.id)
+             for block in sorted(blocks, key=lambda block: block.id)
+             for tx in block.transactions]
+    first = txids[0][0]
+    after_first = [txid for txid in txids if txid[0] > first]
+
+    assert list(query.get_txids_filtered(conn, create.id, limit=2)) == \
+        txids[:2]
+    assert list(query.get_txids_filtered(conn, create.id, last_id=first,
+                                         limit=1)) == after_first[:1]
+    assert list(query.get_txids_filtered(conn, create.id,
+                                         last_id=first)) == after_first
+    assert list(query.get_txids_filtered(conn, create.id)) == txids
+
+
+def test_get_owned_ids_paginated(user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block, Transaction
+    conn = connect()
+
+    txs = [Transaction.create([user_pk], [([user_pk], 1)], {'i': i})
+           for i in range(3)]
+    blocks = [Block(transactions=txs[:2]), Block(transactions=txs[2:])]
+    for block in blocks:
+        query.write_block(conn, block.to_dict())
+    txids = [(block.id, tx.id)
+             for block in sorted(blocks, key=lambda block: block.id)
+             for tx in block.transactions]
+    first = txids[0][0]
+
+    owned = list(query.get_owned_ids(conn, user_pk, limit=2))
+    assert [(block_id, tx['id']) for block_id, tx in owned] == txids[:2]
+    owned = list(query.get_owned_ids(conn, user_pk, last_id=first))
+    assert [(block_id, tx['id']) for block_id, tx in owned] == \
+        [txid for txid in txids if txid[0] > first]
+
+
+def test_get_votes_by_block_id_paginated(structurally_valid_vote):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    block_id = structurally_valid_vote['vote']['voting_for_block']
+    for voter in 'abc':
+        vote = dict(structurally_valid_vote, node_pubkey=voter * 44)
+        query.write_vote(conn, vote)
+
+    votes = query.get_votes_by_block_id(conn, block_id, limit=2)
+    assert [vote['node_pubkey'] for vote in votes] == ['a' * 44, 'b' * 44]
+    votes = query.get_votes_by_block_id(conn, block_id, last_id='a' * 44)
+    assert sorted(vote['node_pubkey'] for vote in votes) == \
+        ['b' * 44, 'c' * 44]
+
+
 @mock.patch('bigchaindb.backend.mongodb.changefeed._FEED_STOP', True)
 def test_get_new_blocks_feed(b, create_tx):
     from bigchaindb.backend import query
@@ -434,6 +585,79 @@ def test_get_new_blocks_feed(b, create_tx):
     assert list(feed) == [b3]
 
 
+def test_get_blocks_after(b, create_tx):
+    from bigchaindb.backend import query
+    from bigchaindb.models import Block
+    import random
+
+    def create_block():
+        block = Block(transactions=[create_tx], timestamp=str(random.random()))
+        b.write_block(block)
+        return block.decouple_assets()[1]
+
+    b1, b2, b3 = create_block(), create_block(), create_block()
+
+    assert list(query.get_blocks_after(b.connection, b1['id'])) == [b2, b3]
+    assert list(query.get_blocks_after(b.connection, b1['id'], limit=1)) == [b2]
+    assert list(query.get_blocks_after(b.connection, b3['id'])) == []
+    assert query.get_blocks_after(b.connection, 'a' * 64) is None
+
+
+def test_get_blocks_after_in_the_order_of_the_oplog(b, create_tx):
+    from bson import ObjectId
+    from bigchaindb.backend import query
+    from bigchaindb.models import Block
+
+    b1 = Block(transactions=[create_tx], timestamp='1')
+    b.write_block(b1)
+    # the ObjectId of a node with a clock behind
+    b2 = Block(transactions=[create_tx], timestamp='2').to_dict()
+    b.connection.run(b.connection.collection('bigchain')
+                     .insert_one(dict(b2, _id=ObjectId('0' * 24))))
+
+    assert [block['id'] for block in query.get_blocks_after(b.connection, b1.id)] == \
+        [b2['id']]
+
+
+def test_get_blocks_of_transactions_and_backlog_transaction_ids(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect()
+
+    block = Block(transactions=[signed_create_tx, signed_transfer_tx])
+    query.write_block(conn, block.to_dict())
+    query.write_transaction(conn, signed_transfer_tx.to_dict())
+
+    txids = [signed_create_tx.id, signed_transfer_tx.id, 'a' * 64]
+    assert list(query.get_blocks_of_transactions(conn, txids[:1] + txids[2:])) == \
+        [(signed_create_tx.id, {'id': block.id, 'block': {'voters': block.voters}})]
+    assert list(query.get_backlog_transaction_ids(conn, txids)) == [signed_transfer_tx.id]
+
+
+def test_get_transactions_from_blocks_and_votes_for_blocks(signed_create_tx,
+                                                           signed_transfer_tx,
+                                                           structurally_valid_vote):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect()
+
+    blocks = [Block(transactions=[signed_create_tx, signed_transfer_tx], voters=['a']),
+              Block(transactions=[signed_transfer_tx], voters=['b'])]
+    for block in blocks:
+        query.write_block(conn, block.to_dict())
+
+    found = query.get_transactions_from_blocks(conn, [signed_transfer_tx.id, 'a' * 64])
+    assert sorted((block['id'], block['block']['voters'], transaction['id'])
+                  for block, transaction in found) == \
+        sorted((block.id, block.voters, signed_transfer_tx.id) for block in blocks)
+
+    vote = structurally_valid_vote
+    query.write_vote(conn, vote)
+    assert list(query.get_votes_for_blocks(
+        conn, [vote['vote']['voting_for_block'], 'other'])) == [vote]
+    assert list(query.get_votes_for_blocks(conn, ['other'])) == []
+
+
 def test_get_spending_transactions(user_pk):
     from bigchaindb.backend import connect, query
     from bigchaindb.models import Block, Transaction
@@ -19,22 +19,28 @@ def test_init_creates_db_tables_and_indexes():
 
     collection_names = conn.conn[dbname].collection_names()
     assert sorted(collection_names) == ['assets', 'backlog', 'bigchain',
+                                        'changefeed', 'vote_checkpoints',
                                         'votes']
 
     indexes = conn.conn[dbname]['bigchain'].index_information().keys()
-    assert sorted(indexes) == ['_id_', 'asset_id', 'block_timestamp', 'inputs',
-                               'outputs', 'transaction_id']
+    assert sorted(indexes) == ['_id_', 'asset_id', 'block_id',
+                               'block_timestamp', 'inputs', 'outputs',
+                               'transaction_id']
 
     indexes = conn.conn[dbname]['backlog'].index_information().keys()
     assert sorted(indexes) == ['_id_', 'assignee__transaction_timestamp',
-                               'transaction_id']
+                               'assignment_timestamp', 'transaction_id']
 
     indexes = conn.conn[dbname]['votes'].index_information().keys()
-    assert sorted(indexes) == ['_id_', 'block_and_voter']
+    assert sorted(indexes) == ['_id_', 'block_and_voter',
+                               'previous_block_and_voter']
 
     indexes = conn.conn[dbname]['assets'].index_information().keys()
     assert sorted(indexes) == ['_id_', 'asset_id', 'text']
 
+    indexes = conn.conn[dbname]['vote_checkpoints'].index_information().keys()
+    assert sorted(indexes) == ['_id_', 'voter']
+
 
 def test_init_database_fails_if_db_exists():
     import bigchaindb
@@ -67,6 +73,7 @@ def test_create_tables():
 
     collection_names = conn.conn[dbname].collection_names()
     assert sorted(collection_names) == ['assets', 'backlog', 'bigchain',
+                                        'changefeed', 'vote_checkpoints',
                                         'votes']
 
 
@@ -86,17 +93,19 @@ def test_create_secondary_indexes():
 
     # Bigchain table
     indexes = conn.conn[dbname]['bigchain'].index_information().keys()
-    assert sorted(indexes) == ['_id_', 'asset_id', 'block_timestamp', 'inputs',
-                               'outputs', 'transaction_id']
+    assert sorted(indexes) == ['_id_', 'asset_id', 'block_id',
+                               'block_timestamp', 'inputs', 'outputs',
+                               'transaction_id']
 
     # Backlog table
     indexes = conn.conn[dbname]['backlog'].index_information().keys()
     assert sorted(indexes) == ['_id_', 'assignee__transaction_timestamp',
-                               'transaction_id']
+                               'assignment_timestamp', 'transaction_id']
 
     # Votes table
     indexes = conn.conn[dbname]['votes'].index_information().keys()
-    assert sorted(indexes) == ['_id_', 'block_and_voter']
+    assert sorted(indexes) == ['_id_', 'block_and_voter',
+                               'previous_block_and_voter']
 
 
 def test_drop(dummy_db):
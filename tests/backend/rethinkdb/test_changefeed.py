@@ -93,3 +93,18 @@ def test_changefeed_prefeed(mock_changefeed_connection):
     changefeed.outqueue = outpipe
     changefeed.run_forever()
     assert outpipe.qsize() == 4
+
+
+def test_changefeed_with_match(mock_changefeed_connection):
+    from bigchaindb.backend import get_changefeed
+    from bigchaindb.backend.changefeed import ChangeFeed
+
+    outpipe = Pipe()
+    changefeed = get_changefeed(mock_changefeed_connection, 'backlog',
+                                ChangeFeed.INSERT, match={'assignee': 'me'})
+    changefeed.outqueue = outpipe
+    changefeed.run_forever()
+
+    query = mock_changefeed_connection.run.call_args[0][0]
+    assert '.filter(' in str(query)
+    assert 'assignee' in str(query)
@@ -27,6 +27,9 @@ def test_init_creates_db_tables_and_indexes():
     assert conn.run(r.db(dbname).table('backlog').index_list().contains(
         'assignee__transaction_timestamp')) is True
 
+    assert conn.run(r.db(dbname).table('backlog').index_list().contains(
+        'assignment_timestamp')) is True
+
 
 @pytest.mark.bdb
 def test_init_database_fails_if_db_exists():
@@ -64,7 +67,10 @@ def test_create_tables():
     assert conn.run(r.db(dbname).table_list().contains('backlog')) is True
     assert conn.run(r.db(dbname).table_list().contains('votes')) is True
     assert conn.run(r.db(dbname).table_list().contains('assets')) is True
-    assert len(conn.run(r.db(dbname).table_list())) == 4
+    assert conn.run(r.db(dbname).table_list().contains(
+        'vote_checkpoints')) is True
+    assert conn.run(r.db(dbname).table_list().contains('changefeed')) is True
+    assert len(conn.run(r.db(dbname).table_list())) == 6
 
 
 @pytest.mark.bdb
@@ -94,10 +100,14 @@ def test_create_secondary_indexes():
     # Backlog table
     assert conn.run(r.db(dbname).table('backlog').index_list().contains(
         'assignee__transaction_timestamp')) is True
+    assert conn.run(r.db(dbname).table('backlog').index_list().contains(
+        'assignment_timestamp')) is True
 
     # Votes table
     assert conn.run(r.db(dbname).table('votes').index_list().contains(
         'block_and_voter')) is True
+    assert conn.run(r.db(dbname).table('votes').index_list().contains(
+        'previous_block_and_voter')) is True
 
 
 def test_drop(dummy_db):
@@ -0,0 +1,102 @@
+from unittest import mock
+
+import pytest
+
+
+pytestmark = [
+    pytest.mark.bdb,
+    pytest.mark.usefixtures('feed_stop'),
+]
+
+
+@pytest.fixture
+def feed_stop():
+    with mock.patch('bigchaindb.backend.sqlite.changefeed._FEED_STOP', True):
+        yield
+
+
+@pytest.fixture
+def conn():
+    from bigchaindb.backend import connect
+    return connect()
+
+
+def test_changes_are_logged(conn):
+    from bigchaindb.backend import query
+    from bigchaindb.backend.changefeed import ChangeFeed, get_changes
+
+    query.write_transaction(conn, {'id': 'a', 'assignee': 'me'})
+    query.update_transaction(conn, 'a', {'assignee': 'you'})
+    query.delete_transaction(conn, 'a')
+
+    changes = list(get_changes(conn, 'backlog', ChangeFeed.INSERT |
+                               ChangeFeed.UPDATE | ChangeFeed.DELETE,
+                               position=0))
+    assert [(operation, document) for operation, document, _ in changes] == [
+        (ChangeFeed.INSERT, {'id': 'a', 'assignee': 'me'}),
+        (ChangeFeed.UPDATE, {'id': 'a', 'assignee': 'you'}),
+        (ChangeFeed.DELETE, {'id': 'a', 'assignee': 'you'}),
+    ]
+
+    # a changefeed starts after the last change
+    assert list(get_changes(conn, 'backlog', ChangeFeed.INSERT)) == []
+
+
+def test_get_changes_with_match(conn):
+    from bigchaindb.backend import query
+    from bigchaindb.backend.changefeed import ChangeFeed, get_changes
+
+    query.write_transaction(conn, {'id': 'a', 'assignee': 'me'})
+    query.write_transaction(conn, {'id': 'b', 'assignee': 'you'})
+    query.delete_transaction(conn, 'a', 'b')
+
+    changes = get_changes(conn, 'backlog',
+                          ChangeFeed.INSERT | ChangeFeed.DELETE,
+                          position=0, match={'assignee': 'me'})
+    # deletes are not filtered
+    assert [(operation, document['id']) for operation, document, _ in changes] == [
+        (ChangeFeed.INSERT, 'a'), (ChangeFeed.DELETE, 'a'),
+        (ChangeFeed.DELETE, 'b')]
+
+
+def test_get_insert_position(conn):
+    from bigchaindb.backend import query
+    from bigchaindb.backend.changefeed import (ChangeFeed, get_changes,
+                                               get_insert_position)
+
+    query.write_transaction(conn, {'id': 'a'})
+    query.write_transaction(conn, {'id': 'b'})
+
+    position = get_insert_position(conn, 'backlog', 'a')
+    changes = list(get_changes(conn, 'backlog', ChangeFeed.INSERT,
+                               position=position))
+    assert changes == [(ChangeFeed.INSERT, {'id': 'b'}, position + 1)]
+    assert get_insert_position(conn, 'backlog', 'c') is None
+
+
+def test_stored_position(conn):
+    from bigchaindb.backend.changefeed import (get_stored_position,
+                                               store_position)
+
+    assert get_stored_position(conn, 'node.backlog') is None
+    store_position(conn, 'node.backlog', 3)
+    store_position(conn, 'node.backlog', 4)
+    assert get_stored_position(conn, 'node.backlog') == 4
+
+
+@mock.patch('bigchaindb.backend.sqlite.schema.CHANGELOG_SIZE', 2000)
+def test_change_log_is_trimmed(dummy_db):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.backend.schema import drop_database, init_database
+
+    conn = connect(name=dummy_db)
+    drop_database(conn, dummy_db)
+    init_database(conn, dummy_db)
+
+    for i in range(3000):
+        query.write_transaction(conn, {'id': str(i)})
+
+    db = conn.open(dummy_db)
+    assert db.execute('SELECT min(position), max(position) '
+                      'FROM changes').fetchone() == (1001, 3000)
+    db.close()
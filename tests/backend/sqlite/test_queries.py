@@ -0,0 +1,239 @@
+import pytest
+
+pytestmark = pytest.mark.bdb
+
+
+def test_write_block_indexes_its_transactions(signed_create_tx,
+                                              signed_transfer_tx, user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect()
+
+    block = Block(transactions=[signed_create_tx, signed_transfer_tx])
+    query.write_block(conn, block.to_dict())
+
+    db = conn.open()
+    assert db.execute('SELECT block_id, tx_index, txid, operation, asset_id '
+                      'FROM transactions').fetchall() == [
+        (block.id, 0, signed_create_tx.id, 'CREATE', None),
+        (block.id, 1, signed_transfer_tx.id, 'TRANSFER', signed_create_tx.id),
+    ]
+    assert db.execute('SELECT * FROM inputs').fetchall() == [
+        (block.id, 1, signed_create_tx.id, 0)]
+    assert db.execute('SELECT tx_index FROM outputs '
+                      'WHERE public_key = ?', (user_pk,)).fetchall() == [(0,), (1,)]
+    db.close()
+
+    assert query.get_transaction_from_block(
+        conn, signed_transfer_tx.id, block.id) == signed_transfer_tx.to_dict()
+    assert query.get_transaction_from_block(
+        conn, signed_transfer_tx.id, 'other') is None
+
+
+def test_write_transactions(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    query.write_transaction(conn, signed_create_tx.to_dict())
+    query.write_transactions(conn, [signed_create_tx.to_dict(),
+                                    signed_transfer_tx.to_dict()])
+
+    assert query.count_backlog(conn) == 2
+    assert query.get_transaction_from_backlog(
+        conn, signed_transfer_tx.id) == signed_transfer_tx.to_dict()
+
+
+def test_update_transaction_sets_the_fields(signed_create_tx):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    tx = signed_create_tx.to_dict()
+    tx.update({'assignee': 'aaa', 'assignment_timestamp': 10})
+    query.write_transaction(conn, tx)
+
+    query.update_transaction(conn, tx['id'], {'assignee': 'bbb',
+                                              'metadata': {'b': 2}})
+
+    assert query.get_transaction_from_backlog(conn, tx['id']) == \
+        dict(signed_create_tx.to_dict(), metadata={'b': 2})
+    assert query.get_oldest_assignment_timestamp(conn) == 10
+
+
+def test_get_spending_transactions(user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block, Transaction
+    conn = connect()
+
+    out = [([user_pk], 1)]
+    tx1 = Transaction.create([user_pk], out * 3)
+    inputs = tx1.to_inputs()
+    tx2 = Transaction.transfer([inputs[0]], out, tx1.id)
+    tx3 = Transaction.transfer([inputs[1]], out, tx1.id)
+    tx4 = Transaction.transfer([inputs[2]], out, tx1.id)
+    block = Block([tx1, tx2, tx3, tx4])
+    query.write_block(conn, block.to_dict())
+
+    links = [inputs[0].fulfills.to_dict(), inputs[2].fulfills.to_dict()]
+    res = list(query.get_spending_transactions(conn, links))
+
+    # tx3 not a member because input 1 not asked for
+    assert res == [(block.id, tx2.to_dict()), (block.id, tx4.to_dict())]
+    assert list(query.get_spent(conn, tx1.id, 1)) == [tx3.to_dict()]
+
+
+def test_get_votes_for_blocks_by_voter(structurally_valid_vote):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.backend.exceptions import DuplicateKeyError
+    conn = connect()
+
+    vote = structurally_valid_vote
+    block_id = vote['vote']['voting_for_block']
+    query.write_vote(conn, vote)
+    with pytest.raises(DuplicateKeyError):
+        query.write_vote(conn, vote)
+
+    assert list(query.get_votes_for_blocks_by_voter(
+        conn, [block_id, 'other'], vote['node_pubkey'])) == [vote]
+    assert list(query.get_votes_for_blocks_by_voter(
+        conn, [block_id], 'other')) == []
+
+
+def test_get_txids_filtered_paginated(user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block, Transaction
+    conn = connect()
+
+    create = Transaction.create([user_pk], [([user_pk], 3)])
+    transfers = [Transaction.transfer([input_], [([user_pk], 1)], create.id)
+                 for input_ in create.to_inputs()]
+    blocks = [Block(transactions=[create]), Block(transactions=transfers)]
+    for block in blocks:
+        query.write_block(conn, block.to_dict())
+    # in the order of the blocks, then of the transactions in a block
+    txids = [(block.id, tx.id)
+             for block in sorted(blocks, key=lambda block: block.id)
+             for tx in block.transactions]
+    first = txids[0][0]
+    after_first = [txid for txid in txids if txid[0] > first]
+
+    assert list(query.get_txids_filtered(conn, create.id, limit=2)) == \
+        txids[:2]
+    assert list(query.get_txids_filtered(conn, create.id, last_id=first,
+                                         limit=1)) == after_first[:1]
+    assert list(query.get_txids_filtered(conn, create.id,
+                                         last_id=first)) == after_first
+    assert list(query.get_txids_filtered(conn, create.id)) == txids
+
+
+def test_get_owned_ids_paginated(user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block, Transaction
+    conn = connect()
+
+    txs = [Transaction.create([user_pk], [([user_pk], 1)], {'i': i})
+           for i in range(3)]
+    blocks = [Block(transactions=txs[:2]), Block(transactions=txs[2:])]
+    for block in blocks:
+        query.write_block(conn, block.to_dict())
+    txids = [(block.id, tx.id)
+             for block in sorted(blocks, key=lambda block: block.id)
+             for tx in block.transactions]
+    first = txids[0][0]
+
+    owned = list(query.get_owned_ids(conn, user_pk, limit=2))
+    assert [(block_id, tx['id']) for block_id, tx in owned] == txids[:2]
+    owned = list(query.get_owned_ids(conn, user_pk, last_id=first))
+    assert [(block_id, tx['id']) for block_id, tx in owned] == \
+        [txid for txid in txids if txid[0] > first]
+
+
+def test_get_votes_by_block_id_paginated(structurally_valid_vote):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    block_id = structurally_valid_vote['vote']['voting_for_block']
+    for voter in 'abc':
+        vote = dict(structurally_valid_vote, node_pubkey=voter * 44)
+        query.write_vote(conn, vote)
+
+    votes = query.get_votes_by_block_id(conn, block_id, limit=2)
+    assert [vote['node_pubkey'] for vote in votes] == ['a' * 44, 'b' * 44]
+    votes = query.get_votes_by_block_id(conn, block_id, last_id='a' * 44)
+    assert sorted(vote['node_pubkey'] for vote in votes) == \
+        ['b' * 44, 'c' * 44]
+
+
+def test_get_blocks_after(b, create_tx):
+    from bigchaindb.backend import query
+    from bigchaindb.models import Block
+    import random
+
+    def create_block():
+        block = Block(transactions=[create_tx], timestamp=str(random.random()))
+        b.write_block(block)
+        return block.decouple_assets()[1]
+
+    b1, b2, b3 = create_block(), create_block(), create_block()
+
+    assert list(query.get_blocks_after(b.connection, b1['id'])) == [b2, b3]
+    assert list(query.get_blocks_after(b.connection, b1['id'], limit=1)) == [b2]
+    assert list(query.get_blocks_after(b.connection, b3['id'])) == []
+    assert query.get_blocks_after(b.connection, 'a' * 64) is None
+
+
+def test_get_blocks_of_transactions_and_backlog_transaction_ids(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect()
+
+    block = Block(transactions=[signed_create_tx, signed_transfer_tx])
+    query.write_block(conn, block.to_dict())
+    query.write_transaction(conn, signed_transfer_tx.to_dict())
+
+    txids = [signed_create_tx.id, signed_transfer_tx.id, 'a' * 64]
+    assert list(query.get_blocks_of_transactions(conn, txids[:1] + txids[2:])) == \
+        [(signed_create_tx.id, {'id': block.id, 'block': {'voters': block.voters}})]
+    assert list(query.get_backlog_transaction_ids(conn, txids)) == [signed_transfer_tx.id]
+
+
+def test_get_transactions_from_blocks_and_votes_for_blocks(signed_create_tx,
+                                                           signed_transfer_tx,
+                                                           structurally_valid_vote):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect()
+
+    blocks = [Block(transactions=[signed_create_tx, signed_transfer_tx], voters=['a']),
+              Block(transactions=[signed_transfer_tx], voters=['b'])]
+    for block in blocks:
+        query.write_block(conn, block.to_dict())
+
+    found = query.get_transactions_from_blocks(conn, [signed_transfer_tx.id, 'a' * 64])
+    assert sorted((block['id'], block['block']['voters'], transaction['id'])
+                  for block, transaction in found) == \
+        sorted((block.id, block.voters, signed_transfer_tx.id) for block in blocks)
+
+    vote = structurally_valid_vote
+    query.write_vote(conn, vote)
+    assert list(query.get_votes_for_blocks(
+        conn, [vote['vote']['voting_for_block'], 'other'])) == [vote]
+    assert list(query.get_votes_for_blocks(conn, ['other'])) == []
+
+
+def test_text_search_is_not_supported():
+    from bigchaindb.backend import connect, query
+    from bigchaindb.backend.exceptions import OperationError
+
+    with pytest.raises(OperationError):
+        query.text_search(connect(), 'abc')
+
+
+def test_connection_is_reopened_after_a_fork(monkeypatch):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    query.count_blocks(conn)
+    db = conn.conn
+    monkeypatch.setattr('os.getpid', lambda: -1)
+    query.count_blocks(conn)
+    assert conn.conn is not db
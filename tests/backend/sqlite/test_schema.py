@@ -0,0 +1,71 @@
+import pytest
+
+
+pytestmark = pytest.mark.bdb
+
+
+def _names(conn, dbname, kind):
+    db = conn.open(dbname)
+    names = [name for name, in db.execute(
+        "SELECT name FROM sqlite_master WHERE type = ? "
+        "AND name NOT LIKE 'sqlite_%'", (kind,))]
+    db.close()
+    return sorted(names)
+
+
+def test_init_creates_db_tables_and_indexes():
+    import bigchaindb
+    from bigchaindb import backend
+    from bigchaindb.backend.schema import init_database
+
+    conn = backend.connect()
+    dbname = bigchaindb.config['database']['name']
+
+    # the db is set up by the fixture so we need to remove it
+    backend.schema.drop_database(conn, dbname)
+
+    init_database()
+
+    assert _names(conn, dbname, 'table') == [
+        'assets', 'backlog', 'bigchain', 'changefeed', 'changes',
+        'inputs', 'outputs', 'transactions', 'vote_checkpoints', 'votes']
+
+    assert _names(conn, dbname, 'index') == [
+        'asset_id', 'assignment_timestamp', 'block_and_voter',
+        'block_transaction', 'input_link', 'operation', 'output_public_key',
+        'previous_block_and_voter', 'table_position', 'transaction_id',
+        'voter']
+
+    db = conn.open(dbname)
+    assert db.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+    db.close()
+
+
+def test_init_database_fails_if_db_exists():
+    from bigchaindb.backend.schema import init_database
+    from bigchaindb.common import exceptions
+
+    # The db is set up by the fixtures
+    with pytest.raises(exceptions.DatabaseAlreadyExists):
+        init_database()
+
+
+def test_drop(dummy_db):
+    import os
+    from bigchaindb import backend
+    from bigchaindb.backend import schema
+
+    conn = backend.connect()
+    assert os.path.exists(conn.filename(dummy_db))
+    schema.drop_database(conn, dummy_db)
+    assert not os.path.exists(conn.filename(dummy_db))
+
+
+def test_drop_non_existent_db_raises_an_error():
+    from bigchaindb import backend
+    from bigchaindb.backend import schema
+    from bigchaindb.common import exceptions
+
+    conn = backend.connect()
+    with pytest.raises(exceptions.DatabaseDoesNotExist):
+        schema.drop_database(conn, 'does_not_exist')
@@ -0,0 +1,247 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+
+@pytest.fixture
+def changes():
+    from bigchaindb.backend.changefeed import ChangeFeed
+    return [
+        (ChangeFeed.INSERT, {'id': 'a', 'assignee': 'me'}, 1),
+        (ChangeFeed.UPDATE, {'id': 'b', 'assignee': 'you'}, 2),
+        (ChangeFeed.UPDATE, {'id': 'c', 'assignee': 'me'}, 3),
+        (ChangeFeed.DELETE, {'id': 'd'}, 4),
+    ]
+
+
+def acknowledge(subscription, *keys):
+    subscription.acknowledge(*keys)
+    # the keys are flushed to the multiplexer by a thread
+    time.sleep(0.1)
+
+
+def drain(pipe, count):
+    items = [pipe.get(timeout=1) for _ in range(count)]
+    assert pipe.empty()
+    return items
+
+
+def test_subscription_wants():
+    from bigchaindb.backend.changefeed import ChangeFeed, Subscription
+
+    subscription = Subscription(ChangeFeed.INSERT, match={'assignee': 'me'})
+    assert subscription.wants(ChangeFeed.INSERT, {'assignee': 'me'})
+    assert not subscription.wants(ChangeFeed.INSERT, {'assignee': 'you'})
+    assert not subscription.wants(ChangeFeed.UPDATE, {'assignee': 'me'})
+
+
+@patch('bigchaindb.backend.connect')
+def test_multiplexer_fans_out_changes(mock_connect, changes):
+    from bigchaindb.backend.changefeed import ChangeFeed, ChangeFeedMultiplexer
+
+    multiplexer = ChangeFeedMultiplexer()
+    inserts = multiplexer.subscribe('backlog', ChangeFeed.INSERT).pipe
+    mine = multiplexer.subscribe('backlog',
+                                 ChangeFeed.INSERT | ChangeFeed.UPDATE,
+                                 match={'assignee': 'me'}).pipe
+    multiplexer.positions['backlog'] = None
+    multiplexer.stats['backlog'] = {'count': 0, 'received_at': None,
+                                    'lag': None}
+
+    with patch('bigchaindb.backend.changefeed.get_stored_position',
+               return_value=None), \
+            patch('bigchaindb.backend.changefeed.store_position'), \
+            patch('bigchaindb.backend.changefeed.get_changes',
+                  return_value=iter(changes)) as get_changes:
+        multiplexer.run_table('backlog', multiplexer.subscriptions['backlog'])
+
+    # the table is tailed once, for all the subscribed operations, and the
+    # filter is not pushed down since the subscriptions do not share it
+    get_changes.assert_called_once_with(
+        mock_connect.return_value, 'backlog',
+        ChangeFeed.INSERT | ChangeFeed.UPDATE, position=None, match=None)
+    assert drain(inserts, 1) == [{'id': 'a', 'assignee': 'me'}]
+    assert drain(mine, 2) == [{'id': 'a', 'assignee': 'me'},
+                              {'id': 'c', 'assignee': 'me'}]
+    assert multiplexer.positions['backlog'] == 4
+    assert multiplexer.stats['backlog']['count'] == 4
+
+
+@patch('bigchaindb.backend.connect')
+def test_multiplexer_pushes_down_shared_match(mock_connect):
+    from bigchaindb.backend.changefeed import ChangeFeed, ChangeFeedMultiplexer
+
+    multiplexer = ChangeFeedMultiplexer()
+    multiplexer.subscribe('backlog', ChangeFeed.INSERT,
+                          match={'assignee': 'me'}, position=5)
+    multiplexer.subscribe('backlog', ChangeFeed.UPDATE,
+                          match={'assignee': 'me'}, position=3)
+    multiplexer.positions['backlog'] = 3
+    multiplexer.stats['backlog'] = {'count': 0, 'received_at': None,
+                                    'lag': None}
+
+    with patch('bigchaindb.backend.changefeed.get_changes',
+               return_value=iter([])) as get_changes:
+        multiplexer.run_table('backlog', multiplexer.subscriptions['backlog'])
+
+    get_changes.assert_called_once_with(
+        mock_connect.return_value, 'backlog',
+        ChangeFeed.INSERT | ChangeFeed.UPDATE, position=3,
+        match={'assignee': 'me'})
+
+
+@patch('bigchaindb.backend.connect')
+def test_multiplexer_resumes_from_stored_position(mock_connect, changes):
+    from bigchaindb.backend.changefeed import ChangeFeed, ChangeFeedMultiplexer
+
+    multiplexer = ChangeFeedMultiplexer(name='node')
+    inserts = multiplexer.subscribe('backlog', ChangeFeed.INSERT).pipe
+    multiplexer.positions['backlog'] = None
+    multiplexer.stats['backlog'] = {'count': 0, 'received_at': None,
+                                    'lag': None}
+
+    with patch('bigchaindb.backend.changefeed.get_stored_position',
+               return_value=7) as get_stored_position, \
+            patch('bigchaindb.backend.changefeed.get_changes',
+                  return_value=iter(changes[:1])) as get_changes:
+        multiplexer.run_table('backlog', multiplexer.subscriptions['backlog'])
+
+    get_stored_position.assert_called_once_with(mock_connect.return_value,
+                                                'node.backlog')
+    get_changes.assert_called_once_with(
+        mock_connect.return_value, 'backlog', ChangeFeed.INSERT,
+        position=7, match=None)
+    assert drain(inserts, 1) == [{'id': 'a', 'assignee': 'me'}]
+
+
+def test_multiplexer_checkpoints_acknowledged_changes(changes):
+    from bigchaindb.backend.changefeed import ChangeFeed, ChangeFeedMultiplexer
+
+    multiplexer = ChangeFeedMultiplexer(name='node')
+    inserts = multiplexer.subscribe('backlog', ChangeFeed.INSERT)
+    mine = multiplexer.subscribe('backlog',
+                                 ChangeFeed.INSERT | ChangeFeed.UPDATE,
+                                 match={'assignee': 'me'})
+    multiplexer.positions['backlog'] = 0
+    multiplexer.stats['backlog'] = {'count': 0, 'received_at': None,
+                                    'lag': None}
+
+    with patch('bigchaindb.backend.connect'), \
+            patch('bigchaindb.backend.changefeed.get_changes',
+                  return_value=iter(changes)):
+        multiplexer.run_table('backlog', multiplexer.subscriptions['backlog'])
+
+    connection = Mock()
+    with patch('bigchaindb.backend.changefeed.store_position') as store_position:
+        # nothing is acknowledged: resume from before the first change
+        multiplexer.checkpoint(connection)
+        store_position.assert_called_once_with(connection, 'node.backlog', 0)
+
+        # the oldest change not acknowledged is the second of ``mine``
+        acknowledge(inserts, 'a')
+        acknowledge(mine, 'a')
+        store_position.reset_mock()
+        multiplexer.checkpoint(connection)
+        store_position.assert_called_once_with(connection, 'node.backlog', 2)
+
+        # an unchanged position is not stored again
+        store_position.reset_mock()
+        multiplexer.checkpoint(connection)
+        assert not store_position.called
+
+        # all the changes are acknowledged
+        acknowledge(mine, 'c')
+        multiplexer.checkpoint(connection)
+        store_position.assert_called_once_with(connection, 'node.backlog', 4)
+
+
+def test_multiplexer_checkpoints_changes_acknowledged_out_of_order(changes):
+    from bigchaindb.backend.changefeed import ChangeFeed, ChangeFeedMultiplexer
+
+    multiplexer = ChangeFeedMultiplexer(name='node')
+    subscription = multiplexer.subscribe('backlog', ChangeFeed.INSERT | ChangeFeed.UPDATE | ChangeFeed.DELETE)
+    multiplexer.positions['backlog'] = 0
+    multiplexer.stats['backlog'] = {'count': 0, 'received_at': None,
+                                    'lag': None}
+
+    with patch('bigchaindb.backend.connect'), \
+            patch('bigchaindb.backend.changefeed.get_changes',
+                  return_value=iter(changes)):
+        multiplexer.run_table('backlog', multiplexer.subscriptions['backlog'])
+
+    # ``a`` is still being processed
+    acknowledge(subscription, 'c', 'b')
+    acknowledge(subscription, 'd')
+    assert multiplexer.checkpoint_position('backlog') == 0
+
+    acknowledge(subscription, 'a')
+    assert multiplexer.checkpoint_position('backlog') == 4
+
+
+def test_multiplexer_checkpoints_unordered_positions():
+    from bigchaindb.backend.changefeed import ChangeFeed, ChangeFeedMultiplexer
+
+    # e.g. the resume tokens of MongoDB change streams
+    changes = [(ChangeFeed.INSERT, {'id': 'a'}, {'_data': 'z'}),
+               (ChangeFeed.INSERT, {'id': 'b'}, {'_data': 'y'}),
+               (ChangeFeed.INSERT, {'id': 'c'}, {'_data': 'x'})]
+    multiplexer = ChangeFeedMultiplexer(name='node')
+    first = multiplexer.subscribe('backlog', ChangeFeed.INSERT)
+    second = multiplexer.subscribe('backlog', ChangeFeed.INSERT)
+    multiplexer.positions['backlog'] = {'_data': 'w'}
+    multiplexer.stats['backlog'] = {'count': 0, 'received_at': None,
+                                    'lag': None}
+
+    with patch('bigchaindb.backend.connect'), \
+            patch('bigchaindb.backend.changefeed.get_changes',
+                  return_value=iter(changes)):
+        multiplexer.run_table('backlog', multiplexer.subscriptions['backlog'])
+
+    acknowledge(first, 'a', 'b')
+    acknowledge(second, 'a')
+    assert multiplexer.checkpoint_position('backlog') == {'_data': 'z'}
+
+    acknowledge(first, 'c')
+    acknowledge(second, 'b', 'c')
+    assert multiplexer.checkpoint_position('backlog') == {'_data': 'x'}
+
+
+def test_multiplexer_does_not_checkpoint_without_position(changes):
+    from bigchaindb.backend.changefeed import ChangeFeed, ChangeFeedMultiplexer
+
+    multiplexer = ChangeFeedMultiplexer(name='node')
+    multiplexer.subscribe('backlog', ChangeFeed.INSERT)
+    multiplexer.positions['backlog'] = None
+    multiplexer.stats['backlog'] = {'count': 0, 'received_at': None,
+                                    'lag': None}
+
+    with patch('bigchaindb.backend.connect'), \
+            patch('bigchaindb.backend.changefeed.get_stored_position',
+                  return_value=None), \
+            patch('bigchaindb.backend.changefeed.get_changes',
+                  return_value=iter(changes)):
+        multiplexer.run_table('backlog', multiplexer.subscriptions['backlog'])
+
+    with patch('bigchaindb.backend.changefeed.store_position') as store_position:
+        multiplexer.checkpoint(Mock())
+    assert not store_position.called
+
+
+def test_multiplexer_report():
+    from bigchaindb.backend.changefeed import ChangeFeed, ChangeFeedMultiplexer
+
+    multiplexer = ChangeFeedMultiplexer()
+    multiplexer.subscribe('votes', ChangeFeed.INSERT)
+    multiplexer.positions['votes'] = Mock(time=90)
+    multiplexer.stats['votes'] = {'count': 0, 'received_at': None,
+                                  'lag': None}
+
+    with patch('bigchaindb.backend.changefeed.time', return_value=100):
+        multiplexer.update_stats('votes', multiplexer.positions['votes'])
+
+    metrics = Mock()
+    multiplexer.report(metrics)
+    metrics.gauge.assert_any_call('changefeed.votes.count', 1)
+    metrics.gauge.assert_any_call('changefeed.votes.lag', 10)
+    metrics.gauge.assert_any_call('changefeed.votes.queue_depth', 0)
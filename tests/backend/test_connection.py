@@ -15,3 +15,29 @@ def test_get_connection_raises_a_configuration_error(monkeypatch):
                              'bigchaindb.backend.meowmeow.Catsandra'})
 
         connect('catsandra', 'localhost', '1337', 'mydb')
+
+
+def test_connection_connects_once_for_all_threads(monkeypatch):
+    import threading
+    import time
+    from bigchaindb.backend.connection import Connection
+
+    connections = []
+
+    def _connect(self):
+        time.sleep(0.01)
+        connections.append(object())
+        return connections[-1]
+
+    monkeypatch.setattr(Connection, '_connect', _connect, raising=False)
+    conn = Connection(host='host', port=1337, dbname='mydb',
+                      connection_timeout=10, max_tries=1)
+
+    threads = [threading.Thread(target=lambda: conn.conn) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(connections) == 1
+    assert conn.conn is connections[0]
@@ -16,11 +16,13 @@ def test_schema(schema_func_name, args_qty):
 
 @mark.parametrize('query_func_name,args_qty', (
     ('write_transaction', 1),
+    ('write_transactions', 1),
     ('count_blocks', 0),
     ('count_backlog', 0),
     ('get_genesis_block', 0),
     ('delete_transaction', 1),
     ('get_stale_transactions', 1),
+    ('get_oldest_assignment_timestamp', 0),
     ('get_blocks_status_from_transaction', 1),
     ('get_transaction_from_backlog', 1),
     ('get_txids_filtered', 1),
@@ -31,11 +33,18 @@ def test_schema(schema_func_name, args_qty):
     ('get_block', 1),
     ('write_vote', 1),
     ('get_last_voted_block_id', 1),
+    ('get_votes_by_previous_block_and_voter', 2),
+    ('get_vote_checkpoint', 1),
+    ('write_vote_checkpoint', 2),
     ('get_spent', 2),
     ('get_votes_by_block_id_and_voter', 2),
     ('update_transaction', 2),
+    ('update_transactions', 2),
     ('get_transaction_from_block', 2),
     ('get_new_blocks_feed', 1),
+    ('get_blocks_after', 1),
+    ('get_blocks_of_transactions', 1),
+    ('get_backlog_transaction_ids', 1),
     ('get_votes_for_blocks_by_voter', 2),
     ('get_spending_transactions', 1),
     ('write_assets', 1),
@@ -50,6 +59,10 @@ def test_query(query_func_name, args_qty):
 
 @mark.parametrize('changefeed_func_name,args_qty', (
     ('get_changefeed', 2),
+    ('get_changes', 2),
+    ('get_insert_position', 2),
+    ('get_stored_position', 1),
+    ('store_position', 2),
 ))
 def test_changefeed(changefeed_func_name, args_qty):
     from bigchaindb.backend import changefeed
@@ -70,3 +70,31 @@ def test_module_dispatch_errors_on_non_dispatchable_func(mock_module):
         @mock_dispatch(str)
         def dispatched():
             pass
+
+
+def test_paginate_reads_the_results_a_page_at_a_time():
+    from bigchaindb.backend.utils import paginate
+
+    results = ['a', 'b', 'b', 'c', 'd', 'e']
+    calls = []
+
+    def query(*, last_id=None, limit=0):
+        calls.append(last_id)
+        return [r for r in results if last_id is None or r > last_id][:limit]
+
+    pages = list(paginate(query, lambda result: result, size=3))
+
+    # the results with the same key are never split across pages
+    assert pages == [['a'], ['b', 'b'], ['c', 'd'], ['e']]
+    assert calls == [None, 'a', 'b', 'd']
+
+
+def test_paginate_starts_after_the_last_id():
+    from bigchaindb.backend.utils import paginate
+
+    def query(*, last_id=None, limit=0):
+        return [r for r in 'abcde' if r > last_id][:limit]
+
+    pages = list(paginate(query, lambda result: result, last_id='c', size=3))
+
+    assert pages == [['d', 'e']]
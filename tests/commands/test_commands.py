@@ -1,5 +1,5 @@
 import json
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 from argparse import Namespace
 import copy
 
@@ -23,6 +23,9 @@ def test_make_sure_we_dont_remove_any_command():
     assert parser.parse_args(['set-replicas', '1']).command
     assert parser.parse_args(['add-replicas', 'localhost:27017']).command
     assert parser.parse_args(['remove-replicas', 'localhost:27017']).command
+    assert parser.parse_args(['pipelines', 'status']).command
+    assert parser.parse_args(['traces', 'report']).command
+    assert parser.parse_args(['profile']).command
 
 
 @patch('bigchaindb.commands.utils.start')
@@ -88,6 +91,126 @@ def test_bigchain_show_config(capsys):
     assert output_config == config
 
 
+@pytest.mark.usefixtures('ignore_local_config_file')
+def test_bigchain_show_config_hides_the_profiling_token(capsys, monkeypatch):
+    from bigchaindb import config
+    from bigchaindb.commands.bigchaindb import run_show_config
+
+    monkeypatch.setitem(config['profiling'], 'request_token', 'secret')
+    run_show_config(Namespace(config=None))
+
+    output_config = json.loads(capsys.readouterr()[0])
+    assert output_config['profiling']['request_token'] == 'x' * 8
+
+
+METRICS = """\
+# TYPE bigchaindb_pipeline_stage_items_total counter
+bigchaindb_pipeline_stage_items_total{pipeline="block",stage="write",direction="in"} %(items)s
+bigchaindb_pipeline_stage_items_total{pipeline="block",stage="write",direction="out"} %(items)s
+bigchaindb_pipeline_stage_duration_seconds_sum{pipeline="block",stage="write"} %(busy)s
+bigchaindb_pipeline_stage_duration_seconds_count{pipeline="block",stage="write"} %(items)s
+bigchaindb_pipeline_stage_wait_seconds_total{pipeline="block",stage="write"} 1.5
+bigchaindb_pipeline_stage_queue_depth{pipeline="block",stage="write"} 3
+"""
+
+
+@pytest.mark.usefixtures('ignore_local_config_file')
+@patch('bigchaindb.commands.bigchaindb.urlopen')
+def test_run_pipelines_status_once(urlopen, capsys):
+    from bigchaindb.commands.bigchaindb import run_pipelines
+
+    urlopen.return_value.read.return_value = (METRICS % {'items': 4, 'busy': 0.2}).encode()
+    run_pipelines(Namespace(config=None, url=None, once=True, interval=1))
+
+    assert urlopen.call_args[0][0] == 'http://localhost:9984/metrics'
+    lines = capsys.readouterr()[0].splitlines()
+    assert lines[0].split() == ['PIPELINE', 'STAGE', 'IN', 'OUT', 'IN/S',
+                                'QUEUE', 'BUSY', 'WAIT', 'LATENCY']
+    assert lines[1].split() == ['block', 'write', '4', '4', '-', '3', '-', '-', '50.0ms']
+
+
+@pytest.mark.usefixtures('ignore_local_config_file')
+@patch('bigchaindb.commands.bigchaindb.urlopen')
+def test_run_pipelines_status_refreshes_the_table(urlopen, capsys, monkeypatch):
+    from bigchaindb.commands.bigchaindb import run_pipelines
+
+    urlopen.return_value.read.side_effect = [
+        (METRICS % {'items': 4, 'busy': 0.2}).encode(),
+        (METRICS % {'items': 14, 'busy': 1.2}).encode(),
+        KeyboardInterrupt,
+    ]
+    clock = iter([10, 12])
+    monkeypatch.setattr('time.monotonic', lambda: next(clock))
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    run_pipelines(Namespace(config=None, url='http://node/metrics', once=False,
+                            interval=2))
+
+    lines = capsys.readouterr()[0].splitlines()
+    assert lines[-1].split() == ['block', 'write', '14', '14', '5.0', '3',
+                                 '0.50', '0.00', '100.0ms']
+
+
+@pytest.mark.usefixtures('ignore_local_config_file')
+@patch('bigchaindb.commands.bigchaindb.urlopen', side_effect=OSError('refused'))
+def test_run_pipelines_status_without_node(urlopen):
+    from bigchaindb.commands.bigchaindb import run_pipelines
+
+    with pytest.raises(SystemExit) as exc:
+        run_pipelines(Namespace(config=None, url=None, once=True, interval=1))
+    assert 'refused' in exc.value.args[0]
+
+
+@pytest.mark.usefixtures('ignore_local_config_file')
+def test_run_traces_report(capsys, tmpdir):
+    from bigchaindb.commands.bigchaindb import run_traces
+
+    node_a, node_b = tmpdir.join('a.log'), tmpdir.join('b.log')
+    node_a.write('tx1 post 10.0\ntx1 backlog 10.004\ntx2 post 11.0\ntx2 backlog 11.002\n')
+    node_b.write('tx1 vote:b 10.5\n')
+    run_traces(Namespace(config=None, files=[str(node_a), str(node_b)]))
+
+    lines = capsys.readouterr()[0].splitlines()
+    assert lines[0].split() == ['PHASE', 'TRACES', 'P50', 'P90', 'P99', 'MAX']
+    assert lines[1].split() == ['post->backlog', '2', '2.0ms', '4.0ms', '4.0ms', '4.0ms']
+    assert lines[2].split() == ['backlog->first_vote', '1', '496.0ms', '496.0ms', '496.0ms', '496.0ms']
+    assert lines[3].split() == ['first_vote->last_vote', '1', '0.0ms', '0.0ms', '0.0ms', '0.0ms']
+    assert lines[4].split()[:2] == ['total', '2']
+
+
+@pytest.mark.usefixtures('ignore_local_config_file')
+def test_run_traces_report_without_traces(tmpdir):
+    from bigchaindb.commands.bigchaindb import run_traces
+
+    with pytest.raises(SystemExit) as exc:
+        run_traces(Namespace(config=None, files=[str(tmpdir.join('none.log'))]))
+    assert 'none.log' in exc.value.args[0]
+
+
+@pytest.mark.usefixtures('ignore_local_config_file')
+@patch('bigchaindb.profiling.request')
+@patch('bigchaindb.profiling.processes',
+       return_value={12: 'block.validate_tx', 13: 'vote.validate_tx', 14: 'webapi', 15: 'blocks'})
+def test_run_profile(processes, request, capsys):
+    from bigchaindb.commands.bigchaindb import run_profile
+
+    run_profile(Namespace(config=None, processes=['block', 'webapi'], seconds=5))
+
+    assert request.call_args_list == [call(12, 5), call(14, 5)]
+    out, err = capsys.readouterr()
+    assert out.splitlines() == ['12 block.validate_tx', '14 webapi']
+    assert 'in 5 seconds' in err
+
+
+@pytest.mark.usefixtures('ignore_local_config_file')
+@patch('bigchaindb.profiling.processes', return_value={})
+def test_run_profile_without_node(processes):
+    from bigchaindb.commands.bigchaindb import run_profile
+
+    with pytest.raises(SystemExit) as exc:
+        run_profile(Namespace(config=None, processes=[], seconds=None))
+    assert 'No process' in exc.value.args[0]
+
+
 @pytest.mark.usefixtures('ignore_local_config_file')
 def test_bigchain_export_my_pubkey_when_pubkey_set(capsys, monkeypatch):
     from bigchaindb import config
@@ -250,6 +373,8 @@ def test_run_configure_when_config_does_exist(monkeypatch,
 @pytest.mark.parametrize('backend', (
     'rethinkdb',
     'mongodb',
+    'memory',
+    'sqlite',
 ))
 def test_run_configure_with_backend(backend, monkeypatch, mock_write_config):
     import bigchaindb
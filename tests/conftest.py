@@ -114,7 +114,7 @@ def _restore_dbs(request):
 
 
 @pytest.fixture(scope='session')
-def _configure_bigchaindb(request, certs_dir):
+def _configure_bigchaindb(request, certs_dir, tmpdir_factory):
     import bigchaindb
     from bigchaindb import config_utils
     test_db_name = TEST_DB_NAME
@@ -145,7 +145,9 @@ def _configure_bigchaindb(request, certs_dir):
         'keypair': {
             'private': '31Lb1ZGKTyHnmVK3LUMrAUrPNfd4sE2YyBt3UA4A25aA',
             'public': '4XYfCbabAWVUCbjTmRTFEu2sc3dFEdkse4r6X498B1s8',
-        }
+        },
+        # the processes started by the tests don't register in ~
+        'profiling': {'directory': str(tmpdir_factory.mktemp('profiling'))},
     }
     config['database']['name'] = test_db_name
     config_utils.set_config(config)
@@ -515,3 +517,26 @@ def genesis_tx(b, user_pk):
     tx.operation = Transaction.GENESIS
     genesis_tx = tx.sign([b.me_private])
     return genesis_tx
+
+
+@pytest.fixture
+def traces(monkeypatch, tmpdir):
+    """Trace every transaction, to a temporary trace file."""
+    from bigchaindb import config
+    path = tmpdir.join('traces.log')
+    monkeypatch.setitem(config, 'tracing', {'sample_rate': 1, 'file': str(path)})
+    return path
+
+
+@pytest.fixture
+def profiling_directory(monkeypatch, tmpdir_factory):
+    """A temporary profiling directory. The signal handler of the
+    profiler is restored afterwards."""
+    import signal
+    from bigchaindb import config, profiling
+    path = tmpdir_factory.mktemp('profiles')
+    monkeypatch.setitem(config['profiling'], 'directory', str(path))
+    monkeypatch.setattr('bigchaindb.profiling._profiler', None)
+    handler = signal.getsignal(profiling.SIGNAL)
+    yield path
+    signal.signal(profiling.SIGNAL, handler)
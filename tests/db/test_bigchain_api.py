@@ -314,6 +314,24 @@ class TestBigchainApi(object):
         assert tx_from_db.to_dict() == tx.to_dict()
         assert status == Bigchain.TX_IN_BACKLOG
 
+    @pytest.mark.usefixtures('inputs')
+    def test_write_transactions(self, b, user_pk, user_sk):
+        from bigchaindb import Bigchain
+        from bigchaindb.models import Transaction
+
+        txs = []
+        for input_tx in b.get_owned_ids(user_pk)[:2]:
+            input_tx = b.get_transaction(input_tx.txid)
+            tx = Transaction.transfer(input_tx.to_inputs(), [([user_pk], 1)],
+                                      asset_id=input_tx.id)
+            txs.append(tx.sign([user_sk]))
+        b.write_transactions(txs)
+
+        for tx in txs:
+            tx_from_db, status = b.get_transaction(tx.id, include_status=True)
+            assert tx_from_db.to_dict() == tx.to_dict()
+            assert status == Bigchain.TX_IN_BACKLOG
+
     @pytest.mark.usefixtures('inputs')
     def test_read_transaction(self, b, user_pk, user_sk):
         from bigchaindb.models import Transaction
@@ -389,6 +407,40 @@ class TestBigchainApi(object):
         assert tx.to_dict() == response.to_dict()
         assert status == b.TX_IN_BACKLOG
 
+    @pytest.mark.genesis
+    def test_get_statuses_decided_by_the_elections(self, b, user_pk, monkeypatch):
+        from bigchaindb.common.crypto import generate_key_pair
+        from bigchaindb.models import Block, Transaction
+
+        txs = [Transaction.create([user_pk], [([user_pk], 1)], {'i': i})
+               for i in range(4)]
+        other = generate_key_pair()[1]
+        monkeypatch.setattr(b, 'nodes_except_me', [other])
+        blocks = [
+            # voted valid by this node
+            Block([txs[0]], voters=[b.me]),
+            # voted valid by this node only, out of two voters
+            Block([txs[1]], voters=[b.me, other]),
+            # voted invalid
+            Block([txs[2]], voters=[b.me]),
+        ]
+        for block, valid in zip(blocks, [True, True, False]):
+            b.write_block(block)
+            b.write_vote(b.vote(block.id, b.get_last_voted_block().id, valid))
+        b.write_transaction(txs[3])
+
+        txids = [tx.id for tx in txs] + ['a' * 64]
+        statuses = b.get_statuses(txids)
+        assert statuses == {
+            txs[0].id: 'valid',
+            txs[1].id: 'undecided',
+            txs[2].id: None,
+            txs[3].id: 'backlog',
+            'a' * 64: None,
+        }
+        assert statuses == {txid: b.get_status(txid) for txid in txids}
+        assert b.get_statuses([]) == {}
+
     @pytest.mark.usefixtures('inputs')
     def test_genesis_block(self, b):
         from bigchaindb.backend import query
@@ -660,6 +712,66 @@ class TestTransactionValidation(object):
         with pytest.raises(DoubleSpend):
             b.validate_transaction(signed_transfer_tx)
 
+    @pytest.mark.usefixtures('inputs')
+    def test_validate_transactions_detects_double_spends_in_the_batch(
+            self, b, user_pk, user_sk):
+        from bigchaindb.common.crypto import generate_key_pair
+        from bigchaindb.common.exceptions import DoubleSpend
+        from bigchaindb.models import Transaction
+
+        input_tx = b.get_owned_ids(user_pk).pop()
+        input_tx = b.get_transaction(input_tx.txid)
+        create_tx = Transaction.create([user_pk], [([user_pk], 1)])
+        create_tx = create_tx.sign([user_sk])
+
+        transfers = []
+        for _ in range(2):
+            _, pk = generate_key_pair()
+            tx = Transaction.transfer(input_tx.to_inputs(), [([pk], 1)],
+                                      asset_id=input_tx.id)
+            transfers.append(tx.sign([user_sk]))
+
+        results = b.validate_transactions([transfers[0], create_tx,
+                                           transfers[1]])
+
+        assert results[:2] == [transfers[0], create_tx]
+        assert isinstance(results[2], DoubleSpend)
+
+    def test_validate_transactions_rejects_the_duplicates_in_the_batch(self, b, user_pk, user_sk):
+        from bigchaindb.common.exceptions import DuplicateTransaction
+        from bigchaindb.models import Transaction
+
+        create_tx = Transaction.create([user_pk], [([user_pk], 1)])
+        create_tx = create_tx.sign([user_sk])
+        other_tx = Transaction.create([user_pk], [([user_pk], 2)])
+        other_tx = other_tx.sign([user_sk])
+
+        results = b.validate_transactions([create_tx, other_tx, create_tx])
+
+        assert results[:2] == [create_tx, other_tx]
+        assert isinstance(results[2], DuplicateTransaction)
+
+    @pytest.mark.usefixtures('inputs')
+    def test_validate_transactions_reads_the_inputs_at_once(self, b, user_pk,
+                                                            user_sk):
+        from bigchaindb.models import Transaction
+
+        transfers = []
+        for input_tx in b.get_owned_ids(user_pk)[:3]:
+            input_tx = b.get_transaction(input_tx.txid)
+            tx = Transaction.transfer(input_tx.to_inputs(), [([user_pk], 1)],
+                                      asset_id=input_tx.id)
+            transfers.append(tx.sign([user_sk]))
+
+        with patch('bigchaindb.backend.query.get_spent') as get_spent, \
+                patch('bigchaindb.backend.query.get_transaction_from_block') as get_transaction, \
+                patch('bigchaindb.backend.query.get_votes_by_block_id') as get_votes:
+            assert b.validate_transactions(transfers) == transfers
+
+        assert not get_spent.called
+        assert not get_transaction.called
+        assert not get_votes.called
+
     @pytest.mark.usefixtures('inputs')
     def test_valid_non_create_transaction_after_block_creation(self, b,
                                                                user_pk,
@@ -1,4 +1,5 @@
 from copy import deepcopy
+from queue import Empty
 import pytest
 import random
 
@@ -63,7 +64,11 @@ def federation_3():
 
 
 def process_tx(steps):
-    steps.block_changefeed(timeout=1)
+    try:
+        # the changefeed only returns the transactions assigned to the node
+        steps.block_changefeed(timeout=1)
+    except Empty:
+        return
     if steps.block_filter_tx():
         steps.block_validate_tx()
         steps.block_create(timeout=True)
@@ -1,6 +1,6 @@
 import random
 import time
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from multipipes import Pipe
 import pytest
@@ -39,6 +39,19 @@ def test_validate_transaction(b, create_tx):
     assert block_maker.validate_tx(valid_tx.to_dict()) == valid_tx
 
 
+@pytest.mark.bdb
+def test_validate_transaction_publishes_the_invalid_ones(b, create_tx):
+    from bigchaindb.events import EventTypes, setup_events_queue
+    from bigchaindb.pipelines.block import BlockPipeline
+
+    block_maker = BlockPipeline(events_queue=setup_events_queue())
+
+    assert block_maker.validate_tx(create_tx.to_dict()) is None
+    event = block_maker.event_handler.get_event(timeout=1)
+    assert event.type == EventTypes.TRANSACTION_INVALID
+    assert event.data == {'id': create_tx.id}
+
+
 def test_validate_transaction_handles_exceptions(b, signed_create_tx):
     """
     This test makes sure that `BlockPipeline.validate_tx` handles possible
@@ -79,6 +92,33 @@ def test_create_block(b, user_pk):
     assert len(block_doc.transactions) == 100
 
 
+@pytest.mark.bdb
+def test_block_pipeline_acknowledges_the_changes(b, user_pk):
+    from bigchaindb.models import Transaction
+    from bigchaindb.pipelines.block import BlockPipeline
+
+    acknowledge = Mock()
+    block_maker = BlockPipeline(acknowledge=acknowledge)
+
+    # a transaction assigned to another node
+    assert block_maker.filter_tx({'id': 'a' * 64, 'assignee': 'nobody'}) is None
+    acknowledge.assert_called_once_with('a' * 64)
+
+    # a duplicate, refused by the block
+    tx = Transaction.create([b.me], [([user_pk], 1)]).sign([b.me_private])
+    acknowledge.reset_mock()
+    block_maker.create(tx)
+    assert not acknowledge.called
+    block_maker.create(tx)
+    acknowledge.assert_called_once_with(tx.id)
+
+    # the transactions of a written block
+    block = block_maker.create(None, timeout=True)
+    acknowledge.reset_mock()
+    block_maker.delete_tx(block)
+    acknowledge.assert_called_once_with(tx.id)
+
+
 @pytest.mark.bdb
 def test_write_block(b, user_pk):
     from bigchaindb.models import Block, Transaction
@@ -175,6 +215,22 @@ def test_start(create_pipeline):
     assert pipeline == create_pipeline.return_value
 
 
+def test_changefeed_only_emits_own_assignments(monkeypatch):
+    import bigchaindb
+    from bigchaindb.backend.changefeed import ChangeFeed
+    from bigchaindb.pipelines import block
+
+    get_changefeed = Mock()
+    monkeypatch.setattr('bigchaindb.backend.get_changefeed', get_changefeed)
+    block.get_changefeed()
+
+    _, table, operation = get_changefeed.call_args[0]
+    assert table == 'backlog'
+    assert operation == ChangeFeed.INSERT | ChangeFeed.UPDATE
+    assert get_changefeed.call_args[1] == {
+        'match': {'assignee': bigchaindb.config['keypair']['public']}}
+
+
 @pytest.mark.bdb
 def test_full_pipeline(b, user_pk):
     from bigchaindb.models import Block, Transaction
@@ -1,5 +1,5 @@
 import time
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -41,7 +41,8 @@ def test_check_for_quorum_invalid(b, user_pk):
         b.write_vote(vote)
 
     # since this block is now invalid, should pass to the next process
-    assert e.check_for_quorum(votes[-1]) == test_block
+    assert e.check_for_quorum(votes[-1]) == (
+        test_block, (key_pairs[-1][1], test_block.id))
 
 
 @pytest.mark.bdb
@@ -76,7 +77,8 @@ def test_check_for_quorum_invalid_prev_node(b, user_pk):
         b.write_vote(vote)
 
     # since nodes cannot agree on prev block, the block is invalid
-    assert e.check_for_quorum(votes[-1]) == test_block
+    assert e.check_for_quorum(votes[-1]) == (
+        test_block, (key_pairs[-1][1], test_block.id))
 
 
 @pytest.mark.bdb
@@ -114,24 +116,51 @@ def test_check_for_quorum_valid(b, user_pk):
     assert e.check_for_quorum(votes[-1]) is None
 
 
+@pytest.mark.bdb
+def test_check_for_quorum_is_traced(b, user_pk, traces):
+    from bigchaindb.models import Transaction
+    from bigchaindb.tracing import read
+
+    tx = Transaction.create([b.me], [([user_pk], 1)])
+    block = b.create_block([tx]).sign(b.me_private)
+    b.write_block(block)
+    vote = b.vote(block.id, 'a' * 64, True)
+    b.write_vote(vote)
+
+    other = b.vote(block.id, 'a' * 64, True)
+    other['node_pubkey'] = 'other'
+
+    e = election.Election()
+    e.bigchain = b
+    e.check_for_quorum(vote)
+    e.check_for_quorum(other)
+
+    # the vote of this node is stamped by the vote pipeline
+    assert list(read(str(traces))[tx.id]) == ['decided', 'vote:other']
+
+
 @patch('bigchaindb.core.Bigchain.get_block')
 def test_invalid_vote(get_block, b):
-    e = election.Election()
+    acknowledge = Mock()
+    e = election.Election(acknowledge=acknowledge)
     assert e.check_for_quorum({}) is None
     get_block.assert_not_called()
+    acknowledge.assert_called_once_with((None, None))
 
 
 @pytest.mark.bdb
 def test_check_requeue_transaction(b, user_pk):
     from bigchaindb.models import Transaction
 
-    e = election.Election()
+    acknowledge = Mock()
+    e = election.Election(acknowledge=acknowledge)
 
     # create blocks with transactions
     tx1 = Transaction.create([b.me], [([user_pk], 1)])
     test_block = b.create_block([tx1])
 
-    e.requeue_transactions(test_block)
+    e.requeue_transactions(test_block, (b.me, test_block.id))
+    acknowledge.assert_called_once_with((b.me, test_block.id))
 
     time.sleep(1)
     backlog_tx, status = b.get_transaction(tx1.id, include_status=True)
@@ -206,20 +235,47 @@ def test_handle_block_events():
 
     events_queue = setup_events_queue()
     e = election.Election(events_queue=events_queue)
-    block_id = 'a' * 64
+    block = {'id': 'a' * 64, 'block': {'transactions': []}}
 
-    assert events_queue.qsize() == 0
+    assert events_queue.empty()
 
     # no event should be emitted in case a block is undecided
-    e.handle_block_events({'status': Bigchain.BLOCK_UNDECIDED}, block_id)
-    assert events_queue.qsize() == 0
+    e.handle_block_events({'status': Bigchain.BLOCK_UNDECIDED}, block)
+    assert events_queue.empty()
 
     # put an invalid block event in the queue
-    e.handle_block_events({'status': Bigchain.BLOCK_INVALID}, block_id)
+    e.handle_block_events({'status': Bigchain.BLOCK_INVALID}, block)
     event = e.event_handler.get_event()
     assert event.type == EventTypes.BLOCK_INVALID
 
     # put a valid block event in the queue
-    e.handle_block_events({'status': Bigchain.BLOCK_VALID}, block_id)
+    e.handle_block_events({'status': Bigchain.BLOCK_VALID}, block)
     event = e.event_handler.get_event()
     assert event.type == EventTypes.BLOCK_VALID
+    assert event.data == {'id': block['id'], 'transactions': []}
+
+
+def test_handle_block_events_records_the_events_dropped_by_a_full_queue(monkeypatch):
+    from bigchaindb import events
+
+    monkeypatch.setattr(events, 'EVENTS_QUEUE_SIZE', 1)
+    monkeypatch.setattr(events, 'PUBLISH_TIMEOUT', 0.01)
+    e = election.Election(events_queue=events.setup_events_queue())
+
+    def block(n):
+        return {'id': str(n) * 64, 'block': {'transactions': []}}
+
+    e.handle_block_events({'status': Bigchain.BLOCK_VALID}, block(1))
+    e.handle_block_events({'status': Bigchain.BLOCK_INVALID}, block(2))
+    e.handle_block_events({'status': Bigchain.BLOCK_VALID}, block(3))
+
+    assert e.event_handler.dropped == ['2' * 64, '3' * 64]
+
+    assert e.event_handler.get_event().data['id'] == '1' * 64
+    e.handle_block_events({'status': Bigchain.BLOCK_VALID}, block(4))
+
+    event = e.event_handler.get_event()
+    assert event.type == events.EventTypes.EVENTS_DROPPED
+    assert event.data == {'blocks': ['2' * 64, '3' * 64]}
+    # the queue was full again, with the event of the dropped ones
+    assert e.event_handler.dropped == ['4' * 64]
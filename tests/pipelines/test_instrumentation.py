@@ -0,0 +1,49 @@
+import threading
+
+from multipipes import Pipe, Pipeline
+
+
+def test_node_records_its_input_queue():
+    from bigchaindb.metrics import (PIPELINE_STAGE_QUEUE_DEPTH,
+                                    PIPELINE_STAGE_WAIT, pipeline_stage)
+    from bigchaindb.pipelines.instrumentation import Node, WaitedQueue
+
+    @pipeline_stage('test')
+    def double(value):
+        return value * 2
+
+    inpipe, outpipe = Pipe(), Pipe()
+    node = Node(double)
+    pipeline = Pipeline([node])
+    pipeline.setup(indata=inpipe, outdata=outpipe)
+
+    # what the processes of the node do before they run
+    node.inqueue = WaitedQueue(node.inqueue, double.metric_labels)
+    inpipe.put(1)
+    inpipe.put(2)
+    node.run()
+
+    assert outpipe.get() == 2
+    assert PIPELINE_STAGE_QUEUE_DEPTH.values[('test', 'double')] == 2
+    assert PIPELINE_STAGE_WAIT.values[('test', 'double')] >= 0
+
+
+def test_threaded_nodes_run_in_threads():
+    from bigchaindb.pipelines.instrumentation import Node, threaded
+
+    def double(value):
+        return value * 2
+
+    with threaded():
+        node = Node(double)
+    assert [type(process) for process in node.processes] == [threading.Thread]
+    # outside of the context
+    assert not isinstance(Node(double).processes[0], threading.Thread)
+
+    inpipe, outpipe = Pipe(), Pipe()
+    Pipeline([node]).setup(indata=inpipe, outdata=outpipe)
+    node.start()
+    inpipe.put(2)
+    assert outpipe.get(timeout=1) == 4
+    node.poison_pill()
+    node.join()
@@ -40,7 +40,7 @@ def test_reassign_transactions(b, user_pk):
     # bigchain.nodes_except_me was not empty.
     tx_dict = tx.to_dict()
     tx_dict['assignee'] = b.me
-    stm.reassign_transactions(tx_dict)
+    list(stm.reassign_transactions([tx_dict]))
 
     # test with federation
     tx = Transaction.create([b.me], [([user_pk], 1)])
@@ -51,7 +51,7 @@ def test_reassign_transactions(b, user_pk):
                                         backlog_reassign_delay=0.001)
     stm.bigchain.nodes_except_me = ['aaa', 'bbb', 'ccc']
     tx = list(query.get_stale_transactions(b.connection, 0))[0]
-    stm.reassign_transactions(tx)
+    list(stm.reassign_transactions([tx]))
 
     reassigned_tx = list(query.get_stale_transactions(b.connection, 0))[0]
     assert reassigned_tx['assignment_timestamp'] > tx['assignment_timestamp']
@@ -65,10 +65,59 @@ def test_reassign_transactions(b, user_pk):
     stm.bigchain.nodes_except_me = []
 
     tx = list(query.get_stale_transactions(b.connection, 0))[0]
-    stm.reassign_transactions(tx)
+    list(stm.reassign_transactions([tx]))
     assert tx['assignee'] != 'lol'
 
 
+@pytest.mark.bdb
+def test_reassign_transactions_groups_by_assignee(b, user_pk):
+    from bigchaindb.backend import query
+    from bigchaindb.models import Transaction
+
+    stm = stale.StaleTransactionMonitor(timeout=0.001,
+                                        backlog_reassign_delay=0.001)
+    stm.bigchain.nodes_except_me = ['aaa', 'bbb']
+
+    for i in range(10):
+        tx = Transaction.create([b.me], [([user_pk], 1)],
+                                metadata={'msg': random.random()})
+        b.write_transaction(tx.sign([b.me_private]))
+    txs = list(query.get_stale_transactions(b.connection, 0))
+
+    with patch('bigchaindb.backend.query.update_transactions',
+               wraps=query.update_transactions) as update_transactions:
+        reassigned = list(stm.reassign_transactions(txs))
+
+    assert reassigned == txs
+    # one bulk update per new assignee
+    assert update_transactions.call_count <= 3
+    assignees = {tx['id']: tx['assignee'] for tx in txs}
+    for tx in query.get_stale_transactions(b.connection, 0):
+        assert tx['assignee'] != assignees[tx['id']]
+
+
+@pytest.mark.bdb
+def test_poll_interval_adapts_to_backlog_age(b, user_pk, monkeypatch):
+    from bigchaindb.models import Transaction
+
+    stm = stale.StaleTransactionMonitor(timeout=1, backlog_reassign_delay=60)
+
+    # empty backlog, nothing can become stale before the reassign delay
+    assert stm.poll_interval() == 60
+
+    monkeypatch.setattr('bigchaindb.core.time', lambda: 1000)
+    tx = Transaction.create([b.me], [([user_pk], 1)])
+    b.write_transaction(tx.sign([b.me_private]))
+
+    # the oldest transaction becomes stale in 20 seconds
+    monkeypatch.setattr('bigchaindb.pipelines.stale.time', lambda: 1040)
+    assert stm.poll_interval() == 20
+
+    # the oldest transaction is already stale, wait the minimum timeout
+    monkeypatch.setattr('bigchaindb.pipelines.stale.time', lambda: 1100)
+    assert stm.poll_interval() == 1
+
+
 @pytest.mark.bdb
 def test_full_pipeline(monkeypatch, user_pk):
     from bigchaindb.backend import query
@@ -43,3 +43,20 @@ def input_single_create(b):
     tx = Transaction.create([b.me], [([b.me], 1)], metadata).sign([b.me_private])
     b.write_transaction(tx)
     return tx
+
+
+@pytest.mark.bdb
+@pytest.mark.genesis
+def test_the_block_pipeline_is_traced(b, steps, traces):
+    from bigchaindb.tracing import read
+
+    tx = input_single_create(b)
+    steps.block_changefeed()
+    steps.block_filter_tx()
+    steps.block_validate_tx()
+    steps.block_create(timeout=True)
+    steps.block_write()
+
+    trace = read(str(traces))[tx.id]
+    assert list(trace) == ['backlog', 'picked', 'validated', 'in_block', 'block_written']
+    assert sorted(trace.values()) == list(trace.values())
@@ -185,6 +185,25 @@ def test_vote_accumulates_transactions(b):
     assert validation == (False, 456, 10)
 
 
+@pytest.mark.bdb
+def test_write_vote_is_traced(b, genesis_block, traces):
+    from bigchaindb.pipelines import vote
+    from bigchaindb.tracing import read
+
+    vote_obj = vote.Vote()
+    block = dummy_block(b)
+    b.write_block(block)
+    txs = block.to_dict()['block']['transactions']
+
+    for tx, block_id, num_tx in vote_obj.ungroup(block.id, txs):
+        last_vote = vote_obj.vote(*vote_obj.validate_tx(tx, block_id, num_tx))
+    vote_obj.write_vote(*last_vote)
+
+    stamps = read(str(traces))
+    assert {txid: list(stamps[txid]) for txid in stamps} == {
+        tx['id']: ['vote:' + b.me] for tx in txs}
+
+
 @pytest.mark.bdb
 def test_valid_block_voting_sequential(b, genesis_block, monkeypatch):
     from bigchaindb.backend import query
@@ -1,5 +1,6 @@
 import copy
 import logging
+import os
 from unittest.mock import mock_open, patch
 
 import pytest
@@ -229,7 +230,8 @@ def test_autoconfigure_read_both_from_file_and_env(monkeypatch, request, certs_d
         'certfile': None,
         'keyfile': None,
         'keyfile_passphrase': None,
-        'crlfile': None
+        'crlfile': None,
+        'changefeed': 'oplog',
     }
 
     database_mongodb_ssl = {
@@ -247,7 +249,28 @@ def test_autoconfigure_read_both_from_file_and_env(monkeypatch, request, certs_d
         'crlfile': certs_dir + '/crl.pem',
         'certfile': certs_dir + '/test_bdb_ssl.crt',
         'keyfile': certs_dir + '/test_bdb_ssl.key',
-        'keyfile_passphrase': None
+        'keyfile_passphrase': None,
+        'changefeed': 'oplog',
+    }
+
+    database_memory = {
+        'backend': 'memory',
+        'host': DATABASE_HOST,
+        'port': DATABASE_PORT,
+        'name': DATABASE_NAME,
+        'connection_timeout': 5000,
+        'max_tries': 3,
+        'latency': 0,
+    }
+
+    database_sqlite = {
+        'backend': 'sqlite',
+        'host': DATABASE_HOST,
+        'port': DATABASE_PORT,
+        'name': DATABASE_NAME,
+        'path': os.path.join('~', '.bigchaindb-data'),
+        'connection_timeout': 5000,
+        'max_tries': 3,
     }
 
     database = {}
@@ -257,6 +280,10 @@ def test_autoconfigure_read_both_from_file_and_env(monkeypatch, request, certs_d
         database = database_rethinkdb
     elif DATABASE_BACKEND == 'mongodb-ssl':
         database = database_mongodb_ssl
+    elif DATABASE_BACKEND == 'memory':
+        database = database_memory
+    elif DATABASE_BACKEND == 'sqlite':
+        database = database_sqlite
 
     assert bigchaindb.config == {
         'CONFIGURED': True,
@@ -265,6 +292,8 @@ def test_autoconfigure_read_both_from_file_and_env(monkeypatch, request, certs_d
             'loglevel': logging.getLevelName(
                 log_config['handlers']['console']['level']).lower(),
             'workers': None,
+            'threads': None,
+            'cache_size': 0,
         },
         'wsserver': {
             'scheme': WSSERVER_SCHEME,
@@ -273,6 +302,11 @@ def test_autoconfigure_read_both_from_file_and_env(monkeypatch, request, certs_d
             'advertised_scheme': WSSERVER_ADVERTISED_SCHEME,
             'advertised_host': WSSERVER_ADVERTISED_HOST,
             'advertised_port': WSSERVER_ADVERTISED_PORT,
+            'read_threads': 0,
+            'queue_size': 1000,
+            'slow_consumer': 'disconnect',
+            'event_log': None,
+            'event_log_size': 1000,
         },
         'database': database,
         'keypair': {
@@ -294,6 +328,16 @@ def test_autoconfigure_read_both_from_file_and_env(monkeypatch, request, certs_d
             'granular_levels': {},
         },
         'graphite': {'host': 'localhost'},
+        'metrics': {'directory': None},
+        'profiling': {
+            'directory': os.path.join(os.path.expanduser('~'), 'bigchaindb-profiles'),
+            'seconds': 30,
+            'request_token': None,
+        },
+        'tracing': {
+            'sample_rate': 0,
+            'file': os.path.join(os.path.expanduser('~'), 'bigchaindb-traces.log'),
+        },
     }
 
 
@@ -74,6 +74,12 @@ def test_bigchain_class_initialization_with_parameters(config):
     assert bigchain.consensus == BaseConsensusRules
 
 
+def test_bigchain_instances_share_a_statsd_client(config):
+    from bigchaindb.core import Bigchain
+
+    assert Bigchain().statsd is Bigchain().statsd
+
+
 def test_get_blocks_status_containing_tx(monkeypatch):
     from bigchaindb.backend import query as backend_query
     from bigchaindb.core import Bigchain
@@ -87,6 +93,89 @@ def test_get_blocks_status_containing_tx(monkeypatch):
         bigchain.get_blocks_status_containing_tx('txid')
 
 
+def test_get_last_voted_block_id_catches_up_with_checkpoint(monkeypatch):
+    from unittest.mock import Mock
+    from bigchaindb.backend import query as backend_query
+    from bigchaindb.core import Bigchain
+
+    votes = {
+        'b1': [{'vote': {'voting_for_block': 'b2'}}],
+        'b2': [{'vote': {'voting_for_block': 'b3'}}],
+    }
+    write_vote_checkpoint = Mock()
+    get_last_voted_block_id = Mock()
+    monkeypatch.setattr(backend_query, 'get_vote_checkpoint',
+                        lambda conn, pubkey: 'b1')
+    monkeypatch.setattr(backend_query, 'get_votes_by_previous_block_and_voter',
+                        lambda conn, block_id, pubkey: votes.get(block_id, []))
+    monkeypatch.setattr(backend_query, 'write_vote_checkpoint',
+                        write_vote_checkpoint)
+    monkeypatch.setattr(backend_query, 'get_last_voted_block_id',
+                        get_last_voted_block_id)
+    bigchain = Bigchain(public_key='pubkey', private_key='privkey')
+
+    assert bigchain.get_last_voted_block_id() == 'b3'
+    write_vote_checkpoint.assert_called_once_with(bigchain.connection,
+                                                  'pubkey', 'b3')
+    assert not get_last_voted_block_id.called
+
+
+def test_get_last_voted_block_id_recovers_checkpoint(monkeypatch):
+    from unittest.mock import Mock
+    from bigchaindb.backend import query as backend_query
+    from bigchaindb.core import Bigchain
+
+    write_vote_checkpoint = Mock()
+    monkeypatch.setattr(backend_query, 'get_vote_checkpoint',
+                        lambda conn, pubkey: None)
+    monkeypatch.setattr(backend_query, 'get_last_voted_block_id',
+                        lambda conn, pubkey: 'b7')
+    monkeypatch.setattr(backend_query, 'write_vote_checkpoint',
+                        write_vote_checkpoint)
+    bigchain = Bigchain(public_key='pubkey', private_key='privkey')
+
+    assert bigchain.get_last_voted_block_id() == 'b7'
+    write_vote_checkpoint.assert_called_once_with(bigchain.connection,
+                                                  'pubkey', 'b7')
+
+
+def test_get_last_voted_block_id_cyclic_checkpoint(monkeypatch):
+    from unittest.mock import Mock
+    from bigchaindb.backend import query as backend_query
+    from bigchaindb.common.exceptions import CyclicBlockchainError
+    from bigchaindb.core import Bigchain
+
+    monkeypatch.setattr(backend_query, 'get_vote_checkpoint',
+                        lambda conn, pubkey: 'b1')
+    monkeypatch.setattr(backend_query, 'get_votes_by_previous_block_and_voter',
+                        lambda conn, block_id, pubkey: [
+                            {'vote': {'voting_for_block': 'b1'}}])
+    monkeypatch.setattr(backend_query, 'write_vote_checkpoint', Mock())
+    bigchain = Bigchain(public_key='pubkey', private_key='privkey')
+
+    with pytest.raises(CyclicBlockchainError):
+        bigchain.get_last_voted_block_id()
+
+
+def test_write_vote_writes_checkpoint(monkeypatch):
+    from unittest.mock import Mock
+    from bigchaindb.backend import query as backend_query
+    from bigchaindb.core import Bigchain
+
+    write_vote = Mock()
+    write_vote_checkpoint = Mock()
+    monkeypatch.setattr(backend_query, 'write_vote', write_vote)
+    monkeypatch.setattr(backend_query, 'write_vote_checkpoint',
+                        write_vote_checkpoint)
+    bigchain = Bigchain(public_key='pubkey', private_key='privkey')
+    vote = {'node_pubkey': 'pubkey', 'vote': {'voting_for_block': 'b1'}}
+
+    bigchain.write_vote(vote)
+    write_vote.assert_called_once_with(bigchain.connection, vote)
+    write_vote_checkpoint.assert_called_once_with(bigchain.connection,
+                                                  'pubkey', 'b1')
+
+
 @pytest.mark.genesis
 def test_get_spent_issue_1271(b, alice, bob, carol):
     from bigchaindb.models import Transaction
@@ -19,3 +19,25 @@ def tests_event_handler():
 
     assert event_from_queue.type == event.type
     assert event_from_queue.data == event.data
+
+
+def test_block_summary(b):
+    from bigchaindb.common.crypto import generate_key_pair
+    from bigchaindb.events import block_summary
+    from bigchaindb.models import Transaction
+
+    alice_priv, alice = generate_key_pair()
+    create = Transaction.create([b.me], [([b.me, alice], 1)]).sign([b.me_private])
+    transfer = Transaction.transfer(create.to_inputs(), [([alice], 1)],
+                                    asset_id=create.id).sign([b.me_private, alice_priv])
+    block = b.create_block([create, transfer]).to_dict()
+
+    assert block_summary(block) == {
+        'id': block['id'],
+        'transactions': [
+            {'id': create.id, 'asset_id': create.id, 'operation': 'CREATE',
+             'public_keys': sorted([b.me, alice])},
+            {'id': transfer.id, 'asset_id': create.id, 'operation': 'TRANSFER',
+             'public_keys': [alice]},
+        ],
+    }
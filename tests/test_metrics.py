@@ -0,0 +1,287 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def registry():
+    from bigchaindb.metrics import Registry
+    return Registry()
+
+
+@pytest.fixture
+def metrics_directory(monkeypatch, tmpdir):
+    import bigchaindb
+    monkeypatch.setitem(bigchaindb.config, 'metrics', {'directory': str(tmpdir)})
+    return tmpdir
+
+
+def test_counter(registry):
+    from bigchaindb.metrics import Counter, render
+
+    responses = Counter('responses_total', 'The responses.', ['status'],
+                        registry=registry)
+    responses.inc(status=200)
+    responses.inc(2, status=200)
+    responses.inc(status=404)
+
+    assert render(registry) == (
+        '# HELP responses_total The responses.\n'
+        '# TYPE responses_total counter\n'
+        'responses_total{status="200"} 3\n'
+        'responses_total{status="404"} 1\n'
+    )
+
+
+def test_histogram(registry):
+    from bigchaindb.metrics import Histogram, render
+
+    duration = Histogram('duration_seconds', 'The durations.', ['route'],
+                         buckets=(0.1, 1), registry=registry)
+    duration.observe(0.05, route='/a"b')
+    duration.observe(0.5, route='/a"b')
+    duration.observe(3, route='/a"b')
+
+    assert render(registry) == (
+        '# HELP duration_seconds The durations.\n'
+        '# TYPE duration_seconds histogram\n'
+        'duration_seconds_bucket{route="/a\\"b",le="0.1"} 1\n'
+        'duration_seconds_bucket{route="/a\\"b",le="1"} 2\n'
+        'duration_seconds_bucket{route="/a\\"b",le="+Inf"} 3\n'
+        'duration_seconds_sum{route="/a\\"b"} 3.55\n'
+        'duration_seconds_count{route="/a\\"b"} 3\n'
+    )
+
+
+def test_labels_are_checked(registry):
+    from bigchaindb.metrics import Counter
+
+    responses = Counter('responses_total', 'The responses.', ['status'],
+                        registry=registry)
+    with pytest.raises(ValueError):
+        responses.inc(route='/')
+
+
+def test_timed(registry):
+    from bigchaindb.metrics import Histogram, timed
+
+    duration = Histogram('duration_seconds', 'The durations.', ['stage'],
+                         registry=registry)
+
+    @timed(duration, stage='double')
+    def double(value):
+        return value * 2
+
+    assert double(21) == 42
+    assert double.__name__ == 'double'
+    assert duration.values[('double',)][-1] > 0
+    assert sum(duration.values[('double',)][:-1]) == 1
+
+
+def test_the_metrics_of_the_processes_are_added_up(registry, metrics_directory):
+    from bigchaindb.metrics import Counter, Histogram, render
+
+    responses = Counter('responses_total', 'The responses.', ['status'],
+                        registry=registry)
+    duration = Histogram('duration_seconds', 'The durations.',
+                         buckets=(1,), registry=registry)
+    responses.inc(status=200)
+    duration.observe(0.5)
+    registry.flush()
+    assert metrics_directory.join('{}.json'.format(os.getpid())).check()
+
+    # the file of another process
+    metrics_directory.join('1.json').write(
+        '{"responses_total": [[["200"], 2], [["500"], 1]],'
+        ' "duration_seconds": [[[], [0, 1, 2.0]]]}')
+    responses.inc(status=200)
+
+    assert render(registry) == (
+        '# HELP responses_total The responses.\n'
+        '# TYPE responses_total counter\n'
+        'responses_total{status="200"} 4\n'
+        'responses_total{status="500"} 1\n'
+        '# HELP duration_seconds The durations.\n'
+        '# TYPE duration_seconds histogram\n'
+        'duration_seconds_bucket{le="1"} 1\n'
+        'duration_seconds_bucket{le="+Inf"} 2\n'
+        'duration_seconds_sum 2.5\n'
+        'duration_seconds_count 2\n'
+    )
+
+
+def test_a_forked_process_starts_afresh(registry, monkeypatch):
+    from bigchaindb.metrics import Counter
+
+    responses = Counter('responses_total', 'The responses.', ['status'],
+                        registry=registry)
+    responses.inc(status=200)
+    monkeypatch.setattr('os.getpid', lambda: registry.pid + 1)
+
+    assert registry.snapshot() == {}
+    responses.inc(status=404)
+    assert responses.values == {('404',): 1}
+
+
+def test_clear(metrics_directory):
+    from bigchaindb.metrics import clear
+
+    metrics_directory.join('1.json').write('{}')
+    metrics_directory.join('notes.txt').write('')
+    clear(str(metrics_directory))
+
+    assert [path.basename for path in metrics_directory.listdir()] == ['notes.txt']
+
+
+def test_pipeline_stage():
+    from bigchaindb.metrics import PIPELINE_STAGE_DURATION, pipeline_stage
+
+    class Pipeline:
+        @pipeline_stage('test')
+        def stage(self, value, timeout=False):
+            return value
+
+    pipeline = Pipeline()
+    assert pipeline.stage(1) == 1
+    assert pipeline.stage.__self__ is pipeline
+    assert ('test', 'stage') in PIPELINE_STAGE_DURATION.values
+
+
+@pytest.mark.bdb
+def test_database_queries_are_timed(b):
+    from bigchaindb.metrics import DATABASE_QUERY_DURATION
+
+    DATABASE_QUERY_DURATION.values.clear()
+    b.get_transaction('a' * 64)
+
+    assert DATABASE_QUERY_DURATION.values[()][-1] > 0
+
+
+@pytest.fixture
+def statsd_server():
+    import socket
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(('127.0.0.1', 0))
+    server.settimeout(1)
+    yield server
+    server.close()
+
+
+def test_statsd_client_aggregates_the_metrics(statsd_server):
+    from bigchaindb.metrics import StatsClient
+
+    client = StatsClient(*statsd_server.getsockname())
+    client.incr('web.tx.post')
+    client.incr('web.tx.post', 2)
+    client.decr('web.tx.post')
+    client.gauge('websocket.subscribers', 3)
+    client.gauge('websocket.subscribers', 5)
+    client.gauge('websocket.queue_depth', 2, delta=True)
+    client.gauge('websocket.queue_depth', 1, delta=True)
+    client.timing('pipelines.block.write', 12.5)
+    with client.timer('pipelines.block.write'):
+        pass
+    client.flush()
+
+    lines = statsd_server.recv(512).decode().split('\n')
+    assert lines[:3] == ['web.tx.post:2|c', 'websocket.subscribers:5|g',
+                         'websocket.queue_depth:+3|g']
+    assert lines[3] == 'pipelines.block.write:12.500000|ms'
+    assert lines[4].startswith('pipelines.block.write:')
+    assert len(lines) == 5
+
+    # nothing is sent until new metrics are recorded
+    client.flush()
+    client.incr('web.tx.post')
+    client.flush()
+    assert statsd_server.recv(512) == b'web.tx.post:1|c'
+
+
+def test_statsd_client_sends_batches_of_packets(statsd_server):
+    from bigchaindb.metrics import StatsClient
+
+    client = StatsClient(*statsd_server.getsockname())
+    for n in range(100):
+        client.incr('counter.{}'.format(n))
+    client.flush()
+
+    lines = []
+    while len(lines) < 100:
+        packet = statsd_server.recv(512).decode()
+        assert len(packet) < 512
+        lines.extend(packet.split('\n'))
+    assert lines == ['counter.{}:1|c'.format(n) for n in range(100)]
+
+
+def test_statsd_client_samples_the_timings(statsd_server, monkeypatch):
+    from bigchaindb.metrics import StatsClient
+
+    monkeypatch.setattr('bigchaindb.metrics.MAX_TIMINGS', 10)
+    client = StatsClient(*statsd_server.getsockname())
+    for n in range(100):
+        client.timing('stage', n)
+
+    assert len(client.timings['stage']) == 10
+    assert client.timed['stage'] == 100
+
+    client.flush()
+    lines = statsd_server.recv(512).decode().split('\n')
+    assert len(lines) == 10
+    assert all(line.startswith('stage:') and line.endswith('|ms|@0.1')
+               for line in lines)
+
+
+def test_statsd_client_is_shared():
+    import bigchaindb
+    from bigchaindb.metrics import statsd_client
+
+    assert statsd_client() is statsd_client(bigchaindb.config['graphite']['host'])
+
+
+def test_gauge(registry, metrics_directory):
+    from bigchaindb.metrics import Gauge, render
+
+    depth = Gauge('queue_depth', 'The depth.', registry=registry)
+    depth.set(3)
+    depth.set(2)
+    metrics_directory.join('1.json').write('{"queue_depth": [[[], 5]]}')
+
+    assert render(registry).splitlines()[-1] == 'queue_depth 5'
+
+
+def test_parse():
+    from bigchaindb.metrics import parse
+
+    text = ('# HELP duration_seconds The durations.\n'
+            'duration_seconds_bucket{route="/a\\"b\\\\",le="+Inf"} 3\n'
+            'duration_seconds_sum 3.55\n')
+
+    assert parse(text) == [
+        ('duration_seconds_bucket', {'route': '/a"b\\', 'le': '+Inf'}, 3),
+        ('duration_seconds_sum', {}, 3.55),
+    ]
+
+
+def test_pipeline_stage_counts_the_items():
+    from bigchaindb.metrics import PIPELINE_STAGE_ITEMS, pipeline_stage
+
+    class Pipeline:
+        @pipeline_stage('items')
+        def filter(self, value, timeout=False):
+            return value or None
+
+        @pipeline_stage('items')
+        def split(self, values):
+            yield from values
+
+    pipeline = Pipeline()
+    pipeline.filter(1)
+    pipeline.filter(0)
+    pipeline.filter(None, timeout=True)
+    assert list(pipeline.split([1, 2, 3])) == [1, 2, 3]
+
+    items = {key: value for key, value in PIPELINE_STAGE_ITEMS.values.items()
+             if key[0] == 'items'}
+    assert items == {('items', 'filter', 'in'): 2, ('items', 'filter', 'out'): 1,
+                     ('items', 'split', 'in'): 1, ('items', 'split', 'out'): 3}
+    assert Pipeline.filter.metric_labels == {'pipeline': 'items', 'stage': 'filter'}
@@ -11,14 +11,66 @@ from bigchaindb.pipelines import vote, block, election, stale
 @patch.object(Process, 'start')
 @patch('bigchaindb.events.setup_events_queue', spec_set=True, autospec=True)
 def test_processes_start(mock_setup_events_queue, mock_process, mock_vote,
-                         mock_block, mock_election, mock_stale):
+                         mock_block, mock_election, mock_stale,
+                         monkeypatch, tmpdir, profiling_directory):
+    import bigchaindb
     from bigchaindb import processes
 
+    monkeypatch.setitem(bigchaindb.config['database'], 'backend', 'mongodb')
+    monkeypatch.setitem(bigchaindb.config['metrics'], 'directory', None)
+    monkeypatch.setattr('tempfile.mkdtemp', lambda prefix: str(tmpdir))
+    tmpdir.join('1234.json').write('{}')
+    profiling_directory.join('1234.process').write('block.validate_tx')
+    profiling_directory.join('block.validate_tx.1234.1500000000.collapsed').write('')
+
     processes.start()
 
-    mock_vote.assert_called_with()
-    mock_block.assert_called_with()
+    assert bigchaindb.config['metrics']['directory'] == str(tmpdir)
+    assert tmpdir.listdir() == []
+    assert [path.basename for path in profiling_directory.listdir()] == [
+        'block.validate_tx.1234.1500000000.collapsed']
+
+    multiplexer = mock_block.call_args[1]['multiplexer']
+    mock_vote.assert_called_with(multiplexer=multiplexer)
+    mock_block.assert_called_with(events_queue=mock_setup_events_queue.return_value,
+                                  multiplexer=multiplexer)
     mock_stale.assert_called_with()
     mock_process.assert_called_with()
     mock_election.assert_called_once_with(
-        events_queue=mock_setup_events_queue.return_value)
+        events_queue=mock_setup_events_queue.return_value,
+        multiplexer=multiplexer)
+
+
+@patch.object(stale, 'start')
+@patch.object(election, 'start')
+@patch.object(block, 'start')
+@patch.object(vote, 'start')
+@patch.object(Process, 'start')
+@patch('bigchaindb.web.server.create_threaded_server')
+@patch('bigchaindb.backend.changefeed.ChangeFeedMultiplexer.start')
+@patch('bigchaindb.processes._run_websocket_server')
+def test_processes_start_in_threads_with_the_memory_backend(
+        mock_websocket, mock_multiplexer, mock_server, mock_process,
+        mock_vote, mock_block, mock_election, mock_stale,
+        monkeypatch, tmpdir, profiling_directory):
+    import bigchaindb
+    from bigchaindb import processes
+    from bigchaindb.pipelines import instrumentation
+
+    monkeypatch.setitem(bigchaindb.config['database'], 'backend', 'memory')
+    monkeypatch.setitem(bigchaindb.config['metrics'], 'directory', str(tmpdir))
+    # the pipelines are created in threads
+    mock_block.side_effect = lambda **kwargs: assert_threaded()
+
+    def assert_threaded():
+        assert instrumentation._threaded
+
+    processes.start()
+
+    assert mock_block.called
+    assert not instrumentation._threaded
+    mock_multiplexer.assert_called_once_with(thread=True)
+    mock_websocket.assert_called_once_with(mock_block.call_args[1]['events_queue'])
+    mock_server.assert_called_once_with(bigchaindb.config['server'])
+    mock_server.return_value.serve_forever.assert_called_once_with()
+    assert not mock_process.called
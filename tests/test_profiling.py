@@ -0,0 +1,160 @@
+import os
+import threading
+
+import pytest
+
+
+def test_collapse():
+    import sys
+    from bigchaindb.profiling import collapse
+
+    def inner():
+        return collapse(sys._getframe())
+
+    stack = inner().split(';')
+    assert stack[-1] == 'inner ({}:{})'.format(__file__, inner.__code__.co_firstlineno)
+    assert stack[-2].startswith('test_collapse (')
+
+
+def test_profiler_samples_the_other_threads():
+    from bigchaindb.profiling import Profiler
+
+    stop = threading.Event()
+
+    def blocked():
+        stop.wait()
+
+    thread = threading.Thread(target=blocked)
+    thread.start()
+    try:
+        profiler = Profiler('test')
+        profiler.sample()
+        profiler.sample()
+    finally:
+        stop.set()
+        thread.join()
+
+    stacks = [stack for stack in profiler.stacks if ';blocked (' in stack]
+    assert len(stacks) == 1
+    assert profiler.stacks[stacks[0]] == 2
+    assert not any('test_profiler_samples_the_other_threads' in stack
+                   for stack in profiler.stacks)
+
+
+def test_profiler_writes_the_collapsed_stacks(profiling_directory, monkeypatch):
+    from bigchaindb.profiling import Profiler
+
+    monkeypatch.setattr('time.time', lambda: 1500000000.5)
+    profiler = Profiler('block.validate_tx')
+    profiler.stacks.update({'main (a.py:1);run (a.py:5)': 3, 'main (a.py:1)': 1})
+    path = profiler.write()
+
+    assert path == str(profiling_directory.join(
+        'block.validate_tx.{}.1500000000.collapsed'.format(os.getpid())))
+    assert profiling_directory.join(os.path.basename(path)).read() == (
+        'main (a.py:1) 1\n'
+        'main (a.py:1);run (a.py:5) 3\n'
+    )
+
+
+def test_the_signal_switches_the_profiler_on(profiling_directory):
+    from bigchaindb import profiling
+
+    profiling.install('test')
+    assert profiling.processes() == {os.getpid(): 'test'}
+
+    profiling.request(os.getpid(), 0.05)
+    profiling._profiler.thread.join()
+
+    profiles = profiling_directory.listdir('test.*.collapsed')
+    assert len(profiles) == 1
+    assert profiles[0].read()
+    assert not profiling_directory.join('{}.seconds'.format(os.getpid())).check()
+
+
+def test_one_profile_at_once(profiling_directory):
+    from bigchaindb.profiling import Profiler
+
+    profiler = Profiler('test')
+    assert profiler.start(0.1)
+    assert not profiler.start(0.1)
+    profiler.thread.join()
+    assert len(profiling_directory.listdir()) == 1
+
+
+def test_processes_forgets_the_gone_ones(profiling_directory):
+    from bigchaindb.profiling import processes
+
+    profiling_directory.join('{}.process'.format(os.getpid())).write('webapi')
+    profiling_directory.join('{}.process'.format(2 ** 30)).write('vote.vote')
+
+    assert processes() == {os.getpid(): 'webapi'}
+    assert [path.basename for path in profiling_directory.listdir()] == [
+        '{}.process'.format(os.getpid())]
+
+
+def test_processes_forgets_the_reused_pids(profiling_directory):
+    from bigchaindb import profiling
+
+    profiling_directory.join('{}.process'.format(os.getpid())).write('webapi\n1')
+
+    with pytest.raises(ProcessLookupError):
+        profiling.request(os.getpid())
+    assert profiling.processes() == {}
+    assert profiling_directory.listdir() == []
+
+
+def test_request_needs_a_registration(profiling_directory, monkeypatch):
+    from bigchaindb import profiling
+
+    monkeypatch.setattr('os.kill', pytest.fail)
+    with pytest.raises(ProcessLookupError):
+        profiling.request(os.getpid())
+
+
+def test_the_registration_is_removed_at_exit(profiling_directory):
+    from multiprocessing import Process
+    from bigchaindb import profiling
+
+    def install():
+        profiling.install('test')
+        assert profiling.processes() == {os.getpid(): 'test'}
+
+    process = Process(target=install)
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+    assert profiling_directory.listdir() == []
+
+    # but not by the processes forked after the registration
+    registration = profiling_directory.join('{}.process'.format(os.getpid()))
+    registration.write('test')
+    profiling._unregister(str(registration), os.getpid() + 1)
+    assert registration.check()
+
+
+@pytest.mark.usefixtures('profiling_directory')
+def test_install_without_directory(monkeypatch, tmpdir):
+    import signal
+    from bigchaindb import config, profiling
+
+    tmpdir.join('file').write('')
+    monkeypatch.setitem(config['profiling'], 'directory', str(tmpdir.join('file')))
+    profiling.install('test')
+
+    assert profiling._profiler is None
+    assert signal.getsignal(profiling.SIGNAL) is not profiling._handle
+
+
+@pytest.mark.usefixtures('profiling_directory')
+def test_install_is_left_to_the_main_thread():
+    import threading
+    from bigchaindb import profiling
+
+    thread = threading.Thread(target=profiling.install, args=('test',))
+    thread.start()
+    thread.join()
+
+    assert profiling.processes() == {}
+    assert profiling._profiler is None
@@ -0,0 +1,74 @@
+import pytest
+
+
+def test_sampled():
+    from bigchaindb.tracing import sampled
+
+    assert sampled('00' * 32, 0.01)
+    assert not sampled('ff' * 32, 0.99)
+    assert sampled('ff' * 32, 1)
+    assert not sampled('00' * 32, 0)
+    assert not sampled(None, 1)
+
+
+def test_nothing_is_stamped_by_default(monkeypatch):
+    from bigchaindb import tracing
+
+    monkeypatch.setattr('bigchaindb.tracing._write', pytest.fail)
+    tracing.stamp('post', 'a' * 64)
+
+
+def test_stamp(traces, monkeypatch):
+    from bigchaindb import tracing
+
+    monkeypatch.setattr('time.time', lambda: 12.5)
+    tracing.stamp('post', 'a' * 64, 'b' * 64)
+    traces.write('{} backlog 13.25\n'.format('a' * 64), mode='a')
+
+    assert traces.read().splitlines() == [
+        '{} post 12.500000'.format('a' * 64),
+        '{} post 12.500000'.format('b' * 64),
+        '{} backlog 13.25'.format('a' * 64),
+    ]
+
+
+def test_read_keeps_the_first_stamp_of_a_point(tmpdir):
+    from bigchaindb.tracing import read
+
+    node_a, node_b = tmpdir.join('a.log'), tmpdir.join('b.log')
+    node_a.write('tx post 1.0\ntx decided 5.0\ntx decided 6.0\ntx vote:a 4.0\ntx de')
+    node_b.write('tx decided 4.5\ntx vote:b 4.2\n')
+
+    assert read(str(node_a), str(node_b)) == {
+        'tx': {'post': 1.0, 'decided': 4.5, 'vote:a': 4.0, 'vote:b': 4.2}}
+
+
+def test_votes():
+    from bigchaindb.tracing import votes
+
+    trace = {'post': 1.0, 'vote:a': 4.0, 'vote:c': 6.0, 'vote:b': 4.2, 'decided': 4.5}
+    assert votes(trace) == {'post': 1.0, 'decided': 4.5, 'first_vote': 4.0,
+                            'quorum_vote': 4.2, 'last_vote': 6.0}
+    assert votes({'vote:a': 4.0}) == {'first_vote': 4.0, 'last_vote': 4.0}
+
+
+def test_report():
+    from bigchaindb.tracing import report
+
+    traces = {str(n): {'post': 0, 'backlog': n / 100, 'vote:a': 1, 'vote:b': 1.5,
+                       'decided': 1.5, 'vote:c': 3}
+              for n in range(1, 101)}
+    traces['other'] = {'picked': 0, 'validated': 0.5}
+
+    rows = report(traces)
+    assert [row[:2] for row in rows] == [
+        ('post->backlog', 100), ('backlog->first_vote', 100), ('picked->validated', 1),
+        ('first_vote->quorum_vote', 100), ('first_vote->last_vote', 100),
+        ('quorum_vote->decided', 100), ('total', 101)]
+    assert rows[0][2:] == pytest.approx((0.5, 0.9, 0.99, 1))
+    assert rows[1][2:] == pytest.approx((0.49, 0.89, 0.98, 0.99))
+    assert rows[2][2:] == (0.5, 0.5, 0.5, 0.5)
+    assert rows[3][2:] == (0.5, 0.5, 0.5, 0.5)
+    assert rows[4][2:] == (2, 2, 2, 2)
+    assert rows[5][2:] == (0, 0, 0, 0)
+    assert rows[6][2:] == (1.5, 1.5, 1.5, 1.5)
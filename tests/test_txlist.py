@@ -49,17 +49,76 @@ def txlist(b, user_pk, user2_pk, user_sk, user2_sk, genesis_block):
     return type('', (), {
         'create1': create1,
         'transfer1': transfer1,
+        'block2_id': block2.id,
     })
 
 
 @pytest.mark.bdb
 def test_get_txlist_by_asset(b, txlist):
     res = b.get_transactions_filtered(txlist.create1.id)
-    assert set(tx.id for tx in res) == set([txlist.transfer1.id,
-                                            txlist.create1.id])
+    assert set(tx.id for _, tx in res) == set([txlist.transfer1.id,
+                                               txlist.create1.id])
 
 
 @pytest.mark.bdb
 def test_get_txlist_by_operation(b, txlist):
     res = b.get_transactions_filtered(txlist.create1.id, operation='CREATE')
-    assert set(tx.id for tx in res) == {txlist.create1.id}
+    assert set(tx.id for _, tx in res) == {txlist.create1.id}
+
+
+@pytest.mark.bdb
+def test_get_txlist_after_last_id(b, txlist):
+    transactions = list(b.get_transactions_filtered(txlist.create1.id))
+    block_ids = [block_id for block_id, _ in transactions]
+    assert block_ids == sorted(block_ids)
+
+    first = block_ids[0]
+    res = b.get_transactions_filtered(txlist.create1.id, last_id=first)
+    assert [tx.id for _, tx in res] == \
+        [tx.id for block_id, tx in transactions if block_id > first]
+
+
+@pytest.mark.bdb
+def test_get_txlist_skips_the_invalid_blocks(b, txlist):
+    from bigchaindb.models import Transaction
+
+    # the transfer is also in a block voted invalid
+    tx = Transaction.create([b.me], [([b.me], 1)]).sign([b.me_private])
+    block = b.create_block([txlist.transfer1, tx])
+    b.write_block(block)
+    b.write_vote(b.vote(block.id, txlist.block2_id, False))
+    res = b.get_transactions_filtered(txlist.create1.id, operation='TRANSFER')
+    assert [(block_id, tx.id) for block_id, tx in res] == \
+        [(txlist.block2_id, txlist.transfer1.id)]
+
+
+@pytest.mark.bdb
+def test_iter_outputs_filtered_after_last_id(b, txlist, user_pk):
+    outputs = list(b.iter_outputs_filtered(user_pk))
+    assert set(link for _, link in outputs) == \
+        set(b.get_outputs_filtered(user_pk))
+    block_ids = [block_id for block_id, _ in outputs]
+    assert block_ids == sorted(block_ids)
+
+    first = block_ids[0]
+    res = b.iter_outputs_filtered(user_pk, last_id=first)
+    assert list(res) == [o for o in outputs if o[0] > first]
+
+
+@pytest.mark.bdb
+def test_iter_outputs_filtered_reads_a_single_query(b, txlist, user_pk,
+                                                    monkeypatch):
+    from bigchaindb.backend import query
+
+    outputs = list(b.iter_outputs_filtered(user_pk))
+    calls = []
+
+    def get_owned_ids(connection, owner, **kwargs):
+        calls.append(kwargs)
+        return get_owned_ids.original(connection, owner, **kwargs)
+
+    get_owned_ids.original = query.get_owned_ids
+    monkeypatch.setattr(query, 'get_owned_ids', get_owned_ids)
+    monkeypatch.setattr(b, 'OUTPUTS_BATCH_SIZE', 1)
+    assert list(b.iter_outputs_filtered(user_pk)) == outputs
+    assert calls == [{'last_id': None}]
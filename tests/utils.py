@@ -1,9 +1,12 @@
+import os
 from functools import singledispatch
 
 import rethinkdb as r
 
+from bigchaindb.backend.memory.connection import MemoryConnection
 from bigchaindb.backend.mongodb.connection import MongoDBConnection
 from bigchaindb.backend.rethinkdb.connection import RethinkDBConnection
+from bigchaindb.backend.sqlite.connection import SQLiteConnection
 
 
 @singledispatch
@@ -21,6 +24,18 @@ def list_mongo_dbs(connection):
     raise NotImplementedError
 
 
+@list_dbs.register(MemoryConnection)
+def list_memory_dbs(connection):
+    return list(connection.conn.databases)
+
+
+@list_dbs.register(SQLiteConnection)
+def list_sqlite_dbs(connection):
+    return [filename[:-len('.sqlite')]
+            for filename in os.listdir(connection.path)
+            if filename.endswith('.sqlite')]
+
+
 @singledispatch
 def flush_db(connection, dbname):
     raise NotImplementedError
@@ -33,6 +48,8 @@ def flush_rethink_db(connection, dbname):
         connection.run(r.db(dbname).table('backlog').delete())
         connection.run(r.db(dbname).table('votes').delete())
         connection.run(r.db(dbname).table('assets').delete())
+        connection.run(r.db(dbname).table('vote_checkpoints').delete())
+        connection.run(r.db(dbname).table('changefeed').delete())
     except r.ReqlOpFailedError:
         pass
 
@@ -43,6 +60,26 @@ def flush_mongo_db(connection, dbname):
     connection.conn[dbname].backlog.delete_many({})
     connection.conn[dbname].votes.delete_many({})
     connection.conn[dbname].assets.delete_many({})
+    connection.conn[dbname].vote_checkpoints.delete_many({})
+    connection.conn[dbname].changefeed.delete_many({})
+
+
+@flush_db.register(MemoryConnection)
+def flush_memory_db(connection, dbname):
+    with connection.conn.lock:
+        for table in connection.conn[dbname].tables.values():
+            table.delete(*list(table.documents))
+
+
+@flush_db.register(SQLiteConnection)
+def flush_sqlite_db(connection, dbname):
+    db = connection.open(dbname)
+    with db:
+        for table in ('bigchain', 'backlog', 'votes', 'assets',
+                      'vote_checkpoints', 'transactions', 'inputs', 'outputs',
+                      'changes', 'changefeed'):
+            db.execute('DELETE FROM {}'.format(table))
+    db.close()
 
 
 @singledispatch
@@ -0,0 +1,111 @@
+import pytest
+
+from bigchaindb.models import Transaction
+
+BLOCKS_ENDPOINT = '/api/v1/blocks/'
+TX_ENDPOINT = '/api/v1/transactions/'
+
+
+def test_response_cache_evicts_the_least_recently_used_response():
+    from bigchaindb.web.caching import ResponseCache
+
+    cache = ResponseCache(2)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    assert cache.get('a') == 'A'
+
+    cache.put('c', 'C')
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A'
+    assert cache.get('c') == 'C'
+
+
+def test_response_cache_of_size_zero_keeps_nothing():
+    from bigchaindb.web.caching import ResponseCache
+
+    cache = ResponseCache()
+    cache.put('a', 'A')
+    assert cache.get('a') is None
+
+
+@pytest.fixture
+def app(request):
+    from bigchaindb.web import server
+    return server.create_app(debug=True, cache_size=10)
+
+
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_get_transaction_is_immutable(b, client, user_pk):
+    tx = b.get_transaction(b.get_owned_ids(user_pk).pop().txid)
+
+    res = client.get(TX_ENDPOINT + tx.id)
+    assert res.status_code == 200
+    assert res.json == tx.to_dict()
+    assert res.headers['ETag'] == '"{}"'.format(tx.id)
+    assert 'immutable' in res.headers['Cache-Control']
+
+    res = client.get(TX_ENDPOINT + tx.id,
+                     headers={'If-None-Match': '"{}"'.format(tx.id)})
+    assert res.status_code == 304
+    assert res.data == b''
+    assert res.headers['ETag'] == '"{}"'.format(tx.id)
+
+
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_get_transaction_is_cached(b, client, user_pk, monkeypatch):
+    tx = b.get_transaction(b.get_owned_ids(user_pk).pop().txid)
+    client.get(TX_ENDPOINT + tx.id)
+
+    monkeypatch.setattr('bigchaindb.core.Bigchain.get_transaction',
+                        lambda *args, **kwargs: pytest.fail('database read'))
+    res = client.get(TX_ENDPOINT + tx.id)
+    assert res.status_code == 200
+    assert res.json == tx.to_dict()
+    assert res.headers['ETag'] == '"{}"'.format(tx.id)
+
+    res = client.get(TX_ENDPOINT + tx.id,
+                     headers={'If-None-Match': '"{}"'.format(tx.id)})
+    assert res.status_code == 304
+
+
+@pytest.mark.bdb
+def test_conditional_get_of_an_unknown_transaction(client):
+    txid = 'a' * 64
+    res = client.get(TX_ENDPOINT + txid,
+                     headers={'If-None-Match': '"{}"'.format(txid)})
+    assert res.status_code == 404
+
+
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_get_block_is_immutable_once_valid(b, client):
+    tx = Transaction.create([b.me], [([b.me], 1)])
+    tx = tx.sign([b.me_private])
+
+    block = b.create_block([tx])
+    b.write_block(block)
+
+    res = client.get(BLOCKS_ENDPOINT + block.id)
+    assert res.status_code == 200
+    assert 'ETag' not in res.headers
+    assert 'Cache-Control' not in res.headers
+
+    # an undecided block might still be decided invalid
+    res = client.get(BLOCKS_ENDPOINT + block.id,
+                     headers={'If-None-Match': '"{}"'.format(block.id)})
+    assert res.status_code == 200
+
+    vote = b.vote(block.id, b.get_last_voted_block().id, True)
+    b.write_vote(vote)
+
+    res = client.get(BLOCKS_ENDPOINT + block.id)
+    assert res.status_code == 200
+    assert res.json == block.to_dict()
+    assert res.headers['ETag'] == '"{}"'.format(block.id)
+    assert 'immutable' in res.headers['Cache-Control']
+
+    res = client.get(BLOCKS_ENDPOINT + block.id,
+                     headers={'If-None-Match': '"{}"'.format(block.id)})
+    assert res.status_code == 304
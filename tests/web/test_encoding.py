@@ -0,0 +1,40 @@
+import pytest
+
+
+def test_get_json_decodes_the_body_whatever_its_content_type(app):
+    from bigchaindb.web.encoding import get_json
+
+    with app.test_request_context(data='{"a": [1, "b"]}',
+                                  content_type='text/plain'):
+        assert get_json() == {'a': [1, 'b']}
+
+
+def test_get_json_rejects_an_invalid_body(app):
+    from werkzeug.exceptions import BadRequest
+    from bigchaindb.web.encoding import get_json
+
+    with app.test_request_context(data='{"a": '):
+        with pytest.raises(BadRequest):
+            get_json()
+
+
+def test_post_invalid_json_returns_400(client):
+    res = client.post('/api/v1/transactions/', data='{"a": ')
+    assert res.status_code == 400
+
+
+def test_resources_are_encoded_with_rapidjson(client, monkeypatch):
+    import rapidjson
+
+    calls = []
+    rapidjson_dumps = rapidjson.dumps
+
+    def dumps(data, *args, **kwargs):
+        calls.append(data)
+        return rapidjson_dumps(data, *args, **kwargs)
+
+    monkeypatch.setattr('bigchaindb.web.encoding.rapidjson.dumps', dumps)
+    # the errors of Flask-RESTful use the representation of the resources
+    res = client.get('/api/v1/outputs/')
+    assert res.status_code == 400
+    assert res.json == calls[0]
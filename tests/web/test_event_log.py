@@ -0,0 +1,62 @@
+import pytest
+
+
+def block(n):
+    return {'id': str(n) * 64, 'transactions': []}
+
+
+@pytest.fixture
+def event_log(tmpdir):
+    from bigchaindb.web.event_log import EventLog
+    event_log = EventLog(str(tmpdir.join('events.log')), size=4)
+    yield event_log
+    event_log.close()
+
+
+def test_append_and_read(event_log):
+    assert event_log.first is None
+    assert [event_log.append(block(n)) for n in range(3)] == [1, 2, 3]
+
+    assert event_log.first == 1
+    assert event_log.position(block(1)['id']) == 2
+    assert event_log.position(block(9)['id']) is None
+    assert list(event_log.read(1, 3)) == [(2, block(1))]
+    assert list(event_log.read(0, 10)) == [(1, block(0)), (2, block(1)),
+                                           (3, block(2))]
+
+
+def test_read_keeps_the_events_dropped_while_reading(event_log):
+    event_log.append(block(0))
+    event_log.append(block(1))
+    records = event_log.read(0, 3)
+    for n in range(2, 5):
+        event_log.append(block(n))
+
+    assert event_log.first == 3
+    assert list(records) == [(1, block(0)), (2, block(1))]
+
+
+def test_the_log_is_bounded(event_log):
+    for n in range(7):
+        event_log.append(block(n))
+
+    # the log keeps between two and four events
+    assert event_log.first == 5
+    assert event_log.position(block(3)['id']) is None
+    assert [sequence for sequence, _ in event_log.read(0, 10)] == [5, 6, 7]
+
+
+def test_the_log_is_reopened_where_it_was(event_log):
+    from bigchaindb.web.event_log import EventLog
+
+    for n in range(5):
+        event_log.append(block(n))
+    event_log.close()
+    with open(event_log.path, 'a') as current:
+        current.write('6 {"id": "interru')
+
+    reopened = EventLog(event_log.path, size=4)
+    assert reopened.first == 3
+    assert reopened.append(block(6)) == 6
+    assert [sequence for sequence, _ in reopened.read(0, 10)] == [3, 4, 5, 6]
+    reopened.close()
@@ -0,0 +1,43 @@
+import pytest
+
+METRICS_ENDPOINT = '/metrics'
+
+
+@pytest.mark.bdb
+def test_get_metrics(client):
+    from bigchaindb.metrics import HTTP_REQUEST_DURATION, HTTP_RESPONSES
+
+    HTTP_REQUEST_DURATION.values.clear()
+    HTTP_RESPONSES.values.clear()
+    # the metrics are recorded once the server closes the response
+    client.get('/api/v1/transactions/' + 'a' * 64).close()
+    client.get('/api/v1/transactions/' + 'b' * 64).close()
+    client.get('/api/v1/nowhere').close()
+
+    res = client.get(METRICS_ENDPOINT)
+    assert res.status_code == 200
+    assert res.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+
+    lines = res.get_data(as_text=True).splitlines()
+    route = 'method="GET",route="/api/v1/transactions/<string:tx_id>"'
+    assert 'bigchaindb_http_responses_total{%s,status="404"} 2' % route in lines
+    assert ('bigchaindb_http_responses_total'
+            '{method="GET",route="<unmatched>",status="404"} 1') in lines
+    assert 'bigchaindb_http_request_duration_seconds_count{%s} 2' % route in lines
+    assert '# TYPE bigchaindb_pipeline_stage_duration_seconds histogram' in lines
+
+
+def test_middleware_records_the_errors():
+    from unittest.mock import Mock
+    from werkzeug.routing import Map
+    from bigchaindb.metrics import HTTP_RESPONSES
+    from bigchaindb.web.metrics_middleware import MetricsMiddleware
+
+    HTTP_RESPONSES.values.clear()
+    middleware = MetricsMiddleware(Mock(side_effect=RuntimeError), Map())
+    with pytest.raises(RuntimeError):
+        middleware({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/',
+                    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80',
+                    'wsgi.url_scheme': 'http'}, None)
+
+    assert HTTP_RESPONSES.values == {('GET', '<unmatched>', '500'): 1}
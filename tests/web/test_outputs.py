@@ -10,41 +10,41 @@ def test_get_outputs_endpoint(client, user_pk):
     m = MagicMock()
     m.txid = 'a'
     m.output = 0
-    with patch('bigchaindb.core.Bigchain.get_outputs_filtered') as gof:
-        gof.return_value = [m, m]
+    with patch('bigchaindb.core.Bigchain.iter_outputs_filtered') as gof:
+        gof.return_value = [('b', m), ('b', m)]
         res = client.get(OUTPUTS_ENDPOINT + '?public_key={}'.format(user_pk))
         assert res.json == [
             {'transaction_id': 'a', 'output_index': 0},
             {'transaction_id': 'a', 'output_index': 0}
         ]
     assert res.status_code == 200
-    gof.assert_called_once_with(user_pk, None)
+    gof.assert_called_once_with(user_pk, None, last_id=None)
 
 
 def test_get_outputs_endpoint_unspent(client, user_pk):
     m = MagicMock()
     m.txid = 'a'
     m.output = 0
-    with patch('bigchaindb.core.Bigchain.get_outputs_filtered') as gof:
-        gof.return_value = [m]
+    with patch('bigchaindb.core.Bigchain.iter_outputs_filtered') as gof:
+        gof.return_value = [('b', m)]
         params = '?spent=False&public_key={}'.format(user_pk)
         res = client.get(OUTPUTS_ENDPOINT + params)
     assert res.json == [{'transaction_id': 'a', 'output_index': 0}]
     assert res.status_code == 200
-    gof.assert_called_once_with(user_pk, False)
+    gof.assert_called_once_with(user_pk, False, last_id=None)
 
 
 def test_get_outputs_endpoint_spent(client, user_pk):
     m = MagicMock()
     m.txid = 'a'
     m.output = 0
-    with patch('bigchaindb.core.Bigchain.get_outputs_filtered') as gof:
-        gof.return_value = [m]
+    with patch('bigchaindb.core.Bigchain.iter_outputs_filtered') as gof:
+        gof.return_value = [('b', m)]
         params = '?spent=true&public_key={}'.format(user_pk)
         res = client.get(OUTPUTS_ENDPOINT + params)
     assert res.json == [{'transaction_id': 'a', 'output_index': 0}]
     assert res.status_code == 200
-    gof.assert_called_once_with(user_pk, True)
+    gof.assert_called_once_with(user_pk, True, last_id=None)
 
 
 def test_get_outputs_endpoint_without_public_key(client):
@@ -0,0 +1,113 @@
+import pytest
+
+VOTES_ENDPOINT = '/api/v1/votes'
+
+
+def test_paginated_response_links_to_the_next_page(app):
+    from bigchaindb.web.pagination import decode_cursor, paginated_response
+
+    with app.test_request_context('/api/v1/things?limit=2&a=b'):
+        res = paginated_response(iter('abcd'), 2, key=lambda r: r)
+    assert res.json == ['a', 'b']
+
+    link, rel = res.headers['Link'].split('; ')
+    assert rel == 'rel="next"'
+    path, query = link.strip('<>').split('?')
+    assert path == '/api/v1/things'
+    args = dict(arg.split('=') for arg in query.split('&'))
+    assert args['limit'] == '2' and args['a'] == 'b'
+    assert decode_cursor(args['cursor'].replace('%3D', '=')) == 'b'
+
+
+def test_paginated_response_keeps_the_results_of_a_key_together(app):
+    from bigchaindb.web.pagination import paginated_response
+
+    with app.test_request_context('/api/v1/things?limit=2'):
+        res = paginated_response(iter('abbb'), 2, key=lambda r: r)
+    assert res.json == ['a', 'b', 'b', 'b']
+    assert 'Link' not in res.headers
+
+
+def test_paginated_response_closes_the_results(app):
+    from bigchaindb.web.pagination import paginated_response
+
+    closed = []
+
+    def results():
+        try:
+            yield from 'abc'
+        finally:
+            closed.append(True)
+
+    with app.test_request_context('/api/v1/things?limit=1'):
+        paginated_response(results(), 1, key=lambda r: r)
+    assert closed == [True]
+
+
+@pytest.mark.parametrize('count', [0, 1, 100, 250])
+def test_streamed_response(app, count, monkeypatch):
+    from bigchaindb.web import pagination
+
+    monkeypatch.setattr(pagination, 'CHUNK_SIZE', 100)
+    with app.test_request_context('/api/v1/things'):
+        res = pagination.streamed_response(iter(range(count)),
+                                           serialize=lambda r: {'n': r})
+        assert res.is_streamed
+        assert res.json == [{'n': n} for n in range(count)]
+
+
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_get_votes_endpoint_paginated(b, client, structurally_valid_vote):
+    from bigchaindb.backend import query
+
+    block_id = structurally_valid_vote['vote']['voting_for_block']
+    for voter in 'abc':
+        query.write_vote(b.connection,
+                         dict(structurally_valid_vote, node_pubkey=voter * 44))
+
+    res = client.get(VOTES_ENDPOINT + '?limit=2&block_id=' + block_id)
+    assert res.status_code == 200
+    assert [vote['node_pubkey'] for vote in res.json] == ['a' * 44, 'b' * 44]
+
+    next_page = res.headers['Link'].split('; ')[0].strip('<>')
+    res = client.get(next_page)
+    assert [vote['node_pubkey'] for vote in res.json] == ['c' * 44]
+    assert 'Link' not in res.headers
+
+
+def test_get_assets_endpoint_paginated(client, monkeypatch):
+    assets = [{'id': 'a', 'data': 1, 'score': 1.5},
+              {'id': 'b', 'data': 2, 'score': 1.5},
+              {'id': 'c', 'data': 3, 'score': 0.75}]
+    searches = []
+
+    def text_search(self, search, *, limit=0, text_score=False, after=None):
+        searches.append(after)
+        for asset in assets:
+            if after is None or (-asset['score'], asset['id']) > (-after[0], after[1]):
+                yield dict(asset)
+
+    monkeypatch.setattr('bigchaindb.Bigchain.text_search', text_search)
+
+    res = client.get('/api/v1/assets/?search=abc&limit=2')
+    assert res.json == [{'id': 'a', 'data': 1}, {'id': 'b', 'data': 2}]
+
+    next_page = res.headers['Link'].split('; ')[0].strip('<>')
+    res = client.get(next_page)
+    assert res.json == [{'id': 'c', 'data': 3}]
+    assert 'Link' not in res.headers
+    assert searches == [None, (1.5, 'b')]
+
+
+def test_get_assets_endpoint_with_invalid_cursor(client):
+    from bigchaindb.web.pagination import encode_cursor
+
+    res = client.get('/api/v1/assets/?search=abc&limit=2&cursor=' +
+                     encode_cursor('abc'))
+    assert res.status_code == 400
+
+
+def test_get_votes_endpoint_with_invalid_limit(client):
+    res = client.get(VOTES_ENDPOINT + '?limit=0&block_id=123')
+    assert res.status_code == 400
@@ -73,3 +73,27 @@ def test_valid_operation():
         valid_operation('blah')
     with pytest.raises(ValueError):
         valid_operation('')
+
+
+def test_valid_limit():
+    from bigchaindb.web.views.parameters import valid_limit
+
+    assert valid_limit('1') == 1
+    assert valid_limit('1000') == 1000
+
+    with pytest.raises(ValueError):
+        valid_limit('0')
+    with pytest.raises(ValueError):
+        valid_limit('1001')
+    with pytest.raises(ValueError):
+        valid_limit('ten')
+
+
+def test_valid_cursor():
+    from bigchaindb.web.pagination import encode_cursor
+    from bigchaindb.web.views.parameters import valid_cursor
+
+    assert valid_cursor(encode_cursor('a' * 64)) == 'a' * 64
+
+    with pytest.raises(ValueError):
+        valid_cursor('a')
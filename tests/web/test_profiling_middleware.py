@@ -0,0 +1,107 @@
+import pytest
+
+
+@pytest.fixture
+def profiled_client(monkeypatch, profiling_directory):
+    from bigchaindb import config
+    from bigchaindb.web import server
+
+    monkeypatch.setitem(config['profiling'], 'request_token', 'secret')
+    return server.create_app(debug=True).test_client()
+
+
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_profile_a_request(profiled_client, profiling_directory, user_pk):
+    import pstats
+
+    res = profiled_client.get('/api/v1/outputs/?public_key=' + user_pk,
+                              headers={'X-BigchainDB-Profile': 'secret'})
+    assert res.status_code == 200
+    assert res.json
+
+    timing = res.headers['Server-Timing'].split(', ')
+    assert timing[0].startswith('total;dur=')
+    assert timing[1].startswith('db;dur=')
+    assert not timing[1].endswith(';desc="0 round trips"')
+    assert any(metric.startswith('query.') for metric in timing[2:])
+
+    profile = profiling_directory.join(res.headers['X-BigchainDB-Profile'])
+    assert pstats.Stats(str(profile)).total_calls
+
+
+@pytest.mark.bdb
+@pytest.mark.parametrize('headers', [{}, {'X-BigchainDB-Profile': 'guess'}])
+def test_the_other_requests_are_not_profiled(profiled_client, profiling_directory, headers):
+    res = profiled_client.get('/api/v1/transactions/' + 'a' * 64, headers=headers)
+
+    assert res.status_code == 404
+    assert 'Server-Timing' not in res.headers
+    assert profiling_directory.listdir() == []
+
+
+def test_no_profiling_without_token():
+    from bigchaindb.web import server
+    from bigchaindb.web.profiling_middleware import ProfilingMiddleware
+
+    app = server.create_app()
+    assert not isinstance(app.wsgi_app.app, ProfilingMiddleware)
+
+
+def test_queries_are_the_functions_of_backend_query():
+    from types import SimpleNamespace
+    from bigchaindb.web.profiling_middleware import queries
+
+    query = '/bigchaindb/backend/mongodb/query.py'
+    connection = '/bigchaindb/backend/mongodb/connection.py'
+    stats = SimpleNamespace(stats={
+        (connection, 70, 'run'): (3, 3, 0.1, 0.25, {}),
+        (query, 20, 'get_spent'): (1, 1, 0.01, 0.05, {}),
+        (query, 40, 'get_owned_ids'): (2, 2, 0.01, 0.2, {}),
+        (query, 42, '<genexpr>'): (9, 9, 0.01, 0.1, {}),
+        (query, 60, '<lambda>'): (2, 2, 0.01, 0.1, {}),
+        (query, 80, '_page'): (2, 2, 0.01, 0.1, {}),
+        ('/bigchaindb/core.py', 10, 'get_spent'): (1, 1, 0.01, 0.3, {}),
+    })
+
+    assert queries(stats) == (3, 0.25, {'get_spent': (1, 0.05), 'get_owned_ids': (2, 0.2)})
+
+
+def test_queries_are_the_mongodb_commands():
+    from types import SimpleNamespace
+    from bigchaindb.web.profiling_middleware import queries
+
+    connection = '/bigchaindb/backend/mongodb/connection.py'
+    stats = SimpleNamespace(stats={(connection, 70, 'run'): (1, 1, 0.1, 0.25, {})})
+
+    assert queries(stats) == (1, 0.25, {})
+    assert queries(stats, [0.25, 0.5]) == (2, 0.75, {})
+
+
+def test_the_commands_of_the_cursors_are_counted(profiling_directory):
+    from types import SimpleNamespace
+    from bigchaindb.web.profiling_middleware import CommandListener, ProfilingMiddleware
+
+    def app(environ, start_response):
+        start_response('200 OK', [])
+        # the getMore commands, while the body is iterated
+        for _ in range(2):
+            CommandListener.record(SimpleNamespace(duration_micros=1500))
+            yield b'[]'
+
+    middleware = ProfilingMiddleware(app, 'secret')
+    headers = {}
+    middleware({'HTTP_X_BIGCHAINDB_PROFILE': 'secret'},
+               lambda status, response_headers, exc_info=None: headers.update(response_headers))
+
+    assert headers['Server-Timing'].split(', ')[1] == 'db;dur=3.0;desc="2 round trips"'
+    # outside of a profiled request
+    CommandListener.record(SimpleNamespace(duration_micros=1500))
+
+
+def test_server_timing():
+    from bigchaindb.web.profiling_middleware import server_timing
+
+    assert server_timing(1.5, 3, 0.25, {'get_spent': (1, 0.05), 'get_owned_ids': (2, 0.2)}) == (
+        'total;dur=1500.0, db;dur=250.0;desc="3 round trips", '
+        'query.get_owned_ids;dur=200.0;desc="2 calls", query.get_spent;dur=50.0;desc="1 calls"')
@@ -0,0 +1,246 @@
+import asyncio
+
+import pytest
+
+from bigchaindb.models import Transaction
+
+
+@pytest.fixture
+def read_app(loop):
+    from bigchaindb.web.websocket_server import init_app
+
+    return init_app(asyncio.Queue(loop=loop), loop=loop, read_threads=2)
+
+
+def test_read_api_is_only_served_if_enabled(loop, read_app):
+    from bigchaindb.web.websocket_server import init_app
+
+    app = init_app(asyncio.Queue(loop=loop), loop=loop)
+    assert 'read_executor' not in app
+    assert 'read_executor' in read_app
+
+
+def test_parse_validates_the_query_parameters():
+    from aiohttp.test_utils import make_mocked_request
+    from bigchaindb.web.read_api import _parse
+    from bigchaindb.web.views.parameters import valid_bool
+
+    request = make_mocked_request('GET', '/api/v1/outputs?spent=true')
+    args, error = _parse(request, {'spent': valid_bool, 'public_key': str})
+    assert args == {'spent': True, 'public_key': None}
+    assert error is None
+
+    request = make_mocked_request('GET', '/api/v1/outputs?spent=yes')
+    args, error = _parse(request, {'spent': valid_bool})
+    assert args is None
+    assert error.status == 400
+
+    request = make_mocked_request('GET', '/api/v1/outputs')
+    _, error = _parse(request, {'public_key': (str, True)})
+    assert error.status == 400
+
+    request = make_mocked_request('GET', '/api/v1/outputs?other=1')
+    _, error = _parse(request, {'public_key': str})
+    assert error.status == 400
+
+
+@asyncio.coroutine
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_read_api_get_transaction(b, user_pk, read_app, test_client):
+    tx = b.get_transaction(b.get_owned_ids(user_pk).pop().txid)
+    client = yield from test_client(read_app)
+
+    res = yield from client.get('/api/v1/transactions/' + tx.id)
+    assert res.status == 200
+    assert (yield from res.json()) == tx.to_dict()
+    assert res.headers['ETag'] == '"{}"'.format(tx.id)
+
+    res = yield from client.get('/api/v1/transactions/123')
+    assert res.status == 404
+
+
+def test_immutable_response_honours_if_none_match():
+    from aiohttp.test_utils import make_mocked_request
+    from bigchaindb.web.read_api import _immutable_response
+
+    request = make_mocked_request('GET', '/api/v1/transactions/abc')
+    response = _immutable_response(request, 'abc', {'id': 'abc'})
+    assert response.status == 200
+    assert response.headers['ETag'] == '"abc"'
+
+    for if_none_match in ('"abc"', '"other", W/"abc"', '*'):
+        request = make_mocked_request('GET', '/api/v1/transactions/abc',
+                                      headers={'If-None-Match': if_none_match})
+        response = _immutable_response(request, 'abc', {'id': 'abc'})
+        assert response.status == 304
+        assert response.headers['ETag'] == '"abc"'
+        assert not response.body
+
+    request = make_mocked_request('GET', '/api/v1/transactions/abc',
+                                  headers={'If-None-Match': '"other"'})
+    assert _immutable_response(request, 'abc', {'id': 'abc'}).status == 200
+
+
+@asyncio.coroutine
+@pytest.mark.bdb
+def test_read_api_get_status(b, read_app, test_client):
+    tx = Transaction.create([b.me], [([b.me], 1)]).sign([b.me_private])
+    b.write_transaction(tx)
+    client = yield from test_client(read_app)
+
+    res = yield from client.get('/api/v1/statuses?transaction_id=' + tx.id)
+    assert (yield from res.json()) == {'status': 'backlog'}
+
+    res = yield from client.get('/api/v1/statuses')
+    assert res.status == 400
+
+
+@asyncio.coroutine
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_read_api_get_outputs_paginated(b, user_pk, read_app, test_client):
+    outputs = list(b.iter_outputs_filtered(user_pk))
+    client = yield from test_client(read_app)
+
+    # the page has the outputs of the first block
+    res = yield from client.get('/api/v1/outputs?limit=1&public_key=' + user_pk)
+    assert res.status == 200
+    assert (yield from res.json()) == [link.to_dict() for block_id, link in outputs
+                                       if block_id == outputs[0][0]]
+    assert 'rel="next"' in res.headers['Link']
+
+
+@asyncio.coroutine
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_read_api_streams_the_outputs(b, user_pk, read_app, test_client, monkeypatch):
+    monkeypatch.setattr('bigchaindb.web.read_api.MAX_LIMIT', 1)
+    outputs = [link for _, link in b.iter_outputs_filtered(user_pk)]
+    client = yield from test_client(read_app)
+
+    res = yield from client.get('/api/v1/outputs?public_key=' + user_pk)
+    assert res.status == 200
+    assert (yield from res.json()) == [output.to_dict() for output in outputs]
+
+    res = yield from client.get('/api/v1/outputs?public_key=' + 'A' * 44)
+    assert (yield from res.json()) == []
+
+
+@asyncio.coroutine
+@pytest.mark.bdb
+def test_read_api_waits_for_the_status(b, read_app, test_client, loop):
+    from bigchaindb import events
+
+    tx = Transaction.create([b.me], [([b.me], 1)]).sign([b.me_private])
+    block = b.create_block([tx])
+    b.write_block(block)
+    client = yield from test_client(read_app)
+
+    res = yield from client.get('/api/v1/statuses?wait=0.1&transaction_id=' + tx.id)
+    assert (yield from res.json()) == {'status': 'undecided'}
+
+    request = loop.create_task(client.get('/api/v1/statuses?wait=10&transaction_id=' + tx.id))
+    yield from asyncio.sleep(0.1)
+    b.write_vote(b.vote(block.id, b.get_last_voted_block().id, True))
+    read_app['dispatcher'].notify(events.Event(events.EventTypes.BLOCK_VALID,
+                                               events.block_summary(block.to_dict())))
+    res = yield from request
+    assert (yield from res.json()) == {'status': 'valid'}
+
+    res = yield from client.get('/api/v1/statuses?wait=61&transaction_id=' + tx.id)
+    assert res.status == 400
+
+
+def test_wait_for_status_queries_once_woken_up(monkeypatch):
+    from bigchaindb import events
+    from bigchaindb.web import read_api
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    dispatcher = Dispatcher(None)
+    request = type('Request', (), {'app': {'dispatcher': dispatcher}})
+    statuses = iter(['undecided', 'valid'])
+
+    def query(request, func):
+        result = asyncio.Future()
+        result.set_result(next(statuses))
+        return result
+
+    monkeypatch.setattr(read_api, '_query', query)
+    waiting = loop.create_task(read_api._wait_for_status(request, 'tx', None, 10,
+                                                         read_api.DECIDED_TRANSACTION))
+    loop.run_until_complete(asyncio.sleep(0))
+    assert dispatcher.waiters['tx']
+
+    dispatcher.notify(events.Event(events.EventTypes.BLOCK_VALID, {
+        'id': 'block', 'transactions': [{'id': 'tx'}]}))
+    assert loop.run_until_complete(waiting) == 'valid'
+    assert not dispatcher.waiters
+    loop.close()
+
+
+def test_wait_for_status_goes_on_after_an_invalid_block(monkeypatch):
+    from bigchaindb import events
+    from bigchaindb.web import read_api
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    dispatcher = Dispatcher(None)
+    request = type('Request', (), {'app': {'dispatcher': dispatcher}})
+    statuses = iter(['undecided', 'backlog', 'valid'])
+
+    def query(request, func):
+        result = asyncio.Future()
+        result.set_result(next(statuses))
+        return result
+
+    def notify(event_type, block_id):
+        dispatcher.notify(events.Event(event_type, {
+            'id': block_id, 'transactions': [{'id': 'tx'}]}))
+        loop.run_until_complete(asyncio.sleep(0))
+
+    monkeypatch.setattr(read_api, '_query', query)
+    waiting = loop.create_task(read_api._wait_for_status(request, 'tx', None, 10,
+                                                         read_api.DECIDED_TRANSACTION))
+    loop.run_until_complete(asyncio.sleep(0))
+
+    # the transaction goes back to the backlog
+    notify(events.EventTypes.BLOCK_INVALID, 'block')
+    assert not waiting.done()
+    assert dispatcher.waiters['tx']
+
+    notify(events.EventTypes.BLOCK_VALID, 'other block')
+    assert loop.run_until_complete(waiting) == 'valid'
+    assert not dispatcher.waiters
+    loop.close()
+
+
+def test_wait_for_status_ends_with_an_invalid_transaction(monkeypatch):
+    from bigchaindb import events
+    from bigchaindb.web import read_api
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    dispatcher = Dispatcher(None)
+    request = type('Request', (), {'app': {'dispatcher': dispatcher}})
+    statuses = iter(['backlog', None])
+
+    def query(request, func):
+        result = asyncio.Future()
+        result.set_result(next(statuses))
+        return result
+
+    monkeypatch.setattr(read_api, '_query', query)
+    waiting = loop.create_task(read_api._wait_for_status(request, 'tx', None, 10,
+                                                         read_api.DECIDED_TRANSACTION))
+    loop.run_until_complete(asyncio.sleep(0))
+
+    # deleted from the backlog by the block pipeline
+    dispatcher.notify(events.Event(events.EventTypes.TRANSACTION_INVALID, {'id': 'tx'}))
+    assert loop.run_until_complete(waiting) is None
+    assert not dispatcher.waiters
+    loop.close()
@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_settings():
     import bigchaindb
     from bigchaindb.web import server
@@ -7,3 +10,36 @@ def test_settings():
     # for whatever reason the value is wrapped in a list
     # needs further investigation
     assert s.cfg.bind[0] == bigchaindb.config['server']['bind']
+
+
+def test_workers_install_the_profiler(profiling_directory):
+    import os
+    import bigchaindb
+    from bigchaindb import profiling
+    from bigchaindb.web import server
+
+    s = server.create_server(bigchaindb.config['server'])
+    s.cfg.post_worker_init(None)
+
+    assert profiling.processes() == {os.getpid(): 'webapi'}
+
+
+@pytest.mark.parametrize('thread_safe', [True, False])
+def test_threads_share_a_thread_safe_connection(monkeypatch, thread_safe):
+    from bigchaindb.web import server
+
+    class Connection:
+        pass
+
+    class Bigchain:
+        def __init__(self, connection=None):
+            self.connection = connection or Connection()
+
+    Connection.thread_safe = thread_safe
+    monkeypatch.setattr(server, 'Bigchain', Bigchain)
+    monkeypatch.setattr(server.backend, 'connect', lambda **kwargs: Connection())
+
+    pool = server.create_app(threads=2).config['bigchain_pool']
+    with pool() as first, pool() as second:
+        assert first is not second
+        assert (first.connection is second.connection) is thread_safe
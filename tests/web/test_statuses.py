@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from bigchaindb.models import Transaction
@@ -92,3 +94,50 @@ def test_get_status_endpoint_returns_400_bad_query_params(client):
 
     res = client.get(STATUSES_ENDPOINT + '?transaction_id=123&block_id=123')
     assert res.status_code == 400
+
+
+def test_get_status_endpoint_rejects_waiting_without_the_read_api(client, monkeypatch):
+    from bigchaindb import config
+
+    monkeypatch.setitem(config['wsserver'], 'read_threads', 0)
+    res = client.get(STATUSES_ENDPOINT + '?wait=10&transaction_id=' + 'a' * 64)
+    assert res.status_code == 400
+
+    monkeypatch.setitem(config['wsserver'], 'read_threads', 4)
+    res = client.get(STATUSES_ENDPOINT + '?wait=61&transaction_id=' + 'a' * 64)
+    assert res.status_code == 400
+
+
+def test_get_status_endpoint_redirects_waiting_to_the_read_api(client, monkeypatch):
+    from bigchaindb import config
+
+    monkeypatch.setitem(config['wsserver'], 'read_threads', 4)
+    monkeypatch.setitem(config['wsserver'], 'advertised_scheme', 'wss')
+    monkeypatch.setitem(config['wsserver'], 'advertised_host', 'example.com')
+    monkeypatch.setitem(config['wsserver'], 'advertised_port', 443)
+
+    res = client.get(STATUSES_ENDPOINT + '?wait=10&block_id=abc')
+    assert res.status_code == 307
+    assert res.headers['Location'] == \
+        'https://example.com:443/api/v1/statuses?wait=10&block_id=abc'
+
+
+@pytest.mark.bdb
+@pytest.mark.genesis
+def test_post_statuses(b, client):
+    tx = Transaction.create([b.me], [([b.me], 1)]).sign([b.me_private])
+    block = b.create_block([tx])
+    b.write_block(block)
+    b.write_vote(b.vote(block.id, b.get_last_voted_block().id, True))
+    backlog = Transaction.create([b.me], [([b.me], 1)], metadata={'n': 1}).sign([b.me_private])
+    b.write_transaction(backlog)
+
+    res = client.post(STATUSES_ENDPOINT, data=json.dumps([tx.id, backlog.id, 'a' * 64]))
+    assert res.status_code == 200
+    assert res.json == {tx.id: 'valid', backlog.id: 'backlog', 'a' * 64: None}
+
+
+@pytest.mark.parametrize('body', [{'id': 'a' * 64}, ['123'], [1], ['a' * 64] * 1001])
+def test_post_statuses_validates_the_ids(client, body):
+    res = client.post(STATUSES_ENDPOINT, data=json.dumps(body))
+    assert res.status_code == 400
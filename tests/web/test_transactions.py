@@ -47,6 +47,19 @@ def test_post_create_transaction_endpoint(b, client):
     assert res.json['outputs'][0]['public_keys'][0] == user_pub
 
 
+@pytest.mark.bdb
+def test_post_transaction_is_traced(b, client, traces):
+    from bigchaindb.models import Transaction
+    from bigchaindb.tracing import read
+    user_priv, user_pub = crypto.generate_key_pair()
+
+    tx = Transaction.create([user_pub], [([user_pub], 1)]).sign([user_priv])
+    res = client.post(TX_ENDPOINT, data=json.dumps(tx.to_dict()))
+    assert res.status_code == 202
+
+    assert list(read(str(traces))[tx.id]) == ['post', 'backlog']
+
+
 @patch('bigchaindb.web.views.base.logger')
 def test_post_create_transaction_with_invalid_id(mock_logger, b, client):
     from bigchaindb.common.exceptions import InvalidHash
@@ -241,6 +254,59 @@ def test_post_invalid_transfer_transaction_returns_400(b, client, user_pk):
     assert res.json['message'] == expected_error_message
 
 
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_post_transaction_batch_endpoint(b, client, user_pk, user_sk):
+    from bigchaindb.models import Transaction
+
+    user_priv, user_pub = crypto.generate_key_pair()
+
+    create_tx = Transaction.create([user_pub], [([user_pub], 1)])
+    create_tx = create_tx.sign([user_priv])
+
+    input_valid = b.get_owned_ids(user_pk).pop()
+    input_tx = b.get_transaction(input_valid.txid)
+    transfers = [
+        Transaction.transfer(input_tx.to_inputs(), [([pk], 1)],
+                             asset_id=input_tx.id).sign([user_sk])
+        for pk in (user_pub, user_pk)
+    ]
+
+    invalid_tx = create_tx.to_dict()
+    invalid_tx['id'] = 'abcd' * 16
+
+    batch = [create_tx.to_dict(), transfers[0].to_dict(), invalid_tx,
+             transfers[1].to_dict()]
+    res = client.post(TX_ENDPOINT + 'batch', data=json.dumps(batch))
+
+    assert res.status_code == 200
+    assert [result['status'] for result in res.json] == [202, 202, 400, 400]
+    assert res.json[0] == {
+        'id': create_tx.id,
+        'status': 202,
+        'location': '../statuses?transaction_id={}'.format(create_tx.id),
+    }
+    assert res.json[2]['message'].startswith('Invalid transaction (InvalidHash)')
+    assert res.json[3]['id'] == transfers[1].id
+    assert res.json[3]['message'].startswith('Invalid transaction (DoubleSpend)')
+
+    assert b.get_status(create_tx.id) == b.TX_IN_BACKLOG
+    assert b.get_status(transfers[0].id) == b.TX_IN_BACKLOG
+    assert b.get_status(transfers[1].id) is None
+
+
+def test_post_transaction_batch_must_be_a_list(client):
+    res = client.post(TX_ENDPOINT + 'batch', data=json.dumps({}))
+    assert res.status_code == 400
+
+
+def test_post_transaction_batch_size_is_limited(client, monkeypatch):
+    monkeypatch.setattr('bigchaindb.web.views.transactions.MAX_BATCH_SIZE', 1)
+    res = client.post(TX_ENDPOINT + 'batch', data=json.dumps([{}, {}]))
+    assert res.status_code == 400
+    assert res.json['message'] == 'The batch has more than 1 transactions'
+
+
 def test_transactions_get_list_good(client):
     from functools import partial
 
@@ -249,7 +315,7 @@ def test_transactions_get_list_good(client):
             of transactions it returns an array of shims with a to_dict() method
             that reports one of the arguments passed to `get_transactions_filtered`.
             """
-        return [type('', (), {'to_dict': partial(lambda a: a, arg)})
+        return [('b', type('', (), {'to_dict': partial(lambda a: a, arg)}))
                 for arg in sorted(args.items())]
 
     asset_id = '1' * 64
@@ -258,11 +324,13 @@ def test_transactions_get_list_good(client):
         url = TX_ENDPOINT + '?asset_id=' + asset_id
         assert client.get(url).json == [
             ['asset_id', asset_id],
+            ['last_id', None],
             ['operation', None]
         ]
         url = TX_ENDPOINT + '?asset_id=' + asset_id + '&operation=CREATE'
         assert client.get(url).json == [
             ['asset_id', asset_id],
+            ['last_id', None],
             ['operation', 'CREATE']
         ]
 
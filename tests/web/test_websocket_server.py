@@ -27,9 +27,33 @@ class MockWebSocket:
     def __init__(self):
         self.received = []
 
+        self.closed = False
+
     def send_str(self, s):
         self.received.append(s)
 
+    @asyncio.coroutine
+    def close(self):
+        self.closed = True
+        yield
+
+
+@pytest.fixture
+def event_loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    pending = asyncio.all_tasks(loop)
+    for task in pending:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    loop.close()
+
+
+def _flush(loop):
+    # let the subscribers send their queued events
+    loop.run_until_complete(asyncio.sleep(0))
+
 
 @asyncio.coroutine
 def test_bridge_sync_async_queue(loop):
@@ -63,6 +87,23 @@ def test_bridge_sync_async_queue(loop):
     assert async_queue.qsize() == 0
 
 
+def test_bridge_deserializes_the_events(event_loop):
+    from bigchaindb.events import Event, EventTypes
+    from bigchaindb.web.websocket_server import _multiprocessing_to_asyncio
+
+    sync_queue = queue.Queue()
+    async_queue = asyncio.Queue()
+    bridge = threading.Thread(target=_multiprocessing_to_asyncio,
+                              args=(sync_queue, async_queue, event_loop),
+                              daemon=True)
+    bridge.start()
+
+    sync_queue.put(Event(EventTypes.BLOCK_VALID, {'id': 'a'}).serialize())
+    event = event_loop.run_until_complete(async_queue.get())
+    assert event.type == EventTypes.BLOCK_VALID
+    assert event.data == {'id': 'a'}
+
+
 @patch('threading.Thread')
 @patch('aiohttp.web.run_app')
 @patch('bigchaindb.web.websocket_server.init_app')
@@ -81,11 +122,14 @@ def test_start_creates_an_event_loop(queue_mock, get_event_loop_mock,
         daemon=True,
     )
     thread_mock.return_value.start.assert_called_once_with()
-    init_app_mock.assert_called_with('event-queue', loop='event-loop')
+    init_app_mock.assert_called_with('event-queue', loop='event-loop',
+                                     read_threads=config['wsserver']['read_threads'])
     run_app_mock.assert_called_once_with(
         init_app_mock.return_value,
         host=config['wsserver']['host'],
         port=config['wsserver']['port'],
+        loop='event-loop',
+        handle_signals=True,
     )
 
 
@@ -125,7 +169,7 @@ def test_websocket_block_event(b, _block, test_client, loop):
     client = yield from test_client(app)
     ws = yield from client.ws_connect(EVENTS_ENDPOINT)
     block = _block.to_dict()
-    block_event = events.Event(events.EventTypes.BLOCK_VALID, block)
+    block_event = events.Event(events.EventTypes.BLOCK_VALID, events.block_summary(block))
 
     yield from event_source.put(block_event)
 
@@ -185,3 +229,306 @@ def test_integration_from_webapi_to_websocket(monkeypatch, client, loop):
     result = loop.run_until_complete(ws.receive())
     json_result = json.loads(result.data)
     assert json_result['transaction_id'] == tx.id
+
+
+def test_dispatcher_matches_the_subscription_filters(event_loop):
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    dispatcher = Dispatcher(None)
+    dispatcher.subscribe('all', MockWebSocket())
+    dispatcher.subscribe('asset', MockWebSocket(), {'asset_id': 'a'})
+    dispatcher.subscribe('transfer', MockWebSocket(),
+                         {'asset_id': 'a', 'operation': 'TRANSFER'})
+    dispatcher.subscribe('key', MockWebSocket(), {'public_key': 'k'})
+
+    assert dispatcher.matching({('asset_id', 'a'), ('operation', 'CREATE'),
+                                ('public_key', 'k')}) == {'all', 'asset', 'key'}
+    assert dispatcher.matching({('asset_id', 'a'), ('operation', 'TRANSFER'),
+                                ('public_key', 'j')}) == {'all', 'asset', 'transfer'}
+
+    dispatcher.unsubscribe('asset')
+    dispatcher.unsubscribe('all')
+    assert dispatcher.matching({('asset_id', 'a'), ('operation', 'CREATE')}) == set()
+    assert dispatcher.matching({('public_key', 'k')}) == {'key'}
+
+
+@pytest.mark.parametrize('_block', (3,), indirect=('_block',), ids=('block',))
+def test_dispatcher_publishes_the_events_to_the_matching_subscribers(_block, event_loop):
+    from bigchaindb import events
+    from bigchaindb.web.websocket_server import Dispatcher, POISON_PILL
+
+    block = _block.to_dict()
+    tx = block['block']['transactions'][1]
+
+    event_source = asyncio.Queue()
+    dispatcher = Dispatcher(event_source)
+    everything, asset = MockWebSocket(), MockWebSocket()
+    dispatcher.subscribe('everything', everything)
+    dispatcher.subscribe('asset', asset, {'asset_id': tx['id']})
+
+    event_source.put_nowait(events.Event(events.EventTypes.BLOCK_VALID, events.block_summary(block)))
+    event_source.put_nowait(POISON_PILL)
+    event_loop.run_until_complete(dispatcher.publish())
+    _flush(event_loop)
+
+    assert len(everything.received) == 3
+    assert [json.loads(event)['transaction_id'] for event in asset.received] == [tx['id']]
+    # the event is serialized once for all its subscribers
+    assert asset.received[0] is everything.received[1]
+
+
+@pytest.mark.parametrize('_block', (3,), indirect=('_block',), ids=('block',))
+def test_dispatcher_batches_the_events(_block, event_loop):
+    from bigchaindb import events
+    from bigchaindb.web.websocket_server import Dispatcher, POISON_PILL
+
+    event_source = asyncio.Queue()
+    dispatcher = Dispatcher(event_source)
+    websocket = MockWebSocket()
+    dispatcher.subscribe('batched', websocket, batch_size=2)
+
+    event_source.put_nowait(events.Event(events.EventTypes.BLOCK_VALID,
+                                         events.block_summary(_block.to_dict())))
+    event_source.put_nowait(POISON_PILL)
+    event_loop.run_until_complete(dispatcher.publish())
+    _flush(event_loop)
+
+    assert [len(json.loads(message)) for message in websocket.received] == [2, 1]
+    assert [event['transaction_id'] for message in websocket.received
+            for event in json.loads(message)] == [tx.id for tx in _block.transactions]
+
+
+@pytest.mark.parametrize('_block', (3,), indirect=('_block',), ids=('block',))
+def test_dispatcher_stamps_the_traces(_block, event_loop, traces):
+    from bigchaindb import events
+    from bigchaindb.tracing import read
+    from bigchaindb.web.websocket_server import Dispatcher, POISON_PILL
+
+    event_source = asyncio.Queue()
+    dispatcher = Dispatcher(event_source)
+    event_source.put_nowait(events.Event(events.EventTypes.BLOCK_VALID,
+                                         events.block_summary(_block.to_dict())))
+    event_source.put_nowait(POISON_PILL)
+    event_loop.run_until_complete(dispatcher.publish())
+
+    assert {txid: list(trace) for txid, trace in read(str(traces)).items()} == {
+        tx.id: ['event'] for tx in _block.transactions}
+
+
+@pytest.mark.parametrize('policy', ('drop', 'disconnect'))
+def test_dispatcher_handles_the_slow_consumers(policy, event_loop):
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    dispatcher = Dispatcher(None, queue_size=2, slow_consumer=policy)
+    slow, fast = MockWebSocket(), MockWebSocket()
+    dispatcher.subscribe('slow', slow)
+    dispatcher.subscribe('fast', fast)
+
+    # the sender of the fast subscriber runs between the events, not the
+    # one of the slow subscriber
+    dispatcher.subscribers['slow'].task.cancel()
+    with patch.object(dispatcher.metrics, 'incr') as incr:
+        for event in ('a', 'b', 'c'):
+            dispatcher.send(['slow', 'fast'], event)
+            _flush(event_loop)
+
+    assert fast.received == ['a', 'b', 'c']
+    if policy == 'drop':
+        assert 'slow' in dispatcher.subscribers
+        assert dispatcher.subscribers['slow'].queue.qsize() == 2
+        incr.assert_called_once_with('websocket.dropped')
+    else:
+        assert 'slow' not in dispatcher.subscribers
+        assert slow.closed
+        assert dispatcher.matching(set()) == {'fast'}
+        incr.assert_any_call('websocket.disconnected')
+
+
+def test_subscription_filters_are_validated():
+    from bigchaindb.web.websocket_server import _subscription_filters
+
+    assert _subscription_filters({'operation': 'create', 'asset_id': 'a' * 64}) == \
+        {'operation': 'CREATE', 'asset_id': 'a' * 64}
+
+    with pytest.raises(ValueError):
+        _subscription_filters({'asset_id': 'a'})
+    with pytest.raises(ValueError):
+        _subscription_filters({'metadata': 'a'})
+
+
+def test_batch_size_is_validated():
+    from bigchaindb.web.websocket_server import _subscription_filters, _valid_batch_size
+
+    assert _valid_batch_size('10') == 10
+    assert _subscription_filters({'batch_size': '10'}) == {}
+
+    for batch_size in ('0', '101', 'a'):
+        with pytest.raises(ValueError):
+            _valid_batch_size(batch_size)
+
+
+def _summary(n, public_key='k'):
+    return {'id': str(n) * 64,
+            'transactions': [{'id': str(n) * 63 + 'f', 'asset_id': str(n) * 63 + 'f',
+                              'operation': 'CREATE', 'public_keys': [public_key]}]}
+
+
+@pytest.fixture
+def resumable_dispatcher(tmpdir, event_loop):
+    from bigchaindb import events
+    from bigchaindb.web.event_log import EventLog
+    from bigchaindb.web.websocket_server import Dispatcher, POISON_PILL
+
+    event_source = asyncio.Queue()
+    event_log = EventLog(str(tmpdir.join('events.log')))
+    dispatcher = Dispatcher(event_source, event_log=event_log)
+
+    def publish(*summaries):
+        for summary in summaries:
+            event_source.put_nowait(events.Event(events.EventTypes.BLOCK_VALID, summary))
+        event_source.put_nowait(POISON_PILL)
+        event_loop.run_until_complete(dispatcher.publish())
+
+    dispatcher.publish_blocks = publish
+    yield dispatcher
+    event_log.close()
+
+
+@pytest.mark.parametrize('since', (1, '1' * 64))
+def test_dispatcher_resumes_from_the_event_log(since, resumable_dispatcher, event_loop):
+    dispatcher = resumable_dispatcher
+    dispatcher.publish_blocks(_summary(1), _summary(2, public_key='j'), _summary(3))
+
+    websocket = MockWebSocket()
+    dispatcher.subscribe('late', websocket, {'public_key': 'k'}, since=since)
+    dispatcher.publish_blocks(_summary(4))
+    # the log is read in the thread of the event log
+    event_loop.run_until_complete(asyncio.sleep(0.1))
+
+    # the missed events, then the new ones
+    assert [(event['block_id'][0], event['sequence'])
+            for event in map(json.loads, websocket.received)] == [('3', 3), ('4', 4)]
+
+
+def test_dispatcher_resumes_from_the_database(resumable_dispatcher, event_loop, monkeypatch):
+    from bigchaindb import Bigchain
+
+    def block(n):
+        return {'id': str(n) * 64,
+                'block': {'transactions': [{'id': str(n) * 64, 'operation': 'CREATE',
+                                            'outputs': [{'public_keys': ['k']}]}]}}
+
+    statuses = {'2' * 64: Bigchain.BLOCK_VALID, '3' * 64: Bigchain.BLOCK_INVALID,
+                '4' * 64: Bigchain.BLOCK_VALID, '5' * 64: Bigchain.BLOCK_VALID}
+    bigchain = type('', (), {'block_election_status': lambda self, block: statuses[block['id']]})
+    monkeypatch.setattr('bigchaindb.web.read_api.local_bigchain', bigchain)
+    monkeypatch.setattr('bigchaindb.web.websocket_server.REPLAY_CHUNK_SIZE', 2)
+    queries = []
+
+    def blocks_after(block_id):
+        queries.append(block_id)
+        return iter([block(2), block(3), block(4), block(5)])
+
+    monkeypatch.setattr('bigchaindb.web.websocket_server._blocks_after', blocks_after)
+
+    dispatcher = resumable_dispatcher
+    # the block 4 became valid after the block 5
+    dispatcher.publish_blocks(_summary(5), _summary(4))
+
+    websocket = MockWebSocket()
+    blocks = event_loop.run_until_complete(dispatcher.blocks_since('1' * 64))
+    dispatcher.subscribe('late', websocket, since='1' * 64, blocks=blocks)
+    event_loop.run_until_complete(asyncio.sleep(0.1))
+
+    # the valid blocks of the database up to the event log, then the log,
+    # read from a single query
+    assert [json.loads(event)['block_id'][0] for event in websocket.received] == ['2', '5', '4']
+    assert queries == ['1' * 64]
+
+
+def test_dispatcher_rejects_a_block_unknown_to_the_database(resumable_dispatcher, event_loop,
+                                                            monkeypatch):
+    monkeypatch.setattr('bigchaindb.web.websocket_server._blocks_after', lambda block_id: None)
+    dispatcher = resumable_dispatcher
+    dispatcher.publish_blocks(_summary(2))
+
+    # the events since the blocks of the log are in the log
+    assert event_loop.run_until_complete(dispatcher.blocks_since('2' * 64)) is None
+    assert event_loop.run_until_complete(dispatcher.blocks_since(1)) is None
+    with pytest.raises(ValueError):
+        event_loop.run_until_complete(dispatcher.blocks_since('1' * 64))
+
+    # a block which left the log after the connection closes it
+    websocket = MockWebSocket()
+    dispatcher.subscribe('late', websocket, since='1' * 64)
+    event_loop.run_until_complete(asyncio.sleep(0.1))
+    assert websocket.closed
+    assert websocket.received == []
+
+
+def test_dispatcher_validates_the_resume_position(resumable_dispatcher):
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    with pytest.raises(ValueError):
+        Dispatcher(None).valid_since('1')
+
+    dispatcher = resumable_dispatcher
+    dispatcher.event_log.segment_size = 1
+    dispatcher.publish_blocks(_summary(1), _summary(2), _summary(3))
+
+    assert dispatcher.valid_since('1') == 1
+    assert dispatcher.valid_since('a' * 64) == 'a' * 64
+    with pytest.raises(ValueError):
+        dispatcher.valid_since('0')
+    with pytest.raises(ValueError):
+        dispatcher.valid_since('a')
+
+
+def test_dispatcher_recovers_the_dropped_events(event_loop, monkeypatch):
+    from bigchaindb import Bigchain, events
+    from bigchaindb.web.websocket_server import Dispatcher, POISON_PILL
+
+    def block(n):
+        return {'id': str(n) * 64,
+                'block': {'transactions': [{'id': str(n) * 64, 'operation': 'CREATE',
+                                            'outputs': [{'public_keys': ['k']}]}]}}
+
+    statuses = {'1' * 64: Bigchain.BLOCK_VALID, '2' * 64: Bigchain.BLOCK_INVALID}
+    monkeypatch.setattr('bigchaindb.web.websocket_server._read_blocks',
+                        lambda ids: [(block(block_id[0]), statuses[block_id]) for block_id in ids])
+
+    event_source = asyncio.Queue()
+    dispatcher = Dispatcher(event_source)
+    websocket = MockWebSocket()
+    dispatcher.subscribe('everything', websocket)
+    waiter = dispatcher.waiter('2' * 64)
+
+    event_source.put_nowait(events.Event(events.EventTypes.EVENTS_DROPPED,
+                                         {'blocks': ['1' * 64, '2' * 64]}))
+    event_source.put_nowait(events.Event(events.EventTypes.BLOCK_VALID, _summary(3)))
+    event_source.put_nowait(POISON_PILL)
+    event_loop.run_until_complete(dispatcher.publish())
+    _flush(event_loop)
+
+    assert [json.loads(event)['block_id'][0] for event in websocket.received] == ['1', '3']
+    assert waiter.result() == events.EventTypes.BLOCK_INVALID
+
+
+def test_dispatcher_wakes_up_the_waiters_of_a_decided_block(event_loop):
+    from bigchaindb import events
+    from bigchaindb.web.websocket_server import Dispatcher, POISON_PILL
+
+    event_source = asyncio.Queue()
+    dispatcher = Dispatcher(event_source)
+    block, tx, other = dispatcher.waiter('b' * 64), dispatcher.waiter('1' * 63 + 'f'), dispatcher.waiter('c')
+
+    event_source.put_nowait(events.Event(events.EventTypes.BLOCK_INVALID, _summary(1)))
+    event_source.put_nowait(events.Event(events.EventTypes.BLOCK_VALID, dict(_summary(2), id='b' * 64)))
+    event_source.put_nowait(POISON_PILL)
+    event_loop.run_until_complete(dispatcher.publish())
+
+    assert tx.result() == events.EventTypes.BLOCK_INVALID
+    assert block.result() == events.EventTypes.BLOCK_VALID
+    assert not other.done()
+    dispatcher.forget('c', other)
+    assert not dispatcher.waiters